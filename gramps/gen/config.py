@@ -157,6 +157,7 @@ register('behavior.translator-needed', True)
 register('behavior.use-tips', False)
 register('behavior.welcome', 100)
 register('behavior.web-search-url', 'http://google.com/#&q=%(text)s')
+register('behavior.website-processes', 0)
 register('behavior.addons-url', "https://raw.githubusercontent.com/gramps-project/addons/master/gramps51")
 
 register('database.backend', 'sqlite')
@@ -167,6 +168,12 @@ register('database.autobackup', 0)
 register('database.path', os.path.join(HOME_DIR, 'grampsdb'))
 register('database.host', '')
 register('database.port', '')
+register('database.serializer', 'blob')
+register('database.reindex-processes', 0)
+register('database.cache-size', 20000)
+register('database.cache-memory', 32)
+register('database.filter-cache-size', 10)
+register('database.undo-history', 0)
 
 register('export.proxy-order',
          [["privacy", 0],
@@ -175,6 +182,7 @@ register('export.proxy-order',
           ["note", 0],
           ["reference", 0]]
         )
+register('export.xml-processes', 0)
 
 register('geography.center-lon', 0.0)
 register('geography.lock', False)
@@ -1433,6 +1433,156 @@ class DbReadBase:
         """
         return False
 
+    def select_handles(self, class_name, where=None, values=None):
+        """
+        Return a list of the handles of the objects of the given class whose
+        secondary columns satisfy an SQL WHERE clause.
+
+        Databases that cannot evaluate SQL predicates return None, in which
+        case the caller must examine the objects themselves.
+
+        :param class_name: Name of a primary object class, eg "Person".
+        :type class_name: str
+        :param where: SQL expression, or None to select all objects.
+        :type where: str
+        :param values: Values for the parameter markers in the expression.
+        :type values: list
+        :returns: Returns a list of handles or None.
+        :rtype: list
+        """
+        return None
+
+    def get_column_values(self, class_name, columns):
+        """
+        Return the values of some secondary columns of all the objects of
+        the given class, without reading the objects themselves.
+
+        Databases that do not store secondary columns return None, in which
+        case the caller must read the objects.
+
+        :param class_name: Name of a primary object class, eg "Person".
+        :type class_name: str
+        :param columns: Names of secondary columns, eg ["gramps_id"].
+        :type columns: list
+        :returns: Returns a list of (handle, value, ...) tuples or None.
+        :rtype: list
+        """
+        return None
+
+    def get_filter_cache(self):
+        """
+        Return the cache of the results of filters applied to this database,
+        or None if there is none.
+
+        Views on a database, like proxies, return None, since their results
+        differ from those of the database itself.
+
+        :returns: Returns a :py:class:`.FilterCache` or None.
+        :rtype: :py:class:`.FilterCache`
+        """
+        return None
+
+    def get_kinship_graph(self):
+        """
+        Return the graph of the family links between the people of this
+        database, or None if there is none.
+
+        Views on a database, like proxies, return None, since they may hide
+        people or families.
+
+        :returns: Returns a :py:class:`.KinshipGraph` or None.
+        :rtype: :py:class:`.KinshipGraph`
+        """
+        return None
+
+    def get_lifespan_table(self):
+        """
+        Return the table of the data used to estimate whether the people of
+        this database are alive, or None if there is none.
+
+        Views on a database, like proxies, return None, since they may hide
+        or alter people, families or events.
+
+        :returns: Returns a :py:class:`.LifespanTable` or None.
+        :rtype: :py:class:`.LifespanTable`
+        """
+        return None
+
+    def get_tree_statistics(self):
+        """
+        Return the statistics about the people and media of this database,
+        such as the counts of genders and names, or None if there are none.
+
+        Views on a database, like proxies, return None, since the statistics
+        count every object of the database.
+
+        :returns: Returns a :py:class:`.TreeStatistics` or None.
+        :rtype: :py:class:`.TreeStatistics`
+        """
+        return None
+
+    def get_sort_keys(self, obj_class, start, stop):
+        """
+        Return the objects of a class from position start up to stop, in
+        the order of the sort keys this database keeps for them, or None if
+        it keeps none.
+
+        The objects are sorted on the localized sort key of their title, as
+        given by glocale.sort_key: the title of sources and places, the
+        volume/page of citations, the description of events and media, or
+        the name of tags. Objects with the same key are sorted by handle.
+
+        :param obj_class: Name of the class of the objects, eg "Event".
+        :type obj_class: str
+        :param start: Position of the first object.
+        :type start: int
+        :param stop: Position after the last object.
+        :type stop: int
+        :returns: Returns a list of (sort key, handle) tuples, or None.
+        :rtype: list
+        """
+        return None
+
+    def get_sort_key_position(self, obj_class, handle):
+        """
+        Return the position of an object in the order of
+        :py:meth:`get_sort_keys`, or None if there is no such object or this
+        database keeps no sort keys for its class.
+
+        :param obj_class: Name of the class of the object, eg "Event".
+        :type obj_class: str
+        :param handle: The handle of the object.
+        :type handle: str
+        :returns: Returns the position, or None.
+        :rtype: int
+        """
+        return None
+
+    def search_text(self, obj_class, field, text):
+        """
+        Return the handles of the objects of a class whose text may contain
+        a string, ignoring case, as found by a full-text index, or None if
+        this database has no index for them.
+
+        The result includes all the objects whose text contains the string,
+        but it may also include others, which the caller has to check.
+
+        :param obj_class: Name of the class of the objects: 'Person',
+                          'Event', 'Place', 'Source', 'Citation' or 'Note'.
+        :type obj_class: str
+        :param field: 'gramps_id' to search the Gramps IDs, or 'text' to
+                      search the names of people and places, the
+                      descriptions of events, the titles, authors,
+                      abbreviations and publication information of sources,
+                      the volumes/pages of citations, or the text of notes.
+        :type field: str
+        :param text: The string to search for.
+        :type text: str
+        :returns: Returns a set of handles, or None.
+        :rtype: set
+        """
+        return None
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
@@ -0,0 +1,320 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Caches for the primary objects of a database.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import hashlib
+from collections import OrderedDict
+from operator import itemgetter
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from .dbconst import CLASS_TO_KEY_MAP, KEY_TO_CLASS_MAP, KEY_TO_NAME_MAP
+from ..utils.lru import LRU
+
+#-------------------------------------------------------------------------
+#
+# class DbCache
+#
+#-------------------------------------------------------------------------
+class DbCache:
+    """
+    A least recently used cache for each primary object type, keyed by
+    handle, which records hit, miss and eviction statistics.
+
+    Each entry may be given a size, such as an estimate of the memory it
+    uses, and the total size of the entries of each type is bounded.
+
+    The cache does not know when the database changes; its owner has to
+    discard the entries of changed objects.
+    """
+    def __init__(self, count, budget=0):
+        """
+        :param count: Maximum number of entries for each object type.
+                      0 disables the cache.
+        :type count: int
+        :param budget: Maximum total size of the entries for each object
+                       type. 0 for no limit.
+        :type budget: int
+        """
+        self.caches = {obj_key: LRU(count, budget, itemgetter(1))
+                       for obj_key in KEY_TO_CLASS_MAP}
+        self.hits = dict.fromkeys(KEY_TO_CLASS_MAP, 0)
+        self.misses = dict.fromkeys(KEY_TO_CLASS_MAP, 0)
+
+    def set_capacity(self, obj_key, count, budget=0):
+        """
+        Set the maximum number of entries and the maximum total size of the
+        entries for one object type.  The cache of the type is emptied.
+        """
+        cache = self.caches[obj_key]
+        cache.clear()
+        cache.count = count
+        cache.budget = budget
+
+    def get(self, obj_key, handle):
+        """
+        Return the entry for the handle, or None if it is not cached.
+        """
+        cache = self.caches[obj_key]
+        if handle in cache:
+            self.hits[obj_key] += 1
+            return cache[handle][0]
+        self.misses[obj_key] += 1
+        return None
+
+    def put(self, obj_key, handle, value, size=0):
+        """
+        Store the entry for the handle, with its size.
+        """
+        self.caches[obj_key][handle] = (value, size)
+
+    def discard(self, obj_key, handle):
+        """
+        Remove the entry for the handle, if any.
+        """
+        self.caches[obj_key].discard(handle)
+
+    def clear(self, obj_key=None):
+        """
+        Remove all entries of one object type, or of all types if obj_key is
+        None.
+        """
+        if obj_key is None:
+            for cache in self.caches.values():
+                cache.clear()
+        else:
+            self.caches[obj_key].clear()
+
+    def get_statistics(self):
+        """
+        Return a dictionary, by object class name, of dictionaries with the
+        number of hits, misses, evictions and entries, and the total size of
+        the entries.
+        """
+        return {KEY_TO_CLASS_MAP[obj_key]: {'hits': self.hits[obj_key],
+                                            'misses': self.misses[obj_key],
+                                            'evictions': cache.evictions,
+                                            'entries': len(cache),
+                                            'size': cache.size}
+                for obj_key, cache in self.caches.items()}
+
+#-------------------------------------------------------------------------
+#
+# class FilterCache
+#
+#-------------------------------------------------------------------------
+class FilterCache:
+    """
+    Results of filters applied to all the objects of a type, kept in memory
+    and in the metadata of the database, and keyed by a string that
+    identifies the filter.
+
+    For filters whose rules only examine the objects themselves, the latest
+    change time and the number of the objects of the type are recorded with
+    the result. Only the objects that have been changed at or after that
+    time are evaluated again, and the matches that no longer exist are
+    dropped. When the number of objects does not agree with the objects
+    changed, added or removed since, which happens when objects are added
+    with an older change time and no signal, all the objects are evaluated
+    again. Objects restored with an older change time, by an import or an
+    undo, are not always seen, so :meth:`forget` must be called after them.
+    The results of other filters are reused only while no object of any
+    type has changed. Objects reported by the database signals are always
+    evaluated again, to catch changes within the resolution of the change
+    times.
+    """
+    def __init__(self, db, size):
+        """
+        :param db: The database, which must implement _get_changes_since and
+                   _get_change_summary.
+        :type db: :py:class:`.DbGeneric`
+        :param size: Maximum number of results to keep.
+        :type size: int
+        """
+        self.db = db
+        self.size = size
+        self.entries = None
+        self.dirty = {}
+        self.connected = False
+
+    def __make_callback(self, class_name):
+        def callback(handles):
+            self.__changed(class_name, handles)
+        return callback
+
+    def __changed(self, class_name, handles):
+        """
+        Record objects reported as changed by the database signals.
+        """
+        if not self.entries:
+            return
+        for digest, entry in self.entries.items():
+            if 'summary' in entry:
+                self.dirty[digest] = None
+            elif entry['class'] == class_name:
+                dirty = self.dirty.setdefault(digest, set())
+                if dirty is not None:
+                    dirty.update(handles)
+
+    def clear(self):
+        """
+        Forget the results held in memory.
+        """
+        self.entries = None
+        self.dirty = {}
+
+    def forget(self):
+        """
+        Forget the results, including those saved in the database.
+        """
+        digests = self.db._get_metadata('filter_cache', [])
+        if digests and not self.db.readonly:
+            for digest in digests:
+                self.db._set_metadata('filter_cache_' + digest, None)
+            self.db._set_metadata('filter_cache', [])
+        self.clear()
+
+    def __load(self):
+        """
+        Return the results, loading them from the database if necessary.
+        """
+        if not self.connected:
+            # Connect only once the cache is used.
+            for class_name in KEY_TO_CLASS_MAP.values():
+                for signal in ('add', 'update', 'delete'):
+                    self.db.connect('%s-%s' % (class_name.lower(), signal),
+                                    self.__make_callback(class_name))
+            self.connected = True
+        if self.entries is None:
+            self.entries = OrderedDict()
+            for digest in self.db._get_metadata('filter_cache', []):
+                entry = self.db._get_metadata('filter_cache_' + digest, None)
+                if entry is not None:
+                    self.entries[digest] = entry
+        return self.entries
+
+    def __store(self, digest, entry):
+        """
+        Remember a result, and save it in the database.
+        """
+        entries = self.__load()
+        entries[digest] = entry
+        entries.move_to_end(digest)
+        self.dirty.pop(digest, None)
+        evicted = []
+        while len(entries) > self.size:
+            evicted.append(entries.popitem(last=False)[0])
+        if not self.db.readonly:
+            for old_digest in evicted:
+                self.db._set_metadata('filter_cache_' + old_digest, None)
+            self.db._set_metadata('filter_cache_' + digest, entry)
+            self.db._set_metadata('filter_cache', list(entries))
+
+    def get(self, class_name, key, local, evaluate):
+        """
+        Return the set of handles of the objects of a class that match a
+        filter.
+
+        :param class_name: Name of the class of the filtered objects.
+        :type class_name: str
+        :param key: Identifies the filter, and anything else that its result
+                    depends on.
+        :type key: str
+        :param local: True if the result for an object depends only on the
+                      object itself.
+        :type local: bool
+        :param evaluate: Called with a list of handles, or with None for all
+                         objects, returns the set of the handles that match.
+        :type evaluate: function
+        :returns: Returns the handles of the matching objects.
+        :rtype: set
+        """
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        entry = self.__load().get(digest)
+        if entry is not None and (entry['key'] != key or
+                                  ('summary' in entry) == local):
+            entry = None
+        dirty = self.dirty.get(digest, set())
+        summary = self.db._get_change_summary()
+        if local:
+            # The summary is in the order of the object type keys.
+            count, _, latest = summary[sorted(KEY_TO_NAME_MAP).index(
+                CLASS_TO_KEY_MAP[class_name])]
+            matches = None
+            if entry is not None and dirty is not None:
+                changes = self.db._get_changes_since(class_name,
+                                                     entry['watermark'])
+                if not changes and not dirty and entry['count'] == count:
+                    self.__load().move_to_end(digest)
+                    return set(entry['matches'])
+                handles = set(self.db.method('get_%s_handles', class_name)())
+                touched = handles.intersection(dirty)
+                touched.update(changes)
+                # Only the objects changed after the watermark, or reported
+                # by the signals, can have been added since the result was
+                # stored, and only those reported can have been removed.
+                # Otherwise objects were added or removed with an old change
+                # time and no signal, and all objects are evaluated again.
+                recent = handles.intersection(dirty)
+                recent.update(handle for handle, change in changes.items()
+                              if change > entry['watermark'])
+                unchanged = len(handles) - len(recent)
+                removed = len(dirty) - len(handles.intersection(dirty))
+                if unchanged <= entry['count'] <= (unchanged + len(recent) +
+                                                   removed):
+                    # Drop the matches that have been removed, or that are
+                    # evaluated again.
+                    matches = set(entry['matches'])
+                    matches.intersection_update(handles)
+                    matches.difference_update(touched)
+                    if touched:
+                        matches.update(evaluate(sorted(touched)))
+            if matches is None:
+                matches = set(evaluate(None))
+            # Objects changed at the latest time may still be changed within
+            # the same second, so they are evaluated again next time.
+            entry = {'key': key, 'class': class_name,
+                     'watermark': latest or 0, 'count': count,
+                     'matches': matches}
+        else:
+            if (entry is not None and not dirty and dirty is not None and
+                    entry['summary'] == summary):
+                self.__load().move_to_end(digest)
+                return set(entry['matches'])
+            matches = set(evaluate(None))
+            entry = {'key': key, 'class': class_name, 'summary': summary,
+                     'matches': matches}
+        if entry == self.__load().get(digest):
+            self.__load().move_to_end(digest)
+            self.dirty.pop(digest, None)
+        else:
+            self.__store(digest, entry)
+        return set(matches)
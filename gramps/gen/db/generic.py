@@ -35,6 +35,10 @@ import ast
 import sys
 import datetime
 import glob
+import tempfile
+import zlib
+from array import array
+from itertools import chain
 
 #------------------------------------------------------------------------
 #
@@ -51,6 +55,10 @@ from ..errors import HandleError
 from ..utils.callback import Callback
 from ..updatecallback import UpdateCallback
 from .bookmarks import DbBookmarks
+from .cache import DbCache, FilterCache
+from .kinship import KinshipGraph
+from .lifespan import LifespanTable
+from .statistics import TreeStatistics
 
 from ..utils.id import create_id
 from ..lib.researcher import Researcher
@@ -78,50 +86,169 @@ def touch(fname, mode=0o666, dir_fd=None, **kwargs):
                      dir_fd=None if os.supports_fd else dir_fd, **kwargs)
 
 class DbGenericUndo(DbUndo):
+    """
+    The undo/redo history of a DbGeneric database.
+
+    The records of the transactions are compressed, and appended to a
+    temporary file in the directory of the tree; only their offsets and
+    lengths in the file are kept in memory. A record that is overwritten is
+    appended again. The number of transactions that can be undone is
+    limited by the 'database.undo-history' setting, when it is not 0, and
+    the file is rewritten with only the records in use when the others take
+    up most of it.
+    """
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.directory = None
+        self.undodb = None
+        self.offsets = array('q')
+        self.lengths = array('q')
+        self.first = 0
+        self.size = 0
+        self.used = 0
+        self.history = config.get('database.undo-history')
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the temporary file that holds the records.
         """
-        pass
+        directory = os.path.dirname(self.path) if self.path else None
+        if directory and os.path.isdir(directory):
+            self.directory = directory
+        self.undodb = tempfile.TemporaryFile(prefix='undo', dir=self.directory)
+        self.offsets = array('q')
+        self.lengths = array('q')
+        self.first = 0
+        self.size = 0
+        self.used = 0
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close, and so remove, the file that holds the records.
         """
-        pass
+        if self.undodb is not None:
+            self.undodb.close()
+            self.undodb = None
+        DbUndo.clear(self)
+
+    def clear(self):
+        """
+        Clear the undo/redo list, and the records of the transactions.
+        """
+        DbUndo.clear(self)
+        if self.undodb is not None:
+            self.undodb.seek(0)
+            self.undodb.truncate()
+        self.first += len(self.offsets)
+        self.offsets = array('q')
+        self.lengths = array('q')
+        self.size = 0
+        self.used = 0
+
+    def __write(self, value):
+        """
+        Write a record at the end of the file, and return its offset and
+        length.
+        """
+        data = zlib.compress(value, 1)
+        offset = self.size
+        self.undodb.seek(offset)
+        self.undodb.write(data)
+        self.size += len(data)
+        self.used += len(data)
+        return offset, len(data)
+
+    def __position(self, index):
+        """
+        Return the position of an entry in the offsets and lengths.
+        """
+        position = index - self.first
+        if not 0 <= position < len(self.offsets):
+            raise IndexError('undo record %d is not kept' % index)
+        return position
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its index.
         """
-        self.undodb.append(value)
+        offset, length = self.__write(value)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        return self.first + len(self.offsets) - 1
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
-        return self.undodb[index]
+        position = self.__position(index)
+        self.undodb.seek(self.offsets[position])
+        return zlib.decompress(self.undodb.read(self.lengths[position]))
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value. The new record is appended to the file,
+        and the old one is dropped when the file is next rewritten.
         """
-        self.undodb[index] = value
+        position = self.__position(index)
+        self.used -= self.lengths[position]
+        self.offsets[position], self.lengths[position] = self.__write(value)
+        self.__compact()
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries, including those no longer kept, so
+        that the indexes of the entries are below it.
+        """
+        return self.first + len(self.offsets)
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction to the undo/redo history, forgetting the
+        oldest transactions beyond the size of the history.
         """
-        return len(self.undodb)
+        DbUndo.commit(self, txn, msg)
+        if self.history > 0:
+            while len(self.undoq) > self.history:
+                self.undoq.popleft()
+            self.__forget()
+
+    def __forget(self):
+        """
+        Drop the records older than those of the transactions in the
+        history, rewriting the file when they fill more than half of it.
+        """
+        kept = [txn.first for txn in chain(self.undoq, self.redoq)
+                if txn.first is not None]
+        first = min(kept) if kept else self.first + len(self.offsets)
+        count = first - self.first
+        if count <= 0:
+            return
+        self.used -= sum(self.lengths[:count])
+        del self.offsets[:count]
+        del self.lengths[:count]
+        self.first = first
+        self.__compact()
+
+    def __compact(self):
+        """
+        Rewrite the file with only the records in use, when the others fill
+        more than half of it.
+        """
+        if self.size - self.used <= self.used:
+            return
+        undodb = tempfile.TemporaryFile(prefix='undo', dir=self.directory)
+        offsets = array('q')
+        size = 0
+        for offset, length in zip(self.offsets, self.lengths):
+            self.undodb.seek(offset)
+            undodb.write(self.undodb.read(length))
+            offsets.append(size)
+            size += length
+        self.undodb.close()
+        self.undodb = undodb
+        self.offsets = offsets
+        self.size = self.used = size
 
     def _redo(self, update_history):
         """
@@ -141,7 +268,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = \
-                    pickle.loads(self.undodb[record_id])
+                    pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
@@ -155,6 +282,8 @@ class DbGenericUndo(DbUndo):
         except:
             self.db._txn_abort()
             raise
+        # The objects are restored with their old change times.
+        self.db.filter_cache.forget()
 
         # Notify listeners
         if db.undo_callback:
@@ -190,7 +319,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = \
-                        pickle.loads(self.undodb[record_id])
+                        pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
@@ -204,6 +333,8 @@ class DbGenericUndo(DbUndo):
         except:
             self.db._txn_abort()
             raise
+        # The objects are restored with their old change times.
+        self.db.filter_cache.forget()
 
         # Notify listeners
         if db.undo_callback:
@@ -540,6 +671,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.surname_list = []
         self.genderStats = GenderStats() # can pass in loaded stats as dict
         self.owner = Researcher()
+        # Raw data of primary objects, as kept by the backend:
+        self.cache = DbCache(config.get('database.cache-size'),
+                             config.get('database.cache-memory') * 1024 * 1024)
+        self.filter_cache = FilterCache(
+            self, config.get('database.filter-cache-size'))
+        self.kinship = KinshipGraph(self)
+        self.lifespan = LifespanTable(self)
+        self.statistics = TreeStatistics(self)
         if directory:
             self.load(directory)
 
@@ -595,6 +734,15 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         if not self._schema_exists():
             self._create_schema()
             self._set_metadata('version', str(self.VERSION[0]))
+        self.cache.clear()
+        self.filter_cache.clear()
+        self.kinship.clear()
+        self.lifespan.clear()
+        self.statistics.clear()
+        self._load_serializer()
+        self._load_indexes()
+        self._load_sort_keys()
+        self._load_text_index(callback)
 
         # Load metadata
         self.name_formats = self._get_metadata('name_formats')
@@ -659,6 +807,39 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         self.db_is_open = True
 
+    def _load_serializer(self):
+        """
+        Select the storage format used for the primary objects.
+
+        Backends with a single storage format need not override this.
+        """
+        pass
+
+    def _load_indexes(self):
+        """
+        Create the indexes that trees made by older versions lack.
+
+        Backends without such indexes need not override this.
+        """
+        pass
+
+    def _load_sort_keys(self):
+        """
+        Prepare the sort keys kept for the sorted lists of handles.
+
+        Backends which do not keep them need not override this.
+        """
+        pass
+
+    def _load_text_index(self, callback=None):
+        """
+        Prepare the full-text index of the database, calling callback with
+        the percentage done if it takes long.
+
+        Backends without a full-text index need not override this.
+        """
+        pass
+
     def _close(self):
         """
         Close database backend.
@@ -736,6 +917,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
+        self.cache.clear()
+        self.filter_cache.clear()
+        self.kinship.clear()
+        self.lifespan.clear()
+        self.statistics.clear()
         self.db_is_open = False
         self._directory = None
 
@@ -1652,6 +1840,47 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def _get_changes_since(self, class_name, time):
+        """
+        Return a dictionary of the change times of the objects of a class
+        that were changed at or after the given time, by handle.
+        """
+        raise NotImplementedError
+
+    def _get_change_summary(self):
+        """
+        Return a tuple with the number of objects, and the sum and maximum of
+        their change times, for each primary object type.
+        """
+        raise NotImplementedError
+
+    def get_filter_cache(self):
+        """
+        Return the cache of filter results, or None if it is disabled.
+        """
+        if self.filter_cache.size > 0:
+            return self.filter_cache
+        return None
+
+    def get_kinship_graph(self):
+        """
+        Return the graph of the family links between the people.
+        """
+        return self.kinship
+
+    def get_lifespan_table(self):
+        """
+        Return the table of the data used to estimate whether the people
+        are alive.
+        """
+        return self.lifespan
+
+    def get_tree_statistics(self):
+        """
+        Return the statistics about the people and media.
+        """
+        return self.statistics
+
     def get_raw_person_data(self, handle):
         return self._get_raw_data(PERSON_KEY, handle)
 
@@ -0,0 +1,428 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+The family links between the people of a database, held in memory.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from collections import deque
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from .dbconst import PERSON_KEY, FAMILY_KEY
+
+# Positions in the raw data of people and families:
+PERSON_FAMILY_LIST = 8
+PERSON_PARENT_FAMILY_LIST = 9
+FAMILY_FATHER = 2
+FAMILY_MOTHER = 3
+FAMILY_CHILD_REF_LIST = 4
+CHILD_REF_REF = 3
+CHILD_REF_FREL = 4
+CHILD_REF_MREL = 5
+
+# Number of changed objects above which the graph is built again rather than
+# updated:
+MAX_CHANGES = 1000
+
+#-------------------------------------------------------------------------
+#
+# class KinshipGraph
+#
+#-------------------------------------------------------------------------
+class KinshipGraph:
+    """
+    The parents, children and partners of every person of a database.
+
+    People and families are numbered, and the links between them are kept as
+    lists of numbers, so that the graph can be searched without reading any
+    object from the database. The graph is built from the raw data on first
+    use. Its owner reports the people and families that change with
+    :py:meth:`discard`, and they are read again before the next search.
+    """
+    def __init__(self, db):
+        """
+        :param db: The database.
+        :type db: :py:class:`.DbGeneric`
+        """
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the graph; it is built again when next used.
+        """
+        self.built = False
+        self.stale = set()
+        # People, by number:
+        self.person_index = {}
+        self.person_handles = []
+        self.person_present = bytearray()
+        self.parent_families = []   # the main family comes first
+        self.families = []
+        # Families, by number:
+        self.family_index = {}
+        self.family_handles = []
+        self.family_present = bytearray()
+        self.fathers = []           # -1 when there is none
+        self.mothers = []
+        self.children = []
+        self.child_rels = []        # (mother relation, father relation)
+
+    def discard(self, obj_key, handle):
+        """
+        Record that a person or family has been added, changed or removed.
+        """
+        if self.built and obj_key in (PERSON_KEY, FAMILY_KEY):
+            self.stale.add((obj_key, handle))
+            if len(self.stale) > MAX_CHANGES:
+                self.clear()
+
+    def __person(self, handle):
+        """
+        Return the number of a person, allocating one if needed.
+        """
+        index = self.person_index.get(handle)
+        if index is None:
+            index = len(self.person_handles)
+            self.person_index[handle] = index
+            self.person_handles.append(handle)
+            self.person_present.append(0)
+            self.parent_families.append(())
+            self.families.append(())
+        return index
+
+    def __family(self, handle):
+        """
+        Return the number of a family, allocating one if needed.
+        """
+        index = self.family_index.get(handle)
+        if index is None:
+            index = len(self.family_handles)
+            self.family_index[handle] = index
+            self.family_handles.append(handle)
+            self.family_present.append(0)
+            self.fathers.append(-1)
+            self.mothers.append(-1)
+            self.children.append(())
+            self.child_rels.append(())
+        return index
+
+    def __set_person(self, handle, data):
+        """
+        Store the links of a person from its raw data, or None if the person
+        does not exist.
+        """
+        index = self.__person(handle)
+        if data is None:
+            self.person_present[index] = 0
+            self.parent_families[index] = ()
+            self.families[index] = ()
+        else:
+            self.person_present[index] = 1
+            self.parent_families[index] = tuple(
+                self.__family(family_handle)
+                for family_handle in data[PERSON_PARENT_FAMILY_LIST])
+            self.families[index] = tuple(
+                self.__family(family_handle)
+                for family_handle in data[PERSON_FAMILY_LIST])
+
+    def __set_family(self, handle, data):
+        """
+        Store the links of a family from its raw data, or None if the family
+        does not exist.
+        """
+        index = self.__family(handle)
+        if data is None:
+            self.family_present[index] = 0
+            self.fathers[index] = self.mothers[index] = -1
+            self.children[index] = self.child_rels[index] = ()
+        else:
+            self.family_present[index] = 1
+            father, mother = data[FAMILY_FATHER], data[FAMILY_MOTHER]
+            self.fathers[index] = self.__person(father) if father else -1
+            self.mothers[index] = self.__person(mother) if mother else -1
+            child_refs = data[FAMILY_CHILD_REF_LIST]
+            self.children[index] = tuple(self.__person(child_ref[CHILD_REF_REF])
+                                         for child_ref in child_refs)
+            self.child_rels[index] = tuple((child_ref[CHILD_REF_MREL][0],
+                                            child_ref[CHILD_REF_FREL][0])
+                                           for child_ref in child_refs)
+
+    def __update(self):
+        """
+        Build the graph, or read the changed people and families again.
+        """
+        if not self.built:
+            for handle, data in self.db._iter_raw_family_data():
+                self.__set_family(handle, data)
+            for handle, data in self.db._iter_raw_person_data():
+                self.__set_person(handle, data)
+            self.built = True
+        elif self.stale:
+            stale, self.stale = self.stale, set()
+            for obj_key, handle in stale:
+                if obj_key == PERSON_KEY:
+                    self.__set_person(handle,
+                                      self.db.get_raw_person_data(handle))
+                else:
+                    self.__set_family(handle,
+                                      self.db.get_raw_family_data(handle))
+
+    def __lookup(self, handle):
+        """
+        Return the number of an existing person, or None.
+        """
+        self.__update()
+        index = self.person_index.get(handle)
+        if index is None or not self.person_present[index]:
+            return None
+        return index
+
+    def __handles(self, indexes):
+        """
+        Return the handles of the existing people among the numbers.
+        """
+        handles = self.person_handles
+        present = self.person_present
+        return set(handles[index] for index in indexes if present[index])
+
+    def __neighbours(self, index):
+        """
+        Return the numbers of the parents, siblings, partners and children of
+        a person.
+        """
+        people = set()
+        for family in self.parent_families[index] + self.families[index]:
+            people.update(self.children[family])
+            people.add(self.fathers[family])
+            people.add(self.mothers[family])
+        people.discard(-1)
+        people.discard(index)
+        return people
+
+    def get_ancestors(self, handle, generations=None, inclusive=True):
+        """
+        Return the handles of the ancestors of a person, following the main
+        parent family of each person.
+
+        :param handle: Handle of the person.
+        :type handle: str
+        :param generations: Number of generations to include, counting the
+                            person as the first one, or None for all.
+        :type generations: int
+        :param inclusive: If True, the person is included.
+        :type inclusive: bool
+        :rtype: set
+        """
+        index = self.__lookup(handle)
+        if index is None:
+            return set()
+        present = self.person_present
+        found = {index}
+        todo = [index]
+        generation = 1
+        while todo and (generations is None or generation < generations):
+            generation += 1
+            parents = []
+            for index in todo:
+                families = self.parent_families[index]
+                if not families:
+                    continue
+                for parent in (self.fathers[families[0]],
+                               self.mothers[families[0]]):
+                    if parent >= 0 and present[parent] and parent not in found:
+                        found.add(parent)
+                        parents.append(parent)
+            todo = parents
+        if not inclusive:
+            found.discard(self.person_index[handle])
+        return self.__handles(found)
+
+    def get_descendants(self, handle, generations=None, inclusive=True):
+        """
+        Return the handles of the descendants of a person.
+
+        :param handle: Handle of the person.
+        :type handle: str
+        :param generations: Number of generations to include, counting the
+                            person as the first one, or None for all.
+        :type generations: int
+        :param inclusive: If True, the person is included.
+        :type inclusive: bool
+        :rtype: set
+        """
+        index = self.__lookup(handle)
+        if index is None:
+            return set()
+        present = self.person_present
+        found = {index}
+        todo = [index]
+        generation = 1
+        while todo and (generations is None or generation < generations):
+            generation += 1
+            children = []
+            for index in todo:
+                for family in self.families[index]:
+                    for child in self.children[family]:
+                        if present[child] and child not in found:
+                            found.add(child)
+                            children.append(child)
+            todo = children
+        if not inclusive:
+            found.discard(self.person_index[handle])
+        return self.__handles(found)
+
+    def get_all_descendants(self, handles):
+        """
+        Return the handles of some people and of all their descendants,
+        following the parent families of each person, as the search for
+        ancestors does.
+
+        :param handles: Handles of the people.
+        :type handles: iterable
+        :rtype: set
+        """
+        self.__update()
+        present = self.person_present
+        offspring = [[] for dummy in self.person_handles]
+        for index, families in enumerate(self.parent_families):
+            for family in families:
+                for parent in (self.fathers[family], self.mothers[family]):
+                    if parent >= 0:
+                        offspring[parent].append(index)
+        found = set()
+        for handle in handles:
+            index = self.person_index.get(handle)
+            if index is not None and present[index]:
+                found.add(index)
+        todo = list(found)
+        while todo:
+            for child in offspring[todo.pop()]:
+                if child not in found:
+                    found.add(child)
+                    todo.append(child)
+        return self.__handles(found)
+
+    def get_relatives(self, handle):
+        """
+        Return the handles of all the people connected to a person by any
+        chain of parents, siblings, partners and children, including the
+        person.
+
+        :rtype: set
+        """
+        index = self.__lookup(handle)
+        if index is None:
+            return set()
+        present = self.person_present
+        found = {index}
+        todo = [index]
+        while todo:
+            index = todo.pop()
+            for other in self.__neighbours(index):
+                if present[other] and other not in found:
+                    found.add(other)
+                    todo.append(other)
+        return self.__handles(found)
+
+    def find_paths(self, handle, targets, step=None):
+        """
+        Search outwards from a person, one remove at a time, and return the
+        handles of the people on a shortest path between the person and each
+        target that can be reached.
+
+        :param handle: Handle of the person.
+        :type handle: str
+        :param targets: Handles of the target people.
+        :type targets: iterable
+        :param step: Called once for each person examined.
+        :type step: function
+        :rtype: set
+        """
+        paths = set()
+        start = self.__lookup(handle)
+        if start is None:
+            return paths
+        person_index = self.person_index
+        targets = set(person_index[target] for target in targets
+                      if target in person_index)
+        previous = {start: None}
+        todo = deque([start])
+        while todo and targets:
+            index = todo.popleft()
+            if step:
+                step()
+            if index in targets:
+                targets.remove(index)
+                path = index
+                while path is not None and path not in paths:
+                    paths.add(path)
+                    path = previous[path]
+            if not self.person_present[index]:
+                continue
+            for other in self.__neighbours(index):
+                if other not in previous:
+                    previous[other] = index
+                    todo.append(other)
+        return self.__handles(paths)
+
+    def get_parent_families(self, handle, all_families=False):
+        """
+        Return the parent families of a person, each as a tuple of the handles
+        of the father and mother (or None), the handles of the children, and
+        the mother and father relations of the person to the family (or None
+        if the person is not listed as a child).
+
+        :param handle: Handle of the person.
+        :type handle: str
+        :param all_families: If False, only the main family is returned.
+        :type all_families: bool
+        :rtype: list
+        """
+        index = self.__lookup(handle)
+        if index is None:
+            return []
+        families = self.parent_families[index]
+        if not all_families:
+            families = families[:1]
+        handles = self.person_handles
+        result = []
+        for family in families:
+            if not self.family_present[family]:
+                continue
+            father, mother = self.fathers[family], self.mothers[family]
+            children = self.children[family]
+            rels = None
+            if index in children:
+                rels = self.child_rels[family][children.index(index)]
+            result.append((handles[father] if father >= 0 else None,
+                           handles[mother] if mother >= 0 else None,
+                           [handles[child] for child in children],
+                           rels))
+        return result
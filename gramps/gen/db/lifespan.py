@@ -0,0 +1,317 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+The data used to estimate the lifespan of the people of a database, held in
+memory, together with the estimates made from it.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..errors import HandleError
+from ..lib import Date, EventType, EventRoleType
+from .dbconst import PERSON_KEY, FAMILY_KEY, EVENT_KEY
+
+# Positions in the raw data of people, families and events:
+PERSON_DEATH_REF_INDEX = 5
+PERSON_BIRTH_REF_INDEX = 6
+PERSON_EVENT_REF_LIST = 7
+PERSON_FAMILY_LIST = 8
+PERSON_PARENT_FAMILY_LIST = 9
+FAMILY_FATHER = 2
+FAMILY_MOTHER = 3
+FAMILY_CHILD_REF_LIST = 4
+FAMILY_EVENT_REF_LIST = 6
+EVENT_TYPE = 2
+EVENT_DATE = 3
+REF_REF = 3
+EVENT_REF_ROLE = 4
+
+# Number of changed objects above which the data is read again rather than
+# updated:
+MAX_CHANGES = 1000
+
+def person_record(person):
+    """
+    Return the data of a person that the lifespan estimate uses: the birth
+    and death event references, as (handle, is primary) pairs or None, and
+    the handles of the primary events, families and parent families.
+    """
+    birth = person.get_birth_ref()
+    death = person.get_death_ref()
+    return ((birth.ref, birth.get_role().is_primary()) if birth else None,
+            (death.ref, death.get_role().is_primary()) if death else None,
+            tuple(ref.ref for ref in person.get_primary_event_ref_list()),
+            tuple(person.get_family_handle_list()),
+            tuple(person.get_parent_family_handle_list()))
+
+def _raw_person_record(data):
+    """
+    Return the record of a person, as person_record does, from its raw data.
+    """
+    refs = data[PERSON_EVENT_REF_LIST]
+    records = [(ref[REF_REF], ref[EVENT_REF_ROLE][0] == EventRoleType.PRIMARY)
+               for ref in refs]
+    birth = data[PERSON_BIRTH_REF_INDEX]
+    death = data[PERSON_DEATH_REF_INDEX]
+    return (records[birth] if 0 <= birth < len(records) else None,
+            records[death] if 0 <= death < len(records) else None,
+            tuple(handle for handle, primary in records if primary),
+            tuple(data[PERSON_FAMILY_LIST]),
+            tuple(data[PERSON_PARENT_FAMILY_LIST]))
+
+#-------------------------------------------------------------------------
+#
+# Light versions of the objects, with the methods the estimate uses
+#
+#-------------------------------------------------------------------------
+class _Ref:
+    """
+    A reference to an event or a child.
+    """
+    __slots__ = ('ref', 'primary')
+
+    def __init__(self, ref, primary=True):
+        self.ref = ref
+        self.primary = primary
+
+    def get_role(self):
+        return self
+
+    def is_primary(self):
+        return self.primary
+
+class _Person:
+    """
+    A person, as seen by the lifespan estimate.
+    """
+    __slots__ = ('handle', 'record', 'table')
+
+    def __init__(self, handle, record, table):
+        self.handle = handle
+        self.record = record
+        self.table = table
+
+    def get_birth_ref(self):
+        return _Ref(*self.record[0]) if self.record[0] else None
+
+    def get_death_ref(self):
+        return _Ref(*self.record[1]) if self.record[1] else None
+
+    def get_primary_event_ref_list(self):
+        return [_Ref(handle) for handle in self.record[2]]
+
+    def get_family_handle_list(self):
+        return list(self.record[3])
+
+    def get_parent_family_handle_list(self):
+        return list(self.record[4])
+
+    def get_main_parents_family_handle(self):
+        return self.record[4][0] if self.record[4] else None
+
+    def get_primary_name(self):
+        return self.table.db.get_person_from_handle(
+            self.handle).get_primary_name()
+
+class _Family:
+    """
+    A family, as seen by the lifespan estimate.
+    """
+    __slots__ = ('father', 'mother', 'children', 'events')
+
+    def __init__(self, father, mother, children, events):
+        self.father = father
+        self.mother = mother
+        self.children = children
+        self.events = events
+
+    def get_father_handle(self):
+        return self.father
+
+    def get_mother_handle(self):
+        return self.mother
+
+    def get_child_ref_list(self):
+        return [_Ref(handle) for handle in self.children]
+
+    def get_event_ref_list(self):
+        return [_Ref(handle) for handle in self.events]
+
+class _Event:
+    """
+    An event, as seen by the lifespan estimate.
+    """
+    __slots__ = ('type', 'date')
+
+    def __init__(self, event_type, date):
+        self.type = event_type
+        self.date = date
+
+    def get_date_object(self):
+        date = Date()
+        if self.date is not None:
+            date.unserialize(self.date)
+        return date
+
+#-------------------------------------------------------------------------
+#
+# class LifespanTable
+#
+#-------------------------------------------------------------------------
+class LifespanTable:
+    """
+    The events and family links of every person of a database, and the
+    estimated birth and death dates of the people.
+
+    The data is read from the raw data of the events, families and people
+    in one pass over each, the first time it is used. It then answers the
+    get_*_from_handle calls of :py:class:`.ProbablyAlive` with light
+    objects, so that the estimate for a person does not read any object
+    from the database. The estimates are kept until any person, family or
+    event changes, since the estimate for a person depends on those of its
+    relatives. Its owner reports the changes with :py:meth:`discard`.
+    """
+    def __init__(self, db):
+        """
+        :param db: The database.
+        :type db: :py:class:`.DbGeneric`
+        """
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the data and the estimates; the data is read again when next
+        used.
+        """
+        self.built = False
+        self.stale = set()
+        self.people = {}
+        self.families = {}
+        self.events = {}
+        self.event_types = {}
+        self.ranges = {}
+
+    def discard(self, obj_key, handle):
+        """
+        Record that a person, family or event has been added, changed or
+        removed.
+        """
+        if obj_key in (PERSON_KEY, FAMILY_KEY, EVENT_KEY):
+            self.ranges.clear()
+            if self.built:
+                self.stale.add((obj_key, handle))
+                if len(self.stale) > MAX_CHANGES:
+                    self.clear()
+
+    def __set_person(self, handle, data):
+        if data is None:
+            self.people.pop(handle, None)
+        else:
+            self.people[handle] = _raw_person_record(data)
+
+    def __set_family(self, handle, data):
+        if data is None:
+            self.families.pop(handle, None)
+        else:
+            self.families[handle] = _Family(
+                data[FAMILY_FATHER], data[FAMILY_MOTHER],
+                tuple(ref[REF_REF] for ref in data[FAMILY_CHILD_REF_LIST]),
+                tuple(ref[REF_REF] for ref in data[FAMILY_EVENT_REF_LIST]))
+
+    def __set_event(self, handle, data):
+        if data is None:
+            self.events.pop(handle, None)
+        else:
+            value = data[EVENT_TYPE][0]
+            event_type = self.event_types.get(value)
+            if event_type is None:
+                event_type = self.event_types[value] = EventType(value)
+            self.events[handle] = _Event(event_type, data[EVENT_DATE])
+
+    def update(self):
+        """
+        Read the data, or the changed people, families and events again.
+        """
+        if not self.built:
+            for handle, data in self.db._iter_raw_event_data():
+                self.__set_event(handle, data)
+            for handle, data in self.db._iter_raw_family_data():
+                self.__set_family(handle, data)
+            for handle, data in self.db._iter_raw_person_data():
+                self.__set_person(handle, data)
+            self.built = True
+        elif self.stale:
+            stale, self.stale = self.stale, set()
+            for obj_key, handle in stale:
+                if obj_key == PERSON_KEY:
+                    self.__set_person(handle,
+                                      self.db.get_raw_person_data(handle))
+                elif obj_key == FAMILY_KEY:
+                    self.__set_family(handle,
+                                      self.db.get_raw_family_data(handle))
+                else:
+                    self.__set_event(handle,
+                                     self.db.get_raw_event_data(handle))
+
+    def get_record(self, handle):
+        """
+        Return the record of a person, as :py:func:`person_record` gives it,
+        or None if there is no such person.
+        """
+        self.update()
+        return self.people.get(handle)
+
+    def get_person_from_handle(self, handle):
+        record = self.people.get(handle)
+        if record is None:
+            raise HandleError('Handle %s not found' % handle)
+        return _Person(handle, record, self)
+
+    def get_family_from_handle(self, handle):
+        family = self.families.get(handle)
+        if family is None:
+            raise HandleError('Handle %s not found' % handle)
+        return family
+
+    def get_event_from_handle(self, handle):
+        event = self.events.get(handle)
+        if event is None:
+            raise HandleError('Handle %s not found' % handle)
+        return event
+
+    def get_range(self, handle, params):
+        """
+        Return the estimate for a person, made with some parameters, as a
+        tuple of the birth and death dates, the explanation and the handle
+        of the relative it is based on, or None if it has not been made.
+        The dates must not be altered.
+        """
+        return self.ranges.get((handle, params))
+
+    def set_range(self, handle, params, estimate):
+        """
+        Keep the estimate for a person.
+        """
+        self.ranges[(handle, params)] = estimate
@@ -0,0 +1,432 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics about the people and media of a database, such as the counts of
+the genders and names and the distribution of the ages, held in memory and
+kept up to date as the database changes.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+import os
+from collections import defaultdict
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..lib import Person, Date, ChildRefType
+from ..utils.file import media_path
+from .dbconst import PERSON_KEY, FAMILY_KEY, EVENT_KEY, MEDIA_KEY
+
+# Positions in the raw data of families, events and media:
+FAMILY_FATHER = 2
+FAMILY_MOTHER = 3
+FAMILY_CHILD_REF_LIST = 4
+CHILD_REF_REF = 3
+CHILD_REF_FREL = 4
+CHILD_REF_MREL = 5
+EVENT_DATE = 3
+MEDIA_PATH = 2
+
+# Number of changed objects above which the data is read again rather than
+# updated:
+MAX_CHANGES = 1000
+
+#-------------------------------------------------------------------------
+#
+# class PersonStats
+#
+#-------------------------------------------------------------------------
+class PersonStats:
+    """
+    What a person adds to the statistics.
+    """
+    __slots__ = ('gender', 'incomplete_names', 'disconnected', 'media',
+                 'birth', 'death', 'parent_families', 'group_names',
+                 'surnames', 'given_names')
+
+    def __init__(self, person):
+        """
+        :param person: The person.
+        :type person: :py:class:`.Person`
+        """
+        names = [person.get_primary_name()] + person.get_alternate_names()
+        self.gender = person.get_gender()
+        self.incomplete_names = 0
+        for name in names:
+            if name.get_first_name().strip() == "":
+                self.incomplete_names += 1
+            elif name.get_surname_list():
+                for surname in name.get_surname_list():
+                    if surname.get_surname().strip() == "":
+                        self.incomplete_names += 1
+            else:
+                self.incomplete_names += 1
+        self.disconnected = (not person.get_main_parents_family_handle() and
+                             not person.get_family_handle_list())
+        self.media = len(person.get_media_list())
+        birth_ref = person.get_birth_ref()
+        death_ref = person.get_death_ref()
+        self.birth = birth_ref.ref if birth_ref else None
+        self.death = death_ref.ref if death_ref else None
+        self.parent_families = tuple(person.get_parent_family_handle_list())
+        self.group_names = frozenset(name.get_group_name().strip()
+                                     for name in names)
+        self.surnames = frozenset(name.get_surname().strip()
+                                  for name in names) - {""}
+        self.given_names = []
+        for given_name in set(name.get_first_name().strip()
+                              for name in names):
+            # A non-breaking space joins the first two given names:
+            nbsp = given_name.split('\u00A0')
+            if len(nbsp) > 1:
+                self.given_names.append(nbsp[0] + '\u00A0' +
+                                        nbsp[1].split()[0])
+                given_name = ' '.join(nbsp[1].split()[1:])
+            self.given_names.extend(given_name.split())
+
+#-------------------------------------------------------------------------
+#
+# class TreeStatistics
+#
+#-------------------------------------------------------------------------
+class TreeStatistics:
+    """
+    Statistics about the people and media of a database, shared by the
+    gramplets and reports that show them.
+
+    The people, families, events and media are read in one pass over each,
+    the first time the statistics are used. The counts that only depend on
+    a person are then updated as people change, by removing what the old
+    version of the person added to them and adding the new version. Those
+    that also depend on events and families, like the ages, are computed
+    from the data held in memory when asked for, and kept until any person,
+    family or event changes. Its owner reports the changes with
+    :py:meth:`discard`.
+
+    The sizes of the media files are not kept, since the files can change
+    outside Gramps: they are read each time they are asked for.
+    """
+    def __init__(self, db):
+        """
+        :param db: The database.
+        :type db: :py:class:`.DbGeneric`
+        """
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the statistics; the data is read again when next used.
+        """
+        self.built = False
+        self.stale = set()
+        self.people = {}
+        self.families = {}
+        self.events = {}
+        self.media = {}
+        self.derived = {}
+        self.genders = defaultdict(int)
+        self.incomplete_names = 0
+        self.disconnected = 0
+        self.with_media = 0
+        self.media_references = 0
+        self.group_names = defaultdict(set)
+        self.surnames = defaultdict(int)
+        self.given_names = defaultdict(int)
+
+    def discard(self, obj_key, handle):
+        """
+        Record that a person, family, event or media object has been added,
+        changed or removed.
+        """
+        if obj_key in (PERSON_KEY, FAMILY_KEY, EVENT_KEY, MEDIA_KEY):
+            if obj_key != MEDIA_KEY:
+                self.derived.clear()
+            if self.built:
+                self.stale.add((obj_key, handle))
+                if len(self.stale) > MAX_CHANGES:
+                    self.clear()
+
+    def __count(self, handle, stats, sign):
+        """
+        Add what a person adds to the counts, or remove it if sign is -1.
+        """
+        self.genders[stats.gender] += sign
+        self.incomplete_names += sign * stats.incomplete_names
+        self.disconnected += sign * stats.disconnected
+        if stats.media:
+            self.with_media += sign
+            self.media_references += sign * stats.media
+        for name in stats.group_names:
+            if sign > 0:
+                self.group_names[name].add(handle)
+            else:
+                handles = self.group_names[name]
+                handles.discard(handle)
+                if not handles:
+                    del self.group_names[name]
+        for counts, names in ((self.surnames, stats.surnames),
+                              (self.given_names, stats.given_names)):
+            for name in names:
+                counts[name] += sign
+                if not counts[name]:
+                    del counts[name]
+
+    def __set_person(self, handle, data):
+        old = self.people.pop(handle, None)
+        if old is not None:
+            self.__count(handle, old, -1)
+        if data is not None:
+            stats = self.people[handle] = PersonStats(Person.create(data))
+            self.__count(handle, stats, 1)
+
+    def __set_family(self, handle, data):
+        if data is None:
+            self.families.pop(handle, None)
+        else:
+            children = {}
+            for ref in data[FAMILY_CHILD_REF_LIST]:
+                children.setdefault(ref[CHILD_REF_REF],
+                                    (ref[CHILD_REF_FREL][0] ==
+                                     ChildRefType.BIRTH,
+                                     ref[CHILD_REF_MREL][0] ==
+                                     ChildRefType.BIRTH))
+            self.families[handle] = (data[FAMILY_FATHER], data[FAMILY_MOTHER],
+                                     children)
+
+    def __set_event(self, handle, data):
+        if data is None:
+            self.events.pop(handle, None)
+        else:
+            date = Date()
+            if data[EVENT_DATE] is not None:
+                date.unserialize(data[EVENT_DATE])
+            # Whether the date displays as any text, as get_date does:
+            if date.get_modifier() == Date.MOD_TEXTONLY:
+                dated = bool(date.get_text())
+            else:
+                dated = date.get_start_date() != Date.EMPTY
+            self.events[handle] = (date.get_year(), dated)
+
+    def __set_media(self, handle, data):
+        self.media.pop(handle, None)
+        if data is not None:
+            self.media[handle] = data[MEDIA_PATH]
+
+    def update(self):
+        """
+        Read the data, or the changed people, families, events and media
+        again.
+        """
+        if not self.built:
+            for handle, data in self.db._iter_raw_event_data():
+                self.__set_event(handle, data)
+            for handle, data in self.db._iter_raw_family_data():
+                self.__set_family(handle, data)
+            for handle, data in self.db._iter_raw_person_data():
+                self.__set_person(handle, data)
+            for handle, data in self.db._iter_raw_media_data():
+                self.__set_media(handle, data)
+            self.built = True
+        elif self.stale:
+            stale, self.stale = self.stale, set()
+            for obj_key, handle in stale:
+                if obj_key == PERSON_KEY:
+                    self.__set_person(handle,
+                                      self.db.get_raw_person_data(handle))
+                elif obj_key == FAMILY_KEY:
+                    self.__set_family(handle,
+                                      self.db.get_raw_family_data(handle))
+                elif obj_key == EVENT_KEY:
+                    self.__set_event(handle,
+                                     self.db.get_raw_event_data(handle))
+                else:
+                    self.__set_media(handle,
+                                     self.db.get_raw_media_data(handle))
+
+    def get_number_of_people(self):
+        """
+        Return the number of people.
+        """
+        self.update()
+        return len(self.people)
+
+    def get_gender_counts(self):
+        """
+        Return the numbers of males, females and people of unknown gender.
+        """
+        self.update()
+        return (self.genders[Person.MALE], self.genders[Person.FEMALE],
+                len(self.people) - self.genders[Person.MALE] -
+                self.genders[Person.FEMALE])
+
+    def get_people_summary(self):
+        """
+        Return the counts that summarize the people, as a dictionary with
+        the keys:
+
+        people
+            The number of people.
+        males, females, unknown
+            The numbers of people of each gender.
+        incomplete_names
+            The number of names, primary or alternate, lacking a given name
+            or a surname.
+        missing_births
+            The number of people without a birth event with a date.
+        disconnected
+            The number of people without parents, spouses or children.
+        with_media
+            The number of people with media references.
+        media_references
+            The total number of media references of the people.
+        unique_surnames
+            The number of distinct surnames.
+        """
+        males, females, unknown = self.get_gender_counts()
+        return {'people': len(self.people),
+                'males': males,
+                'females': females,
+                'unknown': unknown,
+                'incomplete_names': self.incomplete_names,
+                'missing_births': self.__missing_births(),
+                'disconnected': self.disconnected,
+                'with_media': self.with_media,
+                'media_references': self.media_references,
+                'unique_surnames': len(self.surnames)}
+
+    def __missing_births(self):
+        missing = self.derived.get('missing_births')
+        if missing is None:
+            missing = 0
+            for stats in self.people.values():
+                event = self.events.get(stats.birth)
+                if event is None or not event[1]:
+                    missing += 1
+            self.derived['missing_births'] = missing
+        return missing
+
+    def get_surname_counts(self):
+        """
+        Return the number of people with each group name, stripped, among
+        their primary and alternate names, as a dictionary of (count,
+        representative handle) pairs by group name. The representative
+        handle is that of any person with the group name.
+        """
+        self.update()
+        return {name: (len(handles), next(iter(handles)))
+                for name, handles in self.group_names.items()}
+
+    def get_given_name_counts(self):
+        """
+        Return the number of times each given name is used, as a dictionary
+        of counts by given name. The given names of the primary and
+        alternate names of a person are split into single names, except
+        that two names joined by a non-breaking space count as one, and
+        each distinct given name of a person is counted once.
+        """
+        self.update()
+        return dict(self.given_names)
+
+    def get_age_distribution(self):
+        """
+        Return the people with both a birth and a death event, and a birth
+        year, by the difference of the years of those events, as a
+        dictionary of lists of handles.
+        """
+        self.update()
+        ages = self.derived.get('ages')
+        if ages is None:
+            ages = self.derived['ages'] = defaultdict(list)
+            for handle, stats in self.people.items():
+                birth = self.events.get(stats.birth)
+                death = self.events.get(stats.death)
+                if birth and death and birth[0] != 0:
+                    ages[death[0] - birth[0]].append(handle)
+        return ages
+
+    def get_parent_age_distributions(self):
+        """
+        Return the parents by their age at the birth of their children, as
+        a pair of dictionaries of lists of handles, for fathers and for
+        mothers, in which a parent is listed once for each child. Only
+        birth parents with a birth event, of children with a birth year,
+        are counted, and the ages are differences of years.
+        """
+        self.update()
+        diffs = self.derived.get('parents')
+        if diffs is None:
+            diffs = self.derived['parents'] = (defaultdict(list),
+                                               defaultdict(list))
+            for handle, stats in self.people.items():
+                birth = self.events.get(stats.birth)
+                if not birth or birth[0] == 0:
+                    continue
+                for family_handle in stats.parent_families:
+                    family = self.families.get(family_handle)
+                    if family is None or handle not in family[2]:
+                        continue
+                    for parent, is_birth, parent_diffs in zip(
+                            family[:2], family[2][handle], diffs):
+                        if not is_birth or not parent:
+                            continue
+                        parent_stats = self.people.get(parent)
+                        if parent_stats is None:
+                            continue
+                        parent_birth = self.events.get(parent_stats.birth)
+                        if parent_birth:
+                            parent_diffs[birth[0] - parent_birth[0]].append(
+                                parent)
+        return diffs
+
+    def get_media_summary(self):
+        """
+        Return the number of media objects, the total size of their files
+        in bytes and the paths of the files that could not be found. The
+        files are measured again on each call.
+        """
+        self.update()
+        try:
+            base = media_path(self.db)
+        except (KeyError, ValueError):
+            # The base path names an unknown variable:
+            base = None
+        total = 0
+        missing = []
+        for path in self.media.values():
+            if os.path.isabs(path):
+                fullname = path
+            elif base is not None:
+                fullname = os.path.join(base, path)
+            else:
+                missing.append(path)
+                continue
+            try:
+                total += os.path.getsize(fullname)
+            except OSError:
+                missing.append(path)
+        return len(self.media), total, missing
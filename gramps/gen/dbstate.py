@@ -44,6 +44,7 @@ from .utils.callback import Callback
 from .config import config
 from .db.dbconst import DBLOGNAME
 from .db.dummydb import DummyDb
+from .display.name import displayer as name_displayer
 
 #-------------------------------------------------------------------------
 #
@@ -110,6 +111,7 @@ class DbState(Callback):
         Change the current database. and resets the configuration prefixes.
         """
         self.db = database
+        name_displayer.clear_cache()
         self.db.set_prefixes(
             config.get('preferences.iprefix'),
             config.get('preferences.oprefix'),
@@ -136,6 +138,7 @@ class DbState(Callback):
         if self.is_open():
             self.db.close()
         self.db = DummyDb()
+        name_displayer.clear_cache()
         self.open = False
         self.emit('database-changed', (self.db, ))
 
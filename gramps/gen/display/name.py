@@ -70,6 +70,7 @@ from ..const import ARABIC_COMMA, ARABIC_SEMICOLON, GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 from ..lib.name import Name
 from ..lib.nameorigintype import NameOriginType
+from ..utils.lru import LRU
 
 try:
     from ..config import config
@@ -111,6 +112,9 @@ _F_ACT = 2   # if the format is active
 _F_FN = 3    # name format function
 _F_RAWFN = 4 # name format raw function
 
+# Number of people whose names the cached_* methods keep, without config:
+_CACHE_SIZE = 20000
+
 PAT_AS_SURN = False
 
 #-------------------------------------------------------------------------
@@ -371,6 +375,7 @@ class NameDisplay:
         self.name_formats = {}
 
         if WITH_GRAMPS_CONFIG:
+            cache_size = config.get('database.cache-size')
             self.default_format = config.get('preferences.name-format')
             if self.default_format == 0:
                 self.default_format = Name.LNFN
@@ -380,9 +385,15 @@ class NameDisplay:
             PAT_AS_SURN = config.get('preferences.patronimic-surname')
             config.connect('preferences.patronimic-surname', self.change_pa_sur)
         else:
+            cache_size = _CACHE_SIZE
             self.default_format = Name.LNFN
             PAT_AS_SURN = False
 
+        # The names of the people used last, by handle, with the name data
+        # they come from, for the display, the view sort and the report
+        # sort:
+        self.__names = (LRU(cache_size), LRU(cache_size), LRU(cache_size))
+
         #preinit the name formats, this should be updated with the data
         #in the database once a database is loaded
         self.set_name_format(self.STANDARD_FORMATS)
@@ -391,6 +402,7 @@ class NameDisplay:
         """ How to handle single patronymic as surname is changed"""
         global PAT_AS_SURN
         PAT_AS_SURN = config.get('preferences.patronimic-surname')
+        self.clear_cache()
 
     def get_pat_as_surn(self):
         global PAT_AS_SURN
@@ -422,6 +434,15 @@ class NameDisplay:
         self.name_formats = {num: value
                              for num, value in self.name_formats.items()
                              if num >= 0}
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Forget the names kept by the cached_* methods. This is done when the
+        name formats change, and when another database is opened.
+        """
+        for names in self.__names:
+            names.clear()
 
     def set_name_format(self, formats):
 
@@ -457,6 +478,7 @@ class NameDisplay:
             del self.name_formats[num]
         except:
             pass
+        self.clear_cache()
 
     def set_default_format(self, num):
         if num not in self.name_formats:
@@ -467,6 +489,7 @@ class NameDisplay:
             num = Name.LNFN
 
         self.default_format = num
+        self.clear_cache()
 
         self.name_formats[Name.DEF] = (self.name_formats[Name.DEF][_F_NAME],
                                        self.name_formats[Name.DEF][_F_FMT],
@@ -961,6 +984,63 @@ class NameDisplay:
         num = self._is_format_valid(raw_data[_DISPLAY])
         return self.name_formats[num][_F_RAWFN](raw_data)
 
+    def cached_display_name(self, handle, raw_data):
+        """
+        Return the name of a person as :py:meth:`raw_display_name` does,
+        keeping it until the name data or the name formats change.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param raw_data: raw unserialized data of the name of the person.
+        :type raw_data: tuple
+        :returns: Returns the name string representation
+        :rtype: str
+        """
+        names = self.__names[0]
+        entry = names.get(handle)
+        if entry is None or entry[0] != raw_data:
+            entry = names[handle] = (raw_data, self.raw_display_name(raw_data))
+        return entry[1]
+
+    def cached_sort_key(self, handle, raw_data):
+        """
+        Return the name of a person as :py:meth:`raw_sorted_name` does, and
+        its localized sort key, keeping them until the name data or the name
+        formats change. The views sort on these.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param raw_data: raw unserialized data of the name of the person.
+        :type raw_data: tuple
+        :returns: Returns the name string representation and its sort key
+        :rtype: tuple
+        """
+        names = self.__names[1]
+        entry = names.get(handle)
+        if entry is None or entry[0] != raw_data:
+            name = self.raw_sorted_name(raw_data)
+            entry = names[handle] = (raw_data, name, glocale.sort_key(name))
+        return entry[1:]
+
+    def cached_sorted_key(self, handle, raw_data):
+        """
+        Return the localized sort key of the name of a person as
+        :py:meth:`sorted_name` gives it, keeping it until the name data or
+        the name formats change.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param raw_data: raw unserialized data of the name of the person.
+        :type raw_data: tuple
+        :returns: Returns the sort key
+        """
+        names = self.__names[2]
+        entry = names.get(handle)
+        if entry is None or entry[0] != raw_data:
+            name = self.sorted_name(Name().unserialize(raw_data))
+            entry = names[handle] = (raw_data, glocale.sort_key(name))
+        return entry[1]
+
     def display_given(self, person):
         return self.format_str(person.get_primary_name(),'%f')
 
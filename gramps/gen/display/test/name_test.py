@@ -0,0 +1,97 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the cached names of NameDisplay """
+
+import unittest
+from unittest.mock import patch
+
+from ...config import config
+from ...dbstate import DbState
+from ...lib import Name, Surname
+from ..name import NameDisplay, displayer
+
+class CachedNameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.nd = NameDisplay()
+        self.nd.set_default_format(Name.LNFN)
+        name = Name()
+        name.set_first_name('John')
+        name.add_surname(Surname())
+        name.get_primary_surname().set_surname('Smith')
+        self.name = name
+
+    def test_display(self):
+        data = self.name.serialize()
+        self.assertEqual(self.nd.cached_display_name('H1', data),
+                         'Smith, John')
+        self.name.set_first_name('Jim')
+        self.assertEqual(self.nd.cached_display_name('H1',
+                                                     self.name.serialize()),
+                         'Smith, Jim')
+
+    def test_sort_key(self):
+        data = self.name.serialize()
+        name, key = self.nd.cached_sort_key('H1', data)
+        self.assertEqual(name, self.nd.raw_sorted_name(data))
+        self.assertEqual(self.nd.cached_sorted_key('H1', data),
+                         self.nd.cached_sort_key('H1', data)[1])
+
+    def test_format(self):
+        data = self.name.serialize()
+        self.assertEqual(self.nd.cached_display_name('H1', data),
+                         'Smith, John')
+        self.nd.set_default_format(Name.FNLN)
+        self.assertEqual(self.nd.cached_display_name('H1', data),
+                         'John Smith')
+
+    def test_bounded(self):
+        cache_size = config.get('database.cache-size')
+        config.set('database.cache-size', 2)
+        try:
+            nd = NameDisplay()
+        finally:
+            config.set('database.cache-size', cache_size)
+        data = self.name.serialize()
+        with patch.object(nd, 'raw_display_name',
+                          wraps=nd.raw_display_name) as display:
+            for handle in ('H1', 'H2', 'H1', 'H3'):
+                nd.cached_display_name(handle, data)
+            self.assertEqual(display.call_count, 3)
+            # H2 was the least recently used
+            nd.cached_display_name('H1', data)
+            self.assertEqual(display.call_count, 3)
+            nd.cached_display_name('H2', data)
+            self.assertEqual(display.call_count, 4)
+
+    def test_database_change(self):
+        data = self.name.serialize()
+        displayer.cached_display_name('H1', data)
+        with patch.object(displayer, 'raw_display_name',
+                          wraps=displayer.raw_display_name) as display:
+            displayer.cached_display_name('H1', data)
+            self.assertEqual(display.call_count, 0)
+            DbState().no_database()
+            displayer.cached_display_name('H1', data)
+            self.assertEqual(display.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,9 @@
 Package providing filtering framework for Gramps.
 """
 
+import datetime
+
+import gramps.gen.filters
 #------------------------------------------------------------------------
 #
 # Gramps imports
@@ -40,8 +43,22 @@ from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
 from ..const import GRAMPS_LOCALE as glocale
+from ..config import config
 _ = glocale.translation.gettext
 
+# Handle lists shorter than this are checked object by object, since an SQL
+# query has to examine the whole table.
+SQL_MIN_HANDLES = 100
+# Preferences that the results of rules may depend on, through the display
+# of names, places and dates, date matching or the estimate of whether
+# people are alive:
+SETTINGS = ('preferences.name-format', 'preferences.patronimic-surname',
+            'preferences.place-format', 'preferences.place-auto',
+            'preferences.date-format', 'behavior.date-about-range',
+            'behavior.date-after-range', 'behavior.date-before-range',
+            'behavior.max-age-prob-alive', 'behavior.max-sib-age-diff',
+            'behavior.avg-generation-gap', 'behavior.min-generation-years')
+
 #-------------------------------------------------------------------------
 #
 # GenericFilter
@@ -230,6 +247,173 @@ class GenericFilter:
     def or_test(self, db, person):
         return any(rule.apply(db, person) for rule in self.flist)
 
+    def check_sql(self, db, id_list, user=None, tupleind=None):
+        """
+        Apply the filter with the help of SQL predicates, if possible.
+
+        The rules that can be expressed in SQL are combined into a single
+        query against the secondary columns.  With the 'and' operator, the
+        remaining rules are then applied only to the objects selected by the
+        query.
+
+        Returns None if the filter cannot be applied in this way.
+        """
+        if id_list is not None and len(id_list) < SQL_MIN_HANDLES:
+            return None
+        predicates = []
+        remaining = []
+        for rule in self.flist:
+            predicate = rule.get_sql()
+            if predicate is None:
+                remaining.append(rule)
+            else:
+                predicates.append(predicate)
+        logical_op = self.logical_op
+        if logical_op not in self.logical_functions:
+            logical_op = 'and'
+        if not predicates or (remaining and logical_op != 'and'):
+            return None
+
+        clauses = ['(%s)' % clause for clause, values in predicates]
+        values = [value for clause, rule_values in predicates
+                  for value in rule_values]
+        if logical_op == 'and':
+            where = ' AND '.join(clauses)
+        elif logical_op == 'or':
+            where = ' OR '.join(clauses)
+        else:
+            count = ' + '.join('(CASE WHEN %s THEN 1 ELSE 0 END)' % clause
+                               for clause in clauses)
+            if logical_op == 'one':
+                where = '(%s) = 1' % count
+            else:
+                where = '(%s) %% 2 = 1' % count
+
+        class_name = self.make_obj().__class__.__name__
+        handles = db.select_handles(class_name, where, values)
+        if handles is None:
+            return None
+
+        if id_list is None:
+            if remaining:
+                if user:
+                    user.begin_progress(_('Filter'), _('Applying ...'),
+                                        len(handles))
+                final_list = []
+                for handle in handles:
+                    if user:
+                        user.step_progress()
+                    if self.__apply_rules(db, handle, remaining):
+                        final_list.append(handle)
+                if user:
+                    user.end_progress()
+                handles = final_list
+            if self.invert:
+                matches = set(handles)
+                handles = [handle for handle in db.select_handles(class_name)
+                           if handle not in matches]
+            return handles
+
+        matches = set(handles)
+        final_list = []
+        if user:
+            user.begin_progress(_('Filter'), _('Applying ...'), len(id_list))
+        for data in id_list:
+            if tupleind is None:
+                handle = data
+            else:
+                handle = data[tupleind]
+            if user:
+                user.step_progress()
+            val = (handle in matches and
+                   self.__apply_rules(db, handle, remaining))
+            if val != self.invert:
+                final_list.append(data)
+        if user:
+            user.end_progress()
+        return final_list
+
+    def __apply_rules(self, db, handle, rules):
+        """
+        Return True if the object with the given handle passes all the rules.
+        """
+        if not rules:
+            return True
+        obj = self.find_from_handle(db, handle)
+        return all(rule.apply(db, obj) for rule in rules)
+
+    def get_definition(self):
+        """
+        Return a string that identifies the definition of the filter.
+        """
+        return repr((self.__class__.__name__, self.name, self.logical_op,
+                     self.invert,
+                     [(rule.__class__.__module__, rule.__class__.__name__,
+                       rule.list, rule.use_regex) for rule in self.flist]))
+
+    def get_settings(self):
+        """
+        Return a string that identifies the preferences that the rules may
+        depend on.
+        """
+        return repr([config.get(setting) for setting in SETTINGS])
+
+    def get_context(self, db):
+        """
+        Return a string that identifies the state, other than the objects in
+        the database, that rules which examine other objects may depend on:
+        the date, the home person, the bookmarks and the custom filters.
+        """
+        custom_filters = gramps.gen.filters.CustomFilters
+        if custom_filters is None:
+            definitions = []
+        else:
+            definitions = [filt.get_definition()
+                           for namespace in ('Person', 'Family', 'Event',
+                                             'Source', 'Citation', 'Place',
+                                             'Media', 'Repository', 'Note')
+                           for name, filt in sorted(
+                               custom_filters.get_filters_dict(
+                                   namespace).items())]
+        bookmarks = [db.method('get_%s_bookmarks', class_name)().get()
+                     for class_name in ('citation', 'event', 'family',
+                                        'media', 'note', 'place', 'repo',
+                                        'source')]
+        return repr((datetime.date.today().toordinal(),
+                     db.get_default_handle(), db.get_bookmarks().get(),
+                     bookmarks, definitions))
+
+    def check_cache(self, db, id_list, user=None, tupleind=None):
+        """
+        Apply the filter with the help of the filter cache of the database,
+        if possible.
+
+        The set of matching objects is looked up, or brought up to date, in
+        the cache, and then used to select the objects in id_list.
+
+        Returns None if the filter cannot be applied in this way.
+        """
+        if id_list is not None and len(id_list) < SQL_MIN_HANDLES:
+            return None
+        cache = db.get_filter_cache()
+        if cache is None:
+            return None
+        local = all(rule.local for rule in self.flist)
+        key = self.get_definition() + self.get_settings()
+        if not local:
+            key += self.get_context(db)
+
+        def evaluate(handles):
+            return self.__apply(db, handles, None, user, False)
+
+        matches = cache.get(self.make_obj().__class__.__name__, key, local,
+                            evaluate)
+        if id_list is None:
+            return list(matches)
+        if tupleind is None:
+            return [handle for handle in id_list if handle in matches]
+        return [data for data in id_list if data[tupleind] in matches]
+
     def get_check_func(self):
         try:
             m = getattr(self, 'check_' + self.logical_op)
@@ -257,10 +441,56 @@ class GenericFilter:
                 if id_list not given, all items in the database that
                 match the filter are returned as a list of handles
         """
+        if id_list is not None and not isinstance(id_list, (list, tuple)):
+            id_list = list(id_list)
+        if not tree:
+            res = self.check_cache(db, id_list, user, tupleind)
+            if res is not None:
+                return res
+        return self.__apply(db, id_list, tupleind, user, tree)
+
+    def apply_in_steps(self, db, id_list, step, tupleind=None, user=None):
+        """
+        Apply the filter using db to the items of id_list, as apply does,
+        step items at a time.
+
+        Returns a generator yielding the list of the matching items of each
+        step, so that the caller can do other work in between. The rules
+        are prepared once for all the steps. When the filter cache of the
+        database can be used, all the matches are yielded at once.
+        """
+        if not isinstance(id_list, (list, tuple)):
+            id_list = list(id_list)
+        res = self.check_cache(db, id_list, user, tupleind)
+        if res is not None:
+            yield res
+            return
+        m = self.get_check_func()
+        for rule in self.flist:
+            rule.requestprepare(db, user)
+        try:
+            for start in range(0, len(id_list), step):
+                items = id_list[start:start+step]
+                res = self.check_sql(db, items, None, tupleind)
+                if res is None:
+                    res = m(db, items, None, tupleind)
+                yield res
+        finally:
+            for rule in self.flist:
+                rule.requestreset()
+
+    def __apply(self, db, id_list, tupleind, user, tree):
+        """
+        Apply the filter without the filter cache.
+        """
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        res = None
+        if not tree:
+            res = self.check_sql(db, id_list, user, tupleind)
+        if res is None:
+            res = m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
         return res
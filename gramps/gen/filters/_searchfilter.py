@@ -23,18 +23,39 @@ Package providing filtering framework for Gramps.
 """
 
 class SearchFilter:
-    def __init__(self, func, text, invert):
+    def __init__(self, func, text, invert, index=None):
+        """
+        :param index: A function taking the database and returning the
+                      handles that may match, from its full-text index, or
+                      None, as :py:meth:`.DbReadBase.search_text` does.
+        """
         self.func = func
         self.text = text.upper()
         self.invert = invert
+        self.index = index
+        self.handles = None
+
+    def prepare(self, db):
+        """
+        Find the handles that may match before matching many objects.
+        """
+        if self.index is not None:
+            self.handles = self.index(db)
+
+    def reset(self):
+        self.handles = None
 
     def match(self, handle, db):
+        if self.handles is not None and handle not in self.handles:
+            return self.invert
         return self.invert ^ (self.func(handle).upper().find(self.text) != -1)
 
 class ExactSearchFilter(SearchFilter):
-    def __init__(self, func, text, invert):
-        SearchFilter.__init__(self, func, text, invert)
+    def __init__(self, func, text, invert, index=None):
+        SearchFilter.__init__(self, func, text, invert, index)
 
     def match(self, handle, db):
+        if self.handles is not None and handle not in self.handles:
+            return self.invert
         return self.invert ^ (self.func(handle).upper() == self.text.strip())
 
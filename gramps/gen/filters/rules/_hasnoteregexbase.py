@@ -47,8 +47,19 @@ class HasNoteRegexBase(Rule):
     category = _('General filters')
     allow_regex = True
 
+    def prepare(self, db, user):
+        # The notes that may contain the substring, or None to read all
+        self.notes = None
+        if not self.use_regex and self.list[0]:
+            self.notes = db.search_text('Note', 'text', self.list[0])
+
+    def reset(self):
+        self.notes = None
+
     def apply(self, db, person):
         for handle in person.get_note_list():
+            if self.notes is not None and handle not in self.notes:
+                continue
             note = db.get_note_from_handle(handle)
             if self.match_substring(0, note.get()):
                 return True
@@ -45,9 +45,18 @@ class HasNoteSubstrBase(Rule):
                     "substring"
     category = _('General filters')
 
+    def prepare(self, db, user):
+        # The notes that may contain the substring, or None to read all
+        self.notes = db.search_text('Note', 'text', self.list[0])
+
+    def reset(self):
+        self.notes = None
+
     def apply(self, db, person):
         notelist = person.get_note_list()
         for notehandle in notelist:
+            if self.notes is not None and notehandle not in self.notes:
+                continue
             note = db.get_note_from_handle(notehandle)
             n = note.get()
             if n.upper().find(self.list[0].upper()) != -1:
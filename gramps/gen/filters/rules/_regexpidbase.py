@@ -34,6 +34,9 @@ _ = glocale.translation.gettext
 #-------------------------------------------------------------------------
 from . import Rule
 
+# A group of global flags, at the start of a regular expression:
+_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
 #-------------------------------------------------------------------------
 #
 # HasIdOf
@@ -51,6 +54,23 @@ class RegExpIdBase(Rule):
                    "or matches a regular expression"
     category = _('General filters')
     allow_regex = True
+    local = True
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def get_sql(self):
+        if not self.list[0]:
+            return ("1 = 1", [])
+        if self.use_regex:
+            pattern = self.regex[0].pattern
+        else:
+            pattern = re.escape(self.list[0])
+        # Global flags must stay at the start of the pattern, so the case
+        # insensitive flag is merged into a leading flag group, if any.
+        match = _FLAGS.match(pattern)
+        if match:
+            pattern = "(?%si)%s" % (match.group(1), pattern[match.end():])
+        else:
+            pattern = "(?i)" + pattern
+        return ("gramps_id REGEXP ?", [pattern])
@@ -55,6 +55,10 @@ class Rule:
     category = _('Miscellaneous filters')
     description = _('No description')
     allow_regex = False
+    # True if the result for an object depends only on the object itself
+    # and the rule arguments, so that results for unchanged objects can be
+    # kept between applications of a filter.
+    local = False
 
     def __init__(self, arg, use_regex=False):
         self.list = []
@@ -139,6 +143,18 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def get_sql(self):
+        """
+        Return an SQL predicate equivalent to this rule, or None if the rule
+        cannot be expressed in SQL.
+
+        The predicate is a tuple (clause, values), where clause is an SQL
+        expression over the secondary columns of the table of the filtered
+        objects, and values is a list of values for its parameter markers.
+        It is only requested after the rule has been prepared.
+        """
+        return None
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = ('%s="%s"' % (_(self.labels[ix][0] if
@@ -47,6 +47,7 @@ class HasSourceIdOf(HasGrampsId):
     description = _("Matches a citation with a source with a specified Gramps "
                     "ID")
     category = _('Source filters')
+    local = False
 
     def apply(self, dbase, citation):
         source = dbase.get_source_from_handle(
@@ -54,3 +55,8 @@ class HasSourceIdOf(HasGrampsId):
         if HasGrampsId.apply(self, dbase, source):
             return True
         return False
+
+    def get_sql(self):
+        clause, values = HasGrampsId.get_sql(self)
+        return ("source_handle IN (SELECT handle FROM source WHERE %s)"
+                % clause, values)
@@ -49,6 +49,7 @@ class RegExpSourceIdOf(RegExpIdBase):
     description = _("Matches citations whose source has a Gramps ID that "
                     "matches the regular expression")
     category = _('Source filters')
+    local = False
 
     def apply(self, dbase, citation):
         source = dbase.get_source_from_handle(
@@ -56,3 +57,8 @@ class RegExpSourceIdOf(RegExpIdBase):
         if RegExpIdBase.apply(self, dbase, source):
             return True
         return False
+
+    def get_sql(self):
+        clause, values = RegExpIdBase.get_sql(self)
+        return ("source_handle IN (SELECT handle FROM source WHERE %s)"
+                % clause, values)
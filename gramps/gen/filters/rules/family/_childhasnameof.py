@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from ..person import HasNameOf
-from ._memberbase import child_base
+from ._memberbase import child_base, child_sql
 
 #-------------------------------------------------------------------------
 #
@@ -48,3 +48,5 @@ class ChildHasNameOf(HasNameOf):
     category = _('Child filters')
     base_class = HasNameOf
     apply = child_base
+    get_sql = child_sql
+    local = False
@@ -22,13 +22,16 @@
 Set of wrappers for family filter rules based on personal rules.
 
 Any rule that matches family based on personal rule applied
-to father, mother, or any child, just needs to do two things:
+to father, mother, or any child, just needs to do three things:
 > Set the class attribute 'base_class' to the personal rule
 > Set apply method to be an appropriate wrapper below
+> Set get_sql method to the matching SQL wrapper below, which gives no
+  predicate when the personal rule has none
 Example:
 in the class body, outside any method:
 >    base_class = SearchName
 >    apply = child_base
+>    get_sql = child_sql
 """
 
 def father_base(self, db, family):
@@ -55,3 +58,35 @@ def child_base(self, db, family):
         if self.base_class.apply(self, db, child):
             return True
     return False
+
+def member_sql(self, column):
+    predicate = self.base_class.get_sql(self)
+    if predicate is None:
+        return None
+    clause, values = predicate
+    return ("%s IN (SELECT handle FROM person WHERE %s)" % (column, clause),
+            values)
+
+def father_sql(self):
+    return member_sql(self, 'father_handle')
+
+def mother_sql(self):
+    return member_sql(self, 'mother_handle')
+
+def child_sql(self):
+    predicate = self.base_class.get_sql(self)
+    if predicate is None:
+        return None
+    clause, values = predicate
+    # The people a family refers to, other than its father and mother, are
+    # its children.
+    return ("handle IN (SELECT reference.obj_handle FROM reference "
+            "JOIN family AS child_family "
+            "ON child_family.handle = reference.obj_handle "
+            "WHERE reference.ref_class = 'Person' "
+            "AND (child_family.father_handle IS NULL OR "
+            "reference.ref_handle <> child_family.father_handle) "
+            "AND (child_family.mother_handle IS NULL OR "
+            "reference.ref_handle <> child_family.mother_handle) "
+            "AND reference.ref_handle IN "
+            "(SELECT handle FROM person WHERE %s))" % clause, values)
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import mother_base
+from ._memberbase import mother_base, mother_sql
 
 #-------------------------------------------------------------------------
 #
@@ -49,3 +49,5 @@ class MotherHasIdOf(RegExpIdBase):
     category = _('Mother filters')
     base_class = RegExpIdBase
     apply = mother_base
+    get_sql = mother_sql
+    local = False
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from ..person import HasNameOf
-from ._memberbase import mother_base
+from ._memberbase import mother_base, mother_sql
 
 #-------------------------------------------------------------------------
 #
@@ -48,3 +48,5 @@ class MotherHasNameOf(HasNameOf):
     category = _('Mother filters')
     base_class = HasNameOf
     apply = mother_base
+    get_sql = mother_sql
+    local = False
@@ -88,6 +88,10 @@ def find_deep_relations(db, user, person, target_people):
     return_paths = set()  # all people in paths between targets and person
     if person is None:
         return return_paths
+    graph = db.get_kinship_graph()
+    if graph is not None:
+        return graph.find_paths(person.handle, target_people,
+                                user.step_progress if user else None)
     todo = deque([person.handle])  # list of work to do, handles, add to right,
     #                                pop from left
     done = {}  # The key records handles already examined,
@@ -44,9 +44,13 @@ class Everyone(Rule):
     name = _('Everyone')
     category = _('General filters')
     description = _('Matches everyone in the database')
+    local = True
 
     def is_empty(self):
         return True
 
     def apply(self,db,person):
         return True
+
+    def get_sql(self):
+        return ("1 = 1", [])
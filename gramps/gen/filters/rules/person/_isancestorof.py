@@ -54,9 +54,15 @@ class IsAncestorOf(Rule):
             first = 0 if int(self.list[1]) else 1
         except IndexError:
             first = 1
+        graph = db.get_kinship_graph()
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db,root_person,first)
+            if graph is not None:
+                if root_person:
+                    self.map = graph.get_ancestors(root_person.handle,
+                                                   inclusive=not first)
+            else:
+                self.init_ancestor_list(db,root_person,first)
         except:
             pass
 
@@ -54,9 +54,15 @@ class IsDescendantOf(Rule):
             first = False if int(self.list[1]) else True
         except IndexError:
             first = True
+        graph = db.get_kinship_graph()
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person,first)
+            if graph is not None:
+                if root_person:
+                    self.map = graph.get_descendants(root_person.handle,
+                                                     inclusive=not first)
+            else:
+                self.init_list(root_person,first)
         except:
             pass
 
@@ -45,6 +45,10 @@ class IsFemale(Rule):
     name = _('Females')
     category = _('General filters')
     description = _('Matches all females')
+    local = True
 
     def apply(self,db,person):
         return person.gender == Person.FEMALE
+
+    def get_sql(self):
+        return ("gender = ?", [Person.FEMALE])
@@ -54,7 +54,11 @@ class IsLessThanNthGenerationAncestorOf(Rule):
         person = db.get_person_from_gramps_id(self.list[0])
         if person:
             root_handle = person.get_handle()
-            if root_handle:
+            graph = db.get_kinship_graph()
+            if root_handle and graph is not None:
+                self.map = graph.get_ancestors(root_handle,
+                                               max(int(self.list[1]), 1))
+            elif root_handle:
                 self.init_ancestor_list(root_handle)
 
     def init_ancestor_list(self, root_handle):
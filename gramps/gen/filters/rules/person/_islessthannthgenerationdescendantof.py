@@ -52,9 +52,16 @@ class IsLessThanNthGenerationDescendantOf(Rule):
     def prepare(self, db, user):
         self.db = db
         self.map = set()
+        graph = db.get_kinship_graph()
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, 0)
+            if graph is not None:
+                if root_person:
+                    self.map = graph.get_descendants(
+                        root_person.handle, max(int(self.list[1]), 1) + 1,
+                        inclusive=False)
+            else:
+                self.init_list(root_person, 0)
         except:
             pass
 
@@ -45,6 +45,10 @@ class IsMale(Rule):
     name = _('Males')
     category = _('General filters')
     description = _('Matches all males')
+    local = True
 
     def apply(self,db,person):
         return person.gender == Person.MALE
+
+    def get_sql(self):
+        return ("gender = ?", [Person.MALE])
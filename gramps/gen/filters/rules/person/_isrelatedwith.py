@@ -54,7 +54,13 @@ class IsRelatedWith(Rule):
         self.db = db
 
         self.relatives = []
-        self.add_relative(db.get_person_from_gramps_id(self.list[0]))
+        graph = db.get_kinship_graph()
+        if graph is not None:
+            person = db.get_person_from_gramps_id(self.list[0])
+            if person:
+                self.relatives = graph.get_relatives(person.handle)
+        else:
+            self.add_relative(db.get_person_from_gramps_id(self.list[0]))
 
     def reset(self):
         self.relatives = []
@@ -23,6 +23,8 @@
 # Standard Python modules
 #
 #-------------------------------------------------------------------------
+import re
+
 from ....const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -45,6 +47,12 @@ class MatchIdOf(Rule):
     name = _('Person with <Id>')
     description = _("Matches person with a specified Gramps ID")
     category = _('General filters')
+    local = True
 
     def apply(self,db,person):
         return person.gramps_id.find(self.list[0]) !=-1
+
+    def get_sql(self):
+        # The wildcards of LIKE are escaped, to match the ID as a substring.
+        pattern = re.sub(r'([\\%_])', r'\\\1', self.list[0])
+        return ("gramps_id LIKE ? ESCAPE '\\'", ['%' + pattern + '%'])
@@ -258,6 +258,22 @@ class BaseTest(unittest.TestCase):
         self.assertEqual(self.filter_with_rule(rule),
                          set(['48TJQCGNNIR5SJRCAK']))
 
+    def test_childhasidof_sql(self):
+        """
+        Test that ChildHasIdOf selects the same families in SQL.
+        """
+        rule = ChildHasIdOf(['I00'])
+        rule.requestprepare(self.db, None)
+        expected = set(handle for handle in self.db.get_family_handles()
+                       if rule.apply(self.db,
+                                     self.db.get_family_from_handle(handle)))
+        self.assertEqual(len(expected), 66)
+        self.assertEqual(set(self.db.select_handles('Family',
+                                                    *rule.get_sql())),
+                         expected)
+        self.assertEqual(self.filter_with_rule(ChildHasIdOf(['I00'])),
+                         expected)
+
     def test_changedsince(self):
         """
         Test ChangedSince rule.
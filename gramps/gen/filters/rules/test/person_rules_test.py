@@ -28,7 +28,10 @@ import inspect
 
 from ....filters import reload_custom_filters
 reload_custom_filters()
+from ....config import config
+from ....db import DbTxn
 from ....db.utils import import_as_dict
+from ....lib import Person
 from ....filters import GenericFilter, CustomFilters
 from ....const import DATA_DIR
 from ....user import User
@@ -50,9 +53,9 @@ from ..person import (
     IsLessThanNthGenerationAncestorOfBookmarked, IsMale,
     IsMoreThanNthGenerationAncestorOf, IsMoreThanNthGenerationDescendantOf,
     IsParentOfFilterMatch, IsRelatedWith, IsSiblingOfFilterMatch,
-    IsSpouseOfFilterMatch, IsWitness, MissingParent, MultipleMarriages,
+    IsSpouseOfFilterMatch, IsWitness, MatchIdOf, MissingParent, MultipleMarriages,
     NeverMarried, NoBirthdate, NoDeathdate, PeoplePrivate, PeoplePublic,
-    PersonWithIncompleteEvent, ProbablyAlive, RegExpName,
+    PersonWithIncompleteEvent, ProbablyAlive, RegExpIdOf, RegExpName,
     RelationshipPathBetweenBookmarks,
 )
 
@@ -733,6 +736,19 @@ class BaseTest(unittest.TestCase):
         self.assertEqual(self.filter_with_rule(rule), set([
             ]))
 
+    def test_matchidof(self):
+        """
+        Test MatchIdOf rule.
+        """
+        expected = set(handle for handle in self.db.get_person_handles()
+                       if '004' in self.db.get_person_from_handle(
+                           handle).gramps_id)
+        self.assertEqual(len(expected), 13)
+        self.assertEqual(self.filter_with_rule(MatchIdOf(['004'])), expected)
+        self.assertEqual(self.filter_with_rule(MatchIdOf(['i004'])), set())
+        self.assertEqual(self.filter_with_rule(MatchIdOf(['I_04'])), set())
+        self.assertEqual(self.filter_with_rule(MatchIdOf(['I%4'])), set())
+
     def test_hasidof_matching(self):
         """
         Test matching HasIdOf rule.
@@ -767,6 +783,90 @@ class BaseTest(unittest.TestCase):
         # too many to list out to test explicitly
         self.assertEqual(len(self.filter_with_rule(rule)), 1168)
 
+    def test_sql_or(self):
+        """
+        Test 'or' of rules evaluated in SQL.
+        """
+        rules = [IsMale([]), HasUnknownGender([])]
+        self.assertEqual(len(self.filter_with_rule(rules, l_op='or')), 1188)
+
+    def test_sql_one(self):
+        """
+        Test 'one' of rules evaluated in SQL.
+        """
+        rules = [IsMale([]), RegExpIdOf(['I00'])]
+        self.assertEqual(len(self.filter_with_rule(rules, l_op='one')), 1152)
+
+    def test_sql_xor(self):
+        """
+        Test 'xor' of rules evaluated in SQL.
+        """
+        rules = [IsMale([]), RegExpIdOf(['I00']), IsFemale([])]
+        self.assertEqual(len(self.filter_with_rule(rules, l_op='xor')), 2008)
+
+    def test_sql_regexp_flags(self):
+        """
+        Test a regular expression with global flags evaluated in SQL.
+        """
+        rule = RegExpIdOf(['i00'], use_regex=True)
+        results = self.filter_with_rule(rule)
+        self.assertEqual(len(results), 100)
+        rule = RegExpIdOf(['(?s)i00'], use_regex=True)
+        self.assertEqual(self.filter_with_rule(rule), results)
+
+    def test_sql_and_invert(self):
+        """
+        Test inverted 'and' of rules evaluated in SQL.
+        """
+        rules = [IsFemale([]), RegExpIdOf(['I00'])]
+        self.assertEqual(len(self.filter_with_rule(rules, invert=True)), 2086)
+
+    def test_sql_partial(self):
+        """
+        Test 'and' of rules evaluated partly in SQL and partly in Python.
+        """
+        rules = [IsMale([]), HasAddress([0, 'greater than'])]
+        self.assertEqual(self.filter_with_rule(rules), set([
+            'GNUJQCL9MD64AM56OH',
+            ]))
+        self.assertEqual(len(self.filter_with_rule(rules, invert=True)), 2127)
+
+    def test_sql_id_list(self):
+        """
+        Test rules evaluated in SQL against a list of handles.
+        """
+        filter_ = GenericFilter()
+        filter_.set_rules([IsMale([]), HasUnknownGender([])])
+        filter_.set_logical_op('or')
+        handles = sorted(self.db.get_person_handles())
+        results = filter_.apply(self.db, handles)
+        self.assertEqual(len(results), 1188)
+        self.assertEqual(results, sorted(results))
+        results = filter_.apply(self.db, iter(handles))
+        self.assertEqual(len(results), 1188)
+
+    def test_apply_in_steps(self):
+        """
+        Test a filter applied to a list of handles a part at a time.
+        """
+        filter_ = GenericFilter()
+        filter_.add_rule(IsDescendantOf(['I0610', 0]))
+        keys = [(None, handle)
+                for handle in sorted(self.db.get_person_handles())]
+        size = self.db.filter_cache.size
+        self.db.filter_cache.size = 0
+        try:
+            steps = list(filter_.apply_in_steps(self.db, keys, 500,
+                                                tupleind=1))
+        finally:
+            self.db.filter_cache.size = size
+        self.assertEqual(len(steps), 5)
+        self.assertEqual([key for step in steps for key in step],
+                         filter_.apply(self.db, keys, tupleind=1))
+        steps = list(filter_.apply_in_steps(self.db, keys, 500, tupleind=1))
+        self.assertEqual(len(steps), 1)
+        self.assertEqual(len(steps[0]), 85)
+
     def test_missingparent(self):
         """
         Test MissingParent rule.
@@ -876,5 +976,120 @@ class BaseTest(unittest.TestCase):
             'GNUJQCL9MD64AM56OH']))
 
 
+class FilterCacheTest(unittest.TestCase):
+    """
+    Tests the filter cache of the database.
+    """
+
+    def setUp(self):
+        self.db = import_as_dict(EXAMPLE, User())
+
+    def tearDown(self):
+        self.db.close()
+
+    def apply_filter(self, rule):
+        """
+        Apply a filter with the given rule, and check the result against
+        an application without the cache.
+        """
+        filter_ = GenericFilter()
+        filter_.add_rule(rule)
+        results = set(filter_.apply(self.db))
+        self.db.filter_cache.clear()
+        self.db.filter_cache.size = 0
+        self.assertEqual(set(filter_.apply(self.db)), results)
+        self.db.filter_cache.size = 10
+        return results
+
+    def set_gender(self, gramps_id, gender):
+        """
+        Change the gender of a person.
+        """
+        person = self.db.get_person_from_gramps_id(gramps_id)
+        with DbTxn('Set gender', self.db) as trans:
+            person.set_gender(gender)
+            self.db.commit_person(person, trans)
+
+    def test_local(self):
+        """
+        Test a filter of rules that only examine the person.
+        """
+        self.assertEqual(len(self.apply_filter(IsMale([]))), 1168)
+        self.set_gender('I0001', Person.MALE)
+        self.assertEqual(len(self.apply_filter(IsMale([]))), 1169)
+        self.db.undo()
+        self.assertEqual(len(self.apply_filter(IsMale([]))), 1168)
+        self.assertEqual(len(self.db._get_metadata('filter_cache')), 1)
+
+    def test_stored(self):
+        """
+        Test that only the matches and the change watermark are stored.
+        """
+        matches = self.apply_filter(IsMale([]))
+        digest = self.db._get_metadata('filter_cache')[0]
+        entry = self.db._get_metadata('filter_cache_' + digest)
+        self.assertEqual(set(entry), {'key', 'class', 'watermark', 'count',
+                                      'matches'})
+        self.assertEqual(entry['matches'], matches)
+
+    def test_remove(self):
+        """
+        Test a filter of rules that only examine the person, after a person
+        is removed.
+        """
+        self.assertEqual(len(self.apply_filter(IsMale([]))), 1168)
+        person = self.db.get_person_from_gramps_id('I0044')
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(person.handle, trans)
+        results = self.apply_filter(IsMale([]))
+        self.assertNotIn(person.handle, results)
+        self.assertEqual(len(results), 1167)
+
+    def test_silent_add(self):
+        """
+        Test a filter of rules that only examine the person, after a person
+        is added with an old change time while the signals are disabled.
+        """
+        self.assertEqual(len(self.apply_filter(IsMale([]))), 1168)
+        person = Person()
+        person.set_gender(Person.MALE)
+        self.db.disable_signals()
+        try:
+            with DbTxn('Add person', self.db) as trans:
+                self.db.add_person(person, trans)
+                self.db.commit_person(person, trans, change_time=1)
+        finally:
+            self.db.enable_signals()
+        results = self.apply_filter(IsMale([]))
+        self.assertIn(person.handle, results)
+        self.assertEqual(len(results), 1169)
+
+    def test_settings(self):
+        """
+        Test that the preferences are part of the key of a result.
+        """
+        self.apply_filter(IsMale([]))
+        name_format = config.get('preferences.name-format')
+        config.set('preferences.name-format', name_format + 1)
+        try:
+            self.apply_filter(IsMale([]))
+        finally:
+            config.set('preferences.name-format', name_format)
+        self.assertEqual(len(self.db._get_metadata('filter_cache')), 2)
+
+    def test_other_objects(self):
+        """
+        Test a filter of rules that examine other objects.
+        """
+        rule = IsDescendantOf(['I0610', 0])
+        self.assertEqual(len(self.apply_filter(rule)), 85)
+        handle = self.db.get_person_from_gramps_id('I0337').handle
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(handle, trans)
+        results = self.apply_filter(rule)
+        self.assertNotIn(handle, results)
+        self.assertLess(len(results), 85)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -44,6 +44,7 @@ from .datebase import DateBase
 from .tagbase import TagBase
 from .attrbase import SrcAttributeBase
 from .citationbase import IndirectCitationBase
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -70,6 +71,11 @@ class Citation(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
     CONF_LOW = 1
     CONF_VERY_LOW = 0
 
+    # The secondary objects are built when first used:
+    date = LazyAttribute(DateBase.unserialize)
+    media_list = LazyAttribute(MediaBase.unserialize)
+    attribute_list = LazyAttribute(SrcAttributeBase.unserialize)
+
     def __init__(self):
         """Create a new Citation instance."""
         PrimaryObject.__init__(self)
@@ -138,6 +144,7 @@ class Citation(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
         """
         Convert the object to a serialized tuple of data.
         """
+        data = deferred(self)
         return (self.handle,                           #  0
                 self.gramps_id,                        #  1
                 DateBase.serialize(self, no_text_date),#  2
@@ -145,8 +152,9 @@ class Citation(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
                 self.confidence,                       #  4
                 self.source_handle,                    #  5
                 NoteBase.serialize(self),              #  6
-                MediaBase.serialize(self),             #  7
-                SrcAttributeBase.serialize(self),      #  8
+                data.get('media_list') or MediaBase.serialize(self), #  7
+                (data.get('attribute_list') or
+                 SrcAttributeBase.serialize(self)),    #  8
                 self.change,                           #  9
                 TagBase.serialize(self),               # 10
                 self.private)                          # 11
@@ -170,11 +178,11 @@ class Citation(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
          self.private                                  # 11
         ) = data
 
-        DateBase.unserialize(self, date)
+        defer(self, date=date,
+              media_list=media_list,
+              attribute_list=srcattr_list)
         NoteBase.unserialize(self, note_list)
-        MediaBase.unserialize(self, media_list)
         TagBase.unserialize(self, tag_list)
-        SrcAttributeBase.unserialize(self, srcattr_list)
         return self
 
     def _has_handle_reference(self, classname, handle):
@@ -46,6 +46,7 @@ from .datebase import DateBase
 from .placebase import PlaceBase
 from .tagbase import TagBase
 from .eventtype import EventType
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -70,6 +71,11 @@ class Event(CitationBase, NoteBase, MediaBase, AttributeBase,
     Compare this with attribute: :class:`~.attribute.Attribute`
     """
 
+    # The secondary objects are built when first used:
+    date = LazyAttribute(DateBase.unserialize)
+    media_list = LazyAttribute(MediaBase.unserialize)
+    attribute_list = LazyAttribute(AttributeBase.unserialize)
+
     def __init__(self, source=None):
         """
         Create a new Event instance, copying from the source if present.
@@ -111,13 +117,14 @@ class Event(CitationBase, NoteBase, MediaBase, AttributeBase,
                   be considered persistent.
         :rtype: tuple
         """
+        data = deferred(self)
         return (self.handle, self.gramps_id, self.__type.serialize(),
                 DateBase.serialize(self, no_text_date),
                 self.__description, self.place,
                 CitationBase.serialize(self),
                 NoteBase.serialize(self),
-                MediaBase.serialize(self),
-                AttributeBase.serialize(self),
+                data.get('media_list') or MediaBase.serialize(self),
+                data.get('attribute_list') or AttributeBase.serialize(self),
                 self.change, TagBase.serialize(self), self.private)
 
     @classmethod
@@ -190,9 +197,9 @@ class Event(CitationBase, NoteBase, MediaBase, AttributeBase,
 
         self.__type = EventType()
         self.__type.unserialize(the_type)
-        DateBase.unserialize(self, date)
-        MediaBase.unserialize(self, media_list)
-        AttributeBase.unserialize(self, attribute_list)
+        defer(self, date=date,
+              media_list=media_list,
+              attribute_list=attribute_list)
         CitationBase.unserialize(self, citation_list)
         NoteBase.unserialize(self, note_list)
         TagBase.unserialize(self, tag_list)
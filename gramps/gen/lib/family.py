@@ -49,6 +49,7 @@ from .tagbase import TagBase
 from .childref import ChildRef
 from .familyreltype import FamilyRelType
 from .const import IDENTICAL, EQUAL, DIFFERENT
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -59,6 +60,12 @@ LOG = logging.getLogger(".citation")
 # Family class
 #
 #-------------------------------------------------------------------------
+def _unserialize_event_ref_list(family, data):
+    family.event_ref_list = [EventRef().unserialize(er) for er in data]
+
+def _unserialize_child_ref_list(family, data):
+    family.child_ref_list = [ChildRef().unserialize(cr) for cr in data]
+
 class Family(CitationBase, NoteBase, MediaBase, AttributeBase, LdsOrdBase,
              PrimaryObject):
     """
@@ -78,6 +85,13 @@ class Family(CitationBase, NoteBase, MediaBase, AttributeBase, LdsOrdBase,
     or the changes will be lost.
     """
 
+    # The secondary objects are built when first used:
+    event_ref_list = LazyAttribute(_unserialize_event_ref_list)
+    child_ref_list = LazyAttribute(_unserialize_child_ref_list)
+    media_list = LazyAttribute(MediaBase.unserialize)
+    attribute_list = LazyAttribute(AttributeBase.unserialize)
+    lds_ord_list = LazyAttribute(LdsOrdBase.unserialize)
+
     def __init__(self):
         """
         Create a new Family instance.
@@ -116,14 +130,17 @@ class Family(CitationBase, NoteBase, MediaBase, AttributeBase, LdsOrdBase,
                   be considered persistent.
         :rtype: tuple
         """
+        data = deferred(self)
         return (self.handle, self.gramps_id, self.father_handle,
                 self.mother_handle,
-                [cr.serialize() for cr in self.child_ref_list],
+                (data.get('child_ref_list') or
+                 [cr.serialize() for cr in self.child_ref_list]),
                 self.type.serialize(),
-                [er.serialize() for er in self.event_ref_list],
-                MediaBase.serialize(self),
-                AttributeBase.serialize(self),
-                LdsOrdBase.serialize(self),
+                (data.get('event_ref_list') or
+                 [er.serialize() for er in self.event_ref_list]),
+                data.get('media_list') or MediaBase.serialize(self),
+                data.get('attribute_list') or AttributeBase.serialize(self),
+                data.get('lds_ord_list') or LdsOrdBase.serialize(self),
                 CitationBase.serialize(self),
                 NoteBase.serialize(self),
                 self.change, TagBase.serialize(self), self.private)
@@ -203,15 +220,13 @@ class Family(CitationBase, NoteBase, MediaBase, AttributeBase, LdsOrdBase,
 
         self.type = FamilyRelType()
         self.type.unserialize(the_type)
-        self.event_ref_list = [EventRef().unserialize(er)
-                               for er in event_ref_list]
-        self.child_ref_list = [ChildRef().unserialize(cr)
-                               for cr in child_ref_list]
-        MediaBase.unserialize(self, media_list)
-        AttributeBase.unserialize(self, attribute_list)
+        defer(self, event_ref_list=event_ref_list,
+              child_ref_list=child_ref_list,
+              media_list=media_list,
+              attribute_list=attribute_list,
+              lds_ord_list=lds_seal_list)
         CitationBase.unserialize(self, citation_list)
         NoteBase.unserialize(self, note_list)
-        LdsOrdBase.unserialize(self, lds_seal_list)
         TagBase.unserialize(self, tag_list)
         return self
 
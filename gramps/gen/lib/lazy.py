@@ -0,0 +1,87 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Attributes of the primary objects that are only built from their
+serialized data when they are first read.
+"""
+
+#-------------------------------------------------------------------------
+#
+# LazyAttribute class
+#
+#-------------------------------------------------------------------------
+class LazyAttribute:
+    """
+    An attribute holding secondary objects, such as the names or event
+    references of a person, which unserialize does not build.
+
+    The unserialize method of the object keeps the serialized data of the
+    attribute with :func:`defer`. When the attribute is first read, the data
+    is given to the unserialize function of the attribute, which sets it on
+    the object as an ordinary attribute, so that later reads and writes do
+    not go through this class.
+    """
+    def __init__(self, unserialize):
+        """
+        :param unserialize: A function taking the object and the serialized
+                            data, which sets the attribute on the object,
+                            like MediaBase.unserialize.
+        """
+        self.unserialize = unserialize
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        self.unserialize(obj, obj._lazy[self.name])
+        return obj.__dict__[self.name]
+
+def defer(obj, **data):
+    """
+    Keep the serialized data of the lazy attributes of an object, given by
+    name, dropping any value they had.
+    """
+    obj_dict = obj.__dict__
+    for name in data:
+        obj_dict.pop(name, None)
+    obj._lazy = data
+
+def deferred(obj):
+    """
+    Return the serialized data of the lazy attributes of an object that
+    have not been read, by name, which serialize can use as it is.
+    """
+    obj_dict = obj.__dict__
+    lazy = obj_dict.get('_lazy')
+    if not lazy:
+        return {}
+    return {name: data for name, data in lazy.items()
+            if name not in obj_dict}
+
+def undefer(obj):
+    """
+    Build all the lazy attributes of an object that have not been read.
+    """
+    for name in getattr(obj, '_lazy', ()):
+        getattr(obj, name)
@@ -45,6 +45,7 @@ from .notebase import NoteBase
 from .datebase import DateBase
 from .attrbase import AttributeBase
 from .tagbase import TagBase
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -62,6 +63,10 @@ class Media(CitationBase, NoteBase, DateBase, AttributeBase,
     description and privacy.
     """
 
+    # The secondary objects are built when first used:
+    attribute_list = LazyAttribute(AttributeBase.unserialize)
+    date = LazyAttribute(DateBase.unserialize)
+
     def __init__(self, source=None):
         """
         Initialize a Media.
@@ -109,9 +114,10 @@ class Media(CitationBase, NoteBase, DateBase, AttributeBase,
                   be considered persistent.
         :rtype: tuple
         """
+        data = deferred(self)
         return (self.handle, self.gramps_id, self.path, self.mime, self.desc,
                 self.checksum,
-                AttributeBase.serialize(self),
+                data.get('attribute_list') or AttributeBase.serialize(self),
                 CitationBase.serialize(self),
                 NoteBase.serialize(self),
                 self.change,
@@ -182,10 +188,10 @@ class Media(CitationBase, NoteBase, DateBase, AttributeBase,
          self.checksum, attribute_list, citation_list, note_list, self.change,
          date, tag_list, self.private) = data
 
-        AttributeBase.unserialize(self, attribute_list)
+        defer(self, attribute_list=attribute_list,
+              date=date)
         CitationBase.unserialize(self, citation_list)
         NoteBase.unserialize(self, note_list)
-        DateBase.unserialize(self, date)
         TagBase.unserialize(self, tag_list)
         return self
 
@@ -45,6 +45,7 @@ from .personref import PersonRef
 from .attrtype import AttributeType
 from .eventroletype import EventRoleType
 from .attribute import Attribute
+from .lazy import LazyAttribute, defer, deferred
 from .const import IDENTICAL, EQUAL, DIFFERENT
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
@@ -54,6 +55,18 @@ _ = glocale.translation.gettext
 # Person class
 #
 #-------------------------------------------------------------------------
+def _unserialize_primary_name(person, data):
+    person.primary_name = Name().unserialize(data)
+
+def _unserialize_alternate_names(person, data):
+    person.alternate_names = [Name().unserialize(name) for name in data]
+
+def _unserialize_event_ref_list(person, data):
+    person.event_ref_list = [EventRef().unserialize(er) for er in data]
+
+def _unserialize_person_ref_list(person, data):
+    person.person_ref_list = [PersonRef().unserialize(pr) for pr in data]
+
 class Person(CitationBase, NoteBase, AttributeBase, MediaBase,
              AddressBase, UrlBase, LdsOrdBase, PrimaryObject):
     """
@@ -77,6 +90,17 @@ class Person(CitationBase, NoteBase, AttributeBase, MediaBase,
     MALE = 1
     FEMALE = 0
 
+    # The secondary objects are built when first used:
+    primary_name = LazyAttribute(_unserialize_primary_name)
+    alternate_names = LazyAttribute(_unserialize_alternate_names)
+    event_ref_list = LazyAttribute(_unserialize_event_ref_list)
+    person_ref_list = LazyAttribute(_unserialize_person_ref_list)
+    media_list = LazyAttribute(MediaBase.unserialize)
+    lds_ord_list = LazyAttribute(LdsOrdBase.unserialize)
+    address_list = LazyAttribute(AddressBase.unserialize)
+    attribute_list = LazyAttribute(AttributeBase.unserialize)
+    urls = LazyAttribute(UrlBase.unserialize)
+
     def __init__(self, data=None):
         """
         Create a new Person instance.
@@ -132,28 +156,36 @@ class Person(CitationBase, NoteBase, AttributeBase, MediaBase,
                   be considered persistent.
         :rtype: tuple
         """
+        data = deferred(self)
         return (
             self.handle,                                         #  0
             self.gramps_id,                                      #  1
             self.__gender,                                       #  2
-            self.primary_name.serialize(),                       #  3
-            [name.serialize() for name in self.alternate_names], #  4
+            (data.get('primary_name') or
+             self.primary_name.serialize()),                     #  3
+            (data.get('alternate_names') or
+             [name.serialize() for name in self.alternate_names]), # 4
             self.death_ref_index,                                #  5
             self.birth_ref_index,                                #  6
-            [er.serialize() for er in self.event_ref_list],      #  7
+            (data.get('event_ref_list') or
+             [er.serialize() for er in self.event_ref_list]),    #  7
             self.family_list,                                    #  8
             self.parent_family_list,                             #  9
-            MediaBase.serialize(self),                           # 10
-            AddressBase.serialize(self),                         # 11
-            AttributeBase.serialize(self),                       # 12
-            UrlBase.serialize(self),                             # 13
-            LdsOrdBase.serialize(self),                          # 14
+            data.get('media_list') or MediaBase.serialize(self), # 10
+            (data.get('address_list') or
+             AddressBase.serialize(self)),                       # 11
+            (data.get('attribute_list') or
+             AttributeBase.serialize(self)),                     # 12
+            data.get('urls') or UrlBase.serialize(self),         # 13
+            (data.get('lds_ord_list') or
+             LdsOrdBase.serialize(self)),                        # 14
             CitationBase.serialize(self),                        # 15
             NoteBase.serialize(self),                            # 16
             self.change,                                         # 17
             TagBase.serialize(self),                             # 18
             self.private,                                        # 19
-            [pr.serialize() for pr in self.person_ref_list]      # 20
+            (data.get('person_ref_list') or
+             [pr.serialize() for pr in self.person_ref_list])    # 20
             )
 
     @classmethod
@@ -255,8 +287,8 @@ class Person(CitationBase, NoteBase, AttributeBase, MediaBase,
          self.death_ref_index,    #  5
          self.birth_ref_index,    #  6
          event_ref_list,          #  7
-         self.family_list,        #  8
-         self.parent_family_list, #  9
+         family_list,             #  8
+         parent_family_list,      #  9
          media_list,              # 10
          address_list,            # 11
          attribute_list,          # 12
@@ -270,19 +302,17 @@ class Person(CitationBase, NoteBase, AttributeBase, MediaBase,
          person_ref_list,         # 20
         ) = data
 
-        self.primary_name = Name()
-        self.primary_name.unserialize(primary_name)
-        self.alternate_names = [Name().unserialize(name)
-                                for name in alternate_names]
-        self.event_ref_list = [EventRef().unserialize(er)
-                               for er in event_ref_list]
-        self.person_ref_list = [PersonRef().unserialize(pr)
-                                for pr in person_ref_list]
-        MediaBase.unserialize(self, media_list)
-        LdsOrdBase.unserialize(self, lds_ord_list)
-        AddressBase.unserialize(self, address_list)
-        AttributeBase.unserialize(self, attribute_list)
-        UrlBase.unserialize(self, urls)
+        defer(self, primary_name=primary_name,
+              alternate_names=alternate_names,
+              event_ref_list=event_ref_list,
+              person_ref_list=person_ref_list,
+              media_list=media_list,
+              lds_ord_list=lds_ord_list,
+              address_list=address_list,
+              attribute_list=attribute_list,
+              urls=urls)
+        self.family_list = list(family_list)
+        self.parent_family_list = list(parent_family_list)
         CitationBase.unserialize(self, citation_list)
         NoteBase.unserialize(self, note_list)
         TagBase.unserialize(self, tag_list)
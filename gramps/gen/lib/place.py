@@ -41,6 +41,7 @@ from .mediabase import MediaBase
 from .urlbase import UrlBase
 from .tagbase import TagBase
 from .location import Location
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -49,6 +50,18 @@ _ = glocale.translation.gettext
 # Place class
 #
 #-------------------------------------------------------------------------
+def _unserialize_alt_loc(place, data):
+    place.alt_loc = [Location().unserialize(al) for al in data]
+
+def _unserialize_placeref_list(place, data):
+    place.placeref_list = [PlaceRef().unserialize(pr) for pr in data]
+
+def _unserialize_name(place, data):
+    place.name = PlaceName().unserialize(data)
+
+def _unserialize_alt_names(place, data):
+    place.alt_names = [PlaceName().unserialize(an) for an in data]
+
 class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
     """
     Contains information related to a place, including multiple address
@@ -56,6 +69,14 @@ class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
     a collection of images and URLs, a note and a source.
     """
 
+    # The secondary objects are built when first used:
+    alt_loc = LazyAttribute(_unserialize_alt_loc)
+    placeref_list = LazyAttribute(_unserialize_placeref_list)
+    name = LazyAttribute(_unserialize_name)
+    alt_names = LazyAttribute(_unserialize_alt_names)
+    urls = LazyAttribute(UrlBase.unserialize)
+    media_list = LazyAttribute(MediaBase.unserialize)
+
     def __init__(self, source=None):
         """
         Create a new Place object, copying from the source if present.
@@ -107,14 +128,18 @@ class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
                   be considered persistent.
         :rtype: tuple
         """
+        data = deferred(self)
         return (self.handle, self.gramps_id, self.title, self.long, self.lat,
-                [pr.serialize() for pr in self.placeref_list],
-                self.name.serialize(),
-                [an.serialize() for an in self.alt_names],
+                (data.get('placeref_list') or
+                 [pr.serialize() for pr in self.placeref_list]),
+                data.get('name') or self.name.serialize(),
+                (data.get('alt_names') or
+                 [an.serialize() for an in self.alt_names]),
                 self.place_type.serialize(), self.code,
-                [al.serialize() for al in self.alt_loc],
-                UrlBase.serialize(self),
-                MediaBase.serialize(self),
+                (data.get('alt_loc') or
+                 [al.serialize() for al in self.alt_loc]),
+                data.get('urls') or UrlBase.serialize(self),
+                data.get('media_list') or MediaBase.serialize(self),
                 CitationBase.serialize(self),
                 NoteBase.serialize(self),
                 self.change, TagBase.serialize(self), self.private)
@@ -199,12 +224,12 @@ class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
 
         self.place_type = PlaceType()
         self.place_type.unserialize(the_type)
-        self.alt_loc = [Location().unserialize(al) for al in alt_loc]
-        self.placeref_list = [PlaceRef().unserialize(pr) for pr in placeref_list]
-        self.name = PlaceName().unserialize(name)
-        self.alt_names = [PlaceName().unserialize(an) for an in alt_names]
-        UrlBase.unserialize(self, urls)
-        MediaBase.unserialize(self, media_list)
+        defer(self, alt_loc=alt_loc,
+              placeref_list=placeref_list,
+              name=name,
+              alt_names=alt_names,
+              urls=urls,
+              media_list=media_list)
         CitationBase.unserialize(self, citation_list)
         NoteBase.unserialize(self, note_list)
         TagBase.unserialize(self, tag_list)
@@ -37,6 +37,7 @@ from .urlbase import UrlBase
 from .tagbase import TagBase
 from .repotype import RepositoryType
 from .citationbase import IndirectCitationBase
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -49,6 +50,10 @@ class Repository(NoteBase, AddressBase, UrlBase, IndirectCitationBase,
                  PrimaryObject):
     """A location where collections of Sources are found."""
 
+    # The secondary objects are built when first used:
+    address_list = LazyAttribute(AddressBase.unserialize)
+    urls = LazyAttribute(UrlBase.unserialize)
+
     def __init__(self):
         """
         Create a new Repository instance.
@@ -64,11 +69,12 @@ class Repository(NoteBase, AddressBase, UrlBase, IndirectCitationBase,
         """
         Convert the object to a serialized tuple of data.
         """
+        data = deferred(self)
         return (self.handle, self.gramps_id, self.type.serialize(),
                 str(self.name),
                 NoteBase.serialize(self),
-                AddressBase.serialize(self),
-                UrlBase.serialize(self),
+                data.get('address_list') or AddressBase.serialize(self),
+                data.get('urls') or UrlBase.serialize(self),
                 self.change, TagBase.serialize(self), self.private)
 
     @classmethod
@@ -125,9 +131,9 @@ class Repository(NoteBase, AddressBase, UrlBase, IndirectCitationBase,
 
         self.type = RepositoryType()
         self.type.unserialize(the_type)
+        defer(self, address_list=address_list,
+              urls=urls)
         NoteBase.unserialize(self, note_list)
-        AddressBase.unserialize(self, address_list)
-        UrlBase.unserialize(self, urls)
         TagBase.unserialize(self, tag_list)
         return self
 
@@ -28,6 +28,8 @@ Serialization utilities for Gramps.
 #
 #------------------------------------------------------------------------
 import json
+import pickle
+from copy import deepcopy
 
 #------------------------------------------------------------------------
 #
@@ -35,9 +37,12 @@ import json
 #
 #------------------------------------------------------------------------
 import gramps.gen.lib as lib
+from .lazy import undefer
+from .locationbase import LocationBase
 
 def __default(obj):
     obj_dict = {'_class': obj.__class__.__name__}
+    undefer(obj)
     if isinstance(obj, lib.GrampsType):
         obj_dict['string'] = getattr(obj, 'string')
     if isinstance(obj, lib.Date):
@@ -87,3 +92,155 @@ def from_json(data):
     :rtype: object
     """
     return json.loads(data, object_hook=__object_hook)
+
+#------------------------------------------------------------------------
+#
+# Raw data of JSON documents
+#
+#------------------------------------------------------------------------
+# The properties of the objects, in the order of the tuples returned by
+# serialize(), with the serialized values of a new object, by class name.
+# The fields of a LocationBase are a tuple of their own, and a GrampsType
+# has an empty layout.
+_LAYOUTS = {}
+# Serialized GrampsType values, by class name and string:
+_TYPES = {}
+_LOCATION = ('street', 'locality', 'city', 'county', 'state', 'country',
+             'postal', 'phone')
+
+def __get_layout(class_name):
+    obj_class = getattr(lib, class_name)
+    if issubclass(obj_class, lib.GrampsType):
+        return ()
+    layout = [key for key in obj_class.get_schema()['properties']
+              if key != '_class']
+    if issubclass(obj_class, LocationBase):
+        start = layout.index(_LOCATION[0])
+        layout[start:start+len(_LOCATION)] = [_LOCATION]
+    return tuple(zip(layout, obj_class().serialize()))
+
+def __get_type(class_name, string):
+    key = (class_name, string)
+    data = _TYPES.get(key)
+    if data is None:
+        obj = getattr(lib, class_name)()
+        obj.string = string
+        data = _TYPES[key] = obj.serialize()
+    return data
+
+def __data_hook(obj_dict):
+    """
+    Convert a decoded JSON object, whose members have already been
+    converted, into serialized data.
+    """
+    class_name = obj_dict['_class']
+    layout = _LAYOUTS.get(class_name)
+    if layout is None:
+        layout = _LAYOUTS[class_name] = __get_layout(class_name)
+    if not layout:
+        return __get_type(class_name, obj_dict.get('string', ''))
+    data = []
+    for key, default in layout:
+        if isinstance(key, tuple):
+            data.append(tuple(obj_dict.get(name, value)
+                              for name, value in zip(key, default)))
+        elif key not in obj_dict:
+            data.append(deepcopy(default))
+        elif key in ('dateval', 'rect'):
+            value = obj_dict[key]
+            data.append(value if value is None else tuple(value))
+        elif key == 'ranges':
+            data.append([tuple(item) for item in obj_dict[key]])
+        else:
+            data.append(obj_dict[key])
+    return tuple(data)
+
+def json_to_data(data):
+    """
+    Decode JSON data into the serialized data of a Gramps object, as
+    returned by its serialize method, without building the object.
+
+    :param data: The JSON string to be unserialized.
+    :type data: str
+    :returns: The serialized data of a Gramps object.
+    :rtype: tuple
+    """
+    return json.loads(data, object_hook=__data_hook)
+
+
+#------------------------------------------------------------------------
+#
+# Storage serializers
+#
+#------------------------------------------------------------------------
+class BlobSerializer:
+    """
+    Store objects as a pickled copy of the tuple returned by serialize().
+
+    This is the original storage format of the DB-API backend.
+    """
+    name = 'blob'
+    data_field = 'blob_data'
+    # Approximate ratio of the memory used by the raw data of an object to
+    # the length of its stored representation:
+    memory_ratio = 10
+
+    @staticmethod
+    def object_to_string(obj):
+        """
+        Convert a primary object into its stored representation.
+        """
+        return pickle.dumps(obj.serialize())
+
+    @staticmethod
+    def string_to_data(obj_class, string):
+        """
+        Convert a stored representation into raw (serialized) data.
+        """
+        return pickle.loads(string)
+
+    @staticmethod
+    def string_to_object(obj_class, string):
+        """
+        Convert a stored representation into a primary object.
+        """
+        return obj_class.create(pickle.loads(string))
+
+
+class JSONSerializer:
+    """
+    Store objects as JSON documents, written with :func:`to_json` and read
+    back with :func:`json_to_data`.
+
+    Unlike a pickle, the stored documents do not depend on the layout of
+    the serialized tuples and can be inspected by the database engine.
+    """
+    name = 'json'
+    data_field = 'json_data'
+    # Approximate ratio of the memory used by the raw data of an object to
+    # the length of its stored representation:
+    memory_ratio = 3
+
+    @staticmethod
+    def object_to_string(obj):
+        """
+        Convert a primary object into its stored representation.
+        """
+        return to_json(obj)
+
+    @staticmethod
+    def string_to_data(obj_class, string):
+        """
+        Convert a stored representation into raw (serialized) data.
+        """
+        return json_to_data(string)
+
+    @staticmethod
+    def string_to_object(obj_class, string):
+        """
+        Convert a stored representation into a primary object.
+        """
+        return obj_class.create(json_to_data(string))
+
+SERIALIZERS = {serializer.name: serializer
+               for serializer in (BlobSerializer, JSONSerializer)}
@@ -39,6 +39,7 @@ from .attrbase import SrcAttributeBase
 from .reporef import RepoRef
 from .const import DIFFERENT, EQUAL, IDENTICAL
 from .citationbase import IndirectCitationBase
+from .lazy import LazyAttribute, defer, deferred
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -47,10 +48,18 @@ _ = glocale.translation.gettext
 # Source class
 #
 #-------------------------------------------------------------------------
+def _unserialize_reporef_list(source, data):
+    source.reporef_list = [RepoRef().unserialize(item) for item in data]
+
 class Source(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
              PrimaryObject):
     """A record of a source of information."""
 
+    # The secondary objects are built when first used:
+    reporef_list = LazyAttribute(_unserialize_reporef_list)
+    media_list = LazyAttribute(MediaBase.unserialize)
+    attribute_list = LazyAttribute(SrcAttributeBase.unserialize)
+
     def __init__(self):
         """Create a new Source instance."""
         PrimaryObject.__init__(self)
@@ -67,17 +76,20 @@ class Source(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
         """
         Convert the object to a serialized tuple of data.
         """
+        data = deferred(self)
         return (self.handle,                                       # 0
                 self.gramps_id,                                    # 1
                 str(self.title),                                  # 2
                 str(self.author),                                 # 3
                 str(self.pubinfo),                                # 4
                 NoteBase.serialize(self),                          # 5
-                MediaBase.serialize(self),                         # 6
+                data.get('media_list') or MediaBase.serialize(self), # 6
                 str(self.abbrev),                                 # 7
                 self.change,                                       # 8
-                SrcAttributeBase.serialize(self),                  # 9
-                [rr.serialize() for rr in self.reporef_list],      # 10
+                (data.get('attribute_list') or
+                 SrcAttributeBase.serialize(self)),                # 9
+                (data.get('reporef_list') or
+                 [rr.serialize() for rr in self.reporef_list]),    # 10
                 TagBase.serialize(self),                           # 11
                 self.private)                                      # 12
 
@@ -154,11 +166,11 @@ class Source(MediaBase, NoteBase, SrcAttributeBase, IndirectCitationBase,
          self.private       #  12
         ) = data
 
+        defer(self, reporef_list=reporef_list,
+              media_list=media_list,
+              attribute_list=srcattr_list)
         NoteBase.unserialize(self, note_list)
-        MediaBase.unserialize(self, media_list)
         TagBase.unserialize(self, tag_list)
-        SrcAttributeBase.unserialize(self, srcattr_list)
-        self.reporef_list = [RepoRef().unserialize(item) for item in reporef_list]
         return self
 
     def _has_handle_reference(self, classname, handle):
@@ -57,7 +57,7 @@ class TagBase:
         """
         Convert a serialized tuple of data to an object.
         """
-        self.tag_list = data
+        self.tag_list = list(data)
         return self
 
     def add_tag(self, tag):
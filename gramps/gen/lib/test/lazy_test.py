@@ -0,0 +1,79 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the lazy attributes of the primary objects """
+
+import copy
+import unittest
+
+from .. import Person, Name, Surname, EventRef, Place, PlaceName
+from ..lazy import undefer
+
+class LazyTest(unittest.TestCase):
+
+    def setUp(self):
+        person = Person()
+        person.set_handle('H1')
+        name = Name()
+        name.set_first_name('John')
+        name.add_surname(Surname())
+        person.set_primary_name(name)
+        ref = EventRef()
+        ref.ref = 'E1'
+        person.add_event_ref(ref)
+        self.data = person.serialize()
+
+    def test_read(self):
+        person = Person.create(self.data)
+        self.assertNotIn('primary_name', person.__dict__)
+        self.assertEqual(person.get_primary_name().get_first_name(), 'John')
+        self.assertIn('primary_name', person.__dict__)
+        self.assertEqual(person.get_event_ref_list()[0].ref, 'E1')
+        self.assertEqual(person.serialize(), self.data)
+
+    def test_change(self):
+        person = Person.create(self.data)
+        person.get_primary_name().set_first_name('Jim')
+        person.set_event_ref_list([])
+        data = person.serialize()
+        self.assertEqual(data[3][4], 'Jim')
+        self.assertEqual(data[7], [])
+        person.unserialize(self.data)
+        self.assertEqual(person.get_primary_name().get_first_name(), 'John')
+        self.assertEqual(len(person.get_event_ref_list()), 1)
+
+    def test_copy(self):
+        person = Person.create(self.data)
+        other = copy.copy(person)
+        other.get_primary_name().set_first_name('Jim')
+        self.assertEqual(person.get_primary_name().get_first_name(), 'John')
+        other = copy.deepcopy(person)
+        self.assertEqual(other.serialize(), self.data)
+
+    def test_undefer(self):
+        place = Place()
+        place.set_name(PlaceName(value='Paris'))
+        place = Place.create(place.serialize())
+        undefer(place)
+        self.assertEqual(place.__dict__['name'].get_value(), 'Paris')
+        self.assertIn('urls', place.__dict__)
+
+if __name__ == "__main__":
+    unittest.main()
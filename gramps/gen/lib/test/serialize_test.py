@@ -18,14 +18,14 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
-""" Unittest for to_json, from_json """
+""" Unittest for to_json, from_json, json_to_data """
 
 import unittest
 import os
 
 from .. import (Person, Family, Event, Source, Place, Citation,
                 Repository, Media, Note, Tag)
-from ..serialize import to_json, from_json
+from ..serialize import to_json, from_json, json_to_data
 from ...db.utils import import_as_dict
 from ...const import DATA_DIR
 from ...user import User
@@ -44,6 +44,14 @@ class BaseCheck:
         obj = from_json(data)
         self.assertEqual(self.object.serialize(), obj.serialize())
 
+    def test_json_to_data(self):
+        data = to_json(self.object)
+        self.assertEqual(self.object.serialize(), json_to_data(data))
+
+    def test_empty_json_to_data(self):
+        data = '{"_class": "%s"}' % self.cls.__name__
+        self.assertEqual(self.object.serialize(), json_to_data(data))
+
 class PersonCheck(unittest.TestCase, BaseCheck):
     def setUp(self):
         self.cls = Person
@@ -107,6 +115,10 @@ def generate_case(obj):
         self.assertEqual(obj.serialize(), obj2.serialize())
     name = "test_serialize_%s_%s" % (obj.__class__.__name__, obj.handle)
     setattr(DatabaseCheck, name, test)
+    def test_data(self):
+        self.assertEqual(obj.serialize(), json_to_data(data))
+    name = "test_data_%s_%s" % (obj.__class__.__name__, obj.handle)
+    setattr(DatabaseCheck, name, test_data)
     ####
     #def test2(self):
     #    self.assertEqual(obj.serialize(), from_struct(struct).serialize())
@@ -34,7 +34,7 @@ from ...display.name import displayer as global_name_display
 from ...lib.date import Today
 from ...display.place import displayer as _pd
 from ..menu import EnumeratedListOption, BooleanOption, NumberOption
-from ...proxy import PrivateProxyDb, LivingProxyDb
+from ...proxy import PrivateProxyDb, LivingProxyDb, CompiledProxyDb
 from ...utils.grampslocale import GrampsLocale
 from ...const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
@@ -114,7 +114,7 @@ def run_private_data_option(report, menu):
     """
     include_private_data = menu.get_option_by_name('incl_private').get_value()
     if not include_private_data:
-        report.database = PrivateProxyDb(report.database)
+        report.database = CompiledProxyDb(PrivateProxyDb(report.database))
 
 def add_living_people_option(menu, category,
                              mode=LivingProxyDb.MODE_INCLUDE_ALL,
@@ -208,9 +208,10 @@ def run_living_people_option(report, menu, llocale=glocale):
     living_value = option.get_value()
     years_past_death = menu.get_option_by_name('years_past_death').get_value()
     if living_value != LivingProxyDb.MODE_INCLUDE_ALL:
-        report.database = LivingProxyDb(report.database, living_value,
-                                        years_after_death=years_past_death,
-                                        llocale=llocale)
+        report.database = CompiledProxyDb(
+            LivingProxyDb(report.database, living_value,
+                          years_after_death=years_past_death,
+                          llocale=llocale))
     return option
 
 def add_date_format_option(menu, category, localization_option):
@@ -20,10 +20,12 @@
 #
 # gen/proxy/__init__.py
 
-__all__ = [ "filter", "living", "private", "proxybase", "referencedbyselection" ]
+__all__ = [ "filter", "living", "private", "proxybase", "referencedbyselection",
+            "compiled" ]
 
 from .filter import FilterProxyDb
 from .living import LivingProxyDb
 from .private import PrivateProxyDb
 from .referencedbyselection import ReferencedBySelectionProxyDb
 from .cache import CacheProxyDb
+from .compiled import CompiledProxyDb
@@ -22,31 +22,62 @@
 Proxy class for the Gramps databases. Caches lookups from handles.
 """
 
-from ..utils.lru import LRU
+import weakref
+
+from ..config import config
+from ..db.cache import DbCache
+from ..db.dbconst import (PERSON_KEY, FAMILY_KEY, SOURCE_KEY, CITATION_KEY,
+                          EVENT_KEY, MEDIA_KEY, PLACE_KEY, REPOSITORY_KEY,
+                          NOTE_KEY, TAG_KEY, KEY_TO_CLASS_MAP)
+
+def _invalidate(proxy_ref, obj_key):
+    """
+    Return a signal callback that removes changed objects from the cache of
+    a proxy. Only a weak reference to the proxy is kept, so that connecting
+    to the database does not keep the proxy alive.
+    """
+    def callback(handles=None):
+        proxy = proxy_ref()
+        if proxy is None:
+            return
+        if handles is None:
+            proxy.cache.clear(obj_key)
+        else:
+            for handle in handles:
+                proxy.cache.discard(obj_key, handle)
+    return callback
 
 class CacheProxyDb:
     """
     A Proxy for a database with cached lookups on handles.
 
-    Does not invalid caches. Should be used only in read-only
-    places, and not where caches are altered.
+    Objects are cached per type, and removed from the cache when the
+    database signals that they have been updated or deleted, including by
+    undo and redo. The cached objects are shared by all callers, so they
+    must not be altered.
     """
     def __init__(self, database):
         """
         CacheProxy will cache items based on their handle.
 
-        Assumes all handles (regardless of type) are unique.
         Database is called self.db for consistency with other
         proxies.
         """
         self.db = database
-        # Memory allocation is power of 2 where slots has to fit.
-        # LRU uses one extra slot in its work, so set max to 2^17-1
-        # otherwise we are just wasting memory
-        self.cache_handle = LRU(131071)
+        self.cache = DbCache(config.get('database.cache-size'))
+        self.__signal_keys = []
+        proxy_ref = weakref.ref(self)
+        for obj_key, class_name in KEY_TO_CLASS_MAP.items():
+            for signal in ('update', 'delete', 'rebuild'):
+                key = self.db.connect('%s-%s' % (class_name.lower(), signal),
+                                      _invalidate(proxy_ref, obj_key))
+                if key is not None:
+                    self.__signal_keys.append(key)
 
     def __del__(self):
-        self.cache_handle.clear()
+        for key in self.__signal_keys:
+            self.db.disconnect(key)
+        self.cache.clear()
 
     def __getattr__(self, attr):
         """
@@ -61,96 +92,97 @@ class CacheProxyDb:
         specific entry.
         """
         if handle:
-            del self.cache_handle[handle]
+            for obj_key in KEY_TO_CLASS_MAP:
+                self.cache.discard(obj_key, handle)
         else:
-            self.cache_handle.clear()
+            self.cache.clear()
+
+    def get_cache_statistics(self):
+        """
+        Return the hit, miss and eviction statistics of the cache, by object
+        class name.
+        """
+        return self.cache.get_statistics()
+
+    def _get_from_handle(self, obj_key, get_func, handle):
+        """
+        Gets item from cache if it exists, otherwise from the
+        database.
+        """
+        obj = self.cache.get(obj_key, handle)
+        if obj is None:
+            obj = get_func(handle)
+            if obj is not None:
+                self.cache.put(obj_key, handle, obj)
+        return obj
 
     def get_person_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_person_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(PERSON_KEY,
+                                     self.db.get_person_from_handle, handle)
 
     def get_event_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_event_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(EVENT_KEY,
+                                     self.db.get_event_from_handle, handle)
 
     def get_family_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_family_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(FAMILY_KEY,
+                                     self.db.get_family_from_handle, handle)
 
     def get_repository_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_repository_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(REPOSITORY_KEY,
+                                     self.db.get_repository_from_handle,
+                                     handle)
 
     def get_place_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_place_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(PLACE_KEY,
+                                     self.db.get_place_from_handle, handle)
 
     def get_citation_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_citation_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(CITATION_KEY,
+                                     self.db.get_citation_from_handle, handle)
 
     def get_source_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_source_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(SOURCE_KEY,
+                                     self.db.get_source_from_handle, handle)
 
     def get_note_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_note_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(NOTE_KEY,
+                                     self.db.get_note_from_handle, handle)
 
     def get_media_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_media_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(MEDIA_KEY,
+                                     self.db.get_media_from_handle, handle)
 
     def get_tag_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_tag_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle(TAG_KEY,
+                                     self.db.get_tag_from_handle, handle)
@@ -0,0 +1,483 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Proxy class for the Gramps databases. Serves the result of a chain of
+proxies from a snapshot taken on first use.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+import pickle
+
+#-------------------------------------------------------------------------
+#
+# Gramps libraries
+#
+#-------------------------------------------------------------------------
+from ..config import config
+from ..db.cache import DbCache
+from ..db.dbconst import (PERSON_KEY, FAMILY_KEY, SOURCE_KEY, CITATION_KEY,
+                          EVENT_KEY, MEDIA_KEY, PLACE_KEY, REPOSITORY_KEY,
+                          NOTE_KEY, TAG_KEY, KEY_TO_NAME_MAP)
+from ..errors import HandleError
+from ..lib import (Citation, Event, Family, Media, Note, Person, Place,
+                   Repository, Source, Tag)
+from .proxybase import ProxyDbBase
+
+KEY_TO_OBJ_CLASS = {PERSON_KEY: Person,
+                    FAMILY_KEY: Family,
+                    SOURCE_KEY: Source,
+                    CITATION_KEY: Citation,
+                    EVENT_KEY: Event,
+                    MEDIA_KEY: Media,
+                    PLACE_KEY: Place,
+                    REPOSITORY_KEY: Repository,
+                    NOTE_KEY: Note,
+                    TAG_KEY: Tag}
+
+#-------------------------------------------------------------------------
+#
+# CompiledProxyDb
+#
+#-------------------------------------------------------------------------
+class CompiledProxyDb(ProxyDbBase):
+    """
+    A proxy for a chain of proxies, such as a PrivateProxyDb below a
+    LivingProxyDb, which finds what the chain shows once rather than on
+    every access.
+
+    The objects the chain returns, and the handles it hides, are kept in a
+    cache bounded by 'database.cache-size', so that each object goes
+    through the chain, and is sanitized, only once. The objects are kept
+    serialized, and every caller gets a copy of its own, which it may
+    alter. The handles of all the objects of a type that the chain shows
+    are found the first time they are iterated over, and then answer the
+    include, has and iter methods.
+
+    The proxy is a snapshot: it does not see the changes made to the
+    database after an object has been read through it.
+    """
+
+    def __init__(self, db):
+        """
+        Create a new CompiledProxyDb instance.
+
+        :param db: The proxy, or database, to be a snapshot of
+        :type db: DbBase
+        """
+        ProxyDbBase.__init__(self, db)
+        self.cache = DbCache(config.get('database.cache-size'))
+        self.handles = {}
+        self.visible = {}
+
+    def get_cache_statistics(self):
+        """
+        Return the hit, miss and eviction statistics of the cache, by object
+        class name.
+        """
+        return self.cache.get_statistics()
+
+    def _get_handles(self, obj_key):
+        """
+        Return the handles of the objects of a type shown by the chain, in
+        the order the chain gives them.
+        """
+        handles = self.handles.get(obj_key)
+        if handles is None:
+            iter_func = getattr(self.db,
+                                'iter_%s_handles' % KEY_TO_NAME_MAP[obj_key])
+            handles = self.handles[obj_key] = list(iter_func())
+            self.visible[obj_key] = set(handles)
+        return handles
+
+    def _get_data(self, obj_key, handle):
+        """
+        Return the serialized object the chain gives for the handle, or an
+        empty string if the chain hides it.
+        """
+        data = self.cache.get(obj_key, handle)
+        if data is None:
+            obj = getattr(self.db, 'get_%s_from_handle' %
+                          KEY_TO_NAME_MAP[obj_key])(handle)
+            if obj is None:
+                data = b""
+            else:
+                data = pickle.dumps(obj.serialize(), pickle.HIGHEST_PROTOCOL)
+            self.cache.put(obj_key, handle, data)
+        return data
+
+    def _is_visible(self, obj_key, handle):
+        """
+        Return True if the chain shows the object with the handle.
+        """
+        visible = self.visible.get(obj_key)
+        if visible is not None:
+            return handle in visible
+        try:
+            return bool(self._get_data(obj_key, handle))
+        except HandleError:
+            return False
+
+    def _get_from_handle(self, obj_key, handle):
+        """
+        Return a copy of the object the chain gives for the handle, or None
+        if the chain hides it.
+        """
+        data = self._get_data(obj_key, handle)
+        if data:
+            return KEY_TO_OBJ_CLASS[obj_key].create(pickle.loads(data))
+        return None
+
+    def _iter_objects(self, obj_key):
+        """
+        Return an iterator over the objects of a type shown by the chain.
+        """
+        return filter(None, (self._get_from_handle(obj_key, handle)
+                             for handle in self._get_handles(obj_key)))
+
+    def include_person(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(PERSON_KEY, handle)
+
+    def include_family(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(FAMILY_KEY, handle)
+
+    def include_event(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(EVENT_KEY, handle)
+
+    def include_source(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(SOURCE_KEY, handle)
+
+    def include_citation(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(CITATION_KEY, handle)
+
+    def include_place(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(PLACE_KEY, handle)
+
+    def include_media(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(MEDIA_KEY, handle)
+
+    def include_repository(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(REPOSITORY_KEY, handle)
+
+    def include_note(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(NOTE_KEY, handle)
+
+    def include_tag(self, handle):
+        """
+        Predicate returning True if object is to be included, else False
+        """
+        return self._is_visible(TAG_KEY, handle)
+
+    def get_person_from_handle(self, handle):
+        """
+        Finds a Person in the database from the passed Gramps handle.
+        If no such Person exists, None is returned.
+        """
+        return self._get_from_handle(PERSON_KEY, handle)
+
+    def get_family_from_handle(self, handle):
+        """
+        Finds a Family in the database from the passed Gramps handle.
+        If no such Family exists, None is returned.
+        """
+        return self._get_from_handle(FAMILY_KEY, handle)
+
+    def get_event_from_handle(self, handle):
+        """
+        Finds an Event in the database from the passed Gramps handle.
+        If no such Event exists, None is returned.
+        """
+        return self._get_from_handle(EVENT_KEY, handle)
+
+    def get_source_from_handle(self, handle):
+        """
+        Finds a Source in the database from the passed Gramps handle.
+        If no such Source exists, None is returned.
+        """
+        return self._get_from_handle(SOURCE_KEY, handle)
+
+    def get_citation_from_handle(self, handle):
+        """
+        Finds a Citation in the database from the passed Gramps handle.
+        If no such Citation exists, None is returned.
+        """
+        return self._get_from_handle(CITATION_KEY, handle)
+
+    def get_place_from_handle(self, handle):
+        """
+        Finds a Place in the database from the passed Gramps handle.
+        If no such Place exists, None is returned.
+        """
+        return self._get_from_handle(PLACE_KEY, handle)
+
+    def get_media_from_handle(self, handle):
+        """
+        Finds a Media in the database from the passed Gramps handle.
+        If no such Media exists, None is returned.
+        """
+        return self._get_from_handle(MEDIA_KEY, handle)
+
+    def get_repository_from_handle(self, handle):
+        """
+        Finds a Repository in the database from the passed Gramps handle.
+        If no such Repository exists, None is returned.
+        """
+        return self._get_from_handle(REPOSITORY_KEY, handle)
+
+    def get_note_from_handle(self, handle):
+        """
+        Finds a Note in the database from the passed Gramps handle.
+        If no such Note exists, None is returned.
+        """
+        return self._get_from_handle(NOTE_KEY, handle)
+
+    def get_tag_from_handle(self, handle):
+        """
+        Finds a Tag in the database from the passed Gramps handle.
+        If no such Tag exists, None is returned.
+        """
+        return self._get_from_handle(TAG_KEY, handle)
+
+    def iter_person_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Person in
+        the database.
+        """
+        return iter(self._get_handles(PERSON_KEY))
+
+    def iter_family_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Family in
+        the database.
+        """
+        return iter(self._get_handles(FAMILY_KEY))
+
+    def iter_event_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Event in
+        the database.
+        """
+        return iter(self._get_handles(EVENT_KEY))
+
+    def iter_source_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Source in
+        the database.
+        """
+        return iter(self._get_handles(SOURCE_KEY))
+
+    def iter_citation_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Citation
+        in the database.
+        """
+        return iter(self._get_handles(CITATION_KEY))
+
+    def iter_place_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Place in
+        the database.
+        """
+        return iter(self._get_handles(PLACE_KEY))
+
+    def iter_media_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Media
+        Object in the database.
+        """
+        return iter(self._get_handles(MEDIA_KEY))
+
+    def iter_repository_handles(self):
+        """
+        Return an iterator over database handles, one handle for each
+        Repository in the database.
+        """
+        return iter(self._get_handles(REPOSITORY_KEY))
+
+    def iter_note_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Note in
+        the database.
+        """
+        return iter(self._get_handles(NOTE_KEY))
+
+    def iter_tag_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Tag in
+        the database.
+        """
+        return iter(self._get_handles(TAG_KEY))
+
+    def iter_people(self):
+        """
+        Return an iterator over Person objects in the database
+        """
+        return self._iter_objects(PERSON_KEY)
+
+    def iter_families(self):
+        """
+        Return an iterator over Family objects in the database
+        """
+        return self._iter_objects(FAMILY_KEY)
+
+    def iter_events(self):
+        """
+        Return an iterator over Event objects in the database
+        """
+        return self._iter_objects(EVENT_KEY)
+
+    def iter_places(self):
+        """
+        Return an iterator over Place objects in the database
+        """
+        return self._iter_objects(PLACE_KEY)
+
+    def iter_sources(self):
+        """
+        Return an iterator over Source objects in the database
+        """
+        return self._iter_objects(SOURCE_KEY)
+
+    def iter_citations(self):
+        """
+        Return an iterator over Citation objects in the database
+        """
+        return self._iter_objects(CITATION_KEY)
+
+    def iter_media(self):
+        """
+        Return an iterator over Media objects in the database
+        """
+        return self._iter_objects(MEDIA_KEY)
+
+    def iter_repositories(self):
+        """
+        Return an iterator over Repositories objects in the database
+        """
+        return self._iter_objects(REPOSITORY_KEY)
+
+    def iter_notes(self):
+        """
+        Return an iterator over Note objects in the database
+        """
+        return self._iter_objects(NOTE_KEY)
+
+    def iter_tags(self):
+        """
+        Return an iterator over Tag objects in the database
+        """
+        return self._iter_objects(TAG_KEY)
+
+    def has_person_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Person database.
+        """
+        return self._is_visible(PERSON_KEY, handle)
+
+    def has_family_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Family database.
+        """
+        return self._is_visible(FAMILY_KEY, handle)
+
+    def has_event_handle(self, handle):
+        """
+        returns True if the handle exists in the current Event database.
+        """
+        return self._is_visible(EVENT_KEY, handle)
+
+    def has_source_handle(self, handle):
+        """
+        returns True if the handle exists in the current Source database.
+        """
+        return self._is_visible(SOURCE_KEY, handle)
+
+    def has_citation_handle(self, handle):
+        """
+        returns True if the handle exists in the current Citation database.
+        """
+        return self._is_visible(CITATION_KEY, handle)
+
+    def has_place_handle(self, handle):
+        """
+        returns True if the handle exists in the current Place database.
+        """
+        return self._is_visible(PLACE_KEY, handle)
+
+    def has_media_handle(self, handle):
+        """
+        returns True if the handle exists in the current Media database.
+        """
+        return self._is_visible(MEDIA_KEY, handle)
+
+    def has_repository_handle(self, handle):
+        """
+        returns True if the handle exists in the current Repository database.
+        """
+        return self._is_visible(REPOSITORY_KEY, handle)
+
+    def has_note_handle(self, handle):
+        """
+        returns True if the handle exists in the current Note database.
+        """
+        return self._is_visible(NOTE_KEY, handle)
+
+    def has_tag_handle(self, handle):
+        """
+        returns True if the handle exists in the current Tag database.
+        """
+        return self._is_visible(TAG_KEY, handle)
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        """
+        Return the backlinks the chain gives for the handle.
+        """
+        return self.db.find_backlink_handles(handle, include_classes)
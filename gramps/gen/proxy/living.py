@@ -31,7 +31,7 @@ Proxy class for the Gramps databases. Filter out all living people.
 from .proxybase import ProxyDbBase
 from ..lib import (Date, Person, Name, Surname, NameOriginType, Family, Source,
                    Citation, Event, Media, Place, Repository, Note, Tag)
-from ..utils.alive import probably_alive
+from ..utils.alive import probably_alive, is_probably_alive
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -94,6 +94,8 @@ class LivingProxyDb(ProxyDbBase):
         self._ = llocale.translation.gettext
         self._p_f_n = self._(config.get('preferences.private-given-text'))
         self._p_s_n = self._(config.get('preferences.private-surname-text'))
+        # Whether each person is living, found once per person
+        self.__living = {}
 
     def get_person_from_handle(self, handle):
         """
@@ -239,11 +241,22 @@ class LivingProxyDb(ProxyDbBase):
         Returns False if the person is not considered living.
         """
         person_handle = person.get_handle()
-        unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive( unfil_person,
-                               self.db,
-                               self.current_date,
-                               self.years_after_death )
+        living = self.__living.get(person_handle)
+        if living is None:
+            if self.db.get_lifespan_table() is not None:
+                # The person of the database is the unfiltered person
+                living = is_probably_alive(person_handle,
+                                           self.db,
+                                           self.current_date,
+                                           self.years_after_death)
+            else:
+                unfil_person = self.get_unfiltered_person(person_handle)
+                living = probably_alive( unfil_person,
+                                         self.db,
+                                         self.current_date,
+                                         self.years_after_death )
+            self.__living[person_handle] = living
+        return living
 
     def __remove_living_from_family(self, family):
         """
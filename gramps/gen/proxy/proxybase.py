@@ -823,34 +823,44 @@ class ProxyDbBase(DbReadBase):
         return self.db.get_url_types()
 
     def get_raw_person_data(self, handle):
-        return self.get_person_from_handle(handle).serialize()
+        person = self.get_person_from_handle(handle)
+        return person.serialize() if person else None
 
     def get_raw_family_data(self, handle):
-        return self.get_family_from_handle(handle).serialize()
+        family = self.get_family_from_handle(handle)
+        return family.serialize() if family else None
 
     def get_raw_media_data(self, handle):
-        return self.get_media_from_handle(handle).serialize()
+        media = self.get_media_from_handle(handle)
+        return media.serialize() if media else None
 
     def get_raw_place_data(self, handle):
-        return self.get_place_from_handle(handle).serialize()
+        place = self.get_place_from_handle(handle)
+        return place.serialize() if place else None
 
     def get_raw_event_data(self, handle):
-        return self.get_event_from_handle(handle).serialize()
+        event = self.get_event_from_handle(handle)
+        return event.serialize() if event else None
 
     def get_raw_source_data(self, handle):
-        return self.get_source_from_handle(handle).serialize()
+        source = self.get_source_from_handle(handle)
+        return source.serialize() if source else None
 
     def get_raw_citation_data(self, handle):
-        return self.get_citation_from_handle(handle).serialize()
+        citation = self.get_citation_from_handle(handle)
+        return citation.serialize() if citation else None
 
     def get_raw_repository_data(self, handle):
-        return self.get_repository_from_handle(handle).serialize()
+        repository = self.get_repository_from_handle(handle)
+        return repository.serialize() if repository else None
 
     def get_raw_note_data(self, handle):
-        return self.get_note_from_handle(handle).serialize()
+        note = self.get_note_from_handle(handle)
+        return note.serialize() if note else None
 
     def get_raw_tag_data(self, handle):
-        return self.get_tag_from_handle(handle).serialize()
+        tag = self.get_tag_from_handle(handle)
+        return tag.serialize() if tag else None
 
     def has_person_handle(self, handle):
         """
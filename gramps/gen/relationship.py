@@ -837,6 +837,8 @@ class RelationshipCalculator:
         self.stored_map = None
         self.map_handle = None
         self.map_meta = None
+        self.stored_relationships = {}
+        self.relationships_key = None
         self.__db_connected = False
         self.depth = 15
         try:
@@ -863,6 +865,7 @@ class RelationshipCalculator:
         if depth != self.depth:
             self.depth = depth
             self.dirtymap = True
+            self.stored_relationships = {}
 
     def get_depth(self):
         """
@@ -1260,14 +1263,15 @@ class RelationshipCalculator:
                  self.__crosslinks, self.__msg = self.map_meta
                 self.__msg = list(self.__msg)
             else:
-                self.__apply_filter(db, orig_person, '', [], first_map)
+                self.__apply_filter(db, orig_person and orig_person.handle,
+                                    '', [], first_map)
                 self.map_meta = (self.__max_depth_reached,
                                  self.__loop_detected,
                                  self.__all_families,
                                  self.__all_dist, self.__only_birth,
                                  self.__crosslinks, list(self.__msg))
-            self.__apply_filter(db, other_person, '', [], second_map,
-                                stoprecursemap=first_map)
+            self.__apply_filter(db, other_person and other_person.handle,
+                                '', [], second_map, stoprecursemap=first_map)
         except RuntimeError:
             return (-1, None, -1, [], -1, []), \
                             [_("Relationship loop detected")] + self.__msg
@@ -1352,7 +1356,38 @@ class RelationshipCalculator:
         else:
             return [(-1, None, '', [], '', [])], self.__msg
 
-    def __apply_filter(self, db, person, rel_str, rel_fam, pmap,
+    def __get_parent_families(self, db, handle):
+        """
+        Return the parent families of a person, each as a tuple of the handles
+        of the father and mother, the handles of the children, and the mother
+        and father relations of the person, or None if the person is not a
+        child of the family.
+        """
+        graph = db.get_kinship_graph()
+        if graph is not None:
+            return graph.get_parent_families(handle, self.__all_families)
+        person = db.get_person_from_handle(handle)
+        family_handles = []
+        main = person.get_main_parents_family_handle()
+        if main:
+            family_handles = [main]
+        if self.__all_families:
+            family_handles = person.get_parent_family_handle_list()
+        families = []
+        for family_handle in family_handles:
+            family = db.get_family_from_handle(family_handle)
+            if not family:
+                continue
+            childrel = [(ref.get_mother_relation(),
+                         ref.get_father_relation())
+                        for ref in family.get_child_ref_list()
+                        if ref.ref == handle]
+            families.append((family.father_handle, family.mother_handle,
+                             [ref.ref for ref in family.get_child_ref_list()],
+                             childrel[0] if childrel else None))
+        return families
+
+    def __apply_filter(self, db, handle, rel_str, rel_fam, pmap,
                        depth=1, stoprecursemap=None):
         """
         Typically this method is called recursively in two ways:
@@ -1367,7 +1402,7 @@ class RelationshipCalculator:
         will be looked up anyway an stored if common. At end the doubles
         are filtered out
         """
-        if person is None or not person.handle:
+        if not handle:
             return
 
         if depth > self.__max_depth:
@@ -1382,34 +1417,35 @@ class RelationshipCalculator:
         store = True                            #normally we store all parents
         if stoprecursemap:
             store = False                       #but not if a stop map given
-            if person.handle in stoprecursemap:
+            if handle in stoprecursemap:
                 commonancestor = True
                 store = True
 
         #add person to the map, take into account that person can be obtained
         #from different sides
-        if person.handle in pmap:
+        if handle in pmap:
             #person is already a grandparent in another branch, we already have
             # had lookup of all parents, we call that a crosslink
             if not stoprecursemap:
                 self.__crosslinks = True
-            pmap[person.handle][0] += [rel_str]
-            pmap[person.handle][1] += [rel_fam]
+            pmap[handle][0] += [rel_str]
+            pmap[handle][1] += [rel_fam]
             #check if there is no loop father son of his son, ...
             # loop means person is twice reached, same rel_str in begin
-            for rel1 in pmap[person.handle][0]:
-                for rel2 in pmap[person.handle][0]:
+            for rel1 in pmap[handle][0]:
+                for rel2 in pmap[handle][0]:
                     if len(rel1) < len(rel2) and \
                             rel1 == rel2[:len(rel1)]:
                         #loop, keep one message in storage!
                         self.__loop_detected = True
+                        person = db.get_person_from_handle(handle)
                         self.__msg += [_("Relationship loop detected:") + " " +
                                        _("Person %(person)s connects to himself via %(relation)s")  %
                                        {'person' : person.get_primary_name().get_name(),
                                         'relation' : rel2[len(rel1):]}]
                         return
         elif store:
-            pmap[person.handle] = [[rel_str], [rel_fam]]
+            pmap[handle] = [[rel_str], [rel_fam]]
 
         #having added person to the pmap, we only look up recursively to
         # parents if this person is not common relative
@@ -1418,34 +1454,17 @@ class RelationshipCalculator:
             #don't continue search, great speedup!
             return
 
-        family_handles = []
-        main = person.get_main_parents_family_handle()
-        if main:
-            family_handles = [main]
-        if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
-
         try:
             parentstodo = {}
             fam = 0
-            for family_handle in family_handles:
+            for (fhandle, mhandle, child_list,
+                 childrel) in self.__get_parent_families(db, handle):
                 rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
-                if not family:
-                    continue
-                #obtain childref for this person
-                childrel = [(ref.get_mother_relation(),
-                             ref.get_father_relation())
-                            for ref in family.get_child_ref_list()
-                            if ref.ref == person.handle]
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
                 for data in [(fhandle, self.REL_FATHER,
-                              self.REL_FATHER_NOTBIRTH, childrel[0][1]),
+                              self.REL_FATHER_NOTBIRTH, childrel[1]),
                              (mhandle, self.REL_MOTHER,
-                              self.REL_MOTHER_NOTBIRTH, childrel[0][0])]:
+                              self.REL_MOTHER_NOTBIRTH, childrel[0])]:
                     if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
                         if data[3] == ChildRefType.BIRTH:
                             addstr = data[1]
                         elif not self.__only_birth:
@@ -1453,13 +1472,12 @@ class RelationshipCalculator:
                         else:
                             addstr = ''
                         if addstr:
-                            parentstodo[data[0]] = (persontodo,
-                                                    rel_str + addstr,
+                            parentstodo[data[0]] = (rel_str + addstr,
                                                     rel_fam_new)
                     elif data[0] and data[0] in parentstodo:
                         #this person is already scheduled to research
                         #update family list
-                        famlist = parentstodo[data[0]][2]
+                        famlist = parentstodo[data[0]][1]
                         if not isinstance(famlist[-1], list) and \
                                 fam != famlist[-1]:
                             famlist = famlist[:-1] + [[famlist[-1]]]
@@ -1467,14 +1485,13 @@ class RelationshipCalculator:
                                 fam not in famlist[-1]:
                             famlist = famlist[:-1] + [famlist[-1] + [fam]]
                             parentstodo[data[0]] = (parentstodo[data[0]][0],
-                                                    parentstodo[data[0]][1],
                                                     famlist)
                 if not fhandle and not mhandle and stoprecursemap is None:
                     #family without parents, add brothers for orig person
                     #other person has recusemap, and will stop when seeing
                     #the brother.
-                    child_list = [ref.ref for ref in family.get_child_ref_list()
-                                  if ref.ref != person.handle]
+                    child_list = [chandle for chandle in child_list
+                                  if chandle != handle]
                     addstr = self.REL_SIBLING
                     for chandle in child_list:
                         if chandle in pmap:
@@ -1485,9 +1502,9 @@ class RelationshipCalculator:
                             pmap[chandle] = [[rel_str+addstr], [rel_fam_new]]
                 fam += 1
 
-            for handle, data in parentstodo.items():
-                self.__apply_filter(db, data[0],
-                                    data[1], data[2],
+            for parent_handle, data in parentstodo.items():
+                self.__apply_filter(db, parent_handle,
+                                    data[0], data[1],
                                     pmap, depth, stoprecursemap)
         except:
             import traceback
@@ -1790,6 +1807,76 @@ class RelationshipCalculator:
         else:
             return rel_str
 
+    def get_relationships(self, db, orig_person, handles=None,
+                          extra_info=False, olocale=glocale):
+        """
+        Returns the relationships of orig_person to many other people, as a
+        dictionary, by handle, of the values returned by
+        :meth:`get_one_relationship`.
+
+        The ancestors of orig_person are searched only once, and the people
+        who do not descend from any of them are not searched at all. If the
+        calculator is connected to the database signals, the relationships
+        are kept until the database changes.
+
+        :param handles: handles of the other people, or None for everybody
+        :type handles: iterable
+        """
+        if handles is None:
+            handles = db.iter_person_handles()
+        handles = list(handles)
+        key = (orig_person and orig_person.handle, extra_info, olocale)
+        if not self.storemap or self.relationships_key != key:
+            self.stored_relationships = {}
+            self.relationships_key = key
+        known = self.stored_relationships
+        todo = [handle for handle in handles if handle not in known]
+        if todo:
+            storemap = self.storemap
+            if not storemap:
+                # share the map of ancestors of orig_person for this call
+                self.storemap = True
+                self.dirtymap = True
+            try:
+                related = self.__get_related(db, orig_person)
+                unrelated = ('', -1, -1) if extra_info else ''
+                for handle in todo:
+                    if related is not None and handle not in related:
+                        known[handle] = unrelated
+                    else:
+                        known[handle] = self.get_one_relationship(
+                            db, orig_person, db.get_person_from_handle(handle),
+                            extra_info=extra_info, olocale=olocale)
+            finally:
+                if not storemap:
+                    self.storemap = False
+                    self.stored_map = None
+        return {handle: known[handle] for handle in handles}
+
+    def __get_related(self, db, orig_person):
+        """
+        Return the handles of the people who may be related to orig_person:
+        the partners of the person and the descendants of every person in
+        the map of ancestors of the person, or None if they cannot be found
+        quickly.
+        """
+        graph = db.get_kinship_graph()
+        if graph is None or orig_person is None:
+            return None
+        self.get_relationship_distance_new(
+            db, orig_person, orig_person, all_dist=True, all_families=True,
+            only_birth=False)
+        if (self.stored_map is None or self.dirtymap
+                or self.map_handle != orig_person.handle):
+            return None
+        related = graph.get_all_descendants(self.stored_map)
+        for family_handle in orig_person.get_family_handle_list():
+            family = db.get_family_from_handle(family_handle)
+            if family:
+                related.add(family.get_father_handle())
+                related.add(family.get_mother_handle())
+        return related
+
     def get_all_relationships(self, db, orig_person, other_person):
         """
         Return a tuple, of which the first entry is a list with all
@@ -2255,6 +2342,7 @@ class RelationshipCalculator:
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
         self.stored_map = None
+        self.stored_relationships = {}
 
     def _dbchange_callback(self, db):
         """
@@ -2262,6 +2350,7 @@ class RelationshipCalculator:
         Connects must be remade
         """
         self.dirtymap = True
+        self.stored_relationships = {}
         #signals are disconnected on close of old database, connect to new
         self.__connect_db_signals(db)
 
@@ -2273,6 +2362,7 @@ class RelationshipCalculator:
         will be checked
         """
         self.dirtymap = True
+        self.stored_relationships = {}
 
 #-------------------------------------------------------------------------
 #
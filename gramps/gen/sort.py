@@ -47,6 +47,7 @@ from .const import GRAMPS_LOCALE as glocale
 # Constants
 #
 #-------------------------------------------------------------------------
+_PERSON_NAME = 3 # position of the primary name in the raw data of a person
 
 class Sort:
 
@@ -107,11 +108,8 @@ class Sort:
         Sort routine for comparing two displayed names.
         """
 
-        first = self.database.get_person_from_handle(first_id)
-
-        name1 = _nd.sorted(first)
-
-        return glocale.sort_key(name1)
+        data = self.database.get_raw_person_data(first_id)
+        return _nd.cached_sorted_key(first_id, data[_PERSON_NAME])
 
 ##    def by_birthdate(self, first_id, second_id):
 ##        """Sort routine for comparing two people by birth dates. If the birth
@@ -0,0 +1,95 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for relationship.py """
+
+import os
+import unittest
+
+from ..const import DATA_DIR
+from ..db import DbTxn
+from ..db.utils import import_as_dict
+from ..proxy import PrivateProxyDb
+from ..relationship import RelationshipCalculator
+from ..user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class RelationshipsTest(unittest.TestCase):
+    """
+    Compare the relationships computed in bulk with those computed one by
+    one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.handles = sorted(cls.db.iter_person_handles())[:150]
+
+    def setUp(self):
+        self.calc = RelationshipCalculator()
+
+    def compare(self, db, gramps_id, extra_info=False):
+        root = db.get_person_from_gramps_id(gramps_id)
+        handles = [handle for handle in self.handles
+                   if db.has_person_handle(handle)]
+        relationships = self.calc.get_relationships(db, root, handles,
+                                                    extra_info=extra_info)
+        self.assertEqual(list(relationships), handles)
+        for handle in handles:
+            other = db.get_person_from_handle(handle)
+            self.assertEqual(relationships[handle],
+                             self.calc.get_one_relationship(
+                                 db, root, other, extra_info=extra_info))
+        return relationships
+
+    def test_bulk(self):
+        relationships = self.compare(self.db, 'I0044')
+        self.assertTrue(any(relationships.values()))
+        self.assertFalse(all(relationships.values()))
+
+    def test_extra_info(self):
+        self.compare(self.db, 'I0001', extra_info=True)
+
+    def test_proxy(self):
+        self.compare(PrivateProxyDb(self.db), 'I0044')
+
+    def test_invalidate(self):
+        self.calc.storemap = True
+        root = self.db.get_person_from_gramps_id('I0044')
+        father = self.db.get_person_from_handle(
+            self.db.get_family_from_handle(
+                root.get_main_parents_family_handle()).get_father_handle())
+        before = self.calc.get_relationships(self.db, root, [father.handle])
+        self.assertTrue(before[father.handle])
+        with DbTxn('Remove parents', self.db) as trans:
+            self.db.remove_parent_from_family(
+                father.handle, root.get_main_parents_family_handle(), trans)
+        try:
+            self.calc._datachange_callback()
+            root = self.db.get_person_from_handle(root.handle)
+            after = self.calc.get_relationships(self.db, root, [father.handle])
+            self.assertEqual(after[father.handle], '')
+        finally:
+            self.db.undo()
+
+if __name__ == "__main__":
+    unittest.main()
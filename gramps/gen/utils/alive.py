@@ -40,7 +40,8 @@ LOG = logging.getLogger(".gen.utils.alive")
 #-------------------------------------------------------------------------
 from ..display.name import displayer as name_displayer
 from ..lib.date import Date, Today
-from ..errors import DatabaseError
+from ..errors import DatabaseError, HandleError
+from ..db.lifespan import person_record
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 
@@ -87,8 +88,60 @@ class ProbablyAlive:
         self.MAX_AGE_PROB_ALIVE = max_age_prob_alive
         self.AVG_GENERATION_GAP = avg_generation_gap
         self.pset = set()
+        self.table = db.get_lifespan_table()
 
     def probably_alive_range(self, person, is_spouse=False):
+        """
+        Computes estimated birth and death dates.
+        Returns: (birth_date, death_date, explain_text, related_person)
+        """
+        if self.table is None or is_spouse or person is None:
+            return self.__estimate(person, is_spouse)
+        birth, death, explain, handle = self.get_range(person)
+        if handle is None:
+            other = None
+        elif handle == person.handle:
+            other = person
+        else:
+            other = self.db.get_person_from_handle(handle)
+        return (Date(birth) if birth else None,
+                Date(death) if death else None, explain, other)
+
+    def get_range(self, person, handle=None):
+        """
+        Return the estimated birth and death dates of a person, given as an
+        object or by handle, with the explanation and the handle of the
+        relative they are based on. The dates must not be altered.
+
+        The relatives are read from the lifespan table of the database. The
+        estimate is kept in the table, unless the person given differs from
+        the one in the database, as an edited person does.
+        """
+        table = self.table
+        if person is not None:
+            handle = person.handle
+        record = table.get_record(handle)
+        if person is None:
+            if record is None:
+                raise HandleError('Handle %s not found' % handle)
+            person = table.get_person_from_handle(handle)
+        elif record != person_record(person):
+            record = None
+        params = (self.MAX_SIB_AGE_DIFF, self.MAX_AGE_PROB_ALIVE,
+                  self.AVG_GENERATION_GAP)
+        estimate = table.get_range(handle, params) if record else None
+        if estimate is None:
+            db, self.db = self.db, table
+            try:
+                birth, death, explain, other = self.__estimate(person)
+            finally:
+                self.db = db
+            estimate = (birth, death, explain, other and other.handle)
+            if record:
+                table.set_range(handle, params, estimate)
+        return estimate
+
+    def __estimate(self, person, is_spouse=False):
         # FIXME: some of these computed dates need to be a span. For
         #        example, if a person could be born +/- 20 yrs around
         #        a date then it should be a span, and yr_offset should
@@ -228,7 +281,7 @@ class ProbablyAlive:
                     father_handle = family.get_father_handle()
                     if mother_handle == person.handle and father_handle:
                         father = self.db.get_person_from_handle(father_handle)
-                        date1, date2, explain, other = self.probably_alive_range(father, is_spouse=True)
+                        date1, date2, explain, other = self.__estimate(father, is_spouse=True)
                         if date1 and date1.get_year() != 0:
                             return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
                                     Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
@@ -239,7 +292,7 @@ class ProbablyAlive:
                                     _("a spouse's death-related date, ") + explain, other)
                     elif father_handle == person.handle and mother_handle:
                         mother = self.db.get_person_from_handle(mother_handle)
-                        date1, date2, explain, other = self.probably_alive_range(mother, is_spouse=True)
+                        date1, date2, explain, other = self.__estimate(mother, is_spouse=True)
                         if date1 and date1.get_year() != 0:
                             return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
                                     Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
@@ -348,8 +401,7 @@ class ProbablyAlive:
             if person.handle in self.pset:
                 return (None, None, "", None)
             self.pset.add(person.handle)
-            LOG.debug("ancestors_too_old('%s', %s)".format(
-                name_displayer.display(person), year) )
+            LOG.debug("ancestors_too_old('%s', %s)", person.handle, year)
             family_handle = person.get_main_parents_family_handle()
             if family_handle:
                 family = self.db.get_family_from_handle(family_handle)
@@ -493,29 +545,66 @@ def probably_alive(person, db,
     :param max_age_prob_alive: maximum age of a person, in years
     :param avg_generation_gap: average generation gap, in years
     """
-    # First, get the real database to use all people
-    # for determining alive status:
-    birth, death, explain, relative = probably_alive_range(person, db,
-            max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
-    if current_date is None:
-        current_date = Today()
-    LOG.debug("%s: b.%s, d.%s - %s".format(
-        " ".join(person.get_primary_name().get_text_data_list()),
-        birth, death, explain))
+    if return_range:
+        birth, death, explain, relative = probably_alive_range(person, db,
+                max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
+    else:
+        pb = _get_probably_alive(db, max_sib_age_diff, max_age_prob_alive,
+                                 avg_generation_gap)
+        if pb.table is None:
+            birth, death, explain, relative = pb.probably_alive_range(person)
+        else:
+            # The relative is not needed
+            birth, death, explain, relative = pb.get_range(person)
+    LOG.debug("%s: b.%s, d.%s - %s", person.handle, birth, death, explain)
+    result = _alive_on(birth, death, current_date, limit)
+    if return_range:
+        if not birth or not death:
+            return (True, None, None, _("no evidence"), None)
+        return (result, birth, death, explain, relative)
+    else:
+        return result
+
+def is_probably_alive(handle, db,
+                      current_date=None,
+                      limit=0,
+                      max_sib_age_diff=None,
+                      max_age_prob_alive=None,
+                      avg_generation_gap=None):
+    """
+    Return true if the person with the handle may be alive on current_date,
+    as :py:func:`probably_alive` does for the person of the database.
+
+    When the database keeps a lifespan table, the person is not read from
+    the database, and the estimate is made once, and kept until a person,
+    family or event changes.
+    """
+    pb = _get_probably_alive(db, max_sib_age_diff, max_age_prob_alive,
+                             avg_generation_gap)
+    if pb.table is None:
+        return probably_alive(pb.db.get_person_from_handle(handle), db,
+                              current_date, limit, max_sib_age_diff,
+                              max_age_prob_alive, avg_generation_gap)
+    birth, death, explain, relative = pb.get_range(None, handle)
+    LOG.debug("%s: b.%s, d.%s - %s", handle, birth, death, explain)
+    return _alive_on(birth, death, current_date, limit)
+
+def _alive_on(birth, death, current_date, limit):
+    """
+    Return true if a person with the estimated birth and death dates may be
+    alive on current_date.
+    """
     if not birth or not death:
         # no evidence, must consider alive
-        return ((True, None, None, _("no evidence"), None) if return_range
-                else True)
+        return True
     # must have dates from here:
+    if current_date is None:
+        current_date = Today()
     if limit:
         death += limit # add these years to death
     # Finally, check to see if current_date is between dates
-    result = (current_date.match(birth, ">=") and
-              current_date.match(death, "<="))
-    if return_range:
-        return (result, birth, death, explain, relative)
-    else:
-        return result
+    return (current_date.match(birth, ">=") and
+            current_date.match(death, "<="))
 
 def probably_alive_range(person, db,
                          max_sib_age_diff=None,
@@ -525,16 +614,22 @@ def probably_alive_range(person, db,
     Computes estimated birth and death dates.
     Returns: (birth_date, death_date, explain_text, related_person)
     """
-    # First, find the real database to use all people
-    # for determining alive status:
+    pb = _get_probably_alive(db, max_sib_age_diff, max_age_prob_alive,
+                             avg_generation_gap)
+    return pb.probably_alive_range(person)
+
+def _get_probably_alive(db, max_sib_age_diff, max_age_prob_alive,
+                        avg_generation_gap):
+    """
+    Return a ProbablyAlive for the real database under any proxies, which
+    is used to examine all people.
+    """
     from ..proxy.proxybase import ProxyDbBase
     basedb = db
     while isinstance(basedb, ProxyDbBase):
         basedb = basedb.db
-    # Now, we create a wrapper for doing work:
-    pb = ProbablyAlive(basedb, max_sib_age_diff,
-                       max_age_prob_alive, avg_generation_gap)
-    return pb.probably_alive_range(person)
+    return ProbablyAlive(basedb, max_sib_age_diff,
+                         max_age_prob_alive, avg_generation_gap)
 
 def update_constants():
     """
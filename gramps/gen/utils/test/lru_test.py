@@ -0,0 +1,57 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018 Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the LRU cache """
+
+import unittest
+
+from ..lru import LRU
+
+class LRUTest(unittest.TestCase):
+
+    def test_count(self):
+        lru = LRU(3)
+        for key in 'abc':
+            lru[key] = key.upper()
+        lru['a']
+        lru['d'] = 'D'
+        self.assertEqual(lru.keys(), ['c', 'a', 'd'])
+        self.assertEqual(lru.items(), [('c', 'C'), ('a', 'A'), ('d', 'D')])
+        self.assertEqual(lru.evictions, 1)
+
+    def test_budget(self):
+        lru = LRU(10, budget=6, sizeof=len)
+        lru['a'] = 'xxx'
+        lru['b'] = 'yyy'
+        lru['c'] = 'zz'
+        self.assertEqual(lru.keys(), ['b', 'c'])
+        self.assertEqual(lru.size, 5)
+        del lru['b']
+        self.assertEqual(lru.size, 2)
+        lru.clear()
+        self.assertEqual(lru.size, 0)
+
+    def test_disabled(self):
+        lru = LRU(0)
+        lru['a'] = 'A'
+        self.assertNotIn('a', lru)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,7 +44,8 @@ from ...user import User
 from gramps.gen.proxy import (PrivateProxyDb,
                               LivingProxyDb,
                               FilterProxyDb,
-                              ReferencedBySelectionProxyDb)
+                              ReferencedBySelectionProxyDb,
+                              CompiledProxyDb)
 
 #-------------------------------------------------------------------------
 #
@@ -572,7 +573,11 @@ class WriterOptionBox:
 
         self.proxy_dbase.clear()
         for proxy_name in self.get_proxy_names():
-            dbase = self.apply_proxy(proxy_name, dbase, progress)
+            proxy_dbase = self.apply_proxy(proxy_name, dbase, progress)
+            if proxy_dbase is not dbase:
+                # The next proxy and the exporter read each object many
+                # times; have it go through the proxies below only once.
+                dbase = CompiledProxyDb(proxy_dbase)
             if preview:
                 self.proxy_dbase[proxy_name] = dbase
                 self.preview_proxy_button[proxy_name].set_sensitive(1)
@@ -302,8 +302,17 @@ class ListView(NavigationView):
         """
         NavigationView.set_inactive(self)
         self.uistate.viewmanager.tags.tag_disable()
+        if self.model and self.model.is_building():
+            self.model.cancel_build()
+            self.dirty = True
 
     def build_tree(self, force_sidebar=False, preserve_col=True):
+        """
+        Rebuild the model with the current search or filter. The model is
+        built in the background, and attached to the list when it is ready,
+        or when the first rows of a search or filter are found; a build
+        that is still running is abandoned.
+        """
         if self.active:
             cput0 = perf_counter()
             if not self.search_bar.is_visible():
@@ -312,49 +321,72 @@ class ListView(NavigationView):
                 value = self.search_bar.get_value()
                 filter_info = (False, value, value[0] in self.exact_search())
 
+            if self.model and self.model.is_building():
+                # the data of the model is incomplete
+                self.model.cancel_build()
+                self.dirty = True
+            self.list.set_model(None)
             if self.dirty or not self.model:
                 if self.model:
-                    self.list.set_model(None)
                     self.model.destroy()
                 self.model = self.make_model(
                     self.dbstate.db, self.uistate, self.sort_col,
-                    search=filter_info, sort_map=self.column_order())
+                    search=filter_info, sort_map=self.column_order(),
+                    rebuild=False)
             else:
                 #the entire data to show is already in memory.
                 #run only the part that determines what to show
-                self.list.set_model(None)
                 self.model.set_search(filter_info)
-                try:
-                    self.model.rebuild_data()
-                except FilterError as msg:
-                    (msg1, msg2) = msg.messages()
-                    ErrorDialog(msg1, msg2,
-                                parent=self.uistate.window)
-
-            cput1 = perf_counter()
-            self.build_columns(preserve_col)
-            cput2 = perf_counter()
-            self.list.set_model(self.model)
-            cput3 = perf_counter()
-            self.__display_column_sort()
-            self.goto_active(None)
-
             self.dirty = False
-            cput4 = perf_counter()
-            self.uistate.show_filter_results(self.dbstate,
-                                             self.model.displayed(),
-                                             self.model.total())
-            LOG.debug(self.__class__.__name__ + ' build_tree ' +
-                    str(perf_counter() - cput0) + ' sec')
-            LOG.debug('parts ' + str(cput1-cput0) + ' , '
-                             + str(cput2-cput1) + ' , '
-                             + str(cput3-cput2) + ' , '
-                             + str(cput4-cput3) + ' , '
-                             + str(perf_counter() - cput4))
-
+            self.uistate.push_message(self.dbstate, _("Loading items..."))
+            self.model.rebuild_in_background(
+                lambda err: self.__built(err, cput0, preserve_col),
+                lambda: self.__show_first_rows(preserve_col))
         else:
             self.dirty = True
 
+    def __show_first_rows(self, preserve_col):
+        """
+        Called when the first rows of the model built by build_tree are
+        known, to show them while the others are found.
+        """
+        self.build_columns(preserve_col)
+        self.list.set_model(self.model)
+        self.__display_column_sort()
+
+    def __built(self, err, cput0, preserve_col):
+        """
+        Called when the model has been built by build_tree.
+        """
+        # the first rows may have been shown while the others were found
+        self.list.set_model(None)
+        if isinstance(err, FilterError):
+            (msg1, msg2) = err.messages()
+            ErrorDialog(msg1, msg2,
+                        parent=self.uistate.window)
+        elif err is not None:
+            raise err
+
+        cput1 = perf_counter()
+        self.build_columns(preserve_col)
+        cput2 = perf_counter()
+        self.list.set_model(self.model)
+        cput3 = perf_counter()
+        self.__display_column_sort()
+        self.goto_active(None)
+
+        cput4 = perf_counter()
+        self.uistate.show_filter_results(self.dbstate,
+                                         self.model.displayed(),
+                                         self.model.total())
+        LOG.debug(self.__class__.__name__ + ' build_tree ' +
+                str(perf_counter() - cput0) + ' sec')
+        LOG.debug('parts ' + str(cput1-cput0) + ' , '
+                         + str(cput2-cput1) + ' , '
+                         + str(cput3-cput2) + ' , '
+                         + str(cput4-cput3) + ' , '
+                         + str(perf_counter() - cput4))
+
     def search_build_tree(self):
         self.build_tree()
 
@@ -411,7 +443,8 @@ class ListView(NavigationView):
         To handle this, we set the self.inactive variable that we can check
         in row_change to look for this particular condition.
         """
-        if not handle or handle in self.selected_handles():
+        if (not handle or self.model.is_building()
+                or handle in self.selected_handles()):
             return
 
         iter_ = self.model.get_iter_from_handle(handle)
@@ -630,6 +663,9 @@ class ListView(NavigationView):
             else:
                 order = Gtk.SortType.DESCENDING
 
+        if self.model.is_building():
+            self.model.cancel_build()
+            same_col = False
         self.sort_col = data
         self.sort_order = order
         handle = self.first_selected()
@@ -689,6 +725,8 @@ class ListView(NavigationView):
         """
         Called when the database is changed.
         """
+        if self.model:
+            self.model.cancel_build()
         self.list.set_model(None)
         self._change_db(db)
         self.connect_signals()
@@ -739,6 +777,11 @@ class ListView(NavigationView):
         """
         Called when an object is added.
         """
+        if self.model and self.model.is_building():
+            # the rows read so far may be out of date
+            self.dirty = True
+            self.build_tree()
+            return
         if self.active or \
            (not self.dirty and not self._dirty_on_change_inactive):
             cput = perf_counter()
@@ -756,6 +799,11 @@ class ListView(NavigationView):
         """
         Called when an object is updated.
         """
+        if self.model and self.model.is_building():
+            # the rows read so far may be out of date
+            self.dirty = True
+            self.build_tree()
+            return
         if self.model:
             self.model.prev_handle = None
         if self.active or \
@@ -779,6 +827,11 @@ class ListView(NavigationView):
         """
         Called when an object is deleted.
         """
+        if self.model and self.model.is_building():
+            # the rows read so far may be out of date
+            self.dirty = True
+            self.build_tree()
+            return
         if self.active or \
            (not self.dirty and not self._dirty_on_change_inactive):
             cput = perf_counter()
@@ -20,6 +20,13 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+#-------------------------------------------------------------------------
+#
+# GTK modules
+#
+#-------------------------------------------------------------------------
+from gi.repository import GLib
+
 #-------------------------------------------------------------------------
 #
 # Gramps modules
@@ -32,15 +39,30 @@ class BaseModel:
 
     # LRU cache size
     _CACHE_SIZE = config.get('interface.treemodel-cache-size')
+    # Class of the objects of the model, and the columns that the full-text
+    # index of the database can search, with the field holding their text:
+    search_class = None
+    search_fields = {}
+    # Columns on which the model is sorted in the order of the sort keys
+    # that the database keeps for search_class, if any:
+    sorted_columns = ()
+    # Columns whose value is a secondary column of search_class, which the
+    # database can read without the objects, with the name of that column:
+    column_fields = {}
+    # Number of rows read between two returns to the main loop, when the
+    # model is built in the background:
+    BUILD_STEP = 1000
 
     def __init__(self):
         self.lru_data = LRU(BaseModel._CACHE_SIZE)
         self.lru_path = LRU(BaseModel._CACHE_SIZE)
+        self.__build = None
 
     def destroy(self):
         """
         Destroy the items in memory.
         """
+        self.cancel_build()
         self.lru_data = None
         self.lru_path = None
 
@@ -78,6 +100,75 @@ class BaseModel:
                     self.lru_data[handle] = {}
                 self.lru_data[handle][col] = data
 
+    def build_steps(self):
+        """
+        Return a generator that builds the data of the model as
+        rebuild_data does, yielding every BUILD_STEP rows or so, and
+        yielding True when the first rows can be shown.
+        Must be overridden in the inheriting class.
+        """
+        raise NotImplementedError
+
+    def rebuild_in_background(self, callback, first_rows=None):
+        """
+        Rebuild the data of the model in steps run when the main loop is
+        idle, so that the interface stays responsive. When the build ends,
+        callback is called with None, or with the exception that stopped
+        it. A pending build is cancelled first.
+
+        The model must not be attached to a view until it is built, unless
+        a step yields True: the model then shows the first rows found, and
+        first_rows, if given, is called to attach it. The model must be
+        attached again when the build ends.
+        """
+        self.cancel_build()
+        steps = self.build_steps()
+
+        def step():
+            try:
+                if next(steps) and first_rows is not None:
+                    first_rows()
+            except StopIteration:
+                self.__build = None
+                callback(None)
+                return False
+            except Exception as err:
+                self.__build = None
+                callback(err)
+                return False
+            return True
+
+        self.__build = (GLib.idle_add(step), steps)
+
+    def cancel_build(self):
+        """
+        Stop the build started by rebuild_in_background, if any. The data of
+        the model is then incomplete, and must be rebuilt before use.
+        """
+        if self.__build:
+            source_id, steps = self.__build
+            self.__build = None
+            GLib.source_remove(source_id)
+            steps.close()
+            self._in_build = False
+
+    def is_building(self):
+        """
+        Return True if the model is being built in the background.
+        """
+        return self.__build is not None
+
+    def search_index(self, col, text):
+        """
+        Return a function finding the handles of the objects whose value in
+        a column may contain a text with the full-text index of a database,
+        or None if the index does not hold the values of the column.
+        """
+        field = self.search_fields.get(col)
+        if field is None:
+            return None
+        return lambda db: db.search_text(self.search_class, field, text)
+
     ## Cached Path's for TreeView:
     def get_cached_path(self, handle):
         """
@@ -56,10 +56,17 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     """
     Flat citation model.  (Original code in CitationBaseModel).
     """
+    search_class = 'Citation'
+    search_fields = {0: 'text', 1: 'gramps_id'}
+    sorted_columns = (0,)
+    column_fields = {0: 'page', 1: 'gramps_id'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         self.map = db.get_raw_citation_data
         self.gen_cursor = db.get_citation_cursor
+        self.number_items = db.get_number_of_citations
         self.fmap = [
             self.citation_page,
             self.citation_id,
@@ -95,7 +102,8 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
             self.citation_tag_color
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -103,6 +111,7 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
         """
         self.db = None
         self.gen_cursor = None
+        self.number_items = None
         self.map = None
         self.fmap = None
         self.smap = None
@@ -66,7 +66,8 @@ class CitationTreeModel(CitationBaseModel, TreeBaseModel):
     Hierarchical citation model.
     """
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         self.db = db
         self.number_items = self.db.get_number_of_sources
         self.map = self.db.get_raw_source_data
@@ -102,6 +103,7 @@ class CitationTreeModel(CitationBaseModel, TreeBaseModel):
 
         TreeBaseModel.__init__(self, self.db, uistate, scol=scol, order=order,
                                search=search, skip=skip, sort_map=sort_map,
+                               rebuild=rebuild,
                                nrgroups=1,
                                group_can_have_handle=True,
                                has_secondary=True)
@@ -71,9 +71,16 @@ INVALID_DATE_FORMAT = config.get('preferences.invalid-date-format')
 #-------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
 
+    search_class = 'Event'
+    search_fields = {0: 'text', 1: 'gramps_id'}
+    sorted_columns = (0,)
+    column_fields = {0: 'description', 1: 'gramps_id'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         self.gen_cursor = db.get_event_cursor
+        self.number_items = db.get_number_of_events
         self.map = db.get_raw_event_data
 
         self.fmap = [
@@ -101,7 +108,8 @@ class EventModel(FlatBaseModel):
             self.column_tag_color
            ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -109,6 +117,7 @@ class EventModel(FlatBaseModel):
         """
         self.db = None
         self.gen_cursor = None
+        self.number_items = None
         self.map = None
         self.fmap = None
         self.smap = None
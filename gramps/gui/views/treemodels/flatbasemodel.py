@@ -42,6 +42,10 @@ The class FlatNodeMap keeps a sortkeyhandle list with (sortkey, handle) entries,
 and a handle2path dictionary. As the Map is flat, the index in sortkeyhandle
 corresponds to the path.
 
+The class VirtualNodeMap is used instead when all the objects are shown,
+sorted on a column of which the database keeps the sort keys. Its sortkeyhandle
+list is read from the database a window at a time.
+
 The class FlatBaseModel, is the base class for all flat treeview models.
 It keeps a FlatNodeMap, and obtains data from database as needed
 """
@@ -434,6 +438,272 @@ class FlatNodeMap:
         return Gtk.TreePath((delpath,))
 
 
+#-------------------------------------------------------------------------
+#
+# SortKeyList
+#
+#-------------------------------------------------------------------------
+class SortKeyList:
+    """
+    The ascending sorted list of the (sortkey, handle) tuples of all the
+    objects of a class, as the database keeps it, of which only a window is
+    held in memory. Other parts of the list are read when they are indexed.
+    """
+    # Number of tuples read from the database at once:
+    WINDOW = 500
+
+    def __init__(self, db, obj_class, count):
+        self.db = db
+        self.obj_class = obj_class
+        self.count = count
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the window, which is read again when next indexed.
+        """
+        self.start = 0
+        self.window = []
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('index out of range')
+        offset = index - self.start
+        if not 0 <= offset < len(self.window):
+            # read some tuples before the index too, for views scrolling up
+            self.start = max(0, index - self.WINDOW // 4)
+            self.window = self.db.get_sort_keys(self.obj_class, self.start,
+                                                self.start + self.WINDOW)
+            offset = index - self.start
+        return self.window[offset]
+
+    def find(self, handle):
+        """
+        Return the index of a handle if it is in the window, or None.
+        """
+        for offset, (dummy_srtkey, hndl) in enumerate(self.window):
+            if hndl == handle:
+                return self.start + offset
+        return None
+
+    def position(self, handle):
+        """
+        Return the index of a handle as the database gives it, or None if
+        the database does not hold the object.
+        """
+        return self.db.get_sort_key_position(self.obj_class, handle)
+
+    def index(self, handle):
+        """
+        Return the index of a handle, or None if the database does not hold
+        the object.
+        """
+        index = self.find(handle)
+        if index is None:
+            index = self.position(handle)
+        return index
+
+#-------------------------------------------------------------------------
+#
+# VirtualNodeMap
+#
+#-------------------------------------------------------------------------
+class VirtualNodeMap:
+    """
+    A NodeMap for a flat treeview showing all the objects of a class,
+    ordered by a column of which the database keeps the sort keys.
+
+    It offers the methods of :class:`FlatNodeMap` that the model uses when
+    all the objects are shown. Its index2hndl list is a
+    :class:`SortKeyList`, so that only the number of rows and the rows
+    around the last ones shown are kept in memory, whatever the size of the
+    database, and there is no hndl2index map: the index of a handle is
+    looked up in the database.
+    """
+
+    def __init__(self, db, obj_class, count, reverse=False):
+        """
+        Create a new instance for the objects of a class, given by name,
+        of which there are count.
+        """
+        self._index2hndl = SortKeyList(db, obj_class, count)
+        self._reverse = reverse
+        # See FlatNodeMap.
+        self.stamp = 0
+
+    def destroy(self):
+        """
+        Unset all elements that can prevent garbage collection
+        """
+        self._index2hndl.db = None
+        self._index2hndl = None
+
+    def reverse_order(self):
+        """
+        Reverse the order of the paths.
+        """
+        self._reverse = not self._reverse
+
+    def real_path(self, index):
+        """
+        Given the index in the list, return the real path.
+        """
+        if self._reverse:
+            return len(self._index2hndl) - 1 - index
+        return index
+
+    real_index = real_path
+
+    def clear_map(self):
+        """
+        Clears out the list.
+        """
+        self._index2hndl.count = 0
+        self._index2hndl.clear()
+
+    def get_path(self, iter):
+        """
+        Return the path from the passed iter.
+        """
+        index = iter.user_data
+        # pygobject 3.8 stores 0 as None, see FlatNodeMap.get_path
+        if index is None:
+            index = 0
+        return Gtk.TreePath((self.real_path(index),))
+
+    def get_path_from_handle(self, handle):
+        """
+        Return the path from the passed handle, or None if handle does not
+        link to a path
+        """
+        index = self._index2hndl.index(handle)
+        if index is None:
+            return None
+        return Gtk.TreePath((self.real_path(index),))
+
+    def find_path(self, handle):
+        """
+        Return the path of a handle if its row is in the window read from
+        the database, or None. After a change to the object, this is the
+        path of the row before the change.
+        """
+        index = self._index2hndl.find(handle)
+        if index is None:
+            return None
+        return Gtk.TreePath((self.real_path(index),))
+
+    def get_sorted_path(self, handle):
+        """
+        Return the path of a handle as the database gives it, or None.
+        """
+        index = self._index2hndl.position(handle)
+        if index is None:
+            return None
+        return Gtk.TreePath((self.real_path(index),))
+
+    def new_iter(self, handle):
+        """
+        Return a new iter containing the handle
+        """
+        return self.__new_iter(self._index2hndl.index(handle))
+
+    def __new_iter(self, index):
+        iter = Gtk.TreeIter()
+        iter.stamp = self.stamp
+        iter.user_data = index
+        return iter
+
+    def get_iter(self, path):
+        """
+        Return an iter from the path.
+
+        Will raise IndexError if the path is not in the list.
+        """
+        index = self.real_index(path)
+        if not 0 <= index < len(self._index2hndl):
+            raise IndexError('path out of range')
+        return self.__new_iter(index)
+
+    def get_handle(self, path):
+        """
+        Return the handle from the path.
+
+        Will raise IndexError if the path is not in the list.
+        """
+        return self._index2hndl[self.real_index(path)][1]
+
+    def iter_next(self, iter):
+        """
+        Move the iter to the next row, returning False if there is none.
+        """
+        index = iter.user_data
+        if index is None:
+            index = 0
+        index += -1 if self._reverse else 1
+        if not 0 <= index < len(self._index2hndl):
+            return False
+        iter.user_data = index
+        return True
+
+    def get_first_iter(self):
+        """
+        Return the iter of the first row.
+
+        Will raise IndexError if the list is empty.
+        """
+        return self.get_iter(0)
+
+    def __len__(self):
+        """
+        Return the number of rows.
+        """
+        return len(self._index2hndl)
+
+    def max_rows(self):
+        """
+        Return maximum number of entries that might be present in the
+        map
+        """
+        return len(self._index2hndl)
+
+    def insert(self, srtkey_hndl, allkeyonly=False):
+        """
+        Add the row of an object that has been added to the database.
+        The sortkey is not used. Returns the path of the inserted row.
+        """
+        self._index2hndl.count += 1
+        self._index2hndl.clear()
+        index = self._index2hndl.index(srtkey_hndl[1])
+        if index is None:
+            self._index2hndl.count -= 1
+            return None
+        return Gtk.TreePath((self.real_path(index),))
+
+    def delete(self, handle):
+        """
+        Delete the row of an object, which is looked up in the window, and
+        then in the database. An object that has been removed from the
+        database can only be found in the window; otherwise its row is no
+        longer known, and the path of the last row is returned, as the rows
+        after the removed one are read again anyway.
+        Returns the path of the deleted row.
+        """
+        if not self._index2hndl:
+            return None
+        index = self._index2hndl.index(handle)
+        if index is None:
+            index = len(self._index2hndl) - 1
+        delpath = self.real_path(index)
+        self._index2hndl.count -= 1
+        self._index2hndl.clear()
+        return Gtk.TreePath((delpath,))
+
+
 #-------------------------------------------------------------------------
 #
 # FlatBaseModel
@@ -449,7 +719,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(),
-                 sort_map=None):
+                 sort_map=None, rebuild=True):
         cput = perf_counter()
         GObject.GObject.__init__(self)
         BaseModel.__init__(self)
@@ -473,7 +743,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         else:
             col = scol
         # get the function that maps data to sort_keys
-        self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
+        self.sort_func = self.get_sort_func(col)
+        self.sort_model_col = col
         self.sort_col = scol
         self.skip = skip
         self._in_build = False
@@ -483,10 +754,18 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         self._reverse = (order == Gtk.SortType.DESCENDING)
 
-        self.rebuild_data()
+        if rebuild:
+            self.rebuild_data()
         _LOG.debug(self.__class__.__name__ + ' __init__ ' +
                     str(perf_counter() - cput) + ' sec')
 
+    def get_sort_func(self, col):
+        """
+        Return the function that maps the data of a row to its sort key,
+        when sorting on a column of the model.
+        """
+        return lambda x: glocale.sort_key(self.smap[col](x))
+
     def destroy(self):
         """
         Unset all elements that prevent garbage collection
@@ -498,6 +777,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.destroy()
         self.node_map = None
         self.rebuild_data = None
+        self._build_steps = None
         self.search = None
 
     def set_search(self, search):
@@ -514,6 +794,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                 #following is None if no data given in filter sidebar
                 self.search = search[1]
                 self.rebuild_data = self._rebuild_filter
+                self._build_steps = self._build_filter
             else:
                 if search[1]: # Search from topbar in columns
                     # we have search[1] = (index, text_unicode, inversion)
@@ -521,16 +802,19 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     text = search[1][1]
                     inv = search[1][2]
                     func = lambda x: self._get_value(x, col) or UEMPTY
+                    index = self.search_index(col, text)
                     if search[2]:
-                        self.search = ExactSearchFilter(func, text, inv)
+                        self.search = ExactSearchFilter(func, text, inv, index)
                     else:
-                        self.search = SearchFilter(func, text, inv)
+                        self.search = SearchFilter(func, text, inv, index)
                 else:
                     self.search = None
                 self.rebuild_data = self._rebuild_search
+                self._build_steps = self._build_search
         else:
             self.search = None
             self.rebuild_data = self._rebuild_search
+            self._build_steps = self._build_search
 
     def total(self):
         """
@@ -563,28 +847,108 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         be shown.
         This list is sorted ascending, via localized string sort.
         """
-        # use cursor as a context manager
-        with self.gen_cursor() as cursor:
-            #loop over database and store the sort field, and the handle
-            srt_keys=[(self.sort_func(data), key)
-                      for key, data in cursor]
-            srt_keys.sort()
-            return srt_keys
+        srt_keys = []
+        for dummy in self._read_sort_keys(srt_keys):
+            pass
+        return srt_keys
+
+    def _read_sort_keys(self, srt_keys):
+        """
+        Fill a list with the sorted (sort_key, handle) pairs of all data that
+        can maximally be shown, yielding every BUILD_STEP rows.
+        """
+        field = self.column_fields.get(self.sort_model_col)
+        if field is not None:
+            rows = self.db.get_column_values(self.search_class, [field])
+            if rows is not None:
+                for start in range(0, len(rows), self.BUILD_STEP):
+                    srt_keys.extend(
+                        (glocale.sort_key(value or ''), handle)
+                        for handle, value in rows[start:start+self.BUILD_STEP])
+                    yield
+                srt_keys.sort()
+                return
+        if self.search_class is not None:
+            # read the handles first, so that no cursor is left open between
+            # the steps
+            handles = self.db.method('get_%s_handles', self.search_class)()
+            for start in range(0, len(handles), self.BUILD_STEP):
+                srt_keys.extend(
+                    (self.sort_func(self.map(handle)), handle)
+                    for handle in handles[start:start+self.BUILD_STEP])
+                yield
+        else:
+            # use cursor as a context manager
+            with self.gen_cursor() as cursor:
+                #loop over database and store the sort field, and the handle
+                srt_keys.extend((self.sort_func(data), key)
+                                for key, data in cursor)
+            yield
+        srt_keys.sort()
+
+    def build_steps(self):
+        """
+        Return a generator building the data with the current search or
+        filter, in steps.
+        """
+        return self._build_steps()
+
+    def _set_node_map(self, virtual):
+        """
+        Use a VirtualNodeMap of all the objects if virtual is True and the
+        database keeps the sort keys of the sort column, otherwise a
+        FlatNodeMap. Return True if the VirtualNodeMap is used.
+        """
+        if (virtual and self.sort_model_col in self.sorted_columns and
+                self.db.get_sort_keys(self.search_class, 0, 0) is not None):
+            self.node_map.destroy()
+            self.node_map = VirtualNodeMap(self.db, self.search_class,
+                                           self.number_items(),
+                                           reverse=self._reverse)
+            return True
+        if isinstance(self.node_map, VirtualNodeMap):
+            self.node_map.destroy()
+            self.node_map = FlatNodeMap()
+        return False
 
     def _rebuild_search(self, ignore=None):
         """ function called when view must be build, given a search text
             in the top search bar
         """
+        for dummy in self._build_search(ignore):
+            pass
+
+    def _build_search(self, ignore=None):
+        """
+        Build the view given a search text in the top search bar, yielding
+        every BUILD_STEP rows, and yielding True once the first rows are
+        shown.
+        """
         self.clear_cache()
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
+            virtual = (not (self.search and self.search.text) and
+                       ignore is None and not self.skip)
+            if self._set_node_map(virtual):
+                self._in_build = False
+                return
             allkeys = self.node_map.full_srtkey_hndl_map()
             if not allkeys:
-                allkeys = self.sort_keys()
+                allkeys = []
+                yield from self._read_sort_keys(allkeys)
             if self.search and self.search.text:
-                dlist = [h for h in allkeys
-                             if self.search.match(h[1], self.db) and
-                             h[1] not in self.skip and h[1] != ignore]
+                def match_steps(keys):
+                    self.search.prepare(self.db)
+                    try:
+                        for start in range(0, len(keys), self.BUILD_STEP):
+                            yield [
+                                h for h in keys[start:start+self.BUILD_STEP]
+                                if self.search.match(h[1], self.db) and
+                                h[1] not in self.skip and h[1] != ignore]
+                    finally:
+                        self.search.reset()
+                dlist = yield from self._match_steps(allkeys, allkeys,
+                                                    match_steps)
                 ident = False
             elif ignore is None and not self.skip:
                 #nothing to remove from the keys present
@@ -600,26 +964,76 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.clear_map()
         self._in_build = False
 
+    def _match_steps(self, keys, allkeys, steps):
+        """
+        Return the (sortkey, handle) tuples of keys, which are some of
+        allkeys, selected by steps: a function returning a generator that
+        is given keys in the order in which they are shown, and yields the
+        tuples selected in each step. Yields after each step. Once some
+        tuples are selected, the node map is set to show them, and True is
+        yielded, so that the model can be attached to a view before all the
+        steps are done.
+        """
+        if self._reverse:
+            keys = keys[::-1]
+        chunks = []
+        shown = False
+        for chunk in steps(keys):
+            chunks.append(chunk)
+            if chunk and not shown:
+                shown = True
+                self.node_map.set_path_map(self.__join(chunks), allkeys,
+                                           identical=False,
+                                           reverse=self._reverse)
+                yield True
+            else:
+                yield
+        return self.__join(chunks)
+
+    def __join(self, chunks):
+        """
+        Join the chunks of tuples selected by _match_steps, in ascending
+        order.
+        """
+        dlist = [key for chunk in chunks for key in chunk]
+        if self._reverse:
+            dlist.reverse()
+        return dlist
+
     def _rebuild_filter(self, ignore=None):
         """ function called when view must be build, given filter options
             in the filter sidebar
         """
+        for dummy in self._build_filter(ignore):
+            pass
+
+    def _build_filter(self, ignore=None):
+        """
+        Build the view given filter options in the filter sidebar, yielding
+        while the keys are read and the filter is applied, and yielding
+        True once the first rows are shown.
+        """
         self.clear_cache()
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
+            if self._set_node_map(self.search is None and ignore is None):
+                self._in_build = False
+                return
             cdb = CacheProxyDb(self.db)
             allkeys = self.node_map.full_srtkey_hndl_map()
             if not allkeys:
-                allkeys = self.sort_keys()
+                allkeys = []
+                yield from self._read_sort_keys(allkeys)
             if self.search:
                 ident = False
                 if ignore is None:
-                    dlist = self.search.apply(cdb, allkeys, tupleind=1,
-                                              user=self.user)
+                    keys = allkeys
                 else:
-                    dlist = self.search.apply(
-                        cdb, [k for k in allkeys if k[1] != ignore],
-                        tupleind=1)
+                    keys = [k for k in allkeys if k[1] != ignore]
+                dlist = yield from self._match_steps(
+                    keys, allkeys, lambda keys: self.search.apply_in_steps(
+                        cdb, keys, self.BUILD_STEP, tupleind=1,
+                        user=self.user))
             elif ignore is None :
                 ident = True
                 dlist = allkeys
@@ -638,6 +1052,13 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Row is only added if search/filter data is such that it must be shown
         """
         assert isinstance(handle, str)
+        if isinstance(self.node_map, VirtualNodeMap):
+            # all the objects are shown
+            insert_path = self.node_map.insert((None, handle))
+            if insert_path is not None:
+                node = self.do_get_iter(insert_path)[1]
+                self.row_inserted(insert_path, node)
+            return
         if self.node_map.get_path_from_handle(handle) is not None:
             return # row is already displayed
         data = self.map(handle)
@@ -667,6 +1088,17 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Update a row, called after the object with handle is changed
         """
+        if isinstance(self.node_map, VirtualNodeMap):
+            self.clear_cache(handle)
+            path = self.node_map.find_path(handle)
+            if path is not None and path == self.node_map.get_sorted_path(
+                    handle):
+                node = self.do_get_iter(path)[1]
+                self.row_changed(path, node)
+            else:
+                self.delete_row_by_handle(handle)
+                self.add_row_by_handle(handle)
+            return
         if self.node_map.get_path_from_handle(handle) is None:
             return # row is not currently displayed
         self.clear_cache(handle)
@@ -52,9 +52,15 @@ from .flatbasemodel import FlatBaseModel
 #-------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
 
+    search_class = 'Media'
+    sorted_columns = (0,)
+    column_fields = {0: 'desc', 1: 'gramps_id', 3: 'path'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         self.gen_cursor = db.get_media_cursor
+        self.number_items = db.get_number_of_media
         self.map = db.get_raw_media_data
 
         self.fmap = [
@@ -81,7 +87,8 @@ class MediaModel(FlatBaseModel):
             self.column_tag_color,
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -89,6 +96,7 @@ class MediaModel(FlatBaseModel):
         """
         self.db = None
         self.gen_cursor = None
+        self.number_items = None
         self.map = None
         self.fmap = None
         self.smap = None
@@ -52,8 +52,13 @@ from gramps.gen.lib import (Note, NoteType, StyledText)
 class NoteModel(FlatBaseModel):
     """
     """
+    search_class = 'Note'
+    search_fields = {0: 'text', 1: 'gramps_id'}
+    column_fields = {1: 'gramps_id'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         """Setup initial values for instance variables."""
         self.gen_cursor = db.get_note_cursor
         self.map = db.get_raw_note_data
@@ -76,7 +81,8 @@ class NoteModel(FlatBaseModel):
             self.column_tag_color
         ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -95,6 +95,8 @@ class PeopleBaseModel(BaseModel):
     Basic Model interface to handle the PersonViews
     """
     _GENDER = [ _('female'), _('male'), _('unknown') ]
+    search_class = 'Person'
+    search_fields = {0: 'text', 1: 'gramps_id'}
 
     def __init__(self, db):
         """
@@ -164,20 +166,11 @@ class PeopleBaseModel(BaseModel):
         return len(self.fmap)+1
 
     def sort_name(self, data):
-        handle = data[0]
-        cached, name = self.get_cached_value(handle, "SORT_NAME")
-        if not cached:
-            name = name_displayer.raw_sorted_name(data[COLUMN_NAME])
-            self.set_cached_value(handle, "SORT_NAME", name)
-        return name
+        # The name displayer keeps the names across rebuilds of the view
+        return name_displayer.cached_sort_key(data[0], data[COLUMN_NAME])[0]
 
     def column_name(self, data):
-        handle = data[0]
-        cached, name = self.get_cached_value(handle, "NAME")
-        if not cached:
-            name = name_displayer.raw_display_name(data[COLUMN_NAME])
-            self.set_cached_value(handle, "NAME", name)
-        return name
+        return name_displayer.cached_display_name(data[0], data[COLUMN_NAME])
 
     def column_spouse(self, data):
         handle = data[0]
@@ -569,10 +562,12 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     Listed people model.
     """
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         PeopleBaseModel.__init__(self, db)
         FlatBaseModel.__init__(self, db, uistate, search=search, skip=skip,
-                               scol=scol, order=order, sort_map=sort_map)
+                               scol=scol, order=order, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -581,15 +576,26 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
         PeopleBaseModel.destroy(self)
         FlatBaseModel.destroy(self)
 
+    def get_sort_func(self, col):
+        """
+        Sort on the name with the sort keys kept by the name displayer.
+        """
+        if self.smap[col] == self.sort_name:
+            return lambda data: name_displayer.cached_sort_key(
+                data[0], data[COLUMN_NAME])[1]
+        return FlatBaseModel.get_sort_func(self, col)
+
 class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
     """
     Hierarchical people model.
     """
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         PeopleBaseModel.__init__(self, db)
         TreeBaseModel.__init__(self, db, uistate, search=search, skip=skip,
-                               scol=scol, order=order, sort_map=sort_map)
+                               scol=scol, order=order, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -67,6 +67,9 @@ _ = glocale.translation.gettext
 #-------------------------------------------------------------------------
 class PlaceBaseModel:
 
+    search_class = 'Place'
+    search_fields = {0: 'text', 1: 'gramps_id', 11: 'text'}
+
     def __init__(self, db):
         self.gen_cursor = db.get_place_cursor
         self.map = db.get_raw_place_data
@@ -258,12 +261,16 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     """
     Flat place model.  (Original code in PlaceBaseModel).
     """
+    column_fields = {1: 'gramps_id', 4: 'code'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
 
         PlaceBaseModel.__init__(self, db)
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -282,11 +289,13 @@ class PlaceTreeModel(PlaceBaseModel, TreeBaseModel):
     Hierarchical place model.
     """
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
 
         PlaceBaseModel.__init__(self, db)
         TreeBaseModel.__init__(self, db, uistate, scol=scol, order=order,
                                search=search, skip=skip, sort_map=sort_map,
+                               rebuild=rebuild,
                                nrgroups=3,
                                group_can_have_handle=True)
 
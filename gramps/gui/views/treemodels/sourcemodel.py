@@ -49,10 +49,18 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #-------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
 
+    search_class = 'Source'
+    search_fields = {0: 'text', 1: 'gramps_id', 2: 'text', 3: 'text',
+                     4: 'text'}
+    sorted_columns = (0,)
+    column_fields = {1: 'gramps_id', 2: 'author', 3: 'abbrev', 4: 'pubinfo'}
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None,
+                 rebuild=True):
         self.map = db.get_raw_source_data
         self.gen_cursor = db.get_source_cursor
+        self.number_items = db.get_number_of_sources
         self.fmap = [
             self.column_title,
             self.column_id,
@@ -76,7 +84,8 @@ class SourceModel(FlatBaseModel):
             self.column_tag_color
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               rebuild=rebuild)
 
     def destroy(self):
         """
@@ -84,6 +93,7 @@ class SourceModel(FlatBaseModel):
         """
         self.db = None
         self.gen_cursor = None
+        self.number_items = None
         self.map = None
         self.fmap = None
         self.smap = None
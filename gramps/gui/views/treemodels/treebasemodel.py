@@ -278,7 +278,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
     def __init__(self, db, uistate, search=None, skip=set(), scol=0,
                  order=Gtk.SortType.ASCENDING, sort_map=None, nrgroups = 1,
-                 group_can_have_handle = False, has_secondary=False):
+                 group_can_have_handle = False, has_secondary=False,
+                 rebuild=True):
         cput = perf_counter()
         GObject.GObject.__init__(self)
         BaseModel.__init__(self)
@@ -335,11 +336,15 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.__total = 0
         self.__displayed = 0
 
+        self.__skip = skip
+
         self.set_search(search)
-        if self.has_secondary:
-            self.rebuild_data(self.current_filter, self.current_filter2, skip)
-        else:
-            self.rebuild_data(self.current_filter, skip=skip)
+        if rebuild:
+            if self.has_secondary:
+                self.rebuild_data(self.current_filter, self.current_filter2,
+                                  skip)
+            else:
+                self.rebuild_data(self.current_filter, skip=skip)
 
         _LOG.debug(self.__class__.__name__ + ' __init__ ' +
                     str(perf_counter() - cput) + ' sec')
@@ -437,20 +442,21 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                 if self.has_secondary:
                     self.search2 = search[1]
                     _LOG.debug("search2 filter %s %s" % (search[0], search[1]))
-                self._build_data = self._rebuild_filter
+                self._build_data = self._build_filter
             elif search[0] == 0: # Search
                 if search[1]:
                     # we have search[1] = (index, text_unicode, inversion)
                     col, text, inv = search[1]
                     func = lambda x: self._get_value(x, col, secondary=False) or ""
+                    index = self.search_index(col, text)
                     if self.has_secondary:
                         func2 = lambda x: self._get_value(x, col, secondary=True) or ""
                     if search[2]:
-                        self.search = ExactSearchFilter(func, text, inv)
+                        self.search = ExactSearchFilter(func, text, inv, index)
                         if self.has_secondary:
                             self.search2 = ExactSearchFilter(func2, text, inv)
                     else:
-                        self.search = SearchFilter(func, text, inv)
+                        self.search = SearchFilter(func, text, inv, index)
                         if self.has_secondary:
                             self.search2 = SearchFilter(func2, text, inv)
                 else:
@@ -458,19 +464,19 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     if self.has_secondary:
                         self.search2 = None
                         _LOG.debug("search2 search with no data")
-                self._build_data = self._rebuild_search
+                self._build_data = self._build_search
             else: # Fast filter
                 self.search = search[1]
                 if self.has_secondary:
                     self.search2 = search[2]
                     _LOG.debug("search2 fast filter")
-                self._build_data = self._rebuild_search
+                self._build_data = self._build_search
         else:
             self.search = None
             if self.has_secondary:
                 self.search2 = search[2]
                 _LOG.debug("search2 no search parameter")
-            self._build_data = self._rebuild_search
+            self._build_data = self._build_search
 
         self.current_filter = self.search
         if self.has_secondary:
@@ -485,6 +491,21 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         the filter functions. When called internally (from __init__) both
         data_filter and data_filter2 will have been set from set_search
         """
+        for dummy in self.__rebuild(data_filter, data_filter2, skip):
+            pass
+
+    def build_steps(self):
+        """
+        Return a generator rebuilding the data map, in steps, as
+        rebuild_data does when called from listview. Skipped handles given
+        to the model are still left out.
+        """
+        return self.__rebuild(None, None, self.__skip)
+
+    def __rebuild(self, data_filter, data_filter2, skip):
+        """
+        Rebuild the data map, yielding every BUILD_STEP rows.
+        """
         cput = perf_counter()
         self.clear_cache()
         self._in_build = True
@@ -494,9 +515,10 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         self.clear()
         if self.has_secondary:
-            self._build_data(self.current_filter, self.current_filter2, skip)
+            yield from self._build_data(self.current_filter,
+                                        self.current_filter2, skip)
         else:
-            self._build_data(self.current_filter, None, skip)
+            yield from self._build_data(self.current_filter, None, skip)
 
         self._in_build = False
 
@@ -507,7 +529,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         _LOG.debug(self.__class__.__name__ + ' rebuild_data ' +
                     str(perf_counter() - cput) + ' sec')
 
-    def _rebuild_search(self, dfilter, dfilter2, skip):
+    def _build_search(self, dfilter, dfilter2, skip):
         """
         Rebuild the data map where a search condition is applied.
         """
@@ -516,16 +538,28 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         items = self.number_items()
         _LOG.debug("rebuild search primary")
-        self.__rebuild_search(dfilter, skip, items,
-                              self.gen_cursor, self.add_row)
+        yield from self.__build_search(dfilter, skip, items,
+                                       self.gen_cursor, self.map,
+                                       self.add_row)
 
         if self.has_secondary:
             _LOG.debug("rebuild search secondary")
             items = self.number_items2()
-            self.__rebuild_search(dfilter2, skip, items,
-                                  self.gen_cursor2, self.add_row2)
+            yield from self.__build_search(dfilter2, skip, items,
+                                           self.gen_cursor2, self.map2,
+                                           self.add_row2)
+
+    def __read_handles(self, gen_cursor):
+        """
+        Return the handles of the objects of a cursor, in its order. The
+        handles are read before the rows are added, so that no cursor is
+        left open between the steps of a build.
+        """
+        with gen_cursor() as cursor:
+            return [handle for handle, data in cursor]
 
-    def __rebuild_search(self, dfilter, skip, items, gen_cursor, add_func):
+    def __build_search(self, dfilter, skip, items, gen_cursor, data_map,
+                       add_func):
         """
         Rebuild the data map for a single Gramps object type, where a search
         condition is applied.
@@ -536,18 +570,27 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         status = progressdlg.LongOpStatus(total_steps=items,
                                           interval=items // 20)
         pmon.add_op(status)
-        with gen_cursor() as cursor:
-            for handle, data in cursor:
+        if isinstance(dfilter, SearchFilter):
+            dfilter.prepare(self.db)
+        try:
+            handles = self.__read_handles(gen_cursor)
+            yield
+            for count, handle in enumerate(handles, 1):
                 status.heartbeat()
                 self.__total += 1
                 if not (handle in skip or (dfilter and not
-                                        dfilter.match(handle, self.db))):
-                    _LOG.debug("    add %s %s" % (handle, data))
+                                           dfilter.match(handle, self.db))):
+                    _LOG.debug("    add %s" % handle)
                     self.__displayed += 1
-                    add_func(handle, data)
-        status.end()
+                    add_func(handle, data_map(handle))
+                if count % self.BUILD_STEP == 0:
+                    yield
+        finally:
+            if isinstance(dfilter, SearchFilter):
+                dfilter.reset()
+            status.end()
 
-    def _rebuild_filter(self, dfilter, dfilter2, skip):
+    def _build_filter(self, dfilter, dfilter2, skip):
         """
         Rebuild the data map where a filter is applied.
         """
@@ -558,22 +601,25 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             # The tree only has primary data
             items = self.number_items()
             _LOG.debug("rebuild filter primary")
-            self.__rebuild_filter(dfilter, skip, items,
-                                  self.gen_cursor, self.map, self.add_row)
+            yield from self.__build_filter(dfilter, skip, items,
+                                           self.gen_cursor, self.map,
+                                           self.add_row)
         else:
             # The tree has both primary and secondary data. The navigation type
             # (navtype) which governs the filters that are offered, is for the
             # secondary data.
             items = self.number_items2()
             _LOG.debug("rebuild filter secondary")
-            self.__rebuild_filter(dfilter2, skip, items,
-                                    self.gen_cursor2, self.map2, self.add_row2)
+            yield from self.__build_filter(dfilter2, skip, items,
+                                           self.gen_cursor2, self.map2,
+                                           self.add_row2)
 
-    def __rebuild_filter(self, dfilter, skip, items, gen_cursor, data_map,
-                         add_func):
+    def __build_filter(self, dfilter, skip, items, gen_cursor, data_map,
+                       add_func):
         """
         Rebuild the data map for a single Gramps object type, where a filter
-        is applied.
+        is applied. The filter is applied to BUILD_STEP objects at a time,
+        in the order of the cursor.
         """
         pmon = progressdlg.ProgressMonitor(
             progressdlg.StatusProgress, (self.uistate,), popup_time=2,
@@ -584,22 +630,25 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         self.__total += items
         assert not skip
-        if dfilter:
-            cdb = CacheProxyDb(self.db)
-            for handle in dfilter.apply(cdb, tree=True,
-                                        user=User(parent=self.uistate.window)):
-                status_ppl.heartbeat()
-                data = data_map(handle)
-                add_func(handle, data)
-                self.__displayed += 1
-        else:
-            with gen_cursor() as cursor:
-                for handle, data in cursor:
+        try:
+            handles = self.__read_handles(gen_cursor)
+            yield
+            if dfilter:
+                cdb = CacheProxyDb(self.db)
+                steps = dfilter.apply_in_steps(
+                    cdb, handles, self.BUILD_STEP,
+                    user=User(parent=self.uistate.window))
+            else:
+                steps = (handles[start:start+self.BUILD_STEP]
+                         for start in range(0, len(handles), self.BUILD_STEP))
+            for matches in steps:
+                for handle in matches:
                     status_ppl.heartbeat()
-                    add_func(handle, data)
+                    add_func(handle, data_map(handle))
                     self.__displayed += 1
-
-        status_ppl.end()
+                yield
+        finally:
+            status_ppl.end()
 
     def add_node(self, parent, child, sortkey, handle, add_parent=True,
                  secondary=False):
@@ -28,6 +28,8 @@ import os
 import time
 import pickle
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 #------------------------------------------------------------------------
 #
@@ -39,20 +41,73 @@ from gramps.gen.db.dbconst import (DBLOGNAME, DBBACKEND, KEY_TO_NAME_MAP,
                                    PERSON_KEY, FAMILY_KEY, SOURCE_KEY,
                                    EVENT_KEY, MEDIA_KEY, PLACE_KEY, NOTE_KEY,
                                    TAG_KEY, CITATION_KEY, REPOSITORY_KEY,
-                                   REFERENCE_KEY)
+                                   REFERENCE_KEY, ARRAYSIZE)
 from gramps.gen.db.generic import DbGeneric
 from gramps.gen.lib import (Tag, Media, Person, Family, Source,
                             Citation, Event, Place, Repository, Note)
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.lib.serialize import SERIALIZERS, BlobSerializer
+from gramps.gen.errors import HandleError
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+PRIMARY_CLASSES = {obj_class.__name__: obj_class
+                   for obj_class in (Person, Family, Event, Place, Source,
+                                     Citation, Media, Repository, Note, Tag)}
+REFERENCE_INDEXES = (('reference_ref_handle', 'ref_handle'),
+                     ('reference_obj_handle', 'obj_handle'))
+# Columns of each table that the sorted handle lists are sorted on. Each has
+# a column of its sort keys, with "_key" appended to its name:
+SORT_COLUMNS = {'person': ('surname', 'given_name'),
+                'citation': ('page',),
+                'event': ('description',),
+                'source': ('title',),
+                'place': ('title',),
+                'media': ('desc',),
+                'tag': ('name',)}
+
+def sort_key(locale, string):
+    """
+    Return the sort key of a string as stored in a sort key column: as
+    bytes, so that the database compares the keys in the order Python does.
+    """
+    if string is None:
+        return None
+    return locale.sort_key(string).encode('utf-8', 'surrogatepass')
+
+def get_references(serializer_name, class_name, rows):
+    """
+    Return the rows of the reference table for a list of (handle, data)
+    rows of a primary table, where data is in the given storage format.
+
+    This is a module level function so that it can be run in a worker
+    process.
+    """
+    string_to_object = SERIALIZERS[serializer_name].string_to_object
+    obj_class = PRIMARY_CLASSES[class_name]
+    references = []
+    for handle, string in rows:
+        obj = string_to_object(obj_class, string)
+        references.extend((handle, class_name, ref_handle, ref_class_name)
+                          for (ref_class_name, ref_handle)
+                          in set(obj.get_referenced_handles_recursively()))
+    return references
+
 class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
+    serializer = BlobSerializer
+    # Handles in each table during a batch transaction, by table key:
+    _batch_handles = None
+    # Names of the secondary columns of each table, by class name:
+    _secondary_fields = {}
+    # Collation of the sort key columns, or None if the tree has none:
+    _sort_key_locale = None
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -77,53 +132,63 @@ class DBAPI(DbGeneric):
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
                            'given_name TEXT, '
                            'surname TEXT, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE family '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE source '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE citation '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE event '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE media '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE place '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
                            'enclosed_by VARCHAR(50), '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE repository '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE note '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE tag '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         # Secondary:
         self.dbapi.execute('CREATE TABLE reference '
@@ -152,6 +217,7 @@ class DBAPI(DbGeneric):
                            ')')
 
         self._create_secondary_columns()
+        self._create_sort_key_columns()
 
         ## Indices:
         self.dbapi.execute('CREATE INDEX person_gramps_id '
@@ -193,8 +259,191 @@ class DBAPI(DbGeneric):
         self.dbapi.execute('CREATE INDEX reference_obj_handle '
                            'ON reference(obj_handle)')
 
+        # Storage format of the primary objects:
+        serializer = SERIALIZERS[config.get('database.serializer')]
+        self.dbapi.execute("INSERT INTO metadata (setting, value) "
+                           "VALUES (?, ?)",
+                           ['serializer', pickle.dumps(serializer.name)])
+        # Collation of the sort keys, which are all empty:
+        self.dbapi.execute("INSERT INTO metadata (setting, value) "
+                           "VALUES (?, ?)",
+                           ['sort_key_locale',
+                            pickle.dumps(glocale.get_collation())])
+
         self.dbapi.commit()
 
+    def _load_serializer(self):
+        """
+        Select the storage format recorded for this tree.
+
+        Trees created before the storage format was selectable have no
+        setting and use pickled blobs.
+        """
+        self.serializer = SERIALIZERS[self._get_metadata('serializer',
+                                                         BlobSerializer.name)]
+
+    def _load_indexes(self):
+        """
+        Create the indexes of the change times, which the filter cache reads.
+        """
+        if self.readonly:
+            return
+        self.dbapi.begin()
+        for table in KEY_TO_NAME_MAP.values():
+            self.dbapi.execute("CREATE INDEX IF NOT EXISTS %s_change "
+                               "ON %s(change)" % (table, table))
+        self.dbapi.commit()
+
+    def _load_sort_keys(self):
+        """
+        Find the collation of the sort key columns.
+
+        Trees created before the sort keys were kept are given the columns,
+        which are filled when first used.
+        """
+        self._sort_key_locale = self._get_metadata('sort_key_locale', None)
+        if self._sort_key_locale is None and not self.readonly:
+            self.dbapi.begin()
+            self._create_sort_key_columns()
+            self.dbapi.commit()
+            self._sort_key_locale = ''
+            self._set_metadata('sort_key_locale', self._sort_key_locale)
+
+    def _create_sort_key_columns(self):
+        """
+        Create the sort key columns and their indexes.
+        """
+        for table, columns in SORT_COLUMNS.items():
+            for column in columns:
+                self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s_key BLOB"
+                                   % (table, column))
+        self.dbapi.execute('CREATE INDEX person_sort_key '
+                           'ON person(surname_key, given_name_key)')
+        for table, columns in SORT_COLUMNS.items():
+            if table != 'person':
+                self.dbapi.execute('CREATE INDEX %s_sort_key '
+                                   'ON %s(%s_key, handle)'
+                                   % (table, table, columns[0]))
+
+    def rebuild_sort_keys(self):
+        """
+        Compute the sort keys of all the objects again, for the current
+        locale.
+        """
+        if self.readonly or self._sort_key_locale is None:
+            return
+        self._txn_begin()
+        for table, columns in SORT_COLUMNS.items():
+            self.dbapi.execute("SELECT handle, %s FROM %s"
+                               % (", ".join(columns), table))
+            rows = [[sort_key(glocale, value) for value in row[1:]] + [row[0]]
+                    for row in self.dbapi.fetchall()]
+            self._executemany(
+                "UPDATE %s SET %s WHERE handle = ?"
+                % (table, ", ".join("%s_key = ?" % column
+                                    for column in columns)), rows)
+        self._txn_commit()
+        self._sort_key_locale = glocale.get_collation()
+        self._set_metadata('sort_key_locale', self._sort_key_locale)
+
+    def _use_sort_keys(self, locale):
+        """
+        Return True if a list of handles sorted in a locale can be read in
+        the order of the sort key columns, computing the keys first if they
+        were made for another locale.
+        """
+        if (self._sort_key_locale is None or
+                locale.get_collation() != glocale.get_collation()):
+            return False
+        if self._sort_key_locale != glocale.get_collation():
+            if self.readonly or self.transaction is not None:
+                return False
+            self.rebuild_sort_keys()
+        return True
+
+    def set_serializer(self, name, callback=None):
+        """
+        Convert all primary objects to a different storage format.
+
+        The old data column is cleared, and the new format is recorded in
+        the metadata table so that it is used when the tree is next opened.
+
+        :param name: Name of the storage format, either "blob" or "json".
+        :type name: str
+        :param callback: Called with the number of tables converted so far.
+        :type callback: function
+        """
+        serializer = SERIALIZERS[name]
+        if self.readonly or serializer is self.serializer:
+            return
+        old_field = self.serializer.data_field
+        new_field = serializer.data_field
+        self._txn_begin()
+        for index, obj_key in enumerate(KEY_TO_NAME_MAP, start=1):
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                             "class_func")
+            if not self._column_exists(table, new_field):
+                self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s %s"
+                                   % (table, new_field,
+                                      "TEXT" if new_field == 'json_data'
+                                      else "BLOB"))
+            self.dbapi.execute("SELECT handle, %s FROM %s"
+                               % (old_field, table))
+            rows = self.dbapi.fetchall()
+            sql = ("UPDATE %s SET %s = ?, %s = NULL WHERE handle = ?"
+                   % (table, new_field, old_field))
+            for handle, string in rows:
+                obj = self.serializer.string_to_object(obj_class, string)
+                self.dbapi.execute(sql, [serializer.object_to_string(obj),
+                                         handle])
+            if callback:
+                callback(index)
+        self._txn_commit()
+        self.serializer = serializer
+        self.cache.clear()
+        self._set_metadata('serializer', serializer.name)
+
+    def _column_exists(self, table, column):
+        """
+        Test whether a column exists in a table.
+
+        The connections of other backends, such as the PostgreSQL addon,
+        may not have a column_exists method, so the standard information
+        schema is read instead.
+        """
+        if hasattr(self.dbapi, 'column_exists'):
+            return self.dbapi.column_exists(table, column)
+        self.dbapi.execute("SELECT COUNT(*) FROM information_schema.columns "
+                           "WHERE table_name = ? AND column_name = ?",
+                           [table, column])
+        return self.dbapi.fetchone()[0] != 0
+
+    def _executemany(self, sql, rows):
+        """
+        Execute a statement once for each row of values.
+
+        The connections of backends without an executemany method execute
+        the statement row by row.
+        """
+        if hasattr(self.dbapi, 'executemany'):
+            self.dbapi.executemany(sql, rows)
+        else:
+            for values in rows:
+                self.dbapi.execute(sql, values)
+
+    def _queue(self, sql, values):
+        """
+        Queue a statement, for execution in bulk with the following ones.
+
+        The connections of backends without a queue method execute the
+        statement at once.
+        """
+        if hasattr(self.dbapi, 'queue'):
+            self.dbapi.queue(sql, values)
+        else:
+            self.dbapi.execute(sql, values)
+
     def _close(self):
         self.dbapi.close()
 
@@ -223,6 +472,10 @@ class DBAPI(DbGeneric):
         """
         if self.transaction == None:
             self.dbapi.rollback()
+            self.cache.clear()
+            self.kinship.clear()
+            self.lifespan.clear()
+            self.statistics.clear()
 
     def transaction_begin(self, transaction):
         """
@@ -232,6 +485,8 @@ class DBAPI(DbGeneric):
                    "Batch " if transaction.batch else "",
                    hex(id(self)), transaction.get_description())
         self.transaction = transaction
+        if transaction.batch:
+            self._batch_handles = {}
         self.dbapi.begin()
         return transaction
 
@@ -247,9 +502,7 @@ class DBAPI(DbGeneric):
                   TXNUPD: "-update",
                   TXNDEL: "-delete",
                   None: "-delete"}
-        if txn.batch:
-            # FIXME: need a User GUI update callback here:
-            self.reindex_reference_map(lambda percent: percent)
+        self._batch_handles = None
         self.dbapi.commit()
         if not txn.batch:
             # Now, emit signals:
@@ -270,6 +523,9 @@ class DBAPI(DbGeneric):
                             signal = KEY_TO_NAME_MAP[
                                 obj_type] + action[trans_type]
                             self.emit(signal, (handles, ))
+        else:
+            # The objects may have been added with their old change times.
+            self.filter_cache.forget()
         self.transaction = None
         msg = txn.get_description()
         self.undodb.commit(txn, msg)
@@ -282,6 +538,12 @@ class DBAPI(DbGeneric):
         Executed after a batch operation abort.
         """
         self.dbapi.rollback()
+        # Objects read during the transaction may have been cached:
+        self.cache.clear()
+        self.kinship.clear()
+        self.lifespan.clear()
+        self.statistics.clear()
+        self._batch_handles = None
         self.transaction = None
         txn.clear()
         txn.first = None
@@ -359,7 +621,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM person '
+                               'ORDER BY surname_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -381,7 +646,22 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT family.handle '
+                               'FROM family '
+                               'LEFT JOIN person AS father '
+                               'ON family.father_handle = father.handle '
+                               'LEFT JOIN person AS mother '
+                               'ON family.mother_handle = mother.handle '
+                               'ORDER BY (CASE WHEN father.handle IS NULL '
+                               'THEN mother.surname_key '
+                               'ELSE father.surname_key '
+                               'END), '
+                               '(CASE WHEN father.handle IS NULL '
+                               'THEN mother.given_name_key '
+                               'ELSE father.given_name_key '
+                               'END)')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -425,7 +705,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM citation '
+                               'ORDER BY page_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -447,7 +730,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM source '
+                               'ORDER BY title_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -469,7 +755,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM place '
+                               'ORDER BY title_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -500,7 +789,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM media '
+                               'ORDER BY desc_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -531,7 +823,10 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles and self._use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM tag '
+                               'ORDER BY name_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -543,18 +838,85 @@ class DBAPI(DbGeneric):
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
 
+    def __sort_key_column(self, obj_class):
+        """
+        Return the table and the sort key column of a class, if the objects
+        can be read in the order of their sort keys, or (None, None).
+        """
+        table = obj_class.lower()
+        columns = SORT_COLUMNS.get(table, ())
+        if len(columns) != 1 or not self._use_sort_keys(glocale):
+            return None, None
+        return table, columns[0] + '_key'
+
+    def get_sort_keys(self, obj_class, start, stop):
+        """
+        Return the objects of a class from position start up to stop, in
+        the order of their sort keys, as (sort key, handle) tuples, or None.
+        """
+        table, column = self.__sort_key_column(obj_class)
+        if table is None:
+            return None
+        self.dbapi.execute('SELECT %s, handle FROM %s '
+                           'ORDER BY %s, handle LIMIT ? OFFSET ?'
+                           % (column, table, column),
+                           [stop - start, start])
+        return [(bytes(row[0] or b'').decode('utf-8', 'surrogatepass'),
+                 row[1]) for row in self.dbapi.fetchall()]
+
+    def get_sort_key_position(self, obj_class, handle):
+        """
+        Return the position of an object in the order of its sort key, or
+        None.
+        """
+        table, column = self.__sort_key_column(obj_class)
+        if table is None:
+            return None
+        self.dbapi.execute('SELECT %s FROM %s WHERE handle = ?'
+                           % (column, table), [handle])
+        row = self.dbapi.fetchone()
+        if row is None:
+            return None
+        self.dbapi.execute('SELECT COUNT(*) FROM %s '
+                           'WHERE %s < ? OR (%s = ? AND handle < ?)'
+                           % (table, column, column),
+                           [row[0], row[0], handle])
+        return self.dbapi.fetchone()[0]
+
     def get_tag_from_name(self, name):
         """
         Find a Tag in the database from the passed Tag name.
 
         If no such Tag exists, None is returned.
         """
-        self.dbapi.execute("SELECT blob_data FROM tag WHERE name = ?", [name])
+        self.dbapi.execute("SELECT %s FROM tag WHERE name = ?"
+                           % self.serializer.data_field, [name])
         row = self.dbapi.fetchone()
         if row:
-            return Tag.create(pickle.loads(row[0]))
+            return self.serializer.string_to_object(Tag, row[0])
         return None
 
+    def select_handles(self, class_name, where=None, values=None):
+        """
+        Return a list of the handles of the objects of the given class whose
+        secondary columns satisfy an SQL WHERE clause.
+        """
+        sql = "SELECT handle FROM %s" % class_name.lower()
+        if where:
+            sql += " WHERE %s" % where
+        self.dbapi.execute(sql, values or [])
+        rows = self.dbapi.fetchall()
+        return [row[0] for row in rows]
+
+    def get_column_values(self, class_name, columns):
+        """
+        Return the values of some secondary columns of all the objects of
+        the given class, without reading the objects themselves.
+        """
+        self.dbapi.execute("SELECT handle, %s FROM %s"
+                           % (", ".join(columns), class_name.lower()))
+        return [tuple(row) for row in self.dbapi.fetchall()]
+
     def _get_number_of(self, obj_key):
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT count(1) FROM %s" % table
@@ -600,23 +962,39 @@ class DBAPI(DbGeneric):
         old_data = None
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
+        fields, values = self._get_secondary_values(obj)
+        data = self.serializer.object_to_string(obj)
+        fields.insert(0, self.serializer.data_field)
+        values.insert(0, data)
 
         if self._has_handle(obj_key, obj.handle):
             old_data = self._get_raw_data(obj_key, obj.handle)
             # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-            self.dbapi.execute(sql,
-                               [pickle.dumps(obj.serialize()),
-                                obj.handle])
+            sql = "UPDATE %s SET %s WHERE handle = ?" % (
+                table, ", ".join("%s = ?" % field for field in fields))
+            self.dbapi.execute(sql, values + [obj.handle])
+            self._update_backlinks(obj, trans)
         else:
             # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
-            self.dbapi.execute(sql,
-                               [obj.handle,
-                                pickle.dumps(obj.serialize())])
-        self._update_secondary_values(obj)
+            sql = "INSERT INTO %s (handle, %s) VALUES (?%s)" % (
+                table, ", ".join(fields), ", ?" * len(fields))
+            if trans.batch:
+                # Batch transactions send new objects and their references
+                # to the database in bulk.
+                self._batch_handles[obj_key].add(obj.handle)
+                self._queue(sql, [obj.handle] + values)
+                self._queue_backlinks(obj)
+            else:
+                self.dbapi.execute(sql, [obj.handle] + values)
+                self._update_backlinks(obj, trans)
+        self._update_text_index(obj_key, obj, old_data is None)
+        self.kinship.discard(obj_key, obj.handle)
+        self.lifespan.discard(obj_key, obj.handle)
+        self.statistics.discard(obj_key, obj.handle)
+        # The data of the object is cached when it is read again, since the
+        # object may still be changed by the caller.
+        self.cache.discard(obj_key, obj.handle)
         if not trans.batch:
-            self._update_backlinks(obj, trans)
             if old_data:
                 trans.add(obj_key, TXNUPD, obj.handle,
                           old_data,
@@ -628,6 +1006,19 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _queue_backlinks(self, obj):
+        """
+        Queue the references from a new object for insertion in bulk.
+        """
+        sql = ("INSERT INTO reference "
+               "(obj_handle, obj_class, ref_handle, ref_class) "
+               "VALUES (?, ?, ?, ?)")
+        obj_class = obj.__class__.__name__
+        for (ref_class_name, ref_handle) in set(
+                obj.get_referenced_handles_recursively()):
+            self._queue(sql, [obj.handle, obj_class,
+                              ref_handle, ref_class_name])
+
     def _update_backlinks(self, obj, transaction):
 
         # Find existing references
@@ -681,7 +1072,14 @@ class DBAPI(DbGeneric):
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
-            if not transaction.batch:
+            self._remove_text_index(obj_key, handle)
+            self.cache.discard(obj_key, handle)
+            self.kinship.discard(obj_key, handle)
+            self.lifespan.discard(obj_key, handle)
+            self.statistics.discard(obj_key, handle)
+            if transaction.batch:
+                self._batch_handles[obj_key].discard(handle)
+            else:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
     def _remove_backlinks(self, obj_class, obj_handle, transaction):
@@ -759,13 +1157,35 @@ class DBAPI(DbGeneric):
         Return an iterator over raw data in the database.
         """
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT handle, blob_data FROM %s" % table
+        obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                         "class_func")
+        string_to_data = self.serializer.string_to_data
+        sql = "SELECT handle, %s FROM %s" % (self.serializer.data_field,
+                                             table)
         with self.dbapi.cursor() as cursor:
             cursor.execute(sql)
             rows = cursor.fetchmany()
             while rows:
                 for row in rows:
-                    yield (row[0], pickle.loads(row[1]))
+                    yield (row[0], string_to_data(obj_class, row[1]))
+                rows = cursor.fetchmany()
+
+    def _iter_objects(self, class_):
+        """
+        Iterate over items in a class.
+
+        The objects are built directly from their stored representation,
+        without going through the raw (serialized) data.
+        """
+        table = class_.__name__.lower()
+        string_to_object = self.serializer.string_to_object
+        sql = "SELECT %s FROM %s" % (self.serializer.data_field, table)
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield string_to_object(class_, row[0])
                 rows = cursor.fetchmany()
 
     def _iter_raw_place_tree_data(self):
@@ -773,55 +1193,101 @@ class DBAPI(DbGeneric):
         Return an iterator over raw data in the place hierarchy.
         """
         to_do = ['']
-        sql = 'SELECT handle, blob_data FROM place WHERE enclosed_by = ?'
+        sql = ('SELECT handle, %s FROM place WHERE enclosed_by = ?'
+               % self.serializer.data_field)
         while to_do:
             handle = to_do.pop()
             self.dbapi.execute(sql, [handle])
             rows = self.dbapi.fetchall()
             for row in rows:
                 to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+                yield (row[0], self.serializer.string_to_data(Place, row[1]))
 
     def reindex_reference_map(self, callback):
         """
         Reindex all primary records in the database.
+
+        The objects are decoded and their references collected in a pool of
+        worker processes (see the database.reindex-processes setting), while
+        the references are loaded in bulk, with the reference indexes
+        dropped until all tables are done. If that fails, the old references
+        and indexes are restored.
         """
         callback(4)
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
-        primary_table = (
-            (self.get_person_cursor, Person),
-            (self.get_family_cursor, Family),
-            (self.get_event_cursor, Event),
-            (self.get_place_cursor, Place),
-            (self.get_source_cursor, Source),
-            (self.get_citation_cursor, Citation),
-            (self.get_media_cursor, Media),
-            (self.get_repository_cursor, Repository),
-            (self.get_note_cursor, Note),
-            (self.get_tag_cursor, Tag),
-        )
-        # Now we use the functions and classes defined above
-        # to loop through each of the primary object tables.
-        for cursor_func, class_func in primary_table:
-            logging.info("Rebuilding %s reference map", class_func.__name__)
-            with cursor_func() as cursor:
-                for found_handle, val in cursor:
-                    obj = class_func.create(val)
-                    references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for (ref_class_name, ref_handle) in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [obj.handle,
-                             obj.__class__.__name__,
-                             ref_handle,
-                             ref_class_name])
+        for index, column in REFERENCE_INDEXES:
+            self.dbapi.execute("DROP INDEX IF EXISTS %s" % index)
+        processes = (config.get('database.reindex-processes') or
+                     os.cpu_count() or 1)
+        pool = None
+        try:
+            for obj_key, class_name in KEY_TO_CLASS_MAP.items():
+                if pool is None and processes > 1 and (
+                        self._get_number_of(obj_key) > ARRAYSIZE):
+                    try:
+                        pool = ProcessPoolExecutor(processes)
+                    except (OSError, ImportError, NotImplementedError) as err:
+                        LOG.warning("Cannot start worker processes: %s", err)
+                        processes = 1
+                self._reindex_table(obj_key, class_name, pool, processes)
+            for index, column in REFERENCE_INDEXES:
+                self.dbapi.execute("CREATE INDEX %s ON reference(%s)"
+                                   % (index, column))
+        except:
+            # Restore the old references and indexes.
+            self._txn_abort()
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown()
         self._txn_commit()
         callback(5)
 
+    def _reindex_table(self, obj_key, class_name, pool, processes):
+        """
+        Insert the references from all objects of one primary table.
+        """
+        logging.info("Rebuilding %s reference map", class_name)
+        start = time.perf_counter()
+        sql = ("INSERT INTO reference "
+               "(obj_handle, obj_class, ref_handle, ref_class) "
+               "VALUES (?, ?, ?, ?)")
+        select = "SELECT handle, %s FROM %s" % (self.serializer.data_field,
+                                                KEY_TO_NAME_MAP[obj_key])
+        pending = deque()
+        count = 0
+        total = 0
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(select)
+            rows = cursor.fetchmany()
+            while rows:
+                count += len(rows)
+                if pool is None:
+                    references = get_references(self.serializer.name,
+                                                class_name, rows)
+                    self._executemany(sql, references)
+                    total += len(references)
+                else:
+                    # Keep a bounded number of chunks in flight, so that
+                    # the table is streamed rather than read into memory.
+                    pending.append(pool.submit(get_references,
+                                               self.serializer.name,
+                                               class_name, rows))
+                    if len(pending) > 2 * processes:
+                        references = pending.popleft().result()
+                        self._executemany(sql, references)
+                        total += len(references)
+                rows = cursor.fetchmany()
+        while pending:
+            references = pending.popleft().result()
+            self._executemany(sql, references)
+            total += len(references)
+        elapsed = time.perf_counter() - start
+        logging.info("Rebuilt %s reference map: %d objects, %d references "
+                     "in %.2fs (%.0f objects/s)", class_name, count, total,
+                     elapsed, count / elapsed if elapsed else 0)
+
     def rebuild_secondary(self, callback=None):
         """
         Rebuild secondary indices
@@ -852,6 +1318,14 @@ class DBAPI(DbGeneric):
 
     def _has_handle(self, obj_key, handle):
         table = KEY_TO_NAME_MAP[obj_key]
+        if self._batch_handles is not None:
+            # During a batch transaction the handles are kept in memory, so
+            # that queued inserts need not be flushed for each lookup.
+            if obj_key not in self._batch_handles:
+                self.dbapi.execute("SELECT handle FROM %s" % table)
+                self._batch_handles[obj_key] = set(
+                    row[0] for row in self.dbapi.fetchall())
+            return handle in self._batch_handles[obj_key]
         sql = "SELECT 1 FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         return self.dbapi.fetchone() is not None
@@ -870,20 +1344,70 @@ class DBAPI(DbGeneric):
         return [row[0] for row in rows]
 
     def _get_raw_data(self, obj_key, handle):
-        table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT blob_data FROM %s WHERE handle = ?" % table
-        self.dbapi.execute(sql, [handle])
-        row = self.dbapi.fetchone()
-        if row:
-            return pickle.loads(row[0])
+        """
+        Return the raw data of an object, from the cache if possible, or
+        None if there is no such object.
+
+        The cache keeps the decoded data, with an estimate of the memory it
+        uses, so that reading a cached object does not decode it again.
+        """
+        data = self.cache.get(obj_key, handle)
+        if data is None:
+            table = KEY_TO_NAME_MAP[obj_key]
+            sql = "SELECT %s FROM %s WHERE handle = ?" % (
+                self.serializer.data_field, table)
+            self.dbapi.execute(sql, [handle])
+            row = self.dbapi.fetchone()
+            if row:
+                obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                                 "class_func")
+                data = self.serializer.string_to_data(obj_class, row[0])
+                self.cache.put(obj_key, handle, data,
+                               len(row[0]) * self.serializer.memory_ratio)
+        return data
+
+    def _get_changes_since(self, class_name, time):
+        """
+        Return a dictionary of the change times of the objects of a class
+        that were changed at or after the given time, by handle.
+        """
+        self.dbapi.execute("SELECT handle, change FROM %s WHERE change >= ?"
+                           % class_name.lower(), [time])
+        return dict(self.dbapi.fetchall())
+
+    def _get_change_summary(self):
+        """
+        Return a tuple with the number of objects, and the sum and maximum of
+        their change times, for each primary object type.
+        """
+        summary = []
+        for obj_key in sorted(KEY_TO_NAME_MAP):
+            self.dbapi.execute("SELECT COUNT(*), COALESCE(SUM(change), 0), "
+                               "MAX(change) FROM %s" % KEY_TO_NAME_MAP[obj_key])
+            summary.append(tuple(self.dbapi.fetchone()))
+        return tuple(summary)
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT blob_data FROM %s WHERE gramps_id = ?" % table
+        sql = "SELECT %s FROM %s WHERE gramps_id = ?" % (
+            self.serializer.data_field, table)
         self.dbapi.execute(sql, [gramps_id])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                             "class_func")
+            return self.serializer.string_to_data(obj_class, row[0])
+
+    def _get_from_handle(self, obj_key, obj_class, handle):
+        if handle is None:
+            raise HandleError('Handle is None')
+        if not handle:
+            raise HandleError('Handle is empty')
+        data = self._get_raw_data(obj_key, handle)
+        if data is not None:
+            return obj_class.create(data)
+        else:
+            raise HandleError('Handle %s not found' % handle)
 
     def get_gender_stats(self):
         """
@@ -928,18 +1452,42 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        self.cache.discard(obj_key, handle)
+        self.kinship.discard(obj_key, handle)
+        self.lifespan.discard(obj_key, handle)
+        self.statistics.discard(obj_key, handle)
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            self._remove_text_index(obj_key, handle)
         else:
+            obj = self._get_table_func(cls)["class_func"].create(data)
+            data_field = self.serializer.data_field
             if self._has_handle(obj_key, handle):
-                sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-                self.dbapi.execute(sql, [pickle.dumps(data), handle])
+                sql = "UPDATE %s SET %s = ? WHERE handle = ?" % (table,
+                                                                 data_field)
+                self.dbapi.execute(sql, [self.serializer.object_to_string(obj),
+                                         handle])
             else:
-                sql = "INSERT INTO %s (handle, blob_data) VALUES (?, ?)" % table
-                self.dbapi.execute(sql, [handle, pickle.dumps(data)])
-            obj = self._get_table_func(cls)["class_func"].create(data)
+                sql = "INSERT INTO %s (handle, %s) VALUES (?, ?)" % (table,
+                                                                     data_field)
+                self.dbapi.execute(sql, [handle,
+                                         self.serializer.object_to_string(obj)])
             self._update_secondary_values(obj)
+            self._update_text_index(obj_key, obj, False)
+
+    def _update_text_index(self, obj_key, obj, new):
+        """
+        Index the text of an object that has been added, if new is True, or
+        changed. Backends with a full-text index override this.
+        """
+        pass
+
+    def _remove_text_index(self, obj_key, handle):
+        """
+        Remove an object from the full-text index.
+        """
+        pass
 
     def get_surname_list(self):
         """
@@ -984,38 +1532,57 @@ class DBAPI(DbGeneric):
                     self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s %s"
                                        % (table_name, field, sql_type))
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return the names and values of its secondary
+        fields, including the derived fields.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append("%s = ?" % field)
-            values.append(getattr(obj, field))
+        if table not in self._secondary_fields:
+            # Building the schema is slow, and it is the same for all objects
+            self._secondary_fields[table] = [
+                field[0] for field in obj.get_secondary_fields()
+                if field[0] != 'handle']
+        fields = list(self._secondary_fields[table])
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == 'Person':
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            fields += ["given_name", "surname"]
+            values += [given_name, surname]
         if table == 'Place':
             handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
+            fields.append("enclosed_by")
             values.append(handle)
 
+        # Sort keys
+        if self._sort_key_locale == glocale.get_collation():
+            for column in SORT_COLUMNS.get(table.lower(), ()):
+                fields.append(column + "_key")
+                values.append(sort_key(glocale, values[fields.index(column)]))
+        elif self._sort_key_locale and table.lower() in SORT_COLUMNS:
+            # The other keys are for another locale, so they must all be
+            # computed again before they are used.
+            self._sort_key_locale = ''
+            self._set_metadata('sort_key_locale', self._sort_key_locale)
+
+        return fields, self._sql_cast_list(values)
+
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute("UPDATE %s SET %s where handle = ?"
-                               % (table_name, ", ".join(sets)),
-                               self._sql_cast_list(values)
-                               + [obj.handle])
+                               % (table_name,
+                                  ", ".join("%s = ?" % field
+                                            for field in fields)),
+                               values + [obj.handle])
 
     def _sql_cast_list(self, values):
         """
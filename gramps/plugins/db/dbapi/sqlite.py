@@ -39,12 +39,50 @@ import logging
 #
 #-------------------------------------------------------------------------
 from gramps.plugins.db.dbapi.dbapi import DBAPI
-from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.db.dbconst import (ARRAYSIZE, PERSON_KEY, EVENT_KEY, PLACE_KEY,
+                                   SOURCE_KEY, CITATION_KEY, NOTE_KEY,
+                                   CLASS_TO_KEY_MAP, KEY_TO_CLASS_MAP)
+from gramps.gen.lib import Person, Event, Place, Source, Citation
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
 sqlite3.paramstyle = 'qmark'
 
+LOG = logging.getLogger(".sqlite")
+
+# Tables of the full-text index, by the key of the objects they index:
+TEXT_TABLES = {PERSON_KEY: 'person_text',
+               EVENT_KEY: 'event_text',
+               PLACE_KEY: 'place_text',
+               SOURCE_KEY: 'source_text',
+               CITATION_KEY: 'citation_text',
+               NOTE_KEY: 'note_text'}
+
+def get_text(obj):
+    """
+    Return the text of an object that the full-text index searches, as
+    described by :py:meth:`.DbReadBase.search_text`.
+    """
+    if isinstance(obj, Person):
+        text = []
+        for name in [obj.get_primary_name()] + obj.get_alternate_names():
+            text.extend(name.get_text_data_list())
+            for surname in name.get_surname_list():
+                text.extend(surname.get_text_data_list())
+    elif isinstance(obj, Event):
+        text = [obj.get_description()]
+    elif isinstance(obj, Place):
+        text = [obj.get_title()] + [name.get_value()
+                                    for name in obj.get_all_names()]
+    elif isinstance(obj, Source):
+        text = [obj.get_title(), obj.get_author(), obj.get_abbreviation(),
+                obj.get_publication_info()]
+    elif isinstance(obj, Citation):
+        text = [obj.get_page()]
+    else:
+        text = [obj.get()]
+    return "\n".join(text)
+
 #-------------------------------------------------------------------------
 #
 # SQLite class
@@ -71,6 +109,142 @@ class SQLite(DBAPI):
             path_to_db = os.path.join(directory, 'sqlite.db')
         self.dbapi = Connection(path_to_db)
 
+    #-------------------------------------------------------------------------
+    #
+    # Full-text index
+    #
+    #-------------------------------------------------------------------------
+    # The index keeps the Gramps ID and the text of the objects in upper
+    # case, in FTS5 tables with the trigram tokenizer, so that it finds the
+    # words of a search within words, as the substring searches of Gramps
+    # do. The rows are keyed on their rowid, which a table of handles maps
+    # to, so that they are found without scanning the index. Tables of the
+    # index, by object key, if the tree has one:
+    _text_tables = {}
+
+    def _load_text_index(self, callback=None):
+        """
+        Find the full-text index, or create it if the tree has none.
+
+        :param callback: Called with the percentage of the objects indexed
+                         so far, if the index is created.
+        :type callback: function
+        """
+        self._text_tables = {}
+        if self.dbapi.table_exists(TEXT_TABLES[NOTE_KEY] + '_handle'):
+            self._text_tables = TEXT_TABLES
+        elif not self.readonly:
+            self.dbapi.begin()
+            try:
+                for table in TEXT_TABLES.values():
+                    # Drop the tables of an index keyed on handles.
+                    self.dbapi.execute("DROP TABLE IF EXISTS %s" % table)
+                    self.dbapi.execute(
+                        "CREATE VIRTUAL TABLE %s USING fts5"
+                        "(gramps_id, text, tokenize = 'trigram')" % table)
+                    self.dbapi.execute(
+                        "CREATE TABLE %s_handle "
+                        "(id INTEGER PRIMARY KEY, "
+                        "handle VARCHAR(50) UNIQUE NOT NULL)" % table)
+            except sqlite3.OperationalError as err:
+                # The trigram tokenizer is new in SQLite 3.34
+                self.dbapi.rollback()
+                LOG.warning("No full-text index: %s", err)
+                return
+            self.dbapi.commit()
+            self._text_tables = TEXT_TABLES
+            self.rebuild_text_index(callback)
+
+    def rebuild_text_index(self, callback=None):
+        """
+        Index the text of all the objects again.
+
+        :param callback: Called with the percentage of the objects indexed
+                         so far.
+        :type callback: function
+        """
+        if self.readonly or not self._text_tables:
+            return
+        total = sum(self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                         "count_func")()
+                    for obj_key in self._text_tables)
+        count = percent = 0
+        self._txn_begin()
+        for obj_key, table in self._text_tables.items():
+            self.dbapi.execute("DELETE FROM %s" % table)
+            self.dbapi.execute("DELETE FROM %s_handle" % table)
+            iter_func = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                             "iter_func")
+            for row_id, obj in enumerate(iter_func(), 1):
+                self.dbapi.queue("INSERT INTO %s_handle (id, handle) "
+                                 "VALUES (?, ?)" % table,
+                                 [row_id, obj.handle])
+                self.dbapi.queue("INSERT INTO %s (rowid, gramps_id, text) "
+                                 "VALUES (?, ?, ?)" % table,
+                                 [row_id, obj.gramps_id.upper(),
+                                  get_text(obj).upper()])
+                count += 1
+                if callback and 100 * count // total > percent:
+                    percent = 100 * count // total
+                    callback(percent)
+        self._txn_commit()
+
+    def _update_text_index(self, obj_key, obj, new):
+        table = self._text_tables.get(obj_key)
+        if table is None:
+            return
+        values = [obj.gramps_id.upper(), get_text(obj).upper()]
+        if not new:
+            self.dbapi.execute("SELECT id FROM %s_handle WHERE handle = ?"
+                               % table, [obj.handle])
+            row = self.dbapi.fetchone()
+            if row is not None:
+                self.dbapi.execute("DELETE FROM %s WHERE rowid = ?" % table,
+                                   [row[0]])
+                self.dbapi.execute("INSERT INTO %s (rowid, gramps_id, text) "
+                                   "VALUES (?, ?, ?)" % table,
+                                   [row[0]] + values)
+                return
+        # The statements are sent in the order they were first queued.
+        self.dbapi.queue("INSERT INTO %s_handle (handle) VALUES (?)" % table,
+                         [obj.handle])
+        self.dbapi.queue("INSERT INTO %s (rowid, gramps_id, text) "
+                         "VALUES ((SELECT id FROM %s_handle "
+                         "WHERE handle = ?), ?, ?)" % (table, table),
+                         [obj.handle] + values)
+
+    def _remove_text_index(self, obj_key, handle):
+        table = self._text_tables.get(obj_key)
+        if table is None:
+            return
+        self.dbapi.execute("SELECT id FROM %s_handle WHERE handle = ?"
+                           % table, [handle])
+        row = self.dbapi.fetchone()
+        if row is not None:
+            self.dbapi.execute("DELETE FROM %s WHERE rowid = ?" % table,
+                               [row[0]])
+            self.dbapi.execute("DELETE FROM %s_handle WHERE id = ?" % table,
+                               [row[0]])
+
+    def search_text(self, obj_class, field, text):
+        """
+        Return the handles of the objects of a class whose text may contain
+        a string, ignoring case, or None if the string has no word of three
+        characters or more, which the index needs.
+        """
+        table = self._text_tables.get(CLASS_TO_KEY_MAP.get(obj_class))
+        if table is None or field not in ('gramps_id', 'text'):
+            return None
+        words = [word for word in re.findall(r'\w+', text.upper())
+                 if len(word) >= 3]
+        if not words:
+            return None
+        query = " AND ".join('%s : "%s"' % (field, word) for word in words)
+        self.dbapi.execute("SELECT handle FROM %s_handle WHERE id IN "
+                           "(SELECT rowid FROM %s WHERE %s MATCH ?)"
+                           % (table, table, table), [query])
+        return {row[0] for row in self.dbapi.fetchall()}
+
 
 #-------------------------------------------------------------------------
 #
@@ -100,7 +274,11 @@ class Connection:
         self.__connection = sqlite3.connect(*args, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
+        # LIKE is case sensitive, as in standard SQL and the other backends.
+        self.__cursor.execute("PRAGMA case_sensitive_like = ON")
         self.__collations = []
+        self.__queue = {}
+        self.__queued = 0
         self.check_collation(glocale)
 
     def check_collation(self, locale):
@@ -123,9 +301,53 @@ class Connection:
         :param kwargs: arguments to be passed to the sqlite3 execute statement
         :type kwargs: list
         """
+        self.flush()
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, sql, rows):
+        """
+        Executes an SQL statement once for each row of parameters.
+
+        :param sql: the SQL statement.
+        :type sql: str
+        :param rows: a sequence of parameter lists.
+        :type rows: list
+        """
+        self.flush()
+        self.log.debug(sql)
+        self.__cursor.executemany(sql, rows)
+
+    def queue(self, sql, values):
+        """
+        Queue an SQL statement that does not return any rows.
+
+        Queued statements are sent in batches with executemany, at the
+        latest before the next statement is executed, a cursor is created or
+        the transaction is committed.
+
+        :param sql: the SQL statement.
+        :type sql: str
+        :param values: the parameters of the statement.
+        :type values: list
+        """
+        self.__queue.setdefault(sql, []).append(values)
+        self.__queued += 1
+        if self.__queued >= ARRAYSIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Execute all queued statements.
+        """
+        if self.__queued:
+            queue = self.__queue
+            self.__queue = {}
+            self.__queued = 0
+            for sql, rows in queue.items():
+                self.log.debug(sql)
+                self.__cursor.executemany(sql, rows)
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -152,6 +374,7 @@ class Connection:
         """
         Commit the current transaction.
         """
+        self.flush()
         self.log.debug("COMMIT;")
         self.__connection.commit()
 
@@ -159,6 +382,8 @@ class Connection:
         """
         Roll back any changes to the database since the last call to commit().
         """
+        self.__queue = {}
+        self.__queued = 0
         self.log.debug("ROLLBACK;")
         self.__connection.rollback()
 
@@ -176,6 +401,20 @@ class Connection:
                      "WHERE type='table' AND name='%s';" % table)
         return self.fetchone()[0] != 0
 
+    def column_exists(self, table, column):
+        """
+        Test whether the specified SQL column exists in the specified table.
+
+        :param table: table name to check.
+        :type table: str
+        :param column: column name to check.
+        :type column: str
+        :returns: True if the column exists, False otherwise.
+        :rtype: bool
+        """
+        self.execute("PRAGMA table_info(%s);" % table)
+        return column in [row[1] for row in self.fetchall()]
+
     def close(self):
         """
         Close the current database.
@@ -187,6 +426,7 @@ class Connection:
         """
         Return a new cursor.
         """
+        self.flush()
         return Cursor(self.__connection)
 
 
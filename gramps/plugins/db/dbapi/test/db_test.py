@@ -23,17 +23,26 @@
 # Standard python modules
 #
 #-------------------------------------------------------------------------
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 #-------------------------------------------------------------------------
 #
 # Gramps modules
 #
 #-------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.db import DbTxn
 from gramps.gen.db.utils import make_database
+from gramps.gen.proxy import CacheProxyDb, CompiledProxyDb, PrivateProxyDb
 from gramps.gen.lib import (Person, Family, Event, Place, Repository, Source,
-                            Citation, Media, Note, Tag, Researcher, Surname)
+                            Citation, Media, Note, Tag, Researcher, Surname,
+                            EventRef, EventType, Date)
+from gramps.gen.utils.alive import is_probably_alive, probably_alive
+from gramps.plugins.db.dbapi import dbapi
 
 #-------------------------------------------------------------------------
 #
@@ -865,6 +874,780 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved['John'], (3, 1, 1))
         self.assertEqual(saved['Mary'], (1, 4, 0))
 
+#-------------------------------------------------------------------------
+#
+# DbJsonRandomTest class
+#
+#-------------------------------------------------------------------------
+class DbJsonRandomTest(DbRandomTest):
+    '''
+    Tests with random objects, stored in JSON format.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+        cls.db.set_serializer('json')
+
+#-------------------------------------------------------------------------
+#
+# MemoryDbTest class
+#
+#-------------------------------------------------------------------------
+class MemoryDbTest(unittest.TestCase):
+    '''
+    Base class of the tests that run on a new SQLite database in memory.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+#-------------------------------------------------------------------------
+#
+# DbSerializerTest class
+#
+#-------------------------------------------------------------------------
+class DbSerializerTest(MemoryDbTest):
+    '''
+    Tests conversion between storage formats.
+    '''
+
+    def test_convert(self):
+        person = Person()
+        surname = Surname()
+        surname.surname = 'Smith'
+        person.primary_name.set_surname_list([surname])
+        with DbTxn('Add person', self.db) as trans:
+            handle = self.db.add_person(person, trans)
+        data = self.db.get_raw_person_data(handle)
+        self.assertEqual(self.db.serializer.name, 'blob')
+
+        self.db.set_serializer('json')
+        self.assertEqual(self.db.serializer.name, 'json')
+        self.assertEqual(self.db._get_metadata('serializer'), 'json')
+        self.assertEqual(self.db.get_raw_person_data(handle), data)
+        self.assertEqual(self.db.get_person_handles(sort_handles=True),
+                         [handle])
+
+        self.db.set_serializer('blob')
+        self.assertEqual(self.db.serializer.name, 'blob')
+        self.assertEqual(self.db.get_raw_person_data(handle), data)
+
+
+class DbBatchTest(MemoryDbTest):
+    '''
+    Tests bulk insertion in batch transactions.
+    '''
+
+    def test_batch_add(self):
+        with DbTxn('Add tag', self.db) as trans:
+            tag = Tag()
+            tag.set_name('Test')
+            tag_handle = self.db.add_tag(tag, trans)
+        with DbTxn('Add people', self.db, batch=True) as trans:
+            handles = []
+            for index in range(2000):
+                person = Person()
+                person.set_gramps_id('I%04d' % index)
+                person.add_tag(tag_handle)
+                handles.append(self.db.add_person(person, trans))
+            person = self.db.get_person_from_handle(handles[0])
+            person.set_gender(Person.MALE)
+            self.db.commit_person(person, trans)
+            self.db.remove_person(handles[1], trans)
+        self.assertEqual(self.db.get_number_of_people(), 1999)
+        self.assertEqual(
+            len(list(self.db.find_backlink_handles(tag_handle))), 1999)
+        person = self.db.get_person_from_gramps_id('I0000')
+        self.assertEqual(person.handle, handles[0])
+        self.assertEqual(person.gender, Person.MALE)
+        self.assertIsNone(self.db.get_person_from_gramps_id('I0001'))
+        self.assertTrue(self.db.has_person_gramps_id('I1999'))
+
+    def test_basic_connection(self):
+        # The full-text index is specific to SQLite.
+        self.db._text_tables = {}
+        self.db.dbapi = BasicConnection(self.db.dbapi)
+        self.test_batch_add()
+        self.db.reindex_reference_map(lambda percent: percent)
+        self.assertEqual(len(self.db.get_person_handles()), 1999)
+        self.db.dbapi.execute("SELECT COUNT(*) FROM reference")
+        self.assertEqual(self.db.dbapi.fetchone()[0], 1999)
+
+
+class BasicConnection:
+    """
+    A connection with only the methods that the connections of all the
+    DB-API backends have.
+    """
+    METHODS = ('check_collation', 'execute', 'fetchone', 'fetchall', 'begin',
+               'commit', 'rollback', 'table_exists', 'close', 'cursor')
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __getattr__(self, name):
+        if name not in self.METHODS:
+            raise AttributeError(name)
+        return getattr(self.connection, name)
+
+
+class DbReindexTest(unittest.TestCase):
+    '''
+    Tests rebuilding the reference map.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+        with DbTxn('Add objects', cls.db) as trans:
+            tag = Tag()
+            tag.set_name('Test')
+            tag_handle = cls.db.add_tag(tag, trans)
+            for index in range(1500):
+                person = Person()
+                person.add_tag(tag_handle)
+                cls.db.add_person(person, trans)
+                family = Family()
+                family.set_father_handle(person.handle)
+                cls.db.add_family(family, trans)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def tearDown(self):
+        config.set('database.reindex-processes', 0)
+
+    def __get_references(self):
+        self.db.dbapi.execute("SELECT * FROM reference")
+        return sorted(self.db.dbapi.fetchall())
+
+    def __reindex(self, processes):
+        references = self.__get_references()
+        config.set('database.reindex-processes', processes)
+        self.db.reindex_reference_map(lambda percent: percent)
+        self.assertEqual(self.__get_references(), references)
+        self.assertEqual(len(references), 3000)
+
+    def test_reindex(self):
+        self.__reindex(1)
+
+    def test_reindex_parallel(self):
+        self.__reindex(2)
+
+    def test_reindex_failure(self):
+        original = dbapi.get_references
+        def get_references(serializer_name, class_name, rows):
+            if class_name == 'Family':
+                raise ValueError(class_name)
+            return original(serializer_name, class_name, rows)
+        references = self.__get_references()
+        config.set('database.reindex-processes', 1)
+        with patch.object(dbapi, 'get_references', get_references):
+            self.assertRaises(ValueError, self.db.reindex_reference_map,
+                              lambda percent: percent)
+        self.assertEqual(self.__get_references(), references)
+        self.db.dbapi.execute("SELECT name FROM sqlite_master "
+                              "WHERE tbl_name = 'reference' AND type = 'index'")
+        self.assertEqual({row[0] for row in self.db.dbapi.fetchall()},
+                         {index for index, column in dbapi.REFERENCE_INDEXES})
+
+
+class DbCacheTest(MemoryDbTest):
+    '''
+    Tests the invalidation of cached objects.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        with DbTxn('Add person', self.db) as trans:
+            person = Person()
+            person.set_gramps_id('I0001')
+            self.handle = self.db.add_person(person, trans)
+
+    def __set_gramps_id(self, gramps_id):
+        with DbTxn('Edit person', self.db) as trans:
+            person = self.db.get_person_from_handle(self.handle)
+            person.set_gramps_id(gramps_id)
+            self.db.commit_person(person, trans)
+
+    def __get_gramps_id(self, database):
+        return database.get_person_from_handle(self.handle).gramps_id
+
+    def test_statistics(self):
+        self.db.cache.clear()
+        self.__get_gramps_id(self.db)
+        self.__get_gramps_id(self.db)
+        stats = self.db.cache.get_statistics()['Person']
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_decoded(self):
+        self.db.cache.clear()
+        data = self.db.get_raw_person_data(self.handle)
+        with patch.object(self.db.serializer, 'string_to_data') as decode:
+            self.assertIs(self.db.get_raw_person_data(self.handle), data)
+            self.__get_gramps_id(self.db)
+            decode.assert_not_called()
+        self.assertGreater(self.db.cache.get_statistics()['Person']['size'],
+                           0)
+
+    def test_changed_object(self):
+        person = self.db.get_person_from_handle(self.handle)
+        person.add_family_handle('F0001')
+        person.add_tag('T0001')
+        person = self.db.get_person_from_handle(self.handle)
+        self.assertEqual(person.get_family_handle_list(), [])
+        self.assertEqual(person.get_tag_list(), [])
+
+    def test_commit(self):
+        self.__get_gramps_id(self.db)
+        self.__set_gramps_id('I0002')
+        self.assertEqual(self.__get_gramps_id(self.db), 'I0002')
+
+    def test_undo(self):
+        self.__set_gramps_id('I0002')
+        self.db.undo()
+        self.assertEqual(self.__get_gramps_id(self.db), 'I0001')
+        self.db.redo()
+        self.assertEqual(self.__get_gramps_id(self.db), 'I0002')
+
+    def test_abort(self):
+        with self.assertRaises(ValueError):
+            with DbTxn('Edit person', self.db) as trans:
+                person = self.db.get_person_from_handle(self.handle)
+                person.set_gramps_id('I0002')
+                self.db.commit_person(person, trans)
+                self.__get_gramps_id(self.db)
+                raise ValueError
+        self.assertEqual(self.__get_gramps_id(self.db), 'I0001')
+
+    def test_remove(self):
+        self.__get_gramps_id(self.db)
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(self.handle, trans)
+        self.assertIsNone(self.db.get_raw_person_data(self.handle))
+
+    def test_proxy(self):
+        proxy = CacheProxyDb(self.db)
+        person = proxy.get_person_from_handle(self.handle)
+        self.assertIs(proxy.get_person_from_handle(self.handle), person)
+        self.__set_gramps_id('I0002')
+        self.assertEqual(self.__get_gramps_id(proxy), 'I0002')
+        self.db.undo()
+        self.assertEqual(self.__get_gramps_id(proxy), 'I0001')
+        stats = proxy.get_cache_statistics()['Person']
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+
+
+class DbUndoTest(MemoryDbTest):
+    '''
+    Tests the undo history.
+    '''
+
+    def setUp(self):
+        self.history = config.get('database.undo-history')
+        config.set('database.undo-history', 2)
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        config.set('database.undo-history', self.history)
+
+    def __add_person(self, gramps_id):
+        with DbTxn('Add person', self.db) as trans:
+            person = Person()
+            person.set_gramps_id(gramps_id)
+            return self.db.add_person(person, trans)
+
+    def test_history(self):
+        handles = [self.__add_person('I%04d' % index) for index in range(4)]
+        undodb = self.db.get_undodb()
+        self.assertEqual(undodb.undo_count, 2)
+        self.assertEqual(len(undodb.offsets), 2)
+        self.assertRaises(IndexError, undodb.__getitem__, 0)
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.undo())
+        self.assertEqual(set(self.db.get_person_handles()), set(handles[:2]))
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.db.get_person_from_handle(handles[2]).gramps_id,
+                         'I0002')
+
+    def test_clear(self):
+        self.__add_person('I0000')
+        undodb = self.db.get_undodb()
+        undodb.clear()
+        self.assertEqual(undodb.size, 0)
+        self.assertFalse(self.db.undo())
+        handle = self.__add_person('I0001')
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.has_person_handle(handle))
+
+    def test_setitem(self):
+        undodb = self.db.get_undodb()
+        first = undodb.append(b'first')
+        second = undodb.append(b'second')
+        undodb[first] = b'changed'
+        self.assertEqual(undodb[first], b'changed')
+        self.assertEqual(undodb[second], b'second')
+        # The old records are dropped when they fill most of the file
+        for count in range(3):
+            undodb[second] = b'second %d' % count
+            self.assertLess(undodb.size - undodb.used, undodb.used)
+        self.assertEqual(undodb[first], b'changed')
+        self.assertEqual(undodb[second], b'second 2')
+        self.assertRaises(IndexError, undodb.__setitem__, second + 1, b'')
+
+class DbKinshipTest(MemoryDbTest):
+    '''
+    Tests the updates of the kinship graph.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.handles = []
+        with DbTxn('Add people', self.db) as trans:
+            for index in range(3):
+                person = Person()
+                person.set_gramps_id('I%04d' % index)
+                self.handles.append(self.db.add_person(person, trans))
+        self.__add_family(0, 1)
+
+    def __add_family(self, father, child):
+        with DbTxn('Add family', self.db) as trans:
+            family = Family()
+            father = self.db.get_person_from_handle(self.handles[father])
+            family.set_father_handle(father.handle)
+            self.db.add_family(family, trans)
+            father.add_family_handle(family.handle)
+            self.db.commit_person(father, trans)
+            child = self.db.get_person_from_handle(self.handles[child])
+            self.db.add_child_to_family(family, child, trans=trans)
+        return family.handle
+
+    def __get_ancestors(self, index):
+        graph = self.db.get_kinship_graph()
+        return graph.get_ancestors(self.handles[index], inclusive=False)
+
+    def test_build(self):
+        self.assertEqual(self.__get_ancestors(1), {self.handles[0]})
+        self.assertEqual(self.__get_ancestors(0), set())
+        graph = self.db.get_kinship_graph()
+        self.assertEqual(graph.get_descendants(self.handles[0]),
+                         {self.handles[0], self.handles[1]})
+
+    def test_commit(self):
+        self.__get_ancestors(2)
+        self.__add_family(1, 2)
+        self.assertEqual(self.__get_ancestors(2),
+                         {self.handles[0], self.handles[1]})
+        self.db.undo()
+        self.assertEqual(self.__get_ancestors(2), set())
+        self.db.redo()
+        self.assertEqual(self.__get_ancestors(2),
+                         {self.handles[0], self.handles[1]})
+
+    def test_remove(self):
+        self.__get_ancestors(1)
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(self.handles[0], trans)
+        self.assertEqual(self.__get_ancestors(1), set())
+
+    def test_proxy(self):
+        self.assertIsNone(PrivateProxyDb(self.db).get_kinship_graph())
+
+
+class DbLifespanTest(MemoryDbTest):
+    '''
+    Tests the updates of the lifespan table.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        with DbTxn('Add people', self.db) as trans:
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            event.set_date_object(Date(1800))
+            self.db.add_event(event, trans)
+            sibling = Person()
+            ref = EventRef()
+            ref.ref = event.handle
+            sibling.add_event_ref(ref)
+            sibling.set_birth_ref(ref)
+            child = Person()
+            family = Family()
+            self.db.add_family(family, trans)
+            for person in (sibling, child):
+                self.db.add_person(person, trans)
+                self.db.add_child_to_family(family, person, trans=trans)
+        self.event = event.handle
+        self.sibling = sibling.handle
+        self.child = child.handle
+
+    def __set_year(self, year):
+        with DbTxn('Edit event', self.db) as trans:
+            event = self.db.get_event_from_handle(self.event)
+            event.set_date_object(Date(year))
+            self.db.commit_event(event, trans)
+
+    def test_estimate(self):
+        self.assertFalse(is_probably_alive(self.child, self.db))
+        child = self.db.get_person_from_handle(self.child)
+        self.assertFalse(probably_alive(child, self.db))
+        result, birth, death, explain, other = probably_alive(
+            child, self.db, return_range=True)
+        self.assertEqual(explain, 'sibling birth date')
+        self.assertEqual(birth.get_year(), 1800 - 20)
+        self.assertTrue(self.db.get_lifespan_table().ranges)
+
+    def test_commit(self):
+        self.assertFalse(is_probably_alive(self.child, self.db))
+        self.__set_year(2000)
+        self.assertTrue(is_probably_alive(self.child, self.db))
+        self.db.undo()
+        self.assertFalse(is_probably_alive(self.child, self.db))
+
+    def test_person(self):
+        self.assertFalse(is_probably_alive(self.child, self.db))
+        with DbTxn('Edit person', self.db) as trans:
+            sibling = self.db.get_person_from_handle(self.sibling)
+            sibling.set_event_ref_list([])
+            sibling.set_birth_ref(None)
+            self.db.commit_person(sibling, trans)
+        self.assertTrue(is_probably_alive(self.child, self.db))
+
+    def test_proxy(self):
+        self.assertIsNone(PrivateProxyDb(self.db).get_lifespan_table())
+
+class DbStatisticsTest(MemoryDbTest):
+    '''
+    Tests the updates of the tree statistics.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        with DbTxn('Add people', self.db) as trans:
+            people = []
+            for year, gender in ((1800, Person.MALE), (1830, Person.FEMALE)):
+                event = Event()
+                event.set_type(EventType.BIRTH)
+                event.set_date_object(Date(year))
+                self.db.add_event(event, trans)
+                person = Person()
+                person.set_gender(gender)
+                name = person.get_primary_name()
+                name.set_first_name('John Henry')
+                name.add_surname(Surname())
+                name.get_primary_surname().set_surname('Smith')
+                ref = EventRef()
+                ref.ref = event.handle
+                person.add_event_ref(ref)
+                person.set_birth_ref(ref)
+                self.db.add_person(person, trans)
+                people.append(person)
+            father, child = people
+            family = Family()
+            family.set_father_handle(father.handle)
+            self.db.add_family(family, trans)
+            father.add_family_handle(family.handle)
+            self.db.commit_person(father, trans)
+            self.db.add_child_to_family(family, child, trans=trans)
+        self.father = father.handle
+        self.child = child.handle
+        self.stats = self.db.get_tree_statistics()
+
+    def test_summary(self):
+        summary = self.stats.get_people_summary()
+        self.assertEqual(summary['people'], 2)
+        self.assertEqual(summary['males'], 1)
+        self.assertEqual(summary['females'], 1)
+        self.assertEqual(summary['incomplete_names'], 0)
+        self.assertEqual(summary['missing_births'], 0)
+        self.assertEqual(summary['disconnected'], 0)
+        self.assertEqual(summary['unique_surnames'], 1)
+        self.assertEqual(self.stats.get_surname_counts()['Smith'][0], 2)
+        self.assertEqual(self.stats.get_given_name_counts(),
+                         {'John': 2, 'Henry': 2})
+        fathers, mothers = self.stats.get_parent_age_distributions()
+        self.assertEqual(fathers, {30: [self.father]})
+        self.assertFalse(mothers)
+
+    def test_commit(self):
+        self.stats.get_people_summary()
+        with DbTxn('Edit person', self.db) as trans:
+            child = self.db.get_person_from_handle(self.child)
+            child.set_gender(Person.MALE)
+            child.get_primary_name().set_first_name('')
+            child.get_primary_name().get_primary_surname().set_surname(
+                'Jones')
+            self.db.commit_person(child, trans)
+            event = self.db.get_event_from_handle(child.get_birth_ref().ref)
+            event.set_date_object(Date())
+            self.db.commit_event(event, trans)
+        summary = self.stats.get_people_summary()
+        self.assertEqual(summary['males'], 2)
+        self.assertEqual(summary['incomplete_names'], 1)
+        self.assertEqual(summary['missing_births'], 1)
+        self.assertEqual(summary['unique_surnames'], 2)
+        self.assertEqual(self.stats.get_given_name_counts(),
+                         {'John': 1, 'Henry': 1})
+        self.assertFalse(self.stats.get_parent_age_distributions()[0])
+        self.db.undo()
+        self.assertEqual(self.stats.get_people_summary()['males'], 1)
+        self.assertEqual(self.stats.get_surname_counts()['Smith'][0], 2)
+
+    def test_remove(self):
+        self.stats.get_people_summary()
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(self.child, trans)
+        self.assertEqual(self.stats.get_gender_counts(), (1, 0, 0))
+        self.assertEqual(self.stats.get_surname_counts(),
+                         {'Smith': (1, self.father)})
+
+    def test_media_summary(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'photo.jpg')
+            with open(path, 'wb') as media_file:
+                media_file.write(b'1234')
+            with DbTxn('Add media', self.db) as trans:
+                media = Media()
+                media.set_path(path)
+                self.db.add_media(media, trans)
+            self.assertEqual(self.stats.get_media_summary(), (1, 4, []))
+            # The files are measured again on each call:
+            with open(path, 'ab') as media_file:
+                media_file.write(b'5678')
+            self.assertEqual(self.stats.get_media_summary(), (1, 8, []))
+            os.remove(path)
+            self.assertEqual(self.stats.get_media_summary(), (1, 0, [path]))
+            with open(path, 'wb') as media_file:
+                media_file.write(b'12')
+            self.assertEqual(self.stats.get_media_summary(), (1, 2, []))
+
+    def test_proxy(self):
+        self.assertIsNone(PrivateProxyDb(self.db).get_tree_statistics())
+
+class DbCompiledProxyTest(MemoryDbTest):
+    '''
+    Tests the proxy that serves the objects of a chain of proxies.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        with DbTxn('Add people', self.db) as trans:
+            event = Event()
+            event.set_privacy(True)
+            self.db.add_event(event, trans)
+            self.handles = []
+            for index in range(3):
+                person = Person()
+                person.set_gramps_id('I%04d' % index)
+                person.set_privacy(index == 1)
+                ref = EventRef()
+                ref.ref = event.handle
+                person.add_event_ref(ref)
+                self.handles.append(self.db.add_person(person, trans))
+
+    def test_objects(self):
+        chain = PrivateProxyDb(self.db)
+        proxy = CompiledProxyDb(chain)
+        person = proxy.get_person_from_handle(self.handles[0])
+        self.assertEqual(person.serialize(),
+                         chain.get_person_from_handle(self.handles[0]
+                                                     ).serialize())
+        self.assertEqual(person.get_event_ref_list(), [])
+        person.set_gramps_id('I0009')
+        person = proxy.get_person_from_handle(self.handles[0])
+        self.assertEqual(person.get_gramps_id(), 'I0000')
+        self.assertIsNone(proxy.get_person_from_handle(self.handles[1]))
+        self.assertFalse(proxy.has_person_handle(self.handles[1]))
+        self.assertTrue(proxy.has_person_handle(self.handles[2]))
+        stats = proxy.get_cache_statistics()['Person']
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 3)
+
+    def test_handles(self):
+        proxy = CompiledProxyDb(PrivateProxyDb(self.db))
+        self.assertEqual(set(proxy.iter_person_handles()),
+                         {self.handles[0], self.handles[2]})
+        self.assertEqual(proxy.get_number_of_people(), 2)
+        self.assertEqual([person.gramps_id for person in proxy.iter_people()],
+                         ['I0000', 'I0002'])
+        self.assertEqual(proxy.get_number_of_events(), 0)
+        self.assertFalse(proxy.has_person_handle(self.handles[1]))
+        self.assertFalse(proxy.has_person_handle('missing'))
+
+    def test_raw_data(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertEqual(proxy.get_raw_person_data(self.handles[0]),
+                         proxy.get_person_from_handle(self.handles[0]
+                                                     ).serialize())
+        self.assertIsNone(proxy.get_raw_person_data(self.handles[1]))
+
+class DbSortKeyTest(MemoryDbTest):
+    '''
+    Tests the sort key columns.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.surnames = ['Zoë', 'adams', 'Émile', 'Baker', '']
+        with DbTxn('Add people', self.db) as trans:
+            for surname in self.surnames:
+                person = Person()
+                person.get_primary_name().add_surname(Surname())
+                person.get_primary_name().get_primary_surname().set_surname(
+                    surname)
+                self.db.add_person(person, trans)
+
+    def __surnames(self):
+        return [self.db.get_person_from_handle(handle).get_primary_name(
+                    ).get_surname()
+                for handle in self.db.get_person_handles(sort_handles=True)]
+
+    def test_sort(self):
+        self.assertEqual(self.__surnames(),
+                         sorted(self.surnames, key=glocale.sort_key))
+
+    def test_rebuild(self):
+        self.db._set_metadata('sort_key_locale', 'other')
+        self.db._load_sort_keys()
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("UPDATE person SET surname_key = NULL")
+        self.db.dbapi.commit()
+        self.assertEqual(self.__surnames(),
+                         sorted(self.surnames, key=glocale.sort_key))
+        self.assertEqual(self.db._get_metadata('sort_key_locale'),
+                         glocale.get_collation())
+
+    def test_other_locale(self):
+        self.db._set_metadata('sort_key_locale', 'other')
+        self.db._load_sort_keys()
+        with DbTxn('Add person', self.db) as trans:
+            person = Person()
+            person.get_primary_name().add_surname(Surname())
+            person.get_primary_name().get_primary_surname().set_surname(
+                'Carter')
+            self.db.add_person(person, trans)
+        self.surnames.append('Carter')
+        self.assertEqual(self.db._get_metadata('sort_key_locale'), '')
+        self.assertEqual(self.__surnames(),
+                         sorted(self.surnames, key=glocale.sort_key))
+        self.assertEqual(self.db._get_metadata('sort_key_locale'),
+                         glocale.get_collation())
+
+    def test_window(self):
+        descriptions = ['Death', 'burial', 'Birth', 'Death']
+        with DbTxn('Add events', self.db) as trans:
+            for description in descriptions:
+                event = Event()
+                event.set_description(description)
+                self.db.add_event(event, trans)
+        keys = self.db.get_sort_keys('Event', 0, 10)
+        self.assertEqual(
+            [self.db.get_event_from_handle(handle).get_description()
+             for dummy, handle in keys],
+            sorted(descriptions, key=glocale.sort_key))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(self.db.get_sort_keys('Event', 1, 3), keys[1:3])
+        for index, (dummy, handle) in enumerate(keys):
+            self.assertEqual(
+                self.db.get_sort_key_position('Event', handle), index)
+        self.assertIsNone(self.db.get_sort_key_position('Event', 'X'))
+        self.assertIsNone(self.db.get_sort_keys('Person', 0, 10))
+
+    def test_column_values(self):
+        rows = self.db.get_column_values('Person', ['gramps_id', 'surname'])
+        self.assertEqual(
+            sorted(rows),
+            sorted((handle, person.gramps_id,
+                    person.get_primary_name().get_surname())
+                   for handle, person in (
+                       (handle, self.db.get_person_from_handle(handle))
+                       for handle in self.db.get_person_handles())))
+
+
+class DbTextIndexTest(MemoryDbTest):
+    '''
+    Tests the full-text index.
+    '''
+
+    def setUp(self):
+        super().setUp()
+        with DbTxn('Add objects', self.db) as trans:
+            note = Note()
+            note.set('The Straße near the church')
+            self.db.add_note(note, trans)
+            person = Person()
+            person.get_primary_name().set_first_name('Johannes')
+            self.db.add_person(person, trans)
+        self.note = note.handle
+        self.person = person.handle
+
+    def test_search(self):
+        self.assertEqual(self.db.search_text('Note', 'text', 'CHURCH'),
+                         {self.note})
+        self.assertEqual(self.db.search_text('Note', 'text', 'strasse'),
+                         {self.note})
+        self.assertEqual(self.db.search_text('Note', 'text', 'near churches'),
+                         set())
+        self.assertEqual(self.db.search_text('Person', 'text', 'Hann, Smith'),
+                         set())
+        self.assertEqual(self.db.search_text('Person', 'text', 'hann'),
+                         {self.person})
+        self.assertEqual(self.db.search_text('Person', 'gramps_id', 'i00'),
+                         {self.person})
+        self.assertIsNone(self.db.search_text('Note', 'text', 'a b'))
+        self.assertIsNone(self.db.search_text('Family', 'text', 'church'))
+
+    def test_commit(self):
+        with DbTxn('Edit note', self.db) as trans:
+            note = self.db.get_note_from_handle(self.note)
+            note.set('The chapel')
+            self.db.commit_note(note, trans)
+        self.assertEqual(self.db.search_text('Note', 'text', 'church'), set())
+        self.db.undo()
+        self.assertEqual(self.db.search_text('Note', 'text', 'church'),
+                         {self.note})
+        with DbTxn('Remove note', self.db) as trans:
+            self.db.remove_note(self.note, trans)
+        self.assertEqual(self.db.search_text('Note', 'text', 'church'), set())
+
+    def test_rows(self):
+        for index in range(3):
+            with DbTxn('Edit note', self.db) as trans:
+                note = self.db.get_note_from_handle(self.note)
+                note.set('The chapel %d' % index)
+                self.db.commit_note(note, trans)
+        self.db.dbapi.execute("SELECT note_text.rowid, handle "
+                              "FROM note_text JOIN note_text_handle "
+                              "ON note_text.rowid = id")
+        self.assertEqual([row[1] for row in self.db.dbapi.fetchall()],
+                         [self.note])
+
+    def test_rebuild(self):
+        percents = []
+        self.db.rebuild_text_index(percents.append)
+        self.assertEqual(percents, [50, 100])
+        self.assertEqual(self.db.search_text('Note', 'text', 'church'),
+                         {self.note})
+        self.assertEqual(self.db.search_text('Person', 'text', 'hann'),
+                         {self.person})
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertIsNone(proxy.search_text('Note', 'text', 'church'))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -38,7 +38,11 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+from threading import Thread
 from xml.sax.saxutils import escape
 
 #------------------------------------------------------------------------
@@ -57,7 +61,9 @@ LOG = logging.getLogger(".WriteXML")
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from gramps.gen.const import URL_HOMEPAGE
-from gramps.gen.lib import Date, Person
+from gramps.gen.lib import (Date, Person, Family, Event, Citation, Source,
+                            Place, Media, Repository, Note, Tag)
+from gramps.gen.config import config
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.version import VERSION
@@ -87,6 +93,112 @@ def escxml(d):
                    '>' : '&gt;',
                    }) if d else ""
 
+# Number of objects written to XML together, in a worker process
+CHUNK_SIZE = 500
+# Number of characters collected before they are compressed and written
+BUFFER_SIZE = 1 << 20
+# Number of buffers waiting to be compressed and written
+QUEUE_SIZE = 8
+
+# The classes of the primary objects and the methods that write them
+CLASSES = {obj_class.__name__: obj_class
+           for obj_class in (Tag, Event, Person, Family, Citation, Source,
+                             Place, Media, Repository, Note)}
+WRITE_METHODS = {
+    "Tag": "write_tag",
+    "Event": "write_event",
+    "Person": "write_person",
+    "Family": "write_family",
+    "Citation": "write_citation",
+    "Source": "write_source",
+    "Place": "write_place_obj",
+    "Media": "write_object",
+    "Repository": "write_repository",
+    "Note": "write_note",
+    }
+
+def write_objects(class_name, strip_photos, rows):
+    """
+    Return the XML of a list of objects of one class, given as raw data.
+
+    This is a module level function so that it can be run in a worker
+    process.
+    """
+    writer = GrampsXmlWriter(None, strip_photos)
+    writer.g = io.StringIO()
+    obj_class = CLASSES[class_name]
+    write = getattr(writer, WRITE_METHODS[class_name])
+    for data in rows:
+        write(obj_class.create(data), 2)
+    return writer.g.getvalue()
+
+#-------------------------------------------------------------------------
+#
+# ThreadedWriter
+#
+#-------------------------------------------------------------------------
+class ThreadedWriter:
+    """
+    Collect text into large buffers, and encode and write them to a binary
+    file in a separate thread, so that the compression of a gzip file runs
+    while the next objects are being written.
+
+    The thread is started when the first buffer is full.
+    """
+    def __init__(self, ofile):
+        self.ofile = ofile
+        self.buffer = []
+        self.size = 0
+        self.error = None
+        self.queue = Queue(QUEUE_SIZE)
+        self.thread = None
+
+    def __run(self):
+        data = self.queue.get()
+        while data is not None:
+            if self.error is None:
+                try:
+                    self.ofile.write(data.encode('utf8'))
+                except Exception as err:
+                    self.error = err
+            data = self.queue.get()
+
+    def write(self, text):
+        """
+        Write a string.
+        """
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Pass the collected text to the writing thread.
+        """
+        if self.error is not None:
+            raise self.error
+        if self.buffer:
+            if self.thread is None:
+                self.thread = Thread(target=self.__run, daemon=True)
+                self.thread.start()
+            self.queue.put(''.join(self.buffer))
+            self.buffer = []
+            self.size = 0
+
+    def close(self):
+        """
+        Write the remaining text and wait for the thread to finish.
+        """
+        try:
+            self.flush()
+        finally:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+        if self.error is not None:
+            raise self.error
+
 #-------------------------------------------------------------------------
 #
 #
@@ -109,7 +221,7 @@ class GrampsXmlWriter(UpdateCallback):
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
         """
-        UpdateCallback.__init__(self, user.callback)
+        UpdateCallback.__init__(self, user.callback if user else None)
         self.user = user
         self.compress = compress
         if not _gzip_ok:
@@ -174,9 +286,11 @@ class GrampsXmlWriter(UpdateCallback):
                                         str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = ThreadedWriter(g)
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
         if filename != '-':
             g.close()
         return 1
@@ -194,9 +308,11 @@ class GrampsXmlWriter(UpdateCallback):
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = ThreadedWriter(g)
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
         g.close()
         return 1
 
@@ -253,103 +369,66 @@ class GrampsXmlWriter(UpdateCallback):
         # by the time we get to person's names
         self.write_name_formats()
 
-        # Write table objects
-        if tag_len > 0:
-            self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
-                self.update()
-            self.g.write("  </tags>\n")
-
-        # Write primary objects
-        if event_len > 0:
-            self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event,2)
-                self.update()
-            self.g.write("  </events>\n")
-
-        if person_len > 0:
-            self.g.write("  <people")
-            person = self.db.get_default_person()
-            if person:
-                self.g.write(' home="_%s"' % person.handle)
-            self.g.write('>\n')
-
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
-                self.update()
-            self.g.write("  </people>\n")
-
-        if family_len > 0:
-            self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family,2)
-                self.update()
-            self.g.write("  </families>\n")
-
-        if citation_len > 0:
-            self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation,2)
-                self.update()
-            self.g.write("  </citations>\n")
-
-        if source_len > 0:
-            self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source,2)
-                self.update()
-            self.g.write("  </sources>\n")
-
-        if place_len > 0:
-            self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place,2)
-                self.update()
-            self.g.write("  </places>\n")
-
-        if obj_len > 0:
-            self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj,2)
-                self.update()
-            self.g.write("  </objects>\n")
-
-        if repo_len > 0:
-            self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo,2)
-                self.update()
-            self.g.write("  </repositories>\n")
-
-        if note_len > 0:
-            self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
-            self.g.write("  </notes>\n")
+        # Write table objects, then primary objects
+        sections = (
+            ("tags", "Tag", tag_len,
+             self.db.get_tag_handles, self.db.get_raw_tag_data),
+            ("events", "Event", event_len,
+             self.db.get_event_handles, self.db.get_raw_event_data),
+            ("people", "Person", person_len,
+             self.db.get_person_handles, self.db.get_raw_person_data),
+            ("families", "Family", family_len,
+             self.db.get_family_handles, self.db.get_raw_family_data),
+            ("citations", "Citation", citation_len,
+             self.db.get_citation_handles, self.db.get_raw_citation_data),
+            ("sources", "Source", source_len,
+             self.db.get_source_handles, self.db.get_raw_source_data),
+            ("places", "Place", place_len,
+             self.db.get_place_handles, self.db.get_raw_place_data),
+            ("objects", "Media", obj_len,
+             self.db.get_media_handles, self.db.get_raw_media_data),
+            ("repositories", "Repository", repo_len,
+             self.db.get_repository_handles,
+             self.db.get_raw_repository_data),
+            ("notes", "Note", note_len,
+             self.db.get_note_handles, self.db.get_raw_note_data),
+            )
+        processes = (config.get('export.xml-processes') or
+                     os.cpu_count() or 1)
+        pool = None
+        if processes > 1 and max(section[2] for section in sections) > (
+                CHUNK_SIZE):
+            # The workers are started now, while the header is still
+            # buffered, so that they are not forked from a process that is
+            # already running the writing thread.
+            try:
+                pool = ProcessPoolExecutor(processes)
+                for future in [pool.submit(os.getpid)
+                               for dummy in range(processes)]:
+                    future.result()
+            except (OSError, ImportError, NotImplementedError) as err:
+                LOG.warning("Cannot start worker processes: %s", err)
+                if pool is not None:
+                    pool.shutdown()
+                    pool = None
+                processes = 1
+        self.written = 0
+        try:
+            for element, class_name, length, get_handles, get_raw in sections:
+                if length == 0:
+                    continue
+                self.g.write("  <%s" % element)
+                if element == "people":
+                    person = self.db.get_default_person()
+                    if person:
+                        self.g.write(' home="_%s"' % person.handle)
+                self.g.write('>\n')
+                self.write_section(class_name, sorted(get_handles()), get_raw,
+                                   pool, processes)
+                self.g.write("  </%s>\n" % element)
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         # Data is written, now write bookmarks.
         self.write_bookmarks()
@@ -360,6 +439,36 @@ class GrampsXmlWriter(UpdateCallback):
 #        self.status.end()
 #        self.status = None
 
+    def write_section(self, class_name, handles, get_raw, pool, processes):
+        """
+        Write the objects of one class, in the order of their handles.
+
+        The objects are read as raw data in chunks, and each chunk is written
+        to XML by :func:`write_objects`, in a worker process if there is a
+        pool. The chunks are written out in order as they are done.
+        """
+        pending = deque()
+        for start in range(0, len(handles), CHUNK_SIZE):
+            rows = []
+            for handle in handles[start:start + CHUNK_SIZE]:
+                data = get_raw(handle)
+                if data:
+                    rows.append(data)
+            if pool is None:
+                self.g.write(write_objects(class_name, self.strip_photos,
+                                           rows))
+            else:
+                # Keep a bounded number of chunks in flight, so that the
+                # table is streamed rather than read into memory.
+                pending.append(pool.submit(write_objects, class_name,
+                                           self.strip_photos, rows))
+                if len(pending) > 2 * processes:
+                    self.g.write(pending.popleft().result())
+            self.written += len(rows)
+            self.update(self.written)
+        while pending:
+            self.g.write(pending.popleft().result())
+
     def write_metadata(self):
         """ Method to write out metadata of the database
         """
@@ -87,6 +87,10 @@ class AgeStatsGramplet(Gramplet):
         self.update()
 
     def db_changed(self):
+        for signal in ('person-add', 'person-update', 'person-delete',
+                       'family-update', 'event-update', 'person-rebuild',
+                       'family-rebuild'):
+            self.connect(self.dbstate.db, signal, self.update)
         self.update()
 
     def main(self):
@@ -99,78 +103,93 @@ class AgeStatsGramplet(Gramplet):
         father_handles = [[] for i in range(self.max_father_diff)]
         text = ""
         count = 0
-        for p in self.dbstate.db.iter_people():
-            if count % 300 == 0:
-                yield True
-            # if birth_date and death_date, compute age
-            birth_ref = p.get_birth_ref()
-            birth_date = None
-            if birth_ref:
-                birth_event = self.dbstate.db.get_event_from_handle(birth_ref.ref)
-                birth_date = birth_event.get_date_object()
-            death_ref = p.get_death_ref()
-            death_date = None
-            if death_ref:
-                death_event = self.dbstate.db.get_event_from_handle(death_ref.ref)
-                death_date = death_event.get_date_object()
-            if death_date and birth_date and birth_date.get_year() != 0:
-                age = death_date.get_year() - birth_date.get_year()
-                if age >= 0 and age < self.max_age:
-                    age_dict[age] += 1
-                    age_handles[age].append(p.handle)
-                #else:
-                #    print "Age out of range: %d for %s" % (age,
-                #                                           p.get_primary_name().get_first_name()
-                #                                           + " " + p.get_primary_name().get_surname())
-            # for each parent m/f:
-            family_list = p.get_parent_family_handle_list()
-            for family_handle in family_list:
-                family = self.dbstate.db.get_family_from_handle(family_handle)
-                if family:
-                    childrel = [(ref.get_mother_relation(),
-                                 ref.get_father_relation()) for ref in
-                                family.get_child_ref_list()
-                                if ref.ref == p.handle] # get first, if more than one
-                    if childrel[0][0] == ChildRefType.BIRTH:
-                        m_handle = family.get_mother_handle()
-                    else:
-                        m_handle = None
-                    if childrel[0][1] == ChildRefType.BIRTH:
-                        f_handle = family.get_father_handle()
-                    else:
-                        f_handle = None
-                    # if they have a birth_date, compute difference each m/f
-                    if f_handle:
-                        f = self.dbstate.db.get_person_from_handle(f_handle)
-                        bref = f.get_birth_ref()
-                        if bref:
-                            bevent = self.dbstate.db.get_event_from_handle(bref.ref)
-                            bdate = bevent.get_date_object()
-                            if bdate and birth_date and birth_date.get_year() != 0:
-                                diff = birth_date.get_year() - bdate.get_year()
-                                if diff >= 0 and diff < self.max_father_diff:
-                                    father_dict[diff] += 1
-                                    father_handles[diff].append(f_handle)
-                                #else:
-                                #    print "Father diff out of range: %d for %s" % (diff,
-                                #                                                   p.get_primary_name().get_first_name()
-                                #                                                   + " " + p.get_primary_name().get_surname())
-                    if m_handle:
-                        m = self.dbstate.db.get_person_from_handle(m_handle)
-                        bref = m.get_birth_ref()
-                        if bref:
-                            bevent = self.dbstate.db.get_event_from_handle(bref.ref)
-                            bdate = bevent.get_date_object()
-                            if bdate and birth_date and birth_date.get_year() != 0:
-                                diff = birth_date.get_year() - bdate.get_year()
-                                if diff >= 0 and diff < self.max_mother_diff:
-                                    mother_dict[diff] += 1
-                                    mother_handles[diff].append(m_handle)
-                                #else:
-                                #    print "Mother diff out of range: %d for %s" % (diff,
-                                #                                                   p.get_primary_name().get_first_name()
-                                #                                                   + " " + p.get_primary_name().get_surname())
-            count += 1
+        stats = self.dbstate.db.get_tree_statistics()
+        if stats is not None:
+            fathers, mothers = stats.get_parent_age_distributions()
+            for values, max_value, counts, value_handles in (
+                    (stats.get_age_distribution(), self.max_age,
+                     age_dict, age_handles),
+                    (fathers, self.max_father_diff,
+                     father_dict, father_handles),
+                    (mothers, self.max_mother_diff,
+                     mother_dict, mother_handles)):
+                for value, handles in values.items():
+                    if value >= 0 and value < max_value:
+                        counts[value] = len(handles)
+                        value_handles[value].extend(handles)
+        else:
+            for p in self.dbstate.db.iter_people():
+                if count % 300 == 0:
+                    yield True
+                # if birth_date and death_date, compute age
+                birth_ref = p.get_birth_ref()
+                birth_date = None
+                if birth_ref:
+                    birth_event = self.dbstate.db.get_event_from_handle(birth_ref.ref)
+                    birth_date = birth_event.get_date_object()
+                death_ref = p.get_death_ref()
+                death_date = None
+                if death_ref:
+                    death_event = self.dbstate.db.get_event_from_handle(death_ref.ref)
+                    death_date = death_event.get_date_object()
+                if death_date and birth_date and birth_date.get_year() != 0:
+                    age = death_date.get_year() - birth_date.get_year()
+                    if age >= 0 and age < self.max_age:
+                        age_dict[age] += 1
+                        age_handles[age].append(p.handle)
+                    #else:
+                    #    print "Age out of range: %d for %s" % (age,
+                    #                                           p.get_primary_name().get_first_name()
+                    #                                           + " " + p.get_primary_name().get_surname())
+                # for each parent m/f:
+                family_list = p.get_parent_family_handle_list()
+                for family_handle in family_list:
+                    family = self.dbstate.db.get_family_from_handle(family_handle)
+                    if family:
+                        childrel = [(ref.get_mother_relation(),
+                                     ref.get_father_relation()) for ref in
+                                    family.get_child_ref_list()
+                                    if ref.ref == p.handle] # get first, if more than one
+                        if childrel[0][0] == ChildRefType.BIRTH:
+                            m_handle = family.get_mother_handle()
+                        else:
+                            m_handle = None
+                        if childrel[0][1] == ChildRefType.BIRTH:
+                            f_handle = family.get_father_handle()
+                        else:
+                            f_handle = None
+                        # if they have a birth_date, compute difference each m/f
+                        if f_handle:
+                            f = self.dbstate.db.get_person_from_handle(f_handle)
+                            bref = f.get_birth_ref()
+                            if bref:
+                                bevent = self.dbstate.db.get_event_from_handle(bref.ref)
+                                bdate = bevent.get_date_object()
+                                if bdate and birth_date and birth_date.get_year() != 0:
+                                    diff = birth_date.get_year() - bdate.get_year()
+                                    if diff >= 0 and diff < self.max_father_diff:
+                                        father_dict[diff] += 1
+                                        father_handles[diff].append(f_handle)
+                                    #else:
+                                    #    print "Father diff out of range: %d for %s" % (diff,
+                                    #                                                   p.get_primary_name().get_first_name()
+                                    #                                                   + " " + p.get_primary_name().get_surname())
+                        if m_handle:
+                            m = self.dbstate.db.get_person_from_handle(m_handle)
+                            bref = m.get_birth_ref()
+                            if bref:
+                                bevent = self.dbstate.db.get_event_from_handle(bref.ref)
+                                bdate = bevent.get_date_object()
+                                if bdate and birth_date and birth_date.get_year() != 0:
+                                    diff = birth_date.get_year() - bdate.get_year()
+                                    if diff >= 0 and diff < self.max_mother_diff:
+                                        mother_dict[diff] += 1
+                                        mother_handles[diff].append(m_handle)
+                                    #else:
+                                    #    print "Mother diff out of range: %d for %s" % (diff,
+                                    #                                                   p.get_primary_name().get_first_name()
+                                    #                                                   + " " + p.get_primary_name().get_surname())
+                count += 1
         width = self.chart_width
         graph_width = width - 8
         self.create_bargraph(age_dict, age_handles, _("Lifespan Age Distribution"), _("Age"), graph_width, 5, self.max_age)
@@ -73,22 +73,27 @@ class GivenNameCloudGramplet(Gramplet):
         representative_handle = {}
 
         cnt = 0
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set(name.get_first_name().strip() for name in allnames)
-            for givenname in allnames:
-                nbsp = givenname.split('\u00A0')
-                if len(nbsp) > 1: # there was an NBSP, a non-breaking space
-                    first_two = nbsp[0] + '\u00A0' + nbsp[1].split()[0]
-                    givensubnames[first_two] += 1
-                    representative_handle[first_two] = person.handle
-                    givenname = ' '.join(nbsp[1].split()[1:])
-                for givensubname in givenname.split():
-                    givensubnames[givensubname] += 1
-                    representative_handle[givensubname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        stats = self.dbstate.db.get_tree_statistics()
+        if stats is not None:
+            givensubnames.update(stats.get_given_name_counts())
+            cnt = stats.get_number_of_people()
+        else:
+            for person in self.dbstate.db.iter_people():
+                allnames = [person.get_primary_name()] + person.get_alternate_names()
+                allnames = set(name.get_first_name().strip() for name in allnames)
+                for givenname in allnames:
+                    nbsp = givenname.split('\u00A0')
+                    if len(nbsp) > 1: # there was an NBSP, a non-breaking space
+                        first_two = nbsp[0] + '\u00A0' + nbsp[1].split()[0]
+                        givensubnames[first_two] += 1
+                        representative_handle[first_two] = person.handle
+                        givenname = ' '.join(nbsp[1].split()[1:])
+                    for givensubname in givenname.split():
+                        givensubnames[givensubname] += 1
+                        representative_handle[givensubname] = person.handle
+                cnt += 1
+                if not cnt % _YIELD_INTERVAL:
+                    yield True
 
         total_people = cnt
         givensubname_sort = []
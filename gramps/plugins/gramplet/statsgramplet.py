@@ -64,106 +64,58 @@ class StatsGramplet(Gramplet):
         self.connect(self.dbstate.db, 'person-delete', self.update)
         self.connect(self.dbstate.db, 'family-add', self.update)
         self.connect(self.dbstate.db, 'family-delete', self.update)
+        self.connect(self.dbstate.db, 'event-update', self.update)
+        self.connect(self.dbstate.db, 'media-add', self.update)
+        self.connect(self.dbstate.db, 'media-update', self.update)
+        self.connect(self.dbstate.db, 'media-delete', self.update)
         self.connect(self.dbstate.db, 'person-rebuild', self.update)
         self.connect(self.dbstate.db, 'family-rebuild', self.update)
 
     def main(self):
         self.set_text(_("Processing..."))
         database = self.dbstate.db
-        personList = database.iter_people()
-
-        with_media = 0
-        total_media = 0
-        incomp_names = 0
-        disconnected = 0
-        missing_bday = 0
-        males = 0
-        females = 0
-        unknowns = 0
-        bytes_cnt = 0
-        notfound = []
-
-        mobjects = database.get_number_of_media()
-        mbytes = "0"
-        for media in database.iter_media():
-            fullname = media_path_full(database, media.get_path())
-            try:
-                bytes_cnt += os.path.getsize(fullname)
-                length = len(str(bytes_cnt))
-                if bytes_cnt <= 999999:
-                    mbytes = _("less than 1")
-                else:
-                    mbytes = str(bytes_cnt)[:(length - 6)]
-            except OSError:
-                notfound.append(media.get_path())
+        stats = database.get_tree_statistics()
+        if stats is None:
+            summary = yield from self.summarize_people(database)
+            mobjects, bytes_cnt, notfound = self.summarize_media(database)
+        else:
+            summary = stats.get_people_summary()
+            mobjects, bytes_cnt, notfound = stats.get_media_summary()
+        if mobjects == len(notfound):
+            mbytes = "0"
+        elif bytes_cnt <= 999999:
+            mbytes = _("less than 1")
+        else:
+            mbytes = str(bytes_cnt)[:-6]
 
-        for cnt, person in enumerate(personList):
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-                total_media += length
-
-            for name in ([person.get_primary_name()] +
-                         person.get_alternate_names()):
-
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
-                        incomp_names += 1
-
-            if (not person.get_main_parents_family_handle() and
-                    not person.get_family_handle_list()):
-                disconnected += 1
-
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = database.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            else:
-                unknowns += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
         self.clear_text()
         self.append_text(_("Individuals") + "\n")
         self.append_text("----------------------------\n")
         self.link(_("Number of individuals") + COLON,
                   'Filter', 'all people')
-        self.append_text(" %s" % database.get_number_of_people())
+        self.append_text(" %s" % summary['people'])
         self.append_text("\n")
         self.link(_("%s:") % _("Males"), 'Filter', 'males')
-        self.append_text(" %s" % males)
+        self.append_text(" %s" % summary['males'])
         self.append_text("\n")
         self.link(_("%s:") % _("Females"), 'Filter', 'females')
-        self.append_text(" %s" % females)
+        self.append_text(" %s" % summary['females'])
         self.append_text("\n")
         self.link(_("%s:") % _("Individuals with unknown gender"),
                   'Filter', 'people with unknown gender')
-        self.append_text(" %s" % unknowns)
+        self.append_text(" %s" % summary['unknown'])
         self.append_text("\n")
         self.link(_("%s:") % _("Incomplete names"),
                   'Filter', 'incomplete names')
-        self.append_text(" %s" % incomp_names)
+        self.append_text(" %s" % summary['incomplete_names'])
         self.append_text("\n")
         self.link(_("%s:") % _("Individuals missing birth dates"),
                   'Filter', 'people with missing birth dates')
-        self.append_text(" %s" % missing_bday)
+        self.append_text(" %s" % summary['missing_births'])
         self.append_text("\n")
         self.link(_("%s:") % _("Disconnected individuals"),
                   'Filter', 'disconnected people')
-        self.append_text(" %s" % disconnected)
+        self.append_text(" %s" % summary['disconnected'])
         self.append_text("\n")
         self.append_text("\n%s\n" % _("Family Information"))
         self.append_text("----------------------------\n")
@@ -180,11 +132,11 @@ class StatsGramplet(Gramplet):
         self.append_text("----------------------------\n")
         self.link(_("%s:") % _("Individuals with media objects"),
                   'Filter', 'people with media')
-        self.append_text(" %s" % with_media)
+        self.append_text(" %s" % summary['with_media'])
         self.append_text("\n")
         self.link(_("%s:") % _("Total number of media object references"),
                   'Filter', 'media references')
-        self.append_text(" %s" % total_media)
+        self.append_text(" %s" % summary['media_references'])
         self.append_text("\n")
         self.link(_("%s:") % _("Number of unique media objects"),
                   'Filter', 'unique media')
@@ -199,3 +151,71 @@ class StatsGramplet(Gramplet):
                   'Filter', 'missing media')
         self.append_text(" %s\n" % len(notfound))
         self.append_text("", scroll_to="begin")
+
+    def summarize_people(self, database):
+        """
+        Count the people of a database without statistics, yielding now and
+        then, and return the counts as
+        :py:meth:`.TreeStatistics.get_people_summary` does.
+        """
+        summary = dict.fromkeys(('people', 'males', 'females', 'unknown',
+                                 'incomplete_names', 'missing_births',
+                                 'disconnected', 'with_media',
+                                 'media_references'), 0)
+        for cnt, person in enumerate(database.iter_people()):
+            summary['people'] += 1
+            length = len(person.get_media_list())
+            if length > 0:
+                summary['with_media'] += 1
+                summary['media_references'] += length
+
+            for name in ([person.get_primary_name()] +
+                         person.get_alternate_names()):
+
+                if name.get_first_name().strip() == "":
+                    summary['incomplete_names'] += 1
+                else:
+                    if name.get_surname_list():
+                        for surname in name.get_surname_list():
+                            if surname.get_surname().strip() == "":
+                                summary['incomplete_names'] += 1
+                    else:
+                        summary['incomplete_names'] += 1
+
+            if (not person.get_main_parents_family_handle() and
+                    not person.get_family_handle_list()):
+                summary['disconnected'] += 1
+
+            birth_ref = person.get_birth_ref()
+            if birth_ref:
+                birth = database.get_event_from_handle(birth_ref.ref)
+                if not get_date(birth):
+                    summary['missing_births'] += 1
+            else:
+                summary['missing_births'] += 1
+
+            if person.get_gender() == Person.FEMALE:
+                summary['females'] += 1
+            elif person.get_gender() == Person.MALE:
+                summary['males'] += 1
+            else:
+                summary['unknown'] += 1
+            if not cnt % _YIELD_INTERVAL:
+                yield True
+        return summary
+
+    def summarize_media(self, database):
+        """
+        Return the number of media objects of a database without
+        statistics, the total size of their files and the paths of the
+        files that could not be found.
+        """
+        bytes_cnt = 0
+        notfound = []
+        for media in database.iter_media():
+            fullname = media_path_full(database, media.get_path())
+            try:
+                bytes_cnt += os.path.getsize(fullname)
+            except OSError:
+                notfound.append(media.get_path())
+        return database.get_number_of_media(), bytes_cnt, notfound
@@ -97,20 +97,29 @@ class SurnameCloudGramplet(Gramplet):
 
         cnt = 0
         namelist = []
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-            # Count unique surnames
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if not name.get_surname().strip() in namelist \
-                    and not name.get_surname().strip() == "":
-                    namelist.append(name.get_surname().strip())
+        stats = self.dbstate.db.get_tree_statistics()
+        if stats is not None:
+            for surname, (count, handle) in stats.get_surname_counts().items():
+                surnames[surname] = count
+                representative_handle[surname] = handle
+            cnt = stats.get_number_of_people()
+            unique_surnames = stats.get_people_summary()['unique_surnames']
+        else:
+            for person in self.dbstate.db.iter_people():
+                allnames = [person.get_primary_name()] + person.get_alternate_names()
+                allnames = set([name.get_group_name().strip() for name in allnames])
+                for surname in allnames:
+                    surnames[surname] += 1
+                    representative_handle[surname] = person.handle
+                cnt += 1
+                if not cnt % _YIELD_INTERVAL:
+                    yield True
+                # Count unique surnames
+                for name in [person.get_primary_name()] + person.get_alternate_names():
+                    if not name.get_surname().strip() in namelist \
+                        and not name.get_surname().strip() == "":
+                        namelist.append(name.get_surname().strip())
+            unique_surnames = len(namelist)
 
         total_people = cnt
         surname_sort = []
@@ -172,7 +181,7 @@ class SurnameCloudGramplet(Gramplet):
                 self.append_text(" ")
                 showing += 1
         self.append_text(("\n\n" + _("Total unique surnames") + ": %d\n") %
-                         len(namelist))
+                         unique_surnames)
         self.append_text((_("Total surnames showing") + ": %d\n") % showing)
         self.append_text((_("Total people") + ": %d") % total_people, "begin")
 
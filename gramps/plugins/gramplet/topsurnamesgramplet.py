@@ -72,15 +72,22 @@ class TopSurnamesGramplet(Gramplet):
         representative_handle = {}
 
         cnt = 0
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        stats = self.dbstate.db.get_tree_statistics()
+        if stats is not None:
+            for surname, (count, handle) in stats.get_surname_counts().items():
+                surnames[surname] = count
+                representative_handle[surname] = handle
+            cnt = stats.get_number_of_people()
+        else:
+            for person in self.dbstate.db.iter_people():
+                allnames = [person.get_primary_name()] + person.get_alternate_names()
+                allnames = set([name.get_group_name().strip() for name in allnames])
+                for surname in allnames:
+                    surnames[surname] += 1
+                    representative_handle[surname] = person.handle
+                cnt += 1
+                if not cnt % _YIELD_INTERVAL:
+                    yield True
 
         total_people = cnt
         surname_sort = []
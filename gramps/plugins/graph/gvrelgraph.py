@@ -200,6 +200,10 @@ class RelGraphReport(Report):
                                             user=self._user)
         # Hash people in a dictionary for faster inclusion checking
         self.persons = set(person_handles)
+        if self.increlname:
+            self.relationships = self.rel_calc.get_relationships(
+                self._db, self.center_person, person_handles,
+                extra_info=self.advrelinfo, olocale=self._locale)
 
         person_handles = self.sort_persons(person_handles)
 
@@ -663,16 +667,12 @@ class RelGraphReport(Report):
         if self.increlname and self.center_person != person:
             # display relationship info
             if self.advrelinfo:
-                (relationship, _ga, _gb) = self.rel_calc.get_one_relationship(
-                    self._db, self.center_person, person,
-                    extra_info=True, olocale=self._locale)
+                (relationship, _ga, _gb) = self.relationships[person.handle]
                 if relationship:
                     label += "%s(%s Ga=%d Gb=%d)" % (line_delimiter,
                                                      relationship, _ga, _gb)
             else:
-                relationship = self.rel_calc.get_one_relationship(
-                    self._db, self.center_person, person,
-                    olocale=self._locale)
+                relationship = self.relationships[person.handle]
                 if relationship:
                     label += "%s(%s)" % (line_delimiter, relationship)
 
@@ -88,7 +88,11 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# Size of the blocks read from the file and fed to the parser
+CHUNK_SIZE = 65536
+# Files smaller than this hold fewer than about a thousand people, and are
+# imported without the bsddb "magic" batch transaction
+SMALL_FILE_SIZE = 250000
 
 CHILD_REL_MAP = {
     "Birth"     : ChildRefType(ChildRefType.BIRTH),
@@ -119,8 +123,7 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
+    file_size = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -138,15 +141,13 @@ def importData(database, filename, user):
                                    config.get('preferences.tag-on-import') else None))
 
         if filename != '-':
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
+            file_size = os.path.getsize(filename)
 
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file, file_size)
         except GrampsImportError as err: # version error
             user.notify_error(*err.messages())
             return
@@ -330,59 +331,6 @@ class ImportInfo:
 
         return txt
 
-class LineParser:
-    def __init__(self, filename):
-
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                import io
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(gzip.open(filename, "rb"),
-                                         encoding='utf8', errors='replace')
-            else:
-                ofile = open(filename, "r", encoding='utf8', errors='replace')
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
-
 #-------------------------------------------------------------------------
 #
 # ImportOpenFileContextManager
@@ -545,6 +493,8 @@ class GrampsParser(UpdateCallback):
 
         self.event = None
         self.eventref = None
+        # Types of the events already parsed, by handle
+        self.event_types = {}
         self.childref = None
         self.personref = None
         self.name = None
@@ -780,11 +730,14 @@ class GrampsParser(UpdateCallback):
                 while has_handle_func(handle):
                     handle = create_id()
             self.import_handles[orig_handle] = {target: [handle, False]}
-        # method is called by a reference
-        if isinstance(prim_obj, abc.Callable):
-            prim_obj = prim_obj()
-        else:
+        if not isinstance(prim_obj, abc.Callable):
+            # This method is called by a start_<primary_object> method, which
+            # fills in the object and commits it; it is stored only then.
             self.import_handles[orig_handle][target][INSTANTIATED] = True
+            prim_obj.set_handle(handle)
+            return handle
+        # method is called by a reference
+        prim_obj = prim_obj()
         prim_obj.set_handle(handle)
         if target == "tag":
             self.db.add_tag(prim_obj, self.trans)
@@ -877,9 +830,13 @@ class GrampsParser(UpdateCallback):
                 handle = create_id()
             if isinstance(prim_obj, abc.Callable):
                 prim_obj = prim_obj()
-            prim_obj.set_handle(handle)
-            prim_obj.set_gramps_id(gramps_id)
-            add_func(prim_obj, self.trans)
+                prim_obj.set_handle(handle)
+                prim_obj.set_gramps_id(gramps_id)
+                add_func(prim_obj, self.trans)
+            else:
+                # The caller commits the object
+                prim_obj.set_handle(handle)
+                prim_obj.set_gramps_id(gramps_id)
             id2handle_map[gramps_id] = handle
         return handle
 
@@ -910,19 +867,21 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile, file_size=0):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
+        :param file_size: the size of the file on disk, used to report the
+                          progress, or 0 if it is not known
         """
-        if personcount < 1000:
-            no_magic = True
-        else:
-            no_magic = False
+        no_magic = file_size < SMALL_FILE_SIZE
+        # The progress is the position in the file on disk, before any
+        # decompression.
+        raw_file = getattr(ifile, 'fileobj', ifile)
         with DbTxn(_("Gramps XML import"), self.db, batch=True,
                    no_magic=no_magic) as self.trans:
-            self.set_total(linecount)
+            self.set_total(max(file_size, 1))
 
             self.db.disable_signals()
 
@@ -933,7 +892,15 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            self.p.buffer_text = True
+            # The file is parsed as it is read, in a single pass.
+            chunk = ifile.read(CHUNK_SIZE)
+            while chunk:
+                self.p.Parse(chunk, False)
+                if file_size:
+                    self.update(raw_file.tell())
+                chunk = ifile.read(CHUNK_SIZE)
+            self.p.Parse(b"", True)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1149,7 +1116,6 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get('title', '')
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1258,7 +1224,6 @@ class GrampsParser(UpdateCallback):
             self.info.add('new-object', EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -1300,21 +1265,18 @@ class GrampsParser(UpdateCallback):
             self.eventref.role.set_from_xml_str(attrs['role'])
 
         # We count here on events being already parsed prior to parsing
-        # people or families. This code will fail if this is not true.
-        event = self.db.get_event_from_handle(self.eventref.ref)
-        if not event:
-            return
+        # people or families. The type of an event that is not yet parsed is
+        # unknown.
+        event_type = self.event_types.get(handle)
 
         if self.family:
-            event.personal = False
             self.family.add_event_ref(self.eventref)
         elif self.person:
-            event.personal = True
-            if (event.type == EventType.BIRTH) \
+            if (event_type == EventType.BIRTH) \
                    and (self.eventref.role == EventRoleType.PRIMARY) \
                    and (self.person.get_birth_ref() is None):
                 self.person.set_birth_ref(self.eventref)
-            elif (event.type == EventType.DEATH) \
+            elif (event_type == EventType.DEATH) \
                      and (self.eventref.role == EventRoleType.PRIMARY) \
                      and (self.person.get_death_ref() is None):
                 self.person.set_death_ref(self.eventref)
@@ -1458,7 +1420,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1593,7 +1554,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1874,7 +1834,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if 'handle' in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -2073,7 +2032,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs['handle'].replace('_', '')
         is_merge_candidate = (self.replace_import_handle and
@@ -2129,7 +2087,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -2278,7 +2235,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans,
@@ -2693,6 +2650,7 @@ class GrampsParser(UpdateCallback):
 
         self.db.commit_event(self.event, self.trans,
                              self.event.get_change_time())
+        self.event_types[self.event.handle] = self.event.get_type()
         self.event = None
 
     def stop_name(self, attrs):
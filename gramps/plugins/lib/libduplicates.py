@@ -0,0 +1,572 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find people who may have been entered more than once in a database.
+
+The data used to compare people is extracted once for every person. People
+are then only compared with the people who share their gender, the soundex
+code of their surname, the initial of one of their given names and their
+year of birth, since the comparison rejects any other pair. People without a
+simple birth date are compared with all the birth years. The comparisons may
+be spread over a pool of worker processes.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import os
+import logging
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.sgettext
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import soundex, compare
+
+LOG = logging.getLogger(".libduplicates")
+
+# Number of pairs of people compared by each task of a worker process:
+TASK_SIZE = 20000
+
+#-------------------------------------------------------------------------
+#
+# Features of a person
+#
+#-------------------------------------------------------------------------
+PersonFeatures = namedtuple('PersonFeatures', [
+    'handle', 'gender',
+    'name',                     # (surnames, suffix, first name)
+    'birth', 'death',           # Date
+    'birth_place', 'death_place',   # (handle, title)
+    'parents',                  # None, or (father name, mother name)
+    'families',                 # [(father, father name, mother, mother name)]
+    ])
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return ' '.join([surn.get_surname() for surn in name.get_surname_list()])
+
+def get_features(db, user=None):
+    """
+    Return a list of the features of every person of the database, in the
+    order of :meth:`iter_people`.
+    """
+    names = {}
+    titles = {}
+    people = []
+
+    def get_event(event_ref):
+        date = Date()
+        place = ("", "")
+        if event_ref:
+            event = db.get_event_from_handle(event_ref.ref)
+            date = event.get_date_object()
+            place_handle = event.get_place_handle()
+            if place_handle not in titles:
+                titles[place_handle] = (db.get_place_from_handle(place_handle)
+                                        .get_title() if place_handle else "")
+            place = (place_handle, titles[place_handle])
+        return date, place
+
+    if user:
+        user.begin_progress(_('Find Duplicates'),
+                            _('Pass 1: Building preliminary lists'),
+                            db.get_number_of_people())
+    for person in db.iter_people():
+        if user:
+            user.step_progress()
+        name = person.get_primary_name()
+        names[person.handle] = (get_surnames(name), name.get_suffix(),
+                                name.get_first_name())
+        birth, birth_place = get_event(person.get_birth_ref())
+        death, death_place = get_event(person.get_death_ref())
+        people.append((person, birth, death, birth_place, death_place))
+    if user:
+        user.end_progress()
+
+    families = {}
+    for family in db.iter_families():
+        families[family.handle] = (family.get_father_handle(),
+                                   family.get_mother_handle())
+
+    def get_parents(handles):
+        father, mother = handles
+        return (names.get(father) if father else None,
+                names.get(mother) if mother else None)
+
+    features = []
+    for person, birth, death, birth_place, death_place in people:
+        main = person.get_main_parents_family_handle()
+        parents = None
+        if main and main in families:
+            parents = get_parents(families[main])
+        person_families = []
+        for family_handle in person.get_family_handle_list():
+            if family_handle in families:
+                father, mother = families[family_handle]
+                person_families.append((father, names.get(father),
+                                        mother, names.get(mother)))
+        features.append(PersonFeatures(
+            person.handle, person.get_gender(), names[person.handle],
+            birth, death, birth_place, death_place, parents,
+            person_families))
+    return features
+
+#-------------------------------------------------------------------------
+#
+# Comparison of two people
+#
+#-------------------------------------------------------------------------
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == '.':
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+def name_compare(s1, s2, use_soundex):
+    if use_soundex:
+        try:
+            return compare(s1, s2)
+        except UnicodeEncodeError:
+            return s1 == s2
+    else:
+        return s1 == s2
+
+def date_match(date1, date2):
+    if date1.is_empty() or date2.is_empty():
+        return 0
+    if date1.is_equal(date2):
+        return 1
+
+    if date1.is_compound() or date2.is_compound():
+        return range_compare(date1, date2)
+
+    if date1.get_year() == date2.get_year():
+        if date1.get_month() == date2.get_month():
+            return 0.75
+        if not date1.get_month_valid() or not date2.get_month_valid():
+            return 0.75
+        else:
+            return -1
+    else:
+        return -1
+
+def range_compare(date1, date2):
+    start_date_1 = date1.get_start_date()[0:3]
+    start_date_2 = date2.get_start_date()[0:3]
+    stop_date_1 = date1.get_stop_date()[0:3]
+    stop_date_2 = date2.get_stop_date()[0:3]
+    if date1.is_compound() and date2.is_compound():
+        if (start_date_2 <= start_date_1 <= stop_date_2 or
+            start_date_1 <= start_date_2 <= stop_date_1 or
+            start_date_2 <= stop_date_1 <= stop_date_2 or
+            start_date_1 <= stop_date_2 <= stop_date_1):
+            return 0.5
+        else:
+            return -1
+    elif date2.is_compound():
+        if start_date_2 <= start_date_1 <= stop_date_2:
+            return 0.5
+        else:
+            return -1
+    else:
+        if start_date_1 <= start_date_2 <= stop_date_1:
+            return 0.5
+        else:
+            return -1
+
+def name_match(name, name1, use_soundex):
+    """
+    Compare two names, given as (surnames, suffix, first name) tuples.
+    """
+    if not name1 or not name:
+        return 0
+
+    srn1, sfx1, first1 = name
+    srn2, sfx2, first2 = name1
+
+    if not name_compare(srn1, srn2, use_soundex):
+        return -1
+    if sfx1 != sfx2:
+        if sfx1 != "" and sfx2 != "":
+            return -1
+
+    if first1 == first2:
+        return 1
+    else:
+        list1 = first1.split()
+        list2 = first2.split()
+
+        if len(list1) < len(list2):
+            return list_reduce(list1, list2, use_soundex)
+        else:
+            return list_reduce(list2, list1, use_soundex)
+
+def place_match(place1, place2, use_soundex):
+    """
+    Compare two places, given as (handle, title) tuples.
+    """
+    p1_id, name1 = place1
+    p2_id, name2 = place2
+    if p1_id == p2_id:
+        return 1
+
+    if not (name1 and name2):
+        return 0
+    if name1 == name2:
+        return 1
+
+    list1 = name1.replace(",", " ").split()
+    list2 = name2.replace(",", " ").split()
+
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2,
+                                                      use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+def list_reduce(list1, list2, use_soundex):
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if is_initial(name) and name[0] == name2[0]:
+                value += 0.25
+            elif is_initial(name2) and name2[0] == name[0]:
+                value += 0.25
+            elif name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2,
+                                                      use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+def compare_people(p1, p2, use_soundex):
+    """
+    Return how likely two people, given by their features, are the same
+    person, or -1 if they cannot be. Whether one is an ancestor of the other
+    is not checked.
+    """
+    chance = name_match(p1.name, p2.name, use_soundex)
+    if chance == -1:
+        return -1
+
+    value = date_match(p1.birth, p2.birth)
+    if value == -1:
+        return -1
+    chance += value
+
+    value = date_match(p1.death, p2.death)
+    if value == -1:
+        return -1
+    chance += value
+
+    value = place_match(p1.birth_place, p2.birth_place, use_soundex)
+    if value == -1:
+        return -1
+    chance += value
+
+    value = place_match(p1.death_place, p2.death_place, use_soundex)
+    if value == -1:
+        return -1
+    chance += value
+
+    if p1.parents is not None and p2.parents is not None:
+        value = name_match(p1.parents[0], p2.parents[0], use_soundex)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = name_match(p1.parents[1], p2.parents[1], use_soundex)
+        if value == -1:
+            return -1
+        chance += value
+
+    for father1, fname1, mother1, mname1 in p1.families:
+        for father2, fname2, mother2, mname2 in p2.families:
+            if p1.gender == Person.FEMALE:
+                if father1 and father2:
+                    if father1 == father2:
+                        chance += 1
+                    else:
+                        value = name_match(fname1, fname2, use_soundex)
+                        if value != -1:
+                            chance += value
+            else:
+                if mother1 and mother2:
+                    if mother1 == mother2:
+                        chance += 1
+                    else:
+                        value = name_match(mname1, mname2, use_soundex)
+                        if value != -1:
+                            chance += value
+    return chance
+
+def compare_pairs(features, use_soundex, threshold, pairs):
+    """
+    Compare pairs of people, given by their positions in the list of
+    features, and return (first, second, chance of first to second, chance
+    of second to first) for the pairs where either chance reaches the
+    threshold.
+    """
+    results = []
+    for first, second in pairs:
+        p1 = features[first]
+        p2 = features[second]
+        chance = compare_people(p1, p2, use_soundex)
+        if p1.gender == p2.gender:
+            back = chance
+        else:
+            # Females and people of unknown gender are compared with each
+            # other, and the spouses compared depend on the first person.
+            back = compare_people(p2, p1, use_soundex)
+        if chance >= threshold or back >= threshold:
+            results.append((first, second, chance, back))
+    return results
+
+_WORKER = {}
+
+def _init_worker(features, use_soundex):
+    """
+    Keep the features in a worker process, so that they are sent only once.
+    """
+    _WORKER['features'] = features
+    _WORKER['use_soundex'] = use_soundex
+
+def _compare_pairs_task(threshold, pairs):
+    return compare_pairs(_WORKER['features'], _WORKER['use_soundex'],
+                         threshold, pairs)
+
+#-------------------------------------------------------------------------
+#
+# Blocking
+#
+#-------------------------------------------------------------------------
+def gen_key(val, use_soundex):
+    if use_soundex:
+        try:
+            return soundex(val)
+        except UnicodeEncodeError:
+            return val
+    else:
+        return val
+
+def get_initials(first_name):
+    """
+    Return the keys of the given names: two names can only match if they
+    are equal, or if they have a word with the same initial.
+    """
+    words = first_name.split()
+    if not words:
+        return {('=', first_name)}
+    return set(word[0] for word in words)
+
+def get_birth_year(date):
+    """
+    Return the year that the birth date of a matching person must have, or
+    None if it may match any year.
+    """
+    if date.is_empty() or date.is_compound():
+        return None
+    return date.get_year()
+
+def iter_pairs(features, use_soundex):
+    """
+    Yield, once, every pair of positions of people that must be compared,
+    the lowest position first.
+    """
+    blocks = {}
+    initials = []
+    for index, person in enumerate(features):
+        gender = person.gender == Person.MALE
+        key = gen_key(person.name[0], use_soundex)
+        initials.append(get_initials(person.name[2]))
+        for initial in initials[index]:
+            blocks.setdefault((gender, key, initial), []).append(index)
+
+    def is_first_block(first, second, initial):
+        # A pair sharing several initials is found in several blocks.
+        common = initials[first] & initials[second]
+        return len(common) == 1 or initial == min(common, key=str)
+
+    for (gender, key, initial), block in blocks.items():
+        years = {}
+        anytime = []
+        for index in block:
+            year = get_birth_year(features[index].birth)
+            if year is None:
+                anytime.append(index)
+            else:
+                years.setdefault(year, []).append(index)
+        groups = list(years.values())
+        for group in groups:
+            for pos, first in enumerate(group):
+                for second in group[pos+1:]:
+                    if is_first_block(first, second, initial):
+                        yield first, second
+        for pos, first in enumerate(anytime):
+            for second in anytime[pos+1:]:
+                if is_first_block(first, second, initial):
+                    yield first, second
+            for group in groups:
+                for second in group:
+                    if is_first_block(first, second, initial):
+                        yield min(first, second), max(first, second)
+
+#-------------------------------------------------------------------------
+#
+# Search
+#
+#-------------------------------------------------------------------------
+def iter_tasks(features, use_soundex):
+    """
+    Yield lists of at most TASK_SIZE pairs of positions to compare.
+    """
+    pairs = []
+    for pair in iter_pairs(features, use_soundex):
+        pairs.append(pair)
+        if len(pairs) == TASK_SIZE:
+            yield pairs
+            pairs = []
+    if pairs:
+        yield pairs
+
+def get_ancestors(db, handle):
+    """
+    Return the handles of a person and the ancestors of the person through
+    the main parent families.
+    """
+    graph = db.get_kinship_graph()
+    if graph is not None:
+        return graph.get_ancestors(handle)
+    ancestors = set()
+    todo = [handle]
+    while todo:
+        handle = todo.pop()
+        if not handle or handle in ancestors:
+            continue
+        ancestors.add(handle)
+        family_handle = db.get_person_from_handle(
+            handle).get_main_parents_family_handle()
+        if family_handle:
+            family = db.get_family_from_handle(family_handle)
+            todo.append(family.get_father_handle())
+            todo.append(family.get_mother_handle())
+    return ancestors
+
+def find_duplicates(db, threshold, use_soundex=True, processes=0,
+                    user=None):
+    """
+    Return a dictionary of the possible duplicates of people, by handle, as
+    tuples of the handle of the other person and the likelihood that both
+    are the same person.
+
+    :param threshold: Minimum likelihood of the pairs reported.
+    :type threshold: float
+    :param use_soundex: If True, surnames and given names are compared by
+                        their soundex codes.
+    :type use_soundex: bool
+    :param processes: Number of worker processes, 0 for one per processor.
+    :type processes: int
+    :param user: Reports the progress.
+    :type user: :py:class:`.User`
+    """
+    features = get_features(db, user)
+    processes = processes or os.cpu_count() or 1
+    if user:
+        user.begin_progress(_('Find Duplicates'),
+                            _('Pass 2: Calculating potential matches'), 0)
+    results = []
+    pending = deque()
+    pool = None
+    try:
+        for pairs in iter_tasks(features, use_soundex):
+            if pool is None and processes > 1 and len(pairs) == TASK_SIZE:
+                try:
+                    pool = ProcessPoolExecutor(processes,
+                                               initializer=_init_worker,
+                                               initargs=(features,
+                                                         use_soundex))
+                except (OSError, ImportError, NotImplementedError) as err:
+                    LOG.warning("Cannot start worker processes: %s", err)
+                    processes = 1
+            if pool is None:
+                results.extend(compare_pairs(features, use_soundex,
+                                             threshold, pairs))
+            else:
+                pending.append(pool.submit(_compare_pairs_task, threshold,
+                                           pairs))
+                if len(pending) > 2 * processes:
+                    results.extend(pending.popleft().result())
+            if user:
+                user.step_progress()
+        while pending:
+            results.extend(pending.popleft().result())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if user:
+        user.end_progress()
+
+    # Compare the people in the order of the database, as the list of
+    # possible duplicates depends on it.
+    chances = {}
+    ancestors = {}
+    for first, second, chance, back in results:
+        handle1 = features[first].handle
+        handle2 = features[second].handle
+        for handle in (handle1, handle2):
+            if handle not in ancestors:
+                ancestors[handle] = get_ancestors(db, handle)
+        if handle1 in ancestors[handle2] or handle2 in ancestors[handle1]:
+            continue
+        if chance >= threshold:
+            chances.setdefault(first, []).append((second, chance))
+        if back >= threshold:
+            chances.setdefault(second, []).append((first, back))
+    the_map = {}
+    for first in sorted(chances):
+        p1key = features[first].handle
+        for second, chance in sorted(chances[first]):
+            p2key = features[second].handle
+            if p2key in the_map and the_map[p2key][0] == p1key:
+                continue
+            if p1key in the_map:
+                if the_map[p1key][1] > chance:
+                    the_map[p1key] = (p2key, chance)
+            else:
+                the_map[p1key] = (p2key, chance)
+    return the_map
@@ -95,7 +95,9 @@ import time
 from collections import defaultdict, OrderedDict
 import string
 import mimetypes
+import multiprocessing
 from io import StringIO, TextIOWrapper
+from queue import Empty
 from urllib.parse import urlparse
 
 #------------------------------------------------------------------------
@@ -838,6 +840,15 @@ class GedcomDateParser(DateParser):
 # Lexer - serves as the lexical analysis engine
 #
 #-------------------------------------------------------------------------
+
+# Files with more lines than this are read in a worker process, while the
+# records are parsed:
+LEXER_PROCESS_LINES = 100000
+# The worker process sends this many lines at a time, and stops reading when
+# LEXER_QUEUE_SIZE such blocks are waiting to be parsed:
+LEXER_BLOCK_SIZE = 1000
+LEXER_QUEUE_SIZE = 32
+
 class Lexer:
     """ low level line reading and early parsing """
     def __init__(self, ifile, __add_msg):
@@ -861,6 +872,18 @@ class Lexer:
             LOG.debug('Error in reading Gedcom line', exc_info=True)
             return None
 
+    def read_lines(self):
+        """
+        Generate the remaining lines of the file, as the tuples from which a
+        GedLine is made.
+        """
+        while True:
+            if len(self.current_list) <= 1 and not self.eof:
+                self.__readahead()
+            if not self.current_list:
+                return
+            yield self.current_list.pop()
+
     def __fix_token_cont(self, data):
         line = self.current_list[0]
         new_value = line[2] + '\n' + data[2]
@@ -959,6 +982,119 @@ class Lexer:
             del self.func_map[key]
         del self.func_map
 
+    def close(self):
+        """
+        Release the resources of the lexer; the file is closed by its owner.
+        """
+        pass
+
+
+def _lexer_process(filename, encoding, queue):
+    """
+    Read the lines of a GEDCOM file and put them on the queue in blocks,
+    followed by None at the end of the file. The messages about the lines are
+    put in the blocks as strings, in the order they were produced.
+
+    This is a module level function so that it can be run in a worker
+    process.
+    """
+    try:
+        with open(filename, "rb") as ifile:
+            messages = []
+            lexer = Lexer(make_reader(ifile, encoding, messages.append),
+                          messages.append)
+            block = []
+            for data in lexer.read_lines():
+                if messages:
+                    block.extend(messages)
+                    del messages[:]
+                block.append(data)
+                if len(block) >= LEXER_BLOCK_SIZE:
+                    queue.put(block)
+                    block = []
+            block.extend(messages)
+            queue.put(block)
+            queue.put(None)
+    except Exception as err:
+        queue.put(err)
+
+
+class LexerProcess:
+    """
+    Lexer that reads the lines of the file in a worker process.
+
+    The lines are passed back in blocks through a queue of bounded size, so
+    that the whole file is never held in memory.
+    """
+    def __init__(self, filename, encoding, __add_msg):
+        self.current_list = []
+        self.eof = False
+        self.__add_msg = __add_msg
+        self.queue = multiprocessing.Queue(LEXER_QUEUE_SIZE)
+        self.process = multiprocessing.Process(
+            target=_lexer_process, args=(filename, encoding, self.queue),
+            daemon=True)
+        self.process.start()
+
+    def readline(self):
+        """ read the next line sent by the worker process """
+        while True:
+            if not self.current_list:
+                if self.eof:
+                    return None
+                self.__read_block()
+                continue
+            data = self.current_list.pop()
+            if not isinstance(data, str):
+                break
+            self.__add_msg(data)
+        try:
+            return GedLine(data)
+        except:
+            LOG.debug('Error in reading Gedcom line', exc_info=True)
+            return None
+
+    def __read_block(self):
+        """
+        Wait for the next block of lines from the worker process.
+        """
+        while True:
+            alive = self.process.is_alive()
+            try:
+                block = self.queue.get(timeout=1)
+                break
+            except Empty:
+                if not alive:
+                    # The process has ended without marking the end of the
+                    # file, so the rest of the file is lost.
+                    LOG.warning("GEDCOM lexer process ended with exit code %s",
+                                self.process.exitcode)
+                    block = None
+                    break
+        if block is None:
+            self.eof = True
+        elif isinstance(block, Exception):
+            self.eof = True
+            raise block
+        else:
+            block.reverse()
+            self.current_list = block
+
+    def clean_up(self):
+        """
+        Nothing to do, the parsing methods are not used by this lexer.
+        """
+        pass
+
+    def close(self):
+        """
+        Stop the worker process if it is still running.
+        """
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.queue.close()
+
 
 #-----------------------------------------------------------------------
 #
@@ -1555,6 +1691,22 @@ class AnselReader(BaseReader):
         return self.__ansel_to_unicode(linebytes)
 
 
+def make_reader(ifile, enc, __add_msg):
+    """
+    Return the reader for a GEDCOM file in the given character set.
+    """
+    if enc == "ANSEL":
+        return AnselReader(ifile, __add_msg)
+    elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
+        return UTF8Reader(ifile, __add_msg, enc)
+    elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
+        return UTF16Reader(ifile, __add_msg)
+    elif enc in ("CP1252", "WINDOWS-1252"):
+        return CP1252Reader(ifile, __add_msg)
+    else:
+        return AnsiReader(ifile, __add_msg)
+
+
 #-------------------------------------------------------------------------
 #
 # CurrentState
@@ -1761,13 +1913,14 @@ class IdMapper:
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        self.used = set()  # the Gramps IDs in swap
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in list(self.swap.values()):
+            while new_val in self.used:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -1783,15 +1936,16 @@ class IdMapper:
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
                 if self.has_gid(formatted_gid) or \
-                        (formatted_gid in list(self.swap.values())):
+                        (formatted_gid in self.used):
                     new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
+                    while new_val in self.used:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.used.add(new_val)
         return new_val
 
     def clean(self, gid):
@@ -2702,18 +2856,16 @@ class GedcomParser(UpdateCallback):
 
         enc = stage_one.get_encoding()
 
-        if enc == "ANSEL":
-            rdr = AnselReader(ifile, self.__add_msg)
-        elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
-            rdr = UTF8Reader(ifile, self.__add_msg, enc)
-        elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
-            rdr = UTF16Reader(ifile, self.__add_msg)
-        elif enc in ("CP1252", "WINDOWS-1252"):
-            rdr = CP1252Reader(ifile, self.__add_msg)
-        else:
-            rdr = AnsiReader(ifile, self.__add_msg)
-
-        self.lexer = Lexer(rdr, self.__add_msg)
+        self.lexer = None
+        if (stage_one.get_line_count() > LEXER_PROCESS_LINES and
+                (os.cpu_count() or 1) > 1):
+            try:
+                self.lexer = LexerProcess(filename, enc, self.__add_msg)
+            except (OSError, ImportError, NotImplementedError) as err:
+                LOG.warning("Cannot start worker process: %s", err)
+        if self.lexer is None:
+            self.lexer = Lexer(make_reader(ifile, enc, self.__add_msg),
+                               self.__add_msg)
         self.filename = filename
         self.backoff = False
 
@@ -2738,31 +2890,34 @@ class GedcomParser(UpdateCallback):
 
         """
         no_magic = self.maxpeople < 1000
-        with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
-                   no_magic=no_magic) as self.trans:
-
-            self.dbase.disable_signals()
-            self.__parse_header_head()
-            self.want_parse_warnings = False
-            self.__parse_header()
-            self.want_parse_warnings = True
-            if self.use_def_src:
-                self.dbase.add_source(self.def_src, self.trans)
-            if self.default_tag and self.default_tag.handle is None:
-                self.dbase.add_tag(self.default_tag, self.trans)
-            self.__parse_record()
-            self.__parse_trailer()
-            for title, handle in self.inline_srcs.items():
-                src = Source()
-                src.set_handle(handle)
-                src.set_title(title)
-                self.dbase.add_source(src, self.trans)
-            self.__clean_up()
-
-            self.place_import.generate_hierarchy(self.trans)
-
-            if not self.dbase.get_feature("skip-check-xref"):
-                self.__check_xref()
+        try:
+            with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
+                       no_magic=no_magic) as self.trans:
+
+                self.dbase.disable_signals()
+                self.__parse_header_head()
+                self.want_parse_warnings = False
+                self.__parse_header()
+                self.want_parse_warnings = True
+                if self.use_def_src:
+                    self.dbase.add_source(self.def_src, self.trans)
+                if self.default_tag and self.default_tag.handle is None:
+                    self.dbase.add_tag(self.default_tag, self.trans)
+                self.__parse_record()
+                self.__parse_trailer()
+                for title, handle in self.inline_srcs.items():
+                    src = Source()
+                    src.set_handle(handle)
+                    src.set_title(title)
+                    self.dbase.add_source(src, self.trans)
+                self.__clean_up()
+
+                self.place_import.generate_hierarchy(self.trans)
+
+                if not self.dbase.get_feature("skip-check-xref"):
+                    self.__check_xref()
+        finally:
+            self.lexer.close()
         self.dbase.enable_signals()
         self.dbase.request_rebuild()
         if self.number_of_errors == 0:
@@ -3260,11 +3415,15 @@ class GedcomParser(UpdateCallback):
                 self.__find_or_create_note, self.dbase.commit_note,
                 self.nid2id, "NOTE")
 
+        # Map the Gramps IDs back to the input xrefs, for the messages below
+        input_fids = {}
+        for (key, val) in self.fid_map.map().items():
+            input_fids.setdefault(val, key)
+        input_pids = {}
+        for (key, val) in self.pid_map.map().items():
+            input_pids.setdefault(val, key)
+
         # Check persons membership in referenced families
-        def __input_fid(gramps_id):
-            for (key, val) in self.fid_map.map().items():
-                if val == gramps_id:
-                    return key
 
         for input_id, gramps_id in self.pid_map.map().items():
             person_handle = self.__find_from_handle(gramps_id, self.gid2id)
@@ -3282,15 +3441,10 @@ class GedcomParser(UpdateCallback):
                                      " Family reference removed from person") %
                                    {'family' : family.gramps_id,
                                     'orig_family' :
-                                        __input_fid(family.gramps_id),
+                                        input_fids.get(family.gramps_id),
                                     'person' : person.gramps_id,
                                     'orig_person' : input_id})
 
-        def __input_pid(gramps_id):
-            for (key, val) in self.pid_map.map().items():
-                if val == gramps_id:
-                    return key
-
         for input_id, gramps_id in self.fid_map.map().items():
             family_handle = self.__find_from_handle(gramps_id, self.fid2id)
             family = self.dbase.get_family_from_handle(family_handle)
@@ -3311,7 +3465,7 @@ class GedcomParser(UpdateCallback):
                                       'orig_family' : input_id,
                                       'father' : father.gramps_id,
                                       'orig_father' :
-                                          __input_pid(father.gramps_id)})
+                                          input_pids.get(father.gramps_id)})
 
             if mother_handle:
                 mother = self.dbase.get_person_from_handle(mother_handle)
@@ -3327,7 +3481,7 @@ class GedcomParser(UpdateCallback):
                                       'orig_family' : input_id,
                                       'mother' : mother.gramps_id,
                                       'orig_mother' :
-                                          __input_pid(mother.gramps_id)})
+                                          input_pids.get(mother.gramps_id)})
 
             for child_ref in family.get_child_ref_list():
                 child_handle = child_ref.ref
@@ -3349,7 +3503,7 @@ class GedcomParser(UpdateCallback):
                                         'orig_family' : input_id,
                                         'child' : child.gramps_id,
                                         'orig_child' :
-                                            __input_pid(child.gramps_id)})
+                                            input_pids.get(child.gramps_id)})
 
         if self.missing_references:
             self.dbase.commit_note(self.explanation, self.trans, time.time())
@@ -0,0 +1,1262 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2008       Brian G. Matherly
+# Copyright (C) 2010       Jakim Friant
+# Copyright (C) 2011       Paul Franklin
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Verify the data of a database against user-adjusted rules.
+
+The dates and the other facts the rules depend on are extracted once for
+every person and family, in a single pass over the raw data of the events,
+the families and the people. Each rule is then evaluated over these facts,
+and the records may be spread over a pool of worker processes. Only the
+records which break a rule are read again, to report their names.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import os
+import csv
+import json
+import logging
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.sgettext
+from gramps.gen.lib import (ChildRefType, Date, EventRoleType, EventType,
+                            FamilyRelType, Name, NameType, Person)
+from gramps.gen.lib.date import Today
+from gramps.gen.utils.db import family_name
+
+LOG = logging.getLogger(".libverify")
+
+# Number of people or families checked by each task of a worker process:
+TASK_SIZE = 5000
+
+#-------------------------------------------------------------------------
+#
+# Facts of the people and families
+#
+#-------------------------------------------------------------------------
+PersonFacts = namedtuple('PersonFacts', [
+    'handle', 'gramps_id', 'gender',
+    'birth', 'death',       # (exact date, estimated date) sort values
+    'bapt', 'bury',         # exact sort values, bury None without a burial
+    'dead',                 # True if there is a death event
+    'invalid_birth', 'invalid_death',   # True for text-only dates
+    'families', 'parent_families',      # number of families
+    'children',             # number of children of all the families
+    'surname',              # surname of a birth name, or None
+    'marriage',             # marriage date of the first family, or None
+    ])
+
+FamilyFacts = namedtuple('FamilyFacts', [
+    'handle', 'gramps_id',
+    'father', 'mother',     # PersonFacts, or None
+    'children',             # [(PersonFacts or None, birth to father,
+                            #   birth to mother)]
+    'marriage',             # sort value
+    'married',              # True if the relationship is married
+    ])
+
+# Positions in the raw data of the objects:
+_EVENT_REF_REF, _EVENT_REF_ROLE = 3, 4
+_CHILD_REF_REF, _CHILD_REF_FREL, _CHILD_REF_MREL = 3, 4, 5
+
+def _get_events(db):
+    """
+    Return a dictionary of the type, sort value, exactness and validity of
+    the date of every event, by handle.
+    """
+    events = {}
+    with db.get_event_cursor() as cursor:
+        for handle, data in cursor:
+            date = data[3]
+            if date:
+                dateval = date[3]
+                exact = dateval[0] != 0 and dateval[1] != 0
+                events[handle] = (data[2][0], date[5], exact,
+                                  date[1] == Date.MOD_TEXTONLY)
+            else:
+                events[handle] = (data[2][0], 0, False, False)
+    return events
+
+def _get_date(event, estimate):
+    """ get the sort value of the date of an event """
+    if event is None or not (estimate or event[2]):
+        return 0
+    return event[1]
+
+def _get_family_data(events, data):
+    """
+    Return the father, mother, child references, marriage date and
+    relationship of the raw data of a family.
+    """
+    marriage = 0
+    for ref in data[6]:
+        event = events.get(ref[_EVENT_REF_REF])
+        if (event and event[0] == EventType.MARRIAGE
+                and ref[_EVENT_REF_ROLE][0] in (EventRoleType.FAMILY,
+                                                EventRoleType.PRIMARY)):
+            marriage = event[1]
+            break
+    children = [(ref[_CHILD_REF_REF],
+                 ref[_CHILD_REF_FREL][0] == ChildRefType.BIRTH,
+                 ref[_CHILD_REF_MREL][0] == ChildRefType.BIRTH)
+                for ref in data[4]]
+    return (data[2], data[3], children, marriage,
+            data[5][0] == FamilyRelType.MARRIED)
+
+def _get_person_facts(events, families, handle, data):
+    """
+    Return the facts of the raw data of a person.
+    """
+    refs = []
+    for ref in data[7]:
+        event = events.get(ref[_EVENT_REF_REF])
+        if event:
+            refs.append((event, ref[_EVENT_REF_ROLE][0]))
+
+    def get_date_of_type(event_type, estimate):
+        for event, role in refs:
+            if role != EventRoleType.PRIMARY and event[0] == EventType.BURIAL:
+                continue
+            if event[0] == event_type:
+                return _get_date(event, estimate)
+        return 0
+
+    buried = any(event[0] == EventType.BURIAL
+                 and role == EventRoleType.PRIMARY for event, role in refs)
+
+    def get_main_event(index):
+        if 0 <= index < len(data[7]):
+            return events.get(data[7][index][_EVENT_REF_REF])
+        return None
+
+    birth_event = get_main_event(data[6])
+    death_event = get_main_event(data[5])
+    birth = [_get_date(birth_event, False), _get_date(birth_event, True)]
+    if not birth[1]:
+        birth[1] = get_date_of_type(EventType.BAPTISM, True)
+    death = [_get_date(death_event, False), _get_date(death_event, True)]
+    if not death[1] and buried:
+        death[1] = get_date_of_type(EventType.BURIAL, True)
+
+    children = 0
+    marriage = None
+    for family_handle in data[8]:
+        family = families.get(family_handle)
+        if family:
+            children += len(family[2])
+        if marriage is None:
+            marriage = family[3] if family else 0
+
+    surname = None
+    name = data[3]
+    if name[8][0] == NameType.BIRTH:
+        surname = Name(data=name).get_surname()
+
+    return PersonFacts(
+        handle, data[1], data[2], tuple(birth), tuple(death),
+        get_date_of_type(EventType.BAPTISM, False),
+        get_date_of_type(EventType.BURIAL, False) if buried else None,
+        0 <= data[5] < len(data[7]),
+        bool(birth_event and birth_event[3]),
+        bool(death_event and death_event[3]),
+        len(data[8]), len(data[9]), children, surname, marriage)
+
+def get_facts(db, user=None):
+    """
+    Return the lists of the facts of every person and of every family of
+    the database, in the order of their cursors.
+    """
+    events = _get_events(db)
+    families = {}
+    family_ids = {}
+    with db.get_family_cursor() as cursor:
+        for handle, data in cursor:
+            families[handle] = _get_family_data(events, data)
+            family_ids[handle] = data[1]
+
+    if user:
+        user.begin_progress(_('Verify the Data'),
+                            _('Extracting the facts...'),
+                            db.get_number_of_people())
+    people = []
+    by_handle = {}
+    with db.get_person_cursor() as cursor:
+        for handle, data in cursor:
+            if user:
+                user.step_progress()
+            facts = _get_person_facts(events, families, handle, data)
+            people.append(facts)
+            by_handle[handle] = facts
+    if user:
+        user.end_progress()
+
+    family_facts = []
+    for handle, data in families.items():
+        father, mother, children, marriage, married = data
+        family_facts.append(FamilyFacts(
+            handle, family_ids[handle], by_handle.get(father),
+            by_handle.get(mother),
+            [(by_handle.get(child), frel, mrel)
+             for child, frel, mrel in children],
+            marriage, married))
+    return people, family_facts
+
+def _get_birth(person, est):
+    """ get a person's birth date, 0 if there is no person """
+    return person.birth[est] if person else 0
+
+def _get_death(person, est):
+    """ get a person's death date, 0 if there is no person """
+    return person.death[est] if person else 0
+
+def _get_age_at_death(person, est):
+    """ get a person's age at death """
+    birth_date = person.birth[est]
+    death_date = person.death[est]
+    if birth_date > 0 and death_date > 0:
+        return death_date - birth_date
+    return 0
+
+def _get_child_birth_dates(family, est):
+    """ get a family's children's birth dates """
+    dates = []
+    for child, frel, mrel in family.children:
+        child_birth_date = _get_birth(child, est)
+        if child_birth_date > 0:
+            dates.append(child_birth_date)
+    return dates
+
+#-------------------------------------------------------------------------
+#
+# Base classes for different tests -- the rules
+#
+#-------------------------------------------------------------------------
+class Rule:
+    """
+    Basic class for use in this tool.
+
+    Other rules must inherit from this. A rule holds its parameters, and is
+    checked against the facts of every person or family.
+    """
+    ID = 0
+    TYPE = ''
+
+    ERROR = 1
+    WARNING = 2
+
+    SEVERITY = WARNING
+
+    FATHER = 'father'
+    MOTHER = 'mother'
+
+    def broken(self, obj):
+        """
+        Return a value, true if this rule is violated by the facts of a
+        person or family.
+        """
+        return False
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        assert False, "Need to be overriden in the derived class"
+
+    def get_name(self, db, handle):
+        """ return the person's primary name or the name of the family """
+        assert False, "Need to be overriden in the derived class"
+
+    def get_rule_id(self):
+        """ return the rule's identification number, and parameters """
+        params = self._get_params()
+        return (self.ID, params)
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return tuple()
+
+    def report_itself(self, db, obj, broken):
+        """ return the details about a rule broken by the facts obj """
+        handle = obj.handle
+        the_type = self.TYPE
+        rule_id = self.get_rule_id()
+        severity = self.SEVERITY
+        name = self.get_name(db, handle)
+        gramps_id = obj.gramps_id
+        msg = self.get_message(broken)
+        return (msg, gramps_id, name, the_type, rule_id, severity, handle)
+
+class PersonRule(Rule):
+    """
+    Person-based class.
+    """
+    TYPE = 'Person'
+    def get_name(self, db, handle):
+        """ return the person's primary name """
+        return db.get_person_from_handle(handle).get_primary_name().get_name()
+
+class FamilyRule(Rule):
+    """
+    Family-based class.
+    """
+    TYPE = 'Family'
+    def get_name(self, db, handle):
+        """ return the name of the family """
+        return family_name(db.get_family_from_handle(handle), db)
+
+class ParentRule(FamilyRule):
+    """
+    Family-based class of the rules broken by either parent.
+    """
+    def get_message(self, broken):
+        """ return the rule's error message """
+        if broken == Rule.FATHER:
+            return self.father_message()
+        return self.mother_message()
+
+    def father_message(self):
+        """ return the rule's error message """
+        assert False, "Need to be overriden in the derived class"
+
+    def mother_message(self):
+        """ return the rule's error message """
+        assert False, "Need to be overriden in the derived class"
+
+#-------------------------------------------------------------------------
+#
+# Actual rules for testing
+#
+#-------------------------------------------------------------------------
+class BirthAfterBapt(PersonRule):
+    """ test if a person was baptised before their birth """
+    ID = 1
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[0]
+        bapt_date = obj.bapt
+        return birth_date > 0 and bapt_date > 0 and birth_date > bapt_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Baptism before birth")
+
+class DeathBeforeBapt(PersonRule):
+    """ test if a person died before their baptism """
+    ID = 2
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        death_date = obj.death[0]
+        bapt_date = obj.bapt
+        return death_date > 0 and bapt_date > 0 and bapt_date > death_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Death before baptism")
+
+class BirthAfterBury(PersonRule):
+    """ test if a person was buried before their birth """
+    ID = 3
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[0]
+        bury_date = obj.bury
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return birth_date > 0 and bury_ok and birth_date > bury_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Burial before birth")
+
+class DeathAfterBury(PersonRule):
+    """ test if a person was buried before their death """
+    ID = 4
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        death_date = obj.death[0]
+        bury_date = obj.bury
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return death_date > 0 and bury_ok and death_date > bury_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Burial before death")
+
+class BirthAfterDeath(PersonRule):
+    """ test if a person died before their birth """
+    ID = 5
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[0]
+        death_date = obj.death[0]
+        return birth_date > 0 and death_date > 0 and birth_date > death_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Death before birth")
+
+class BaptAfterBury(PersonRule):
+    """ test if a person was buried before their baptism """
+    ID = 6
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        bapt_date = obj.bapt
+        bury_date = obj.bury
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return bapt_date > 0 and bury_ok and bapt_date > bury_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Burial before baptism")
+
+class OldAge(PersonRule):
+    """ test if a person died beyond the age the user has set """
+    ID = 7
+    SEVERITY = Rule.WARNING
+    def __init__(self, old_age, est):
+        """ initialize the rule """
+        self.old_age = old_age
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_age, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        age_at_death = _get_age_at_death(obj, self.est)
+        return age_at_death / 365 > self.old_age
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Old age at death")
+
+class UnknownGender(PersonRule):
+    """ test if a person is neither a male nor a female """
+    ID = 8
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.gender not in (Person.MALE, Person.FEMALE)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Unknown gender")
+
+class MultipleParents(PersonRule):
+    """ test if a person belongs to multiple families """
+    ID = 9
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.parent_families > 1
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Multiple parents")
+
+class MarriedOften(PersonRule):
+    """ test if a person was married 'often' """
+    ID = 10
+    SEVERITY = Rule.WARNING
+    def __init__(self, wedder):
+        """ initialize the rule """
+        self.wedder = wedder
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.wedder,)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.families > self.wedder
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Married often")
+
+class OldUnmarried(PersonRule):
+    """ test if a person was married when they died """
+    ID = 11
+    SEVERITY = Rule.WARNING
+    def __init__(self, old_unm, est):
+        """ initialize the rule """
+        self.old_unm = old_unm
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_unm, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        age_at_death = _get_age_at_death(obj, self.est)
+        return age_at_death / 365 > self.old_unm and obj.families == 0
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Old and unmarried")
+
+class TooManyChildren(PersonRule):
+    """ test if a person had 'too many' children """
+    ID = 12
+    SEVERITY = Rule.WARNING
+    def __init__(self, mx_child_dad, mx_child_mom):
+        """ initialize the rule """
+        self.mx_child_dad = mx_child_dad
+        self.mx_child_mom = mx_child_mom
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.mx_child_dad, self.mx_child_mom)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        if obj.gender == Person.MALE and obj.children > self.mx_child_dad:
+            return True
+
+        if obj.gender == Person.FEMALE and obj.children > self.mx_child_mom:
+            return True
+
+        return False
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Too many children")
+
+class SameSexFamily(FamilyRule):
+    """ test if a family's parents are both male or both female """
+    ID = 13
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = obj.mother
+        father = obj.father
+        same_sex = (mother and father and
+                    (mother.gender == father.gender))
+        unknown_sex = (mother and
+                       (mother.gender == Person.UNKNOWN))
+        return same_sex and not unknown_sex
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Same sex marriage")
+
+class FemaleHusband(FamilyRule):
+    """ test if a family's 'husband' is female """
+    ID = 14
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        father = obj.father
+        return father and (father.gender == Person.FEMALE)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Female husband")
+
+class MaleWife(FamilyRule):
+    """ test if a family's 'wife' is male """
+    ID = 15
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = obj.mother
+        return mother and (mother.gender == Person.MALE)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Male wife")
+
+class SameSurnameFamily(FamilyRule):
+    """ test if a family's parents were born with the same surname """
+    ID = 16
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = obj.mother
+        father = obj.father
+        # Only birth names are compared (not married names), and empty
+        # names don't count.
+        return bool(mother and father and mother.surname
+                    and mother.surname == father.surname)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Husband and wife with the same surname")
+
+class LargeAgeGapFamily(FamilyRule):
+    """ test if a family's parents were born far apart """
+    ID = 17
+    SEVERITY = Rule.WARNING
+    def __init__(self, hw_diff, est):
+        """ initialize the rule """
+        self.hw_diff = hw_diff
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.hw_diff, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother_birth_date = _get_birth(obj.mother, self.est)
+        father_birth_date = _get_birth(obj.father, self.est)
+        mother_birth_date_ok = mother_birth_date > 0
+        father_birth_date_ok = father_birth_date > 0
+        large_diff = abs(
+            father_birth_date-mother_birth_date) / 365 > self.hw_diff
+        return mother_birth_date_ok and father_birth_date_ok and large_diff
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Large age difference between spouses")
+
+class MarriageBeforeBirth(FamilyRule):
+    """ test if each family's parent was born before the marriage """
+    ID = 18
+    SEVERITY = Rule.ERROR
+    def __init__(self, est):
+        """ initialize the rule """
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        marr_date = obj.marriage
+        if marr_date <= 0:
+            return False
+        mother_birth_date = _get_birth(obj.mother, self.est)
+        father_birth_date = _get_birth(obj.father, self.est)
+        return ((father_birth_date > 0 and father_birth_date > marr_date) or
+                (mother_birth_date > 0 and mother_birth_date > marr_date))
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Marriage before birth")
+
+class MarriageAfterDeath(FamilyRule):
+    """ test if each family's parent died before the marriage """
+    ID = 19
+    SEVERITY = Rule.ERROR
+    def __init__(self, est):
+        """ initialize the rule """
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        marr_date = obj.marriage
+        if marr_date <= 0:
+            return False
+        mother_death_date = _get_death(obj.mother, self.est)
+        father_death_date = _get_death(obj.father, self.est)
+        return ((father_death_date > 0 and father_death_date < marr_date) or
+                (mother_death_date > 0 and mother_death_date < marr_date))
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Marriage after death")
+
+class EarlyMarriage(FamilyRule):
+    """ test if each family's parent was 'too young' at the marriage """
+    ID = 20
+    SEVERITY = Rule.WARNING
+    def __init__(self, yng_mar, est):
+        """ initialize the rule """
+        self.yng_mar = yng_mar
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.yng_mar, self.est,)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        marr_date = obj.marriage
+        if marr_date <= 0:
+            return False
+        for parent in (obj.father, obj.mother):
+            birth_date = _get_birth(parent, self.est)
+            if (0 < birth_date < marr_date and
+                    (marr_date - birth_date) / 365 < self.yng_mar):
+                return True
+        return False
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Early marriage")
+
+class LateMarriage(FamilyRule):
+    """ test if each family's parent was 'too old' at the marriage """
+    ID = 21
+    SEVERITY = Rule.WARNING
+    def __init__(self, old_mar, est):
+        """ initialize the rule """
+        self.old_mar = old_mar
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_mar, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        marr_date = obj.marriage
+        if marr_date <= 0:
+            return False
+        for parent in (obj.father, obj.mother):
+            birth_date = _get_birth(parent, self.est)
+            if (birth_date > 0 and
+                    (marr_date - birth_date) / 365 > self.old_mar):
+                return True
+        return False
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Late marriage")
+
+class OldParent(ParentRule):
+    """ test if each family's parent was 'too old' at a child's birth """
+    ID = 22
+    SEVERITY = Rule.WARNING
+    def __init__(self, old_mom, old_dad, est):
+        """ initialize the rule """
+        self.old_mom = old_mom
+        self.old_dad = old_dad
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_mom, self.old_dad, self.est)
+
+    def broken(self, obj):
+        """ return the parent violating this rule, or False """
+        mother_birth_date = _get_birth(obj.mother, self.est)
+        father_birth_date = _get_birth(obj.father, self.est)
+        mother_birth_date_ok = mother_birth_date > 0
+        father_birth_date_ok = father_birth_date > 0
+
+        for child_birth_date in _get_child_birth_dates(obj, self.est):
+            if (father_birth_date_ok and
+                    (child_birth_date - father_birth_date) / 365
+                    > self.old_dad):
+                return Rule.FATHER
+            if (mother_birth_date_ok and
+                    (child_birth_date - mother_birth_date) / 365
+                    > self.old_mom):
+                return Rule.MOTHER
+        return False
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Old father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Old mother")
+
+class YoungParent(ParentRule):
+    """ test if each family's parent was 'too young' at a child's birth """
+    ID = 23
+    SEVERITY = Rule.WARNING
+    def __init__(self, yng_mom, yng_dad, est):
+        """ initialize the rule """
+        self.yng_dad = yng_dad
+        self.yng_mom = yng_mom
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.yng_mom, self.yng_dad, self.est)
+
+    def broken(self, obj):
+        """ return the parent violating this rule, or False """
+        mother_birth_date = _get_birth(obj.mother, self.est)
+        father_birth_date = _get_birth(obj.father, self.est)
+        mother_birth_date_ok = mother_birth_date > 0
+        father_birth_date_ok = father_birth_date > 0
+
+        for child_birth_date in _get_child_birth_dates(obj, self.est):
+            if (father_birth_date_ok and
+                    (child_birth_date - father_birth_date) / 365
+                    < self.yng_dad):
+                return Rule.FATHER
+            if (mother_birth_date_ok and
+                    (child_birth_date - mother_birth_date) / 365
+                    < self.yng_mom):
+                return Rule.MOTHER
+        return False
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Young father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Young mother")
+
+class UnbornParent(ParentRule):
+    """ test if each family's parent was not yet born at a child's birth """
+    ID = 24
+    SEVERITY = Rule.ERROR
+    def __init__(self, est):
+        """ initialize the rule """
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken(self, obj):
+        """ return the parent violating this rule, or False """
+        mother_birth_date = _get_birth(obj.mother, self.est)
+        father_birth_date = _get_birth(obj.father, self.est)
+        mother_birth_date_ok = mother_birth_date > 0
+        father_birth_date_ok = father_birth_date > 0
+
+        for child_birth_date in _get_child_birth_dates(obj, self.est):
+            if father_birth_date_ok and father_birth_date > child_birth_date:
+                return Rule.FATHER
+            if mother_birth_date_ok and mother_birth_date > child_birth_date:
+                return Rule.MOTHER
+        return False
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Unborn father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Unborn mother")
+
+class DeadParent(ParentRule):
+    """ test if each family's parent was dead at a child's birth """
+    ID = 25
+    SEVERITY = Rule.ERROR
+    def __init__(self, est):
+        """ initialize the rule """
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken(self, obj):
+        """ return the parent violating this rule, or False """
+        mother_death_date = _get_death(obj.mother, self.est)
+        father_death_date = _get_death(obj.father, self.est)
+        mother_death_date_ok = mother_death_date > 0
+        father_death_date_ok = father_death_date > 0
+
+        for child, has_birth_rel_to_father, has_birth_rel_to_mother \
+                in obj.children:
+            child_birth_date = _get_birth(child, self.est)
+            if child_birth_date <= 0:
+                continue
+            if (has_birth_rel_to_father
+                    and father_death_date_ok
+                    and ((father_death_date + 294) < child_birth_date)):
+                return Rule.FATHER
+            if (has_birth_rel_to_mother
+                    and mother_death_date_ok
+                    and (mother_death_date < child_birth_date)):
+                return Rule.MOTHER
+        return False
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Dead father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Dead mother")
+
+class LargeChildrenSpan(FamilyRule):
+    """ test if a family's first and last children were born far apart """
+    ID = 26
+    SEVERITY = Rule.WARNING
+    def __init__(self, cb_span, est):
+        """ initialize the rule """
+        self.cbs = cb_span
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.cbs, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        child_birth_dates = _get_child_birth_dates(obj, self.est)
+        return bool(child_birth_dates and
+                    (max(child_birth_dates) - min(child_birth_dates)) / 365
+                    > self.cbs)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Large year span for all children")
+
+class LargeChildrenAgeDiff(FamilyRule):
+    """ test if any of a family's children were born far apart """
+    ID = 27
+    SEVERITY = Rule.WARNING
+    def __init__(self, c_space, est):
+        """ initialize the rule """
+        self.c_space = c_space
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.c_space, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        child_birth_dates = _get_child_birth_dates(obj, self.est)
+        child_birth_dates_diff = [child_birth_dates[i+1] - child_birth_dates[i]
+                                  for i in range(len(child_birth_dates)-1)]
+
+        return bool(child_birth_dates_diff and
+                    max(child_birth_dates_diff) / 365 > self.c_space)
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Large age differences between children")
+
+class Disconnected(PersonRule):
+    """ test if a person has no children and no parents """
+    ID = 28
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.parent_families + obj.families == 0
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Disconnected individual")
+
+class InvalidBirthDate(PersonRule):
+    """ test if a person has an 'invalid' birth date """
+    ID = 29
+    SEVERITY = Rule.ERROR
+    def __init__(self, invdate):
+        """ initialize the rule """
+        self._invdate = invdate
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return bool(self._invdate) and obj.invalid_birth
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Invalid birth date")
+
+class InvalidDeathDate(PersonRule):
+    """ test if a person has an 'invalid' death date """
+    ID = 30
+    SEVERITY = Rule.ERROR
+    def __init__(self, invdate):
+        """ initialize the rule """
+        self._invdate = invdate
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return bool(self._invdate) and obj.invalid_death
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Invalid death date")
+
+class MarriedRelation(FamilyRule):
+    """ test if a family has a marriage date but is not marked 'married' """
+    ID = 31
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.marriage > 0 and not obj.married
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Marriage date but not married")
+
+class OldAgeButNoDeath(PersonRule):
+    """ test if a person is 'too old' but is not shown as dead """
+    ID = 32
+    SEVERITY = Rule.WARNING
+    def __init__(self, old_age, est):
+        """ initialize the rule """
+        self.old_age = old_age
+        self.est = est
+        self.today = Today().get_sort_value()
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_age, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[self.est]
+        # the estimated death date is the burial date
+        if obj.dead or obj.death[1] or not birth_date:
+            return False
+        age = (self.today - birth_date) / 365
+        return age > self.old_age
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Old age but no death")
+
+class BirthEqualsDeath(PersonRule):
+    """ test if a person's birth date is the same as their death date """
+    ID = 33
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[0]
+        return birth_date > 0 and birth_date == obj.death[0]
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Birth equals death")
+
+class BirthEqualsMarriage(PersonRule):
+    """ test if a person's birth date is the same as their marriage date """
+    ID = 34
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.birth[0]
+        marr_date = obj.marriage
+        marr_ok = marr_date > 0 if marr_date is not None else False
+        return marr_ok and birth_date > 0 and birth_date == marr_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Birth equals marriage")
+
+class DeathEqualsMarriage(PersonRule):
+    """ test if a person's death date is the same as their marriage date """
+    ID = 35
+    SEVERITY = Rule.WARNING # it's possible
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        death_date = obj.death[0]
+        marr_date = obj.marriage
+        marr_ok = marr_date > 0 if marr_date is not None else False
+        return marr_ok and death_date > 0 and death_date == marr_date
+
+    def get_message(self, broken):
+        """ return the rule's error message """
+        return _("Death equals marriage")
+
+def get_rules(options):
+    """
+    Return the lists of the person rules and of the family rules, with the
+    parameters of a dictionary of the options of the tool.
+    """
+    est = options['estimate_age']
+    person_rules = [
+        BirthAfterBapt(),
+        DeathBeforeBapt(),
+        BirthAfterBury(),
+        DeathAfterBury(),
+        BirthAfterDeath(),
+        BaptAfterBury(),
+        OldAge(options['oldage'], est),
+        OldAgeButNoDeath(options['oldage'], est),
+        UnknownGender(),
+        MultipleParents(),
+        MarriedOften(options['wedder']),
+        OldUnmarried(options['oldunm'], est),
+        TooManyChildren(options['mxchilddad'], options['mxchildmom']),
+        Disconnected(),
+        InvalidBirthDate(options['invdate']),
+        InvalidDeathDate(options['invdate']),
+        BirthEqualsDeath(),
+        BirthEqualsMarriage(),
+        DeathEqualsMarriage(),
+        ]
+    family_rules = [
+        SameSexFamily(),
+        FemaleHusband(),
+        MaleWife(),
+        SameSurnameFamily(),
+        LargeAgeGapFamily(options['hwdif'], est),
+        MarriageBeforeBirth(est),
+        MarriageAfterDeath(est),
+        EarlyMarriage(options['yngmar'], est),
+        LateMarriage(options['oldmar'], est),
+        OldParent(options['oldmom'], options['olddad'], est),
+        YoungParent(options['yngmom'], options['yngdad'], est),
+        UnbornParent(est),
+        DeadParent(est),
+        LargeChildrenSpan(options['cbspan'], est),
+        LargeChildrenAgeDiff(options['cspace'], est),
+        MarriedRelation(),
+        ]
+    return person_rules, family_rules
+
+#-------------------------------------------------------------------------
+#
+# Checking the rules
+#
+#-------------------------------------------------------------------------
+def check_rules(records, rules, start, stop):
+    """
+    Check every rule against the facts of the records from position start
+    to stop, and return a list of the position of each record which breaks
+    a rule, the position of the rule and the value returned by the rule,
+    in the order of the records and then of the rules.
+    """
+    results = []
+    for pos, rule in enumerate(rules):
+        broken = rule.broken
+        for index in range(start, stop):
+            value = broken(records[index])
+            if value:
+                results.append((index, pos, value))
+    results.sort(key=lambda result: result[:2])
+    return results
+
+# Facts and rules of a worker process:
+_WORKER = {}
+
+def _init_worker(records, rules):
+    """
+    Keep the facts and the rules that the tasks of a worker process check.
+    """
+    _WORKER['records'] = records
+    _WORKER['rules'] = rules
+
+def _check_rules_task(kind, start, stop):
+    return check_rules(_WORKER['records'][kind], _WORKER['rules'][kind],
+                       start, stop)
+
+def verify(db, options, processes=0, user=None):
+    """
+    Return the list of the rules broken by the people and then by the
+    families of the database, as the tuples of :meth:`Rule.report_itself`.
+
+    :param options: The options of the tool, which are the parameters of
+                    the rules.
+    :type options: dict
+    :param processes: Number of worker processes, 0 for one per processor.
+    :type processes: int
+    :param user: Reports the progress.
+    :type user: :py:class:`.User`
+    """
+    records = get_facts(db, user)
+    rules = get_rules(options)
+    processes = processes or os.cpu_count() or 1
+    tasks = [(kind, start, min(start + TASK_SIZE, len(records[kind])))
+             for kind in range(2)
+             for start in range(0, len(records[kind]), TASK_SIZE)]
+    if user:
+        user.begin_progress(_('Verify the Data'),
+                            _('Checking the rules...'), len(tasks))
+    results = []
+    pending = deque()
+    pool = None
+    try:
+        for kind, start, stop in tasks:
+            if (pool is None and processes > 1 and
+                    stop - start == TASK_SIZE):
+                try:
+                    pool = ProcessPoolExecutor(processes,
+                                               initializer=_init_worker,
+                                               initargs=(records, rules))
+                except (OSError, ImportError, NotImplementedError) as err:
+                    LOG.warning("Cannot start worker processes: %s", err)
+                    processes = 1
+            if pool is None:
+                broken = check_rules(records[kind], rules[kind], start, stop)
+                results.append((kind, broken))
+            else:
+                pending.append((kind, pool.submit(_check_rules_task,
+                                                  kind, start, stop)))
+                if len(pending) > 2 * processes:
+                    kind, future = pending.popleft()
+                    results.append((kind, future.result()))
+            if user:
+                user.step_progress()
+        while pending:
+            kind, future = pending.popleft()
+            results.append((kind, future.result()))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if user:
+        user.end_progress()
+
+    return [rules[kind][pos].report_itself(db, records[kind][index], value)
+            for kind, broken in results
+            for index, pos, value in broken]
+
+#-------------------------------------------------------------------------
+#
+# Writing the results
+#
+#-------------------------------------------------------------------------
+SEVERITY_CODES = {Rule.ERROR: 'E', Rule.WARNING: 'W'}
+
+RESULT_FIELDS = ['severity', 'message', 'type', 'gramps_id', 'name', 'rule',
+                 'handle']
+
+def write_results(results, filename):
+    """
+    Write the results of :func:`verify` to a file, as JSON if its name ends
+    with .json, or else as CSV.
+    """
+    rows = []
+    for (msg, gramps_id, name, the_type, rule_id, severity,
+         handle) in results:
+        rows.append(dict(zip(RESULT_FIELDS, (
+            SEVERITY_CODES.get(severity, 'S'), msg, the_type, gramps_id,
+            name, rule_id[0], handle))))
+    with open(filename, 'w', encoding='utf-8', newline='') as out:
+        if filename.lower().endswith('.json'):
+            json.dump(rows, out, indent=2, ensure_ascii=False)
+        else:
+            writer = csv.DictWriter(out, RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,83 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for libduplicates.py """
+
+import os
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+from .. import libduplicates
+from ..libduplicates import (compare_people, find_duplicates, gen_key,
+                             get_features, iter_pairs)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class DuplicatesTest(unittest.TestCase):
+    """
+    Test the search for duplicate people.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.features = get_features(cls.db)
+
+    def test_blocking(self):
+        """
+        Blocking must not miss any pair that the comparison accepts.
+        """
+        for use_soundex in (True, False):
+            pairs = list(iter_pairs(self.features, use_soundex))
+            self.assertEqual(len(pairs), len(set(pairs)))
+            pairs = set(pairs)
+            buckets = {}
+            for index, person in enumerate(self.features):
+                key = (person.gender == Person.MALE,
+                       gen_key(person.name[0], use_soundex))
+                buckets.setdefault(key, []).append(index)
+            for bucket in buckets.values():
+                for pos, first in enumerate(bucket):
+                    for second in bucket[pos+1:]:
+                        p1 = self.features[first]
+                        p2 = self.features[second]
+                        if (compare_people(p1, p2, use_soundex) != -1 or
+                                compare_people(p2, p1, use_soundex) != -1):
+                            self.assertIn((first, second), pairs)
+
+    def test_find(self):
+        the_map = find_duplicates(self.db, 1.0, processes=1)
+        self.assertEqual(len(the_map), 222)
+        for p1key, (p2key, chance) in the_map.items():
+            self.assertNotEqual(p1key, p2key)
+            self.assertGreaterEqual(chance, 1.0)
+
+    def test_processes(self):
+        with patch.object(libduplicates, 'TASK_SIZE', 500):
+            the_map = find_duplicates(self.db, 1.0, processes=2)
+        self.assertEqual(the_map, find_duplicates(self.db, 1.0, processes=1))
+
+if __name__ == "__main__":
+    unittest.main()
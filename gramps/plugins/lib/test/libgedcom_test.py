@@ -0,0 +1,107 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for libgedcom.py """
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.const import DATA_DIR
+from .. import libgedcom
+from ..libgedcom import IdMapper, Lexer, LexerProcess, make_reader
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+
+class LexerTest(unittest.TestCase):
+    """
+    Compare the lines read in a worker process with those read directly.
+    """
+
+    def read_lines(self, filename, encoding, in_process):
+        messages = []
+        lines = []
+        with open(filename, "rb") as ifile:
+            if in_process:
+                lexer = LexerProcess(filename, encoding, messages.append)
+            else:
+                lexer = Lexer(make_reader(ifile, encoding, messages.append),
+                              messages.append)
+            try:
+                line = lexer.readline()
+                while line:
+                    lines.append((line.line, line.level, line.token,
+                                  line.token_text, line.data))
+                    line = lexer.readline()
+            finally:
+                lexer.close()
+        return lines, messages
+
+    def compare(self, filename, encoding):
+        expected = self.read_lines(filename, encoding, False)
+        self.assertTrue(expected[0])
+        with patch.object(libgedcom, 'LEXER_BLOCK_SIZE', 7):
+            self.assertEqual(self.read_lines(filename, encoding, True),
+                             expected)
+        return expected
+
+    def test_ansel(self):
+        self.compare(os.path.join(TEST_DIR, "imp_ANSEL_CRLF.ged"), "ANSEL")
+
+    def test_utf16(self):
+        self.compare(os.path.join(TEST_DIR, "imp_UTF_16_LE_BOM_CRLF.ged"),
+                     "UTF16")
+
+    def test_messages(self):
+        with tempfile.NamedTemporaryFile(suffix=".ged", delete=False) as ged:
+            ged.write(b"0 HEAD\n1 CHAR ANSI\n0 @I1@ INDI\n"
+                      b"1 NAME John /Smith/\nX broken line\n"
+                      b"1 NOTE first\n2 CONT second\x7f\n"
+                      b"2 CONC  third\n0 TRLR\n")
+        try:
+            lines, messages = self.compare(ged.name, "ANSI")
+        finally:
+            os.remove(ged.name)
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[4][4], "first\nsecond\x7f third")
+        self.assertEqual(len(messages), 2)
+
+class IdMapperTest(unittest.TestCase):
+    """
+    Test the mapping of GEDCOM xrefs to Gramps IDs.
+    """
+
+    def test_map(self):
+        existing = {"I0001", "I0002"}
+        free = ("I%04d" % index for index in range(1, 100)
+                if "I%04d" % index not in existing)
+        mapper = IdMapper(existing.__contains__, free.__next__,
+                          lambda gid: "I%04d" % int(gid[1:]))
+        self.assertEqual(mapper["@I3@"], "I0003")
+        self.assertEqual(mapper["I0003"], "I0004")
+        self.assertEqual(mapper["@I1@"], "I0005")
+        self.assertEqual(mapper["@I3@"], "I0003")
+        self.assertEqual(mapper[""], "I0006")
+        self.assertEqual(mapper.map(), {"I3": "I0003", "I0003": "I0004",
+                                        "I1": "I0005"})
+
+if __name__ == "__main__":
+    unittest.main()
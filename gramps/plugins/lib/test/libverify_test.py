@@ -0,0 +1,109 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for libverify.py """
+
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+from .. import libverify
+from ..libverify import Rule, get_facts, verify, write_results
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+OPTIONS = {'oldage': 90, 'hwdif': 30, 'cspace': 8, 'cbspan': 25,
+           'yngmar': 17, 'oldmar': 50, 'oldmom': 48, 'yngmom': 17,
+           'yngdad': 18, 'olddad': 65, 'wedder': 3, 'mxchildmom': 12,
+           'mxchilddad': 15, 'lngwdw': 30, 'oldunm': 99, 'estimate_age': 0,
+           'invdate': 1}
+
+class VerifyTest(unittest.TestCase):
+    """
+    Test the verification of the data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.results = verify(cls.db, OPTIONS, processes=1)
+
+    def test_facts(self):
+        people, families = get_facts(self.db)
+        self.assertEqual(len(people), self.db.get_number_of_people())
+        self.assertEqual(len(families), self.db.get_number_of_families())
+        person = [facts for facts in people if facts.gramps_id == 'I0044'][0]
+        self.assertEqual(person.gender, Person.MALE)
+        self.assertEqual(person.birth, (2398756, 2398756))
+        self.assertEqual(person.death, (2419216, 2419216))
+        self.assertEqual(person.bury, 2419219)
+        self.assertEqual((person.families, person.children), (1, 8))
+        self.assertEqual(person.surname, 'Garner von Zieliński')
+        handles = {facts.handle for facts in people}
+        for family in families:
+            for parent in (family.father, family.mother):
+                self.assertTrue(parent is None or parent.handle in handles)
+
+    def test_verify(self):
+        # Old age but no death depends on the current date.
+        counts = Counter(rule_id[0] for (msg, gramps_id, name, the_type,
+                                         rule_id, severity, handle)
+                         in self.results if rule_id[0] != 32)
+        self.assertEqual(counts, {4: 2, 7: 12, 8: 20, 12: 3, 16: 12, 20: 5,
+                                  21: 6, 22: 1, 23: 4, 26: 1, 27: 30,
+                                  28: 73, 33: 1, 34: 1})
+        self.assertIn(('Too many children', 'I0024', 'Burns, Margaret',
+                       'Person', (12, (15, 12)), Rule.WARNING,
+                       'STTJQC8EDV5PN031EQ'), self.results)
+
+    def test_processes(self):
+        with patch.object(libverify, 'TASK_SIZE', 100):
+            results = verify(self.db, OPTIONS, processes=2)
+        self.assertEqual(results, self.results)
+
+    def test_write(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'verify.json')
+            write_results(self.results, filename)
+            with open(filename, encoding='utf-8') as data:
+                rows = json.load(data)
+            self.assertEqual(len(rows), len(self.results))
+            filename = os.path.join(tmpdir, 'verify.csv')
+            write_results(self.results, filename)
+            with open(filename, encoding='utf-8', newline='') as data:
+                self.assertEqual(list(csv.DictReader(data)),
+                                 [{key: str(value) for key, value
+                                   in row.items()} for row in rows])
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -265,6 +265,12 @@ class BirthdayReport(Report):
         ngettext = self._locale.translation.ngettext # to see "nearby" comments
         rel_calc = get_relationship_calculator(reinit=True,
                                                clocale=self._locale)
+        relations = {}
+        if self.relationships:
+            relations = rel_calc.get_relationships(self.database,
+                                                   self.center_person,
+                                                   people,
+                                                   olocale=self._locale)
 
         with self._user.progress(_('Birthday and Anniversary Report'),
                 _('Reading database...'), len(people)) as step:
@@ -315,11 +321,7 @@ class BirthdayReport(Report):
 
                         comment = ""
                         if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            relation = relations[person_handle]
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
@@ -427,11 +429,7 @@ class BirthdayReport(Report):
 
                     comment = ""
                     if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            relation = relations[person_handle]
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
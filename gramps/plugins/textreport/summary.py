@@ -113,55 +113,69 @@ class SummaryReport(Report):
         self.doc.write_text(self._("Individuals"))
         self.doc.end_paragraph()
 
-        num_people = 0
-        for person in self.__db.iter_people():
-            num_people += 1
-            primary_names = [person.get_primary_name()]
-
-            # Count people with media.
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-
-            # Count people with incomplete names.
-            for name in primary_names + person.get_alternate_names():
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
+        stats = self.__db.get_tree_statistics()
+        if stats is not None:
+            summary = stats.get_people_summary()
+            num_people = summary['people']
+            males = summary['males']
+            females = summary['females']
+            unknowns = summary['unknown']
+            incomp_names = summary['incomplete_names']
+            missing_bday = summary['missing_births']
+            disconnected = summary['disconnected']
+            with_media = summary['with_media']
+            unique_surnames = summary['unique_surnames']
+        else:
+            num_people = 0
+            for person in self.__db.iter_people():
+                num_people += 1
+                primary_names = [person.get_primary_name()]
+
+                # Count people with media.
+                length = len(person.get_media_list())
+                if length > 0:
+                    with_media += 1
+
+                # Count people with incomplete names.
+                for name in primary_names + person.get_alternate_names():
+                    if name.get_first_name().strip() == "":
                         incomp_names += 1
+                    else:
+                        if name.get_surname_list():
+                            for surname in name.get_surname_list():
+                                if surname.get_surname().strip() == "":
+                                    incomp_names += 1
+                        else:
+                            incomp_names += 1
+
+                # Count people without families.
+                if (not person.get_main_parents_family_handle() and
+                        not len(person.get_family_handle_list())):
+                    disconnected += 1
+
+                # Count missing birthdays.
+                birth_ref = person.get_birth_ref()
+                if birth_ref:
+                    birth = self.__db.get_event_from_handle(birth_ref.ref)
+                    if not get_date(birth):
+                        missing_bday += 1
+                else:
+                    missing_bday += 1
 
-            # Count people without families.
-            if (not person.get_main_parents_family_handle() and
-                    not len(person.get_family_handle_list())):
-                disconnected += 1
+                # Count genders.
+                if person.get_gender() == Person.FEMALE:
+                    females += 1
+                elif person.get_gender() == Person.MALE:
+                    males += 1
+                else:
+                    unknowns += 1
 
-            # Count missing birthdays.
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = self.__db.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            # Count genders.
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            else:
-                unknowns += 1
-
-            # Count unique surnames
-            for name in primary_names + person.get_alternate_names():
-                if (not name.get_surname().strip() in namelist
-                        and not name.get_surname().strip() == ""):
-                    namelist.append(name.get_surname().strip())
+                # Count unique surnames
+                for name in primary_names + person.get_alternate_names():
+                    if (not name.get_surname().strip() in namelist
+                            and not name.get_surname().strip() == ""):
+                        namelist.append(name.get_surname().strip())
+            unique_surnames = len(namelist)
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(self._("Number of individuals: %d") % num_people)
@@ -195,7 +209,7 @@ class SummaryReport(Report):
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
-        self.doc.write_text(self._("Unique surnames: %d") % len(namelist))
+        self.doc.write_text(self._("Unique surnames: %d") % unique_surnames)
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
@@ -228,20 +242,24 @@ class SummaryReport(Report):
         self.doc.write_text(self._("Media Objects"))
         self.doc.end_paragraph()
 
-        total_media = len(self.__db.get_media_handles())
-        mbytes = "0"
-        for media_id in self.__db.get_media_handles():
-            media = self.__db.get_media_from_handle(media_id)
-            try:
-                size_in_bytes += os.path.getsize(
-                    media_path_full(self.__db, media.get_path()))
-                length = len(str(size_in_bytes))
-                if size_in_bytes <= 999999:
-                    mbytes = self._("less than 1")
-                else:
-                    mbytes = str(size_in_bytes)[:(length-6)]
-            except:
-                notfound.append(media.get_path())
+        stats = self.__db.get_tree_statistics()
+        if stats is not None:
+            total_media, size_in_bytes, notfound = stats.get_media_summary()
+        else:
+            total_media = len(self.__db.get_media_handles())
+            for media_id in self.__db.get_media_handles():
+                media = self.__db.get_media_from_handle(media_id)
+                try:
+                    size_in_bytes += os.path.getsize(
+                        media_path_full(self.__db, media.get_path()))
+                except:
+                    notfound.append(media.get_path())
+        if total_media == len(notfound):
+            mbytes = "0"
+        elif size_in_bytes <= 999999:
+            mbytes = self._("less than 1")
+        else:
+            mbytes = str(size_in_bytes)[:-6]
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(self._("Number of unique media objects: %d"
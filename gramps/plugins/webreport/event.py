@@ -114,15 +114,23 @@ class EventPages(BasePage):
         with self.r_user.progress(_("Narrated Web Site Report"), message,
                                   len(event_handle_list) + 1
                                  ) as step:
-            index = 1
-            for event_handle in event_handle_list:
-                step()
-                index += 1
-                self.eventpage(self.report, title, event_handle)
+            self.report.write_object_pages(
+                Event, title,
+                [(event_handle, ()) for event_handle in event_handle_list],
+                step)
             step()
         self.eventlistpage(self.report, title, event_types,
                            event_handle_list)
 
+    def display_page(self, title, event_handle):
+        """
+        Generate and output the page of an event.
+
+        @param: title        -- Is the title of the web page
+        @param: event_handle -- The handle of the event
+        """
+        self.eventpage(self.report, title, event_handle)
+
     def eventlistpage(self, report, title, event_types, event_handle_list):
         """
         Will create the event list page
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Classes:
+    PageManifest - the record of the pages written by a run of the report,
+                   used to write only the pages that changed on the next run
+    DependencyProxyDb - a proxy that tells the manifest which objects the
+                        page being written reads
+    DependencyDict - a dictionary of the report that tells the manifest which
+                     entries the page being written reads
+"""
+#------------------------------------------------
+# python modules
+#------------------------------------------------
+from collections import defaultdict
+from hashlib import md5
+from types import GeneratorType
+import json
+import logging
+import os
+import re
+
+#------------------------------------------------
+# Gramps module
+#------------------------------------------------
+from gramps.gen.errors import HandleError
+from gramps.version import VERSION
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+MANIFEST_FNAME = ".narrativeweb.json"
+MANIFEST_VERSION = 2
+
+# The database methods whose results the pages depend on
+_RECORDED = re.compile(r"get_\w+_from_(handle|gramps_id)$|"
+                       r"find_backlink_handles$|"
+                       r"get_\w+_handles$|"
+                       r"get_number_of_\w+$")
+
+def _freeze(value):
+    """
+    Return a hashable version of a value read from the manifest.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _plain(value):
+    """
+    Return a version of a value whose repr does not change from one run to
+    the next: objects are serialized, and sets are sorted.
+    """
+    if hasattr(value, "serialize") and not isinstance(value, type):
+        return value.serialize()
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, set):
+        return sorted(repr(_plain(item)) for item in value)
+    return value
+
+#------------------------------------------------
+#
+# DependencyProxyDb
+#
+#------------------------------------------------
+class DependencyProxyDb:
+    """
+    A proxy for the database of the report, which tells the manifest about
+    the calls whose results the page being written depends on.
+    """
+    def __init__(self, database, manifest):
+        self.db = database
+        self.manifest = manifest
+
+    def __getattr__(self, attr):
+        """
+        Use the self.db version of the attribute, recording the calls to
+        the methods that read objects.
+        """
+        func = getattr(self.db, attr)
+        if not _RECORDED.match(attr):
+            return func
+        manifest = self.manifest
+
+        def record(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if isinstance(result, GeneratorType):
+                result = list(result)
+            if manifest.current is not None:
+                manifest.record((attr, _freeze(args),
+                                 _freeze(sorted(kwargs.items()))), result)
+            return result
+        setattr(self, attr, record)
+        return record
+
+    def get_kinship_graph(self):
+        """
+        Return None, so that relationships are found by reading the people
+        and families, which are then recorded.
+        """
+        return None
+
+    def get_lifespan_table(self):
+        """
+        Return None, so that the people, families and events the estimate
+        of whether a person is alive uses are read, and recorded.
+        """
+        return None
+
+#------------------------------------------------
+#
+# DependencyDict
+#
+#------------------------------------------------
+class DependencyDict(defaultdict):
+    """
+    One of the dictionaries of objects of the report, e.g. obj_dict[Person],
+    which tells the manifest about the entries the page being written reads.
+    """
+    def __init__(self, manifest, name, items):
+        defaultdict.__init__(self, set, items)
+        self.manifest = manifest
+        self.name = name
+
+    def __record(self, key):
+        """
+        Tell the manifest about an entry of the dictionary.
+        """
+        if self.manifest.current is not None:
+            self.manifest.record(self.name + (key,), self.entry(key))
+
+    def entry(self, key):
+        """
+        Return an entry without recording it, None if it is missing or empty.
+        """
+        return dict.get(self, key) or None
+
+    def __getitem__(self, key):
+        self.__record(key)
+        return defaultdict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self.__record(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self.__record(key)
+        return dict.get(self, key, default)
+
+#------------------------------------------------
+#
+# PageManifest
+#
+#------------------------------------------------
+class PageManifest:
+    """
+    The pages and files written by the report.
+
+    For each page of a primary object, the manifest holds the database calls
+    made while writing it (the dependencies) and a hash of their results,
+    together with the files it wrote. On the next run, a page whose
+    dependencies give the same hash, and whose files are still there, is not
+    written again. A file whose content has not changed is not rewritten,
+    and the files of the previous run that are not written any more are
+    removed.
+    """
+    def __init__(self, database, html_dir, options):
+        """
+        @param: database -- The database the pages are made from
+        @param: html_dir -- The destination directory of the report
+        @param: options  -- The options of the report; if they differ from
+                            those of the previous run, all pages are written
+        """
+        self.db = database
+        self.html_dir = html_dir
+        self.options = md5(repr((VERSION, sorted(options.items()))).encode(
+            "utf-8")).hexdigest()
+        self.current = None
+        self.signatures = {}
+        self.dicts = {}
+        self.old_pages = {}
+        self.old_files = {}
+        self.old_keys = []
+        self.pages = {}
+        self.files = {}
+        self.keys = {}
+        self.key_list = []
+        self.load()
+
+    def load(self):
+        """
+        Read the manifest of the previous run.
+        """
+        fname = os.path.join(self.html_dir, MANIFEST_FNAME)
+        if not os.path.isfile(fname):
+            return
+        try:
+            with open(fname, encoding="utf-8") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError) as err:
+            LOG.warning("Cannot read %s: %s", fname, err)
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.old_files = data["files"]
+        if data["options"] == self.options:
+            self.old_pages = data["pages"]
+            self.old_keys = [_freeze(key) for key in data["keys"]]
+
+    def save(self):
+        """
+        Remove the files of the previous run that were not written, and
+        write the manifest of this run.
+        """
+        for fname in set(self.old_files) - set(self.files):
+            path = os.path.join(self.html_dir, fname)
+            if os.path.isfile(path):
+                LOG.debug("removing '%s'", fname)
+                os.remove(path)
+        data = {"version": MANIFEST_VERSION,
+                "options": self.options,
+                "keys": self.key_list,
+                "pages": self.pages,
+                "files": self.files}
+        fname = os.path.join(self.html_dir, MANIFEST_FNAME)
+        with open(fname, "w", encoding="utf-8") as manifest_file:
+            json.dump(data, manifest_file)
+
+    def watch(self, name, dictionary, classes):
+        """
+        Make the pages depend on the entries they read from a dictionary of
+        the report, such as obj_dict, keyed by class and handle.
+        """
+        for obj_class in classes:
+            key = (name, obj_class.__name__)
+            dictionary[obj_class] = self.dicts[key] = DependencyDict(
+                self, key, dictionary[obj_class])
+
+    @staticmethod
+    def signature(result):
+        """
+        Return the hash of the result of a database call, or of an entry of
+        a dictionary of the report.
+        """
+        return md5(repr(_plain(result)).encode("utf-8")).hexdigest()
+
+    def __current_signature(self, key):
+        """
+        Return the hash of the result of a database call or dictionary
+        lookup now, or an empty string if the object it read is gone.
+        """
+        signature = self.signatures.get(key)
+        if signature is None:
+            try:
+                if key[:2] in self.dicts:
+                    result = self.dicts[key[:2]].entry(key[2])
+                else:
+                    result = getattr(self.db, key[0])(*key[1], **dict(key[2]))
+                if isinstance(result, GeneratorType):
+                    result = list(result)
+                signature = self.signature(result)
+            except HandleError:
+                signature = ""
+            self.signatures[key] = signature
+        return signature
+
+    def __hash(self, extra, keys):
+        """
+        Return the hash of a page from its dependencies.
+        """
+        page_hash = md5(repr(extra).encode("utf-8"))
+        for key in keys:
+            page_hash.update(repr(key).encode("utf-8"))
+            page_hash.update(self.__current_signature(key).encode("utf-8"))
+        return page_hash.hexdigest()
+
+    def __key_index(self, key):
+        """
+        Return the number of a dependency in the manifest.
+        """
+        index = self.keys.get(key)
+        if index is None:
+            index = self.keys[key] = len(self.key_list)
+            self.key_list.append(key)
+        return index
+
+    def is_current(self, page, extra):
+        """
+        Return True if a page does not need to be written again, keeping it
+        in the manifest.
+
+        @param: page  -- The name of the page, e.g. "Person:<handle>"
+        @param: extra -- Anything else the page depends on, given as a value
+                         whose repr is stable
+        """
+        entry = self.old_pages.get(page)
+        if entry is None:
+            return False
+        deps, page_hash, files = entry
+        for fname in files:
+            if fname not in self.old_files or not os.path.isfile(
+                    os.path.join(self.html_dir, fname)):
+                return False
+        keys = [self.old_keys[index] for index in deps]
+        if self.__hash(extra, keys) != page_hash:
+            return False
+        self.pages[page] = [[self.__key_index(key) for key in keys],
+                            page_hash, files]
+        for fname in files:
+            self.files[fname] = self.old_files[fname]
+        return True
+
+    def start(self, page, extra, key):
+        """
+        Start recording the dependencies of a page.
+
+        @param: key -- The database call that reads the object of the page
+        """
+        self.current = [page, extra, {key: None}, []]
+
+    def record(self, key, result):
+        """
+        Record a database call or dictionary lookup made while writing the
+        current page.
+        """
+        if key not in self.current[2]:
+            self.current[2][key] = None
+            if key not in self.signatures:
+                self.signatures[key] = self.signature(result)
+
+    def finish(self):
+        """
+        Stop recording, and keep the dependencies of the page.
+        """
+        page, extra, deps, files = self.current
+        self.current = None
+        keys = list(deps)
+        self.pages[page] = [[self.__key_index(key) for key in keys],
+                            self.__hash(extra, keys), files]
+
+    def take_pages(self):
+        """
+        Return the pages and the files recorded since the last call, and
+        forget them. This is how a worker process that writes pages gives
+        them to the report process, so the dependencies of the pages are
+        given in full rather than by number.
+        """
+        pages = {page: [[self.key_list[index] for index in deps], page_hash,
+                         files]
+                 for page, (deps, page_hash, files) in self.pages.items()}
+        files = self.files
+        self.pages = {}
+        self.files = {}
+        return pages, files
+
+    def add_pages(self, pages, files):
+        """
+        Keep the pages and the files recorded by a worker process.
+        """
+        for page, (keys, page_hash, page_files) in pages.items():
+            self.pages[page] = [[self.__key_index(key) for key in keys],
+                                page_hash, page_files]
+        self.files.update(files)
+
+    def write_file(self, fname, data):
+        """
+        Write the content of a file, unless it is already there. Return
+        True if the file was written.
+
+        @param: fname -- The name of the file, relative to the destination
+        @param: data  -- The content of the file, as bytes
+        """
+        if self.current is not None:
+            self.current[3].append(fname)
+        content_hash = md5(data).hexdigest()
+        self.files[fname] = content_hash
+        path = os.path.join(self.html_dir, fname)
+        if self.old_files.get(fname) == content_hash and os.path.isfile(path):
+            return False
+        with open(path, "wb") as output_file:
+            output_file.write(data)
+        return True
+
+    def copy_needed(self, from_fname, dest, fname):
+        """
+        Return True if a file must be copied, because it is not already
+        there with the same size and modification time.
+
+        @param: from_fname -- The path of the file to copy
+        @param: dest       -- The full path of the copy
+        @param: fname      -- The path of the copy, relative to the
+                              destination
+        """
+        if self.current is not None:
+            self.current[3].append(fname)
+        stat = os.stat(from_fname)
+        signature = "%d:%d" % (stat.st_mtime, stat.st_size)
+        self.files[fname] = signature
+        if self.old_files.get(fname) != signature:
+            return True
+        try:
+            dest_stat = os.stat(dest)
+        except OSError:
+            return True
+        return (int(dest_stat.st_mtime) != int(stat.st_mtime) or
+                dest_stat.st_size != stat.st_size)
@@ -140,11 +140,13 @@ class MediaPages(BasePage):
                 self.report.obj_dict[Media].keys(),
                 key=lambda x: sort_by_desc_and_gid(
                     self.r_db.get_media_from_handle(x)))
+            # the previous and next media of each page are found first, so
+            # that the pages can be written in any order
+            pages = []
             prev = None
             total = len(sorted_media_handles)
             index = 1
             for handle in sorted_media_handles:
-                gc.collect() # Reduce memory usage when there are many images.
                 if index == media_count:
                     next_ = None
                 elif index < total:
@@ -153,10 +155,8 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(self.report, title,
-                               handle, (prev, next_, index, media_count))
+                pages.append((handle, ((prev, next_, index, media_count),)))
                 prev = handle
-                step()
                 index += 1
 
             total = len(self.unused_media_handles)
@@ -165,20 +165,33 @@ class MediaPages(BasePage):
             prev = sorted_media_handles[total_m-1] if total_m > 0 else 0
             if total > 0:
                 for media_handle in self.unused_media_handles:
-                    gc.collect() # Reduce memory usage when many images.
                     if index == media_count:
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(self.report, title, media_handle,
-                                   (prev, next_, index, media_count))
+                    pages.append((media_handle,
+                                  ((prev, next_, index, media_count),)))
                     prev = media_handle
-                    step()
                     index += 1
                     idx += 1
 
+            self.report.write_object_pages(Media, title, pages, step)
+
         self.medialistpage(self.report, title, sorted_media_handles)
 
+    def display_page(self, title, media_handle, info):
+        """
+        Generate and output the page of a media object.
+
+        @param: title        -- Is the title of the web page
+        @param: media_handle -- The handle of the media
+        @param: info         -- A tuple containing the media handle for the
+                                next and previous media, the current page
+                                number, and the total number of media pages
+        """
+        gc.collect() # Reduce memory usage when there are many images.
+        self.mediapage(self.report, title, media_handle, info)
+
     def medialistpage(self, report, title, sorted_media_handles):
         """
         Generate and output the Media index page.
@@ -657,8 +670,7 @@ class MediaPages(BasePage):
                     self.report.archive.add(fullpath, str(newpath))
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
-                if not os.path.isdir(to_dir):
-                    os.makedirs(to_dir)
+                os.makedirs(to_dir, exist_ok=True)
                 new_file = os.path.join(self.html_dir, newpath)
                 shutil.copyfile(fullpath, new_file)
                 os.utime(new_file, (mtime, mtime))
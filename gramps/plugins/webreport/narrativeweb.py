@@ -48,13 +48,18 @@ Classes:
 #------------------------------------------------
 import logging
 from functools import partial
+import multiprocessing
 import os
 import sys
 import time
 import shutil
 import tarfile
+import tempfile
 from io import BytesIO, TextIOWrapper
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from decimal import getcontext
 
 #------------------------------------------------
@@ -75,6 +80,8 @@ from gramps.gen.plug.report import MenuReportOptions
 from gramps.gen.plug.report import stdoptions
 from gramps.gen.constfunc import win, get_curr_dir
 from gramps.gen.config import config
+from gramps.gen.db import DBMODE_R
+from gramps.gen.user import User
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.display.place import displayer as _pd
 from gramps.gen.proxy import CacheProxyDb
@@ -104,6 +111,7 @@ from gramps.plugins.webreport.download import DownloadPage
 from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
+from gramps.plugins.webreport.manifest import PageManifest, DependencyProxyDb
 
 from gramps.plugins.webreport.common import (get_gendex_data,
                                              HTTP, HTTPS, _WEB_EXT, CSS,
@@ -120,6 +128,39 @@ getcontext().prec = 8
 _DEFAULT_MAX_IMG_WIDTH = 800   # resize images that are wider than this
 _DEFAULT_MAX_IMG_HEIGHT = 600  # resize images that are taller than this
                                # The two values above are settable in options.
+PAGES_CHUNK = 25               # pages written by a worker process at a time
+
+# The report whose pages the worker processes write. They are forked from
+# the report process, so they start with everything it has prepared.
+_REPORT = None
+
+def _start_worker():
+    """
+    Prepare a worker process to write pages of the report.
+    """
+    _REPORT.start_worker()
+
+def write_pages(obj_class, title, pages):
+    """
+    Write a chunk of the pages of objects of a class, and return what the
+    report process must know about them.
+
+    This is a module level function so that it can be run in a worker process.
+    """
+    return _REPORT.write_worker_pages(obj_class, title, pages)
+
+class WorkerUser(User):
+    """
+    The user of a worker process, which keeps the warnings to pass them to
+    the user of the report.
+    """
+    def __init__(self):
+        User.__init__(self)
+        self.warnings = []
+
+    def warn(self, title, warning=""):
+        self.warnings.append((title, warning))
+
 class NavWebReport(Report):
     """
     Create WebReport object that produces the report.
@@ -148,6 +189,7 @@ class NavWebReport(Report):
         stdoptions.run_living_people_option(self, menu)
         self.database = CacheProxyDb(self.database)
         self._db = self.database
+        self.basedb = self.database.basedb
 
         filters_option = menu.get_option_by_name('filter')
         self.filter = filters_option.get_filter()
@@ -201,6 +243,9 @@ class NavWebReport(Report):
         self.encoding = self.options['encoding']
 
         self.use_archive = self.options['archive']
+        # Only write the pages that changed since the last run?
+        self.incremental = (self.options['incremental'] and
+                            not self.use_archive)
         self.use_intro = self.options['intronote'] or self.options['introimg']
         self.use_home = self.options['homenote'] or self.options['homeimg']
         self.use_contact = self.opts['contactnote'] or self.opts['contactimg']
@@ -265,6 +310,11 @@ class NavWebReport(Report):
         else:
             self.html_dir = self.target_path
         self.warn_dir = True       # Only give warning once.
+        self.manifest = None
+        # the object pages can be written by worker processes
+        self.processes = (config.get('behavior.website-processes') or
+                          os.cpu_count() or 1)
+        self.pool = None
         self.obj_dict = None
         self.visited = None
         self.bkref_dict = None
@@ -349,6 +399,14 @@ class NavWebReport(Report):
             config.set('paths.website-cal-uri',
                        os.path.dirname(self.target_cal_uri))
 
+        if self.incremental:
+            # Record what each page reads from the database, so that the
+            # next run can tell which pages changed.
+            self.manifest = PageManifest(self.database, self.html_dir,
+                                         self.options)
+            self.database = DependencyProxyDb(self.database, self.manifest)
+            self._db = self.database
+
         # for use with discovering biological, half, and step siblings for use
         # in display_ind_parents()...
         self.rel_class = get_relationship_calculator(reinit=True,
@@ -441,43 +499,46 @@ class NavWebReport(Report):
         self.base_pages()
         self.visited = []
 
-        # build classes IndividualListPage and IndividualPage
-        self.tab["Person"].display_pages(self.title)
+        try:
+            # build classes IndividualListPage and IndividualPage
+            self.tab["Person"].display_pages(self.title)
 
-        self.build_gendex(self.obj_dict[Person])
+            self.build_gendex(self.obj_dict[Person])
 
-        # build classes SurnameListPage and SurnamePage
-        self.surname_pages(self.obj_dict[Person])
+            # build classes SurnameListPage and SurnamePage
+            self.surname_pages(self.obj_dict[Person])
 
-        # build classes FamilyListPage and FamilyPage
-        if self.inc_families:
-            self.tab["Family"].display_pages(self.title)
+            # build classes FamilyListPage and FamilyPage
+            if self.inc_families:
+                self.tab["Family"].display_pages(self.title)
 
-        # build classes EventListPage and EventPage
-        if self.inc_events:
-            self.tab["Event"].display_pages(self.title)
+            # build classes EventListPage and EventPage
+            if self.inc_events:
+                self.tab["Event"].display_pages(self.title)
 
-        # build classes PlaceListPage and PlacePage
-        self.tab["Place"].display_pages(self.title)
+            # build classes PlaceListPage and PlacePage
+            self.tab["Place"].display_pages(self.title)
 
-        # build classes RepositoryListPage and RepositoryPage
-        if self.inc_repository:
-            self.tab["Repository"].display_pages(self.title)
+            # build classes RepositoryListPage and RepositoryPage
+            if self.inc_repository:
+                self.tab["Repository"].display_pages(self.title)
 
-        # build classes MediaListPage and MediaPage
-        if self.inc_gallery:
-            if not self.create_thumbs_only:
-                self.tab["Media"].display_pages(self.title)
+            # build classes MediaListPage and MediaPage
+            if self.inc_gallery:
+                if not self.create_thumbs_only:
+                    self.tab["Media"].display_pages(self.title)
 
-            # build Thumbnail Preview Page...
-            self.thumbnail_preview_page()
+                # build Thumbnail Preview Page...
+                self.thumbnail_preview_page()
 
-        # build classes AddressBookListPage and AddressBookPage
-        if self.inc_addressbook:
-            self.addressbook_pages(self.obj_dict[Person])
+            # build classes AddressBookListPage and AddressBookPage
+            if self.inc_addressbook:
+                self.addressbook_pages(self.obj_dict[Person])
 
-        # build classes SourceListPage and SourcePage
-        self.tab["Source"].display_pages(self.title)
+            # build classes SourceListPage and SourcePage
+            self.tab["Source"].display_pages(self.title)
+        finally:
+            self.__stop_workers()
 
         # build classes StatisticsPage
         if self.inc_stats:
@@ -494,6 +555,11 @@ class NavWebReport(Report):
         if self.archive:
             self.archive.close()
 
+        # remove the pages of the last run that are gone, and keep the
+        # record of this run
+        if self.manifest:
+            self.manifest.save()
+
         if _WRONGMEDIAPATH:
             error = '\n'.join([
                 _('ID=%(grampsid)s, path=%(dir)s') % {
@@ -550,6 +616,12 @@ class NavWebReport(Report):
                   "".join(("%s: %s\n" % item)
                           for item in self.bkref_dict.items()))
 
+        if self.manifest:
+            # the pages depend on the entries they read, as on the database
+            self.manifest.watch("obj_dict", self.obj_dict, _obj_class_list)
+            self.manifest.watch("bkref_dict", self.bkref_dict,
+                                _obj_class_list)
+
     def _add_person(self, person_handle, bkref_class, bkref_handle):
         """
         Add person_handle to the obj_dict, and recursively all referenced
@@ -1182,6 +1254,184 @@ class NavWebReport(Report):
         else:
             filep.write(linew)
 
+    def page_is_current(self, obj_class, handle, *extra):
+        """
+        Return True if the page of an object does not need to be written
+        again, in incremental mode.
+
+        @param: obj_class -- The class of the object
+        @param: handle    -- The handle of the object
+        @param: extra     -- Anything else the page depends on
+        """
+        if self.manifest is None:
+            return False
+        return self.manifest.is_current(
+            "%s:%s" % (obj_class.__name__, handle), extra)
+
+    @contextmanager
+    def record_page(self, obj_class, handle, *extra):
+        """
+        Record what the page of an object reads while it is written, in
+        incremental mode.
+
+        @param: obj_class -- The class of the object
+        @param: handle    -- The handle of the object
+        @param: extra     -- Anything else the page depends on
+        """
+        if self.manifest is None:
+            yield
+            return
+        self.manifest.start(
+            "%s:%s" % (obj_class.__name__, handle), extra,
+            ("get_%s_from_handle" % obj_class.__name__.lower(), (handle,), ()))
+        try:
+            yield
+        finally:
+            self.manifest.finish()
+
+    def write_object_pages(self, obj_class, title, pages, step):
+        """
+        Write the pages of objects of a class. When there are many, they are
+        written by worker processes (see the behavior.website-processes
+        setting), each reading the tree through its own connection.
+
+        @param: obj_class -- The class of the objects
+        @param: title     -- Is the title of the web page
+        @param: pages     -- A list of (handle, extra) for the pages, where
+                             extra is a tuple of the other arguments of the
+                             display_page method of the tab of the class
+        @param: step      -- The function called for each page written
+        """
+        pool = self.__start_workers(len(pages))
+        if pool is None:
+            for handle, extra in pages:
+                self.__write_page(obj_class, title, handle, extra)
+                step()
+            return
+        pending = deque()
+        for start in range(0, len(pages), PAGES_CHUNK):
+            chunk = pages[start:start + PAGES_CHUNK]
+            pending.append((len(chunk), pool.submit(write_pages, obj_class,
+                                                    title, chunk)))
+            if len(pending) > 2 * self.processes:
+                self.__add_worker_pages(*pending.popleft(), step=step)
+        while pending:
+            self.__add_worker_pages(*pending.popleft(), step=step)
+
+    def __write_page(self, obj_class, title, handle, extra):
+        """
+        Write the page of an object, unless it is current.
+        """
+        if self.page_is_current(obj_class, handle, *extra):
+            return
+        with self.record_page(obj_class, handle, *extra):
+            self.tab[obj_class.__name__].display_page(title, handle, *extra)
+
+    def __start_workers(self, count):
+        """
+        Return the pool of worker processes for writing a number of pages,
+        or None if the pages are written by this process.
+
+        The workers are forked from this process, which is only possible
+        where fork is, and they must be able to open the tree themselves,
+        which is only possible for an SQLite tree on disk.
+        """
+        global _REPORT
+        if self.pool is None and self.processes > 1 and count > PAGES_CHUNK:
+            path = self.basedb.get_save_path()
+            if not path or not os.path.isfile(os.path.join(path,
+                                                           "sqlite.db")):
+                self.processes = 1
+                return None
+            _REPORT = self
+            try:
+                self.pool = ProcessPoolExecutor(
+                    self.processes,
+                    mp_context=multiprocessing.get_context("fork"),
+                    initializer=_start_worker)
+                for future in [self.pool.submit(os.getpid)
+                               for dummy in range(self.processes)]:
+                    future.result()
+            except (OSError, ImportError, NotImplementedError, ValueError,
+                    BrokenProcessPool) as err:
+                LOG.warning("Cannot start worker processes: %s", err)
+                self.__stop_workers()
+                self.processes = 1
+        return self.pool
+
+    def __stop_workers(self):
+        """
+        Stop the worker processes, if any.
+        """
+        global _REPORT
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        _REPORT = None
+
+    def start_worker(self):
+        """
+        Prepare this copy of the report, in a new worker process, for writing
+        pages: open another connection to the tree, and keep the user
+        messages for the report process.
+        """
+        # The connection and the archive belong to the report process: they
+        # are kept, so that they are not closed from here.
+        self.__inherited = (self.basedb.dbapi, self.archive)
+        self.basedb.load(self.basedb.get_save_path(), mode=DBMODE_R)
+        self.archive = None
+        self.user = WorkerUser()
+        if self.manifest:
+            self.manifest.take_pages()
+
+    def write_worker_pages(self, obj_class, title, pages):
+        """
+        Write pages in a worker process. For an archive, they are written in
+        a temporary one.
+
+        Return the name of the temporary archive, the record of the pages
+        for the manifest, and the warnings for the user.
+        """
+        archive_name = None
+        if self.use_archive:
+            os_handle, archive_name = tempfile.mkstemp(suffix=".tar")
+            os.close(os_handle)
+            self.archive = tarfile.open(archive_name, "w")
+        try:
+            for handle, extra in pages:
+                self.__write_page(obj_class, title, handle, extra)
+        finally:
+            if self.archive:
+                self.archive.close()
+                self.archive = None
+        warnings = self.user.warnings
+        self.user.warnings = []
+        return (archive_name,
+                self.manifest.take_pages() if self.manifest else None,
+                warnings)
+
+    def __add_worker_pages(self, count, future, step):
+        """
+        Take in the pages written by a worker process.
+        """
+        archive_name, pages, warnings = future.result()
+        if archive_name:
+            try:
+                with tarfile.open(archive_name) as part:
+                    names = set(self.archive.getnames())
+                    for tarinfo in part:
+                        if tarinfo.name not in names:
+                            self.archive.addfile(tarinfo,
+                                                 part.extractfile(tarinfo))
+            finally:
+                os.remove(archive_name)
+        if pages:
+            self.manifest.add_pages(*pages)
+        for title, warning in warnings:
+            self.user.warn(title, warning)
+        for dummy in range(count):
+            step()
+
     def surname_pages(self, ind_list):
         """
         Generates the surname related pages from list of individual
@@ -1472,16 +1722,19 @@ class NavWebReport(Report):
                 self.cur_fname = os.path.join(subdir, fname) + ext
             else:
                 self.cur_fname = fname + ext
-        if self.archive:
+        if self.archive or self.manifest:
             string_io = BytesIO()
             output_file = TextIOWrapper(string_io, encoding=self.encoding,
                                         errors='xmlcharrefreplace')
+            if subdir and not self.archive:
+                subdir = os.path.join(self.html_dir, subdir)
+                # the directory may be made by a worker process meanwhile
+                os.makedirs(subdir, exist_ok=True)
         else:
             string_io = None
             if subdir:
                 subdir = os.path.join(self.html_dir, subdir)
-                if not os.path.isdir(subdir):
-                    os.makedirs(subdir)
+                os.makedirs(subdir, exist_ok=True)
             fname = os.path.join(self.html_dir, self.cur_fname)
             output_file = open(fname, 'w', encoding=self.encoding,
                                errors='xmlcharrefreplace')
@@ -1511,6 +1764,14 @@ class NavWebReport(Report):
                 string_io.seek(0)
                 self.archive.addfile(tarinfo, string_io)
             output_file.close()
+        elif self.manifest:
+            # the file is only written if its content changed
+            output_file.flush()
+            if self.manifest.write_file(self.cur_fname, string_io.getvalue()):
+                if date > 0:
+                    os.utime(os.path.join(self.html_dir, self.cur_fname),
+                             (date, date))
+            output_file.close()
         else:
             output_file.close()
             if date > 0:
@@ -1567,9 +1828,11 @@ class NavWebReport(Report):
             dest = os.path.join(self.html_dir, to_dir, to_fname)
 
             destdir = os.path.dirname(dest)
-            if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+            os.makedirs(destdir, exist_ok=True)
 
+            if self.manifest and not self.manifest.copy_needed(
+                    from_fname, dest, os.path.relpath(dest, self.html_dir)):
+                return
             if from_fname != dest:
                 try:
                     shutil.copyfile(from_fname, dest)
@@ -1701,6 +1964,14 @@ class NavWebOptions(MenuReportOptions):
                                  "files"))
         addopt("target", self.__target)
 
+        self.__incremental = BooleanOption(
+            _("Only write the pages that changed"), False)
+        self.__incremental.set_help(
+            _("Whether to keep a record of the pages written, and only "
+              "write again the pages whose data changed since the last "
+              "run, removing those that are gone. Not used for archives."))
+        addopt("incremental", self.__incremental)
+
         self.__archive_changed()
 
         title = StringOption(_("Web site title"), _('My Family Tree'))
@@ -2299,8 +2570,10 @@ class NavWebOptions(MenuReportOptions):
         if self.__archive.get_value() is True:
             self.__target.set_extension(".tar.gz")
             self.__target.set_directory_entry(False)
+            self.__incremental.set_available(False)
         else:
             self.__target.set_directory_entry(True)
+            self.__incremental.set_available(True)
 
     def __update_filters(self):
         """
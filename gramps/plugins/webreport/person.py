@@ -143,16 +143,25 @@ class PersonPages(BasePage):
         with self.r_user.progress(_("Narrated Web Site Report"), message,
                                   len(self.report.obj_dict[Person]) + 1
                                  ) as step:
-            index = 1
-            for person_handle in sorted(self.report.obj_dict[Person]):
-                step()
-                index += 1
-                person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, title, person)
+            self.report.write_object_pages(
+                Person, title,
+                [(person_handle, ())
+                 for person_handle in sorted(self.report.obj_dict[Person])],
+                step)
             step()
             self.individuallistpage(self.report, title,
                                     self.report.obj_dict[Person].keys())
 
+    def display_page(self, title, person_handle):
+        """
+        Generate and output the page of an individual.
+
+        @param: title         -- Is the title of the web page
+        @param: person_handle -- The handle of the person
+        """
+        person = self.r_db.get_person_from_handle(person_handle)
+        self.individualpage(self.report, title, person)
+
 #################################################
 #
 #    creates the Individual List Page
@@ -106,11 +106,20 @@ class SourcePages(BasePage):
             self.sourcelistpage(self.report, title,
                                 self.report.obj_dict[Source].keys())
 
-            index = 1
-            for source_handle in self.report.obj_dict[Source]:
-                step()
-                index += 1
-                self.sourcepage(self.report, title, source_handle)
+            self.report.write_object_pages(
+                Source, title,
+                [(source_handle, ())
+                 for source_handle in self.report.obj_dict[Source]],
+                step)
+
+    def display_page(self, title, source_handle):
+        """
+        Generate and output the page of a source.
+
+        @param: title         -- Is the title of the web page
+        @param: source_handle -- The handle of the source
+        """
+        self.sourcepage(self.report, title, source_handle)
 
     def sourcelistpage(self, report, title, source_handles):
         """
@@ -0,0 +1,225 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2018       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for manifest.py """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+from ..manifest import (PageManifest, DependencyProxyDb, DependencyDict,
+                        MANIFEST_FNAME)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+OPTIONS = {'title': 'My Family Tree', 'ext': '.html'}
+
+class ManifestTest(unittest.TestCase):
+    """
+    Test the record of the pages written by the narrated web report.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.handles = sorted(cls.db.get_person_handles())[:2]
+
+    def setUp(self):
+        self.html_dir = tempfile.mkdtemp()
+        self.obj_dict = {Person: {handle: {(handle + ".html", "name", 1)}
+                                  for handle in self.handles}}
+
+    def tearDown(self):
+        shutil.rmtree(self.html_dir)
+
+    def new_manifest(self, options=OPTIONS):
+        """
+        Return the manifest of a new run, and the proxy of its database.
+        """
+        manifest = PageManifest(self.db, self.html_dir, options)
+        manifest.watch("obj_dict", self.obj_dict, [Person])
+        return manifest, DependencyProxyDb(self.db, manifest)
+
+    @staticmethod
+    def write_page(manifest, database, handle, extra=None):
+        """
+        Write the page of a person, the way the report does.
+        """
+        manifest.start("Person:" + handle, extra,
+                       ("get_person_from_handle", (handle,), ()))
+        person = database.get_person_from_handle(handle)
+        data = person.get_primary_name().get_surname().encode("utf-8")
+        written = manifest.write_file(handle + ".html", data)
+        manifest.finish()
+        return written
+
+    def first_run(self):
+        """
+        Write the pages of all the people, and save the manifest.
+        """
+        manifest, database = self.new_manifest()
+        for handle in self.handles:
+            self.assertTrue(self.write_page(manifest, database, handle))
+        manifest.save()
+
+    def test_save(self):
+        self.first_run()
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.html_dir, MANIFEST_FNAME)))
+        manifest = self.new_manifest()[0]
+        self.assertEqual(set(manifest.old_pages),
+                         {"Person:" + handle for handle in self.handles})
+        self.assertEqual(set(manifest.old_files),
+                         {handle + ".html" for handle in self.handles})
+
+    def test_is_current(self):
+        self.first_run()
+        manifest = self.new_manifest()[0]
+        for handle in self.handles:
+            self.assertTrue(manifest.is_current("Person:" + handle, None))
+        self.assertEqual(set(manifest.files),
+                         {handle + ".html" for handle in self.handles})
+        manifest.save()
+        # The pages that were current are kept for the next run
+        manifest = self.new_manifest()[0]
+        self.assertTrue(manifest.is_current("Person:" + self.handles[0], None))
+
+    def test_not_current(self):
+        self.first_run()
+        manifest = self.new_manifest()[0]
+        self.assertFalse(manifest.is_current("Person:unknown", None))
+        self.assertFalse(manifest.is_current("Person:" + self.handles[0],
+                                             "other"))
+        manifest = self.new_manifest({'title': 'Other'})[0]
+        self.assertFalse(manifest.is_current("Person:" + self.handles[0],
+                                             None))
+
+    def test_missing_file(self):
+        self.first_run()
+        os.remove(os.path.join(self.html_dir, self.handles[0] + ".html"))
+        manifest = self.new_manifest()[0]
+        self.assertFalse(manifest.is_current("Person:" + self.handles[0],
+                                             None))
+        self.assertTrue(manifest.is_current("Person:" + self.handles[1],
+                                            None))
+
+    def test_changed_object(self):
+        self.first_run()
+        person = self.db.get_person_from_handle(self.handles[0])
+        gender = person.get_gender()
+        try:
+            with DbTxn("Change gender", self.db) as trans:
+                person.set_gender(Person.UNKNOWN if gender != Person.UNKNOWN
+                                  else Person.MALE)
+                self.db.commit_person(person, trans)
+            manifest = self.new_manifest()[0]
+            self.assertFalse(manifest.is_current("Person:" + self.handles[0],
+                                                 None))
+            self.assertTrue(manifest.is_current("Person:" + self.handles[1],
+                                                None))
+        finally:
+            with DbTxn("Restore gender", self.db) as trans:
+                person.set_gender(gender)
+                self.db.commit_person(person, trans)
+
+    def test_stale_files(self):
+        self.first_run()
+        manifest = self.new_manifest()[0]
+        self.assertTrue(manifest.is_current("Person:" + self.handles[0], None))
+        manifest.save()
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.html_dir, self.handles[0] + ".html")))
+        self.assertFalse(os.path.isfile(
+            os.path.join(self.html_dir, self.handles[1] + ".html")))
+        manifest = self.new_manifest()[0]
+        self.assertEqual(list(manifest.old_files), [self.handles[0] + ".html"])
+
+    def test_write_file(self):
+        manifest = self.new_manifest()[0]
+        self.assertTrue(manifest.write_file("index.html", b"first"))
+        manifest.save()
+        path = os.path.join(self.html_dir, "index.html")
+        mtime = os.stat(path).st_mtime_ns
+        manifest = self.new_manifest()[0]
+        self.assertFalse(manifest.write_file("index.html", b"first"))
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertTrue(manifest.write_file("index.html", b"second"))
+        with open(path, "rb") as output_file:
+            self.assertEqual(output_file.read(), b"second")
+        os.remove(path)
+        manifest = self.new_manifest()[0]
+        self.assertTrue(manifest.write_file("index.html", b"first"))
+        self.assertTrue(os.path.isfile(path))
+
+    def test_proxy(self):
+        manifest, database = self.new_manifest()
+        handle = self.handles[0]
+        database.get_person_from_handle(handle)
+        self.assertIsNone(manifest.current)
+        self.write_page(manifest, database, handle)
+        self.assertIn(("get_person_from_handle", (handle,), ()),
+                      manifest.key_list)
+        # Methods that do not read objects are not recorded
+        self.assertEqual(database.get_dbname(), self.db.get_dbname())
+        self.assertEqual(len(manifest.key_list), 1)
+        manifest.start("Person:" + handle, None,
+                       ("get_person_from_handle", (handle,), ()))
+        database.get_number_of_people()
+        list(database.find_backlink_handles(handle))
+        manifest.finish()
+        self.assertIn(("get_number_of_people", (), ()), manifest.key_list)
+        self.assertIn(("find_backlink_handles", (handle,), ()),
+                      manifest.key_list)
+
+    def test_dependency_dict(self):
+        people = self.obj_dict[Person]
+        manifest = self.new_manifest()[0]
+        self.assertIsInstance(self.obj_dict[Person], DependencyDict)
+        handle = self.handles[0]
+        self.assertIn(handle, people)
+        self.assertEqual(manifest.key_list, [])
+        manifest.start("Person:" + handle, None,
+                       ("get_person_from_handle", (handle,), ()))
+        self.assertIn(handle, self.obj_dict[Person])
+        self.assertIsNone(self.obj_dict[Person].get("unknown"))
+        manifest.write_file(handle + ".html", b"page")
+        manifest.finish()
+        self.assertIn(("obj_dict", "Person", handle), manifest.key_list)
+        self.assertIn(("obj_dict", "Person", "unknown"), manifest.key_list)
+        manifest.save()
+
+        # The page depends on the entries it read
+        self.obj_dict = {Person: dict(people)}
+        manifest = self.new_manifest()[0]
+        self.assertTrue(manifest.is_current("Person:" + handle, None))
+        self.obj_dict = {Person: dict(people)}
+        self.obj_dict[Person]["unknown"] = {("unknown.html", "name", 1)}
+        manifest = self.new_manifest()[0]
+        self.assertFalse(manifest.is_current("Person:" + handle, None))
+
+if __name__ == "__main__":
+    unittest.main()